@@ -2,37 +2,38 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import mysql.connector
+from modules.contagem_registros import obter_contagem, mostrar_contagem, formatar_contagem
+from modules.conexao_resiliente import conectar, obter_conexao_sessao
+from modules.exportacao import mostrar_exportacao
+from modules.resultados import dataframe_do_cursor, tipar_dataframe
+from modules.grade_virtual import invalidar_grade, mostrar_grade
+from modules.operacoes_lote import mostrar_operacao_lote
+from modules.arquivamento import mostrar_arquivamento
+from modules.busca_indexada import (ROTULOS_MODO, descrever_perfil, estimar_busca, executar_busca,
+                                    modos_busca, perfil_coluna)
+from modules.comandos_preparados import (consultar_dataframe_preparado, consultar_preparado,
+                                         executar_preparado)
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 # ============ FUNÇÕES DE CONEXÃO E AUXILIARES ============
 def conectar_banco(banco=None):
-    """Conecta ao banco de dados MariaDB/MySQL"""
-    try:
-        config = {
-            "host": "localhost",
-            "user": "root",
-            "password": ""
-        }
-        
-        if banco:
-            config["database"] = banco
-            
-        conexao = mysql.connector.connect(**config)
-        return conexao
-    except mysql.connector.Error as e:
-        st.error(f"Erro ao conectar ao banco: {e}")
-        return None
+    """
+    Conexão dos formulários, mantida na sessão entre reruns para reaproveitar
+    os comandos preparados (autocommit: leituras sempre veem os dados atuais)
+    """
+    conexao = obter_conexao_sessao(
+        "conexao_formularios", banco=banco,
+        conectar_nova=lambda: conectar(banco, autocommit=True)
+    )
+    if conexao is None:
+        st.error("Erro ao conectar ao banco")
+    return conexao
 
 def listar_bancos_simples():
     """Função local para listar bancos"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         cursor = conexao.cursor()
         cursor.execute("SHOW DATABASES")
         bancos = [db[0] for db in cursor.fetchall()]
@@ -115,10 +116,9 @@ def encontrar_coluna_ordenacao(conexao, tabela):
 def mostrar_resumo_tabela(conexao, tabela):
     """Versão corrigida"""
     try:
-        cursor = conexao.cursor()
-        cursor.execute(f"SELECT COUNT(*) FROM `{tabela}`")
-        total = cursor.fetchone()[0]
+        total = formatar_contagem(obter_contagem(conexao, conexao.database, tabela))
         
+        cursor = conexao.cursor()
         cursor.execute(f"DESCRIBE `{tabela}`")
         colunas_info = cursor.fetchall()
         
@@ -146,77 +146,11 @@ def mostrar_resumo_tabela(conexao, tabela):
         st.warning(f"Não foi possível carregar resumo: {e}")
 
 def corrigir_tipos_dataframe(df):
-    """Corrige tipos misturados no DataFrame para evitar erros do PyArrow"""
-    try:
-        df_corrigido = df.copy()
-        
-        # Para cada coluna, verificar se há tipos misturados
-        for coluna in df_corrigido.columns:
-            # Verificar se a coluna tem tipos misturados
-            tipos = set(type(x).__name__ for x in df_corrigido[coluna].dropna() if x is not None)
-            
-            if len(tipos) > 1:
-                # Converter tudo para string para evitar erros
-                df_corrigido[coluna] = df_corrigido[coluna].astype(str)
-            elif df_corrigido[coluna].dtype == 'object':
-                # Se é objeto, tentar converter para tipos apropriados
-                try:
-                    # Tentar converter para numérico
-                    df_corrigido[coluna] = pd.to_numeric(df_corrigido[coluna])
-                except (ValueError, TypeError):
-                    # Se falhar, manter como string
-                    df_corrigido[coluna] = df_corrigido[coluna].astype(str)
-        
-        return df_corrigido
-    except Exception as e:
-        # Se der erro, retornar o DataFrame original convertido para string
-        try:
-            return df.astype(str)
-        except:
-            return df
-
-def paginacao_simples(df, chave_unica):
-    """Páginação simples com setinhas"""
-    items_per_page = st.selectbox("Registros por página:", [5, 10, 20, 50], key=f"items_{chave_unica}")
-    
-    if f'pagina_{chave_unica}' not in st.session_state:
-        st.session_state[f'pagina_{chave_unica}'] = 1
-    
-    total_items = len(df)
-    total_pages = max(1, (total_items - 1) // items_per_page + 1)
-    current_page = st.session_state[f'pagina_{chave_unica}']
-    
-    # Navegação
-    col1, col2, col3, col4, col5 = st.columns(5)
-    
-    with col1:
-        if st.button("⏮️", key=f"first_{chave_unica}", disabled=current_page == 1):
-            st.session_state[f'pagina_{chave_unica}'] = 1
-            st.rerun()
-    
-    with col2:
-        if st.button("◀️", key=f"prev_{chave_unica}", disabled=current_page == 1):
-            st.session_state[f'pagina_{chave_unica}'] -= 1
-            st.rerun()
-    
-    with col3:
-        st.write(f"**{current_page}/{total_pages}**")
-    
-    with col4:
-        if st.button("▶️", key=f"next_{chave_unica}", disabled=current_page >= total_pages):
-            st.session_state[f'pagina_{chave_unica}'] += 1
-            st.rerun()
-    
-    with col5:
-        if st.button("⏭️", key=f"last_{chave_unica}", disabled=current_page >= total_pages):
-            st.session_state[f'pagina_{chave_unica}'] = total_pages
-            st.rerun()
-    
-    # Mostrar dados da página atual
-    start_idx = (current_page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, total_items)
-    
-    return df.iloc[start_idx:end_idx], current_page, total_pages
+    """
+    Evita erros do PyArrow com tipos misturados sem converter tudo para str:
+    colunas numéricas continuam numéricas e NULL continua nulo
+    """
+    return tipar_dataframe(df)
 
 # ==================== 1. FUNÇÃO LISTAR (COMPLETA) ====================
 def listar_registros(conexao, tabela):
@@ -233,9 +167,12 @@ def listar_registros(conexao, tabela):
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    # Filtro por coluna
+                    # Filtro por coluna (aplicado no servidor, página a página)
                     colunas_filtro = ['Todas'] + estrutura['Campo'].tolist()
                     coluna_filtro = st.selectbox("Filtrar por coluna:", colunas_filtro)
+                    valor_filtro = ""
+                    if coluna_filtro != 'Todas':
+                        valor_filtro = st.text_input(f"Valor para filtrar na coluna '{coluna_filtro}':")
                 
                 with col2:
                     # Ordenação
@@ -243,105 +180,68 @@ def listar_registros(conexao, tabela):
                     ordenar_por = st.selectbox("Ordenar por:", colunas_ordenacao)
                     ordem = st.radio("Ordem:", ["Ascendente", "Descendente"], horizontal=True)
             
-            # Construir query
+            filtro = (coluna_filtro, valor_filtro) if coluna_filtro != 'Todas' and valor_filtro else None
+            ordem_sql = "ASC" if ordem == "Ascendente" else "DESC"
+            
+            # Consulta completa (com filtro e ordem), usada só na exportação
             query = f"SELECT * FROM `{tabela}`"
+            params = None
+            if filtro:
+                query += f" WHERE CAST(`{coluna_filtro}` AS CHAR) LIKE %s"
+                params = (f"%{valor_filtro}%",)
+            query += f" ORDER BY `{ordenar_por}` {ordem_sql}"
             
-            # Adicionar ORDER BY se selecionado
-            if ordenar_por != colunas_ordenacao[0]:
-                ordem_sql = "ASC" if ordem == "Ascendente" else "DESC"
-                query += f" ORDER BY `{ordenar_por}` {ordem_sql}"
+            # ========== PAGINAÇÃO ==========
+            st.write("---")
+            st.write("### 📄 Navegação entre Registros")
             
-            # Executar query
-            cursor = conexao.cursor()
-            cursor.execute(query)
-            registros = cursor.fetchall()
-            colunas = [desc[0] for desc in cursor.description]
-            cursor.close()
+            # Grade paginada por chave: só a página visível sai do servidor
+            janela = mostrar_grade(
+                conexao, conexao.database, tabela, chave=f"formularios_{tabela}",
+                ordenar_por=ordenar_por, descendente=ordem == "Descendente", filtro=filtro
+            )
             
-            if registros:
-                st.success(f"✅ Encontrados {len(registros)} registros")
-                
-                # Converter para DataFrame
-                df = pd.DataFrame(registros, columns=colunas)
-                
-                # CORREÇÃO: Garantir que não há valores None problemáticos
-                df = df.fillna('NULL')  # Preencher None com string
-                
-                # Aplicar filtro se selecionado
-                if coluna_filtro != 'Todas' and coluna_filtro in df.columns:
-                    valor_filtro = st.text_input(f"Valor para filtrar na coluna '{coluna_filtro}':")
-                    if valor_filtro:
-                        df = df[df[coluna_filtro].astype(str).str.contains(valor_filtro, case=False, na=False)]
-                        st.info(f"Filtrado: {len(df)} registros contendo '{valor_filtro}'")
-                
-                # ========== PAGINAÇÃO ==========
-                st.write("---")
-                st.write("### 📄 Navegação entre Registros")
-                
-                # Usar paginação
-                df_paginado, pagina_atual, total_paginas = paginacao_simples(df, tabela)
-                
-                # CORREÇÃO: Aplicar correção de tipos antes de mostrar
-                df_paginado_corrigido = corrigir_tipos_dataframe(df_paginado)
-                
-                # Mostrar estatísticas de navegação
-                col_info1, col_info2 = st.columns(2)
-                with col_info1:
-                    inicio = (pagina_atual - 1) * st.session_state.get(f'items_{tabela}', 10) + 1
-                    fim = min(inicio + st.session_state.get(f'items_{tabela}', 10) - 1, len(df))
-                    st.info(f"**Mostrando:** {inicio} a {fim} de {len(df)}")
-                
-                with col_info2:
-                    st.info(f"**Página:** {pagina_atual} de {total_paginas}")
-                
-                # Mostrar dados COM CORREÇÃO
-                st.dataframe(df_paginado_corrigido, use_container_width=True)
+            if janela is not None and not janela["dados"].empty:
+                df = janela["dados"]
+                if filtro:
+                    st.info(f"Filtrado: registros contendo '{valor_filtro}' em '{coluna_filtro}'")
                 
                 # ========== BOTÕES DE AÇÃO ==========
                 st.write("---")
-                col_export, col_stats, col_refresh = st.columns(3)
-                
-                with col_export:
-                    if st.button("📥 Exportar para CSV", use_container_width=True):
-                        # Para exportar, usar DataFrame original
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            label="Baixar CSV",
-                            data=csv,
-                            file_name=f"{tabela}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv",
-                            use_container_width=True
-                        )
+                col_stats, col_refresh = st.columns(2)
                 
                 with col_stats:
                     if st.button("📊 Estatísticas", use_container_width=True):
-                        with st.expander("📈 Estatísticas Detalhadas"):
+                        with st.expander("📈 Estatísticas Detalhadas (página atual)"):
                             st.write("**Tipos de dados:**")
                             st.write(df.dtypes)
                             
                             st.write("**Resumo estatístico:**")
-                            # Tentar converter colunas numéricas
-                            df_numerico = df.copy()
-                            for col in df_numerico.columns:
-                                try:
-                                    df_numerico[col] = pd.to_numeric(df_numerico[col])
-                                except (ValueError, TypeError):
-                                    # Manter como está se não for numérico
-                                    continue
-                            
-                            # Mostrar describe apenas para colunas numéricas
-                            colunas_numericas = df_numerico.select_dtypes(include=['number']).columns
+                            # Colunas já chegam tipadas: describe direto nas numéricas
+                            colunas_numericas = df.select_dtypes(include=['number']).columns
                             if len(colunas_numericas) > 0:
-                                st.write(df_numerico[colunas_numericas].describe())
+                                st.write(df[colunas_numericas].describe())
                             else:
                                 st.info("Nenhuma coluna numérica para análise estatística.")
                 
                 with col_refresh:
                     if st.button("🔄 Atualizar Dados", use_container_width=True):
+                        invalidar_grade(conexao.database, tabela)
                         st.rerun()
                 
-            else:
-                st.info(f"ℹ️ A tabela '{tabela}' está vazia.")
+                # Exportação em streaming: relê a consulta em lotes direto para arquivo
+                with st.expander("📥 Exportar Registros"):
+                    mostrar_exportacao(
+                        query, params, banco=conexao.database,
+                        nome_base=f"{tabela}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                        chave=f"formularios_{tabela}", tabela=tabela
+                    )
+                
+            elif janela is not None:
+                if filtro:
+                    st.info(f"ℹ️ Nenhum registro contém '{valor_filtro}' em '{coluna_filtro}'.")
+                else:
+                    st.info(f"ℹ️ A tabela '{tabela}' está vazia.")
         else:
             st.error("Não foi possível obter a estrutura da tabela.")
             
@@ -555,20 +455,14 @@ def operacao_create_ui(conexao, tabela):
                 if save_pressed:
                     if dados_form:
                         try:
-                            cursor = conexao.cursor()
-                            
-                            # Construir query
-                            campos = [f"`{campo}`" for campo in dados_form.keys()]
-                            valores = list(dados_form.values())
-                            placeholders = ["%s"] * len(valores)
-                            
-                            query = f"INSERT INTO `{tabela}` ({', '.join(campos)}) VALUES ({', '.join(placeholders)})"
-                            
-                            cursor.execute(query, valores)
+                            # INSERT preparado: mesmo conjunto de campos reaproveita o comando
+                            banco = conexao.database
+                            _, id_inserido = executar_preparado(
+                                conexao, banco, tabela, "inserir",
+                                list(dados_form.keys()), list(dados_form.values())
+                            )
                             conexao.commit()
-                            
-                            id_inserido = cursor.lastrowid
-                            cursor.close()
+                            invalidar_grade(banco, tabela)
                             
                             # Salvar informação do sucesso
                             st.session_state[f'last_success_{tabela}'] = f"ID: {id_inserido}"
@@ -651,16 +545,17 @@ def processar_lote(conexao, tabela, dados_lote, estrutura):
         progress_bar = st.progress(0)
         status_text = st.empty()
         
+        # Um só comando preparado para todas as linhas, numa transação
+        banco = conexao.database
+        conexao.start_transaction()
+        
         for i, linha in enumerate(linhas):
             status_text.text(f"Processando linha {i+1}/{len(linhas)}")
             
             try:
                 valores = [v.strip() for v in linha.split(',')]
                 if len(valores) == len(campos):
-                    cursor = conexao.cursor()
-                    placeholders = ', '.join(['%s'] * len(campos))
-                    query = f"INSERT INTO `{tabela}` ({', '.join([f'`{c}`' for c in campos])}) VALUES ({placeholders})"
-                    cursor.execute(query, valores)
+                    executar_preparado(conexao, banco, tabela, "inserir", campos, valores)
                     inseridos += 1
                 else:
                     erros.append(f"Linha {i+1}: Esperados {len(campos)} campos, recebidos {len(valores)}")
@@ -670,6 +565,7 @@ def processar_lote(conexao, tabela, dados_lote, estrutura):
             progress_bar.progress((i + 1) / len(linhas))
         
         conexao.commit()
+        invalidar_grade(banco, tabela)
         status_text.empty()
         
         if inseridos > 0:
@@ -684,6 +580,8 @@ def processar_lote(conexao, tabela, dados_lote, estrutura):
                 st.write(f"- {erro}")
         
     except Exception as e:
+        if conexao.in_transaction:
+            conexao.rollback()
         st.error(f"❌ Erro ao processar lote: {e}")
 
 def mostrar_ultimos_registros(conexao, tabela, limite=5):
@@ -710,27 +608,17 @@ def mostrar_ultimos_registros(conexao, tabela, limite=5):
         except:
             cursor.execute(f"SELECT * FROM `{tabela}` LIMIT {limite}")
         
-        registros = cursor.fetchall()
-        colunas = [desc[0] for desc in cursor.description]
+        df = dataframe_do_cursor(cursor)
         cursor.close()
         
-        if registros:
+        if not df.empty:
             st.write(f"**Últimos {limite} registros:**")
             
-            # Converter para string para evitar erros
-            dados = []
-            for reg in registros:
-                linha = []
-                for val in reg:
-                    if val is None:
-                        linha.append("NULL")
-                    elif isinstance(val, (bytes, bytearray)):
-                        linha.append(f"[BLOB {len(val)} bytes]")
-                    else:
-                        linha.append(str(val))
-                dados.append(linha)
-            
-            df = pd.DataFrame(dados, columns=colunas)
+            # Só os BLOBs viram texto curto; o resto mantém o tipo
+            for coluna in df.columns[df.dtypes == object]:
+                df[coluna] = df[coluna].map(
+                    lambda v: f"[BLOB {len(v)} bytes]" if isinstance(v, (bytes, bytearray)) else v
+                )
             st.dataframe(df, use_container_width=True)
         else:
             st.info("📭 Nenhum registro na tabela.")
@@ -761,21 +649,71 @@ def operacao_read_ui(conexao, tabela):
                     key="busca_simples_col"
                 )
                 
-                termo_busca = st.text_input("Termo para buscar:", key="busca_simples_termo")
+                # Tipo de busca conforme os índices da coluna (o mais barato primeiro)
+                # Perfil em cache por (banco, tabela, coluna): consulta o information_schema uma vez só
+                banco = conexao.database
+                perfis = st.session_state.setdefault("busca_perfis", {})
+                chave_perfil = (banco, tabela, coluna_busca)
+                perfil = perfis.get(chave_perfil)
+                if perfil is None:
+                    try:
+                        perfil = perfis[chave_perfil] = perfil_coluna(conexao, banco, tabela, coluna_busca)
+                    except Exception as e:
+                        # Sem o perfil a busca segue como se a coluna não tivesse índice
+                        st.error(f"❌ Erro ao ler os índices da coluna: {e}")
+                        perfil = {"coluna": coluna_busca, "tipo": "", "texto": False,
+                                  "indice": None, "unico": False, "fulltext": None}
+                modo_busca = st.radio(
+                    "Tipo de busca:",
+                    modos_busca(perfil),
+                    format_func=lambda m: ROTULOS_MODO[m],
+                    horizontal=True,
+                    key=f"busca_simples_modo_{coluna_busca}"
+                )
+                col_perfil, col_reler = st.columns([4, 1])
+                with col_perfil:
+                    st.caption(descrever_perfil(perfil))
+                with col_reler:
+                    if st.button("🔄 Reler índices", key="busca_simples_reler"):
+                        perfis.pop(chave_perfil, None)
+                        st.rerun()
+                
+                termo_fim = None
+                if modo_busca == "intervalo":
+                    col_de, col_ate = st.columns(2)
+                    with col_de:
+                        termo_busca = st.text_input("De:", key="busca_simples_termo")
+                    with col_ate:
+                        termo_fim = st.text_input("Até:", key="busca_simples_termo_fim")
+                else:
+                    termo_busca = st.text_input(
+                        "Termo para buscar:", key="busca_simples_termo",
+                        help="No modo texto completo valem os operadores do BOOLEAN MODE (+palavra -palavra prefixo*)"
+                    )
+                
+                termo_completo = termo_busca and (modo_busca != "intervalo" or termo_fim)
                 
                 if st.button("🔍 Buscar", key="btn_busca_simples"):
-                    if termo_busca:
+                    if termo_completo:
+                        # EXPLAIN só na busca, não a cada tecla
                         try:
-                            cursor = conexao.cursor()
-                            query = f"SELECT * FROM `{tabela}` WHERE `{coluna_busca}` LIKE %s LIMIT 100"
-                            cursor.execute(query, (f"%{termo_busca}%",))
-                            resultados = cursor.fetchall()
-                            colunas = [desc[0] for desc in cursor.description]
-                            cursor.close()
+                            plano = estimar_busca(conexao, banco, tabela, perfil, modo_busca, termo_busca, termo_fim)
+                            linhas_lidas = f"~{plano['linhas']:,}" if plano["linhas"] is not None else "?"
+                            if modo_busca == "contem" or plano["acesso"] in ("ALL", "index"):
+                                st.warning(f"⚠️ Esta busca não usa índice e varre a tabela "
+                                           f"(EXPLAIN: {linhas_lidas} linhas lidas).")
+                            elif plano["indice"]:
+                                st.caption(f"✅ Usa o índice `{plano['indice']}` "
+                                           f"(EXPLAIN: {linhas_lidas} linhas lidas)")
+                        except Exception as e:
+                            st.warning(f"⚠️ Não foi possível estimar a busca (EXPLAIN): {e}")
+                        
+                        try:
+                            df = executar_busca(conexao, banco, tabela, perfil, modo_busca,
+                                                termo_busca, termo_fim)
                             
-                            if resultados:
-                                st.success(f"✅ Encontrados {len(resultados)} registros")
-                                df = pd.DataFrame(resultados, columns=colunas)
+                            if not df.empty:
+                                st.success(f"✅ Encontrados {len(df)} registros")
                                 st.dataframe(df, use_container_width=True)
                                 
                                 # Exportar resultados
@@ -880,13 +818,11 @@ def operacao_read_ui(conexao, tabela):
                         
                         cursor = conexao.cursor()
                         cursor.execute(query, valores)
-                        resultados = cursor.fetchall()
-                        colunas = [desc[0] for desc in cursor.description]
+                        df = dataframe_do_cursor(cursor)
                         cursor.close()
                         
-                        if resultados:
-                            st.success(f"✅ Encontrados {len(resultados)} registros")
-                            df = pd.DataFrame(resultados, columns=colunas)
+                        if not df.empty:
+                            st.success(f"✅ Encontrados {len(df)} registros")
                             st.dataframe(df, use_container_width=True)
                         else:
                             st.info("Nenhum registro encontrado.")
@@ -913,24 +849,14 @@ def operacao_read_ui(conexao, tabela):
                 if st.button("🔍 Aplicar Filtros", key="btn_filtros"):
                     if filtros:
                         try:
-                            where_clauses = []
-                            valores = []
-                            
-                            for campo, valor in filtros.items():
-                                where_clauses.append(f"`{campo}` LIKE %s")
-                                valores.append(f"%{valor}%")
-                            
-                            query = f"SELECT * FROM `{tabela}` WHERE " + " AND ".join(where_clauses) + " LIMIT 100"
+                            valores = [f"%{valor}%" for valor in filtros.values()]
+                            df = consultar_dataframe_preparado(
+                                conexao, conexao.database, tabela, "buscar_like",
+                                list(filtros.keys()), valores
+                            )
                             
-                            cursor = conexao.cursor()
-                            cursor.execute(query, valores)
-                            resultados = cursor.fetchall()
-                            colunas = [desc[0] for desc in cursor.description]
-                            cursor.close()
-                            
-                            if resultados:
-                                st.success(f"✅ Encontrados {len(resultados)} registros")
-                                df = pd.DataFrame(resultados, columns=colunas)
+                            if not df.empty:
+                                st.success(f"✅ Encontrados {len(df)} registros")
                                 st.dataframe(df, use_container_width=True)
                             else:
                                 st.info("Nenhum registro encontrado com os filtros aplicados.")
@@ -950,13 +876,17 @@ def operacao_update_ui(conexao, tabela):
     """Interface para atualizar registros"""
     st.subheader(f"🔄 Atualizar Registro em '{tabela}'")
     
+    modo = st.radio("Modo:", ["Um registro", "Em lote (por filtro)"], horizontal=True,
+                    key=f"modo_update_{tabela}")
+    if modo == "Em lote (por filtro)":
+        # Milhares de linhas: filtro + simulação + execução em blocos pela chave
+        mostrar_operacao_lote(conexao, conexao.database, tabela, "atualizar", chave="formularios")
+        return
+    
     try:
         # Primeiro, listar alguns registros
-        cursor = conexao.cursor()
-        cursor.execute(f"SELECT * FROM `{tabela}` LIMIT 20")
-        registros = cursor.fetchall()
-        colunas = [desc[0] for desc in cursor.description]
-        cursor.close()
+        banco = conexao.database
+        registros, colunas = consultar_preparado(conexao, banco, tabela, "primeiros", valores=(20,))
         
         if registros:
             st.write(f"**Últimos 20 registros de '{tabela}':**")
@@ -988,11 +918,9 @@ def operacao_update_ui(conexao, tabela):
                 
                 if id_selecionado:
                     # Buscar registro completo
-                    cursor = conexao.cursor()
-                    query = f"SELECT * FROM `{tabela}` WHERE `{coluna_id}` = %s"
-                    cursor.execute(query, (id_selecionado,))
-                    registro = cursor.fetchone()
-                    cursor.close()
+                    linhas, _ = consultar_preparado(conexao, banco, tabela, "buscar_chave",
+                                                    (coluna_id,), (id_selecionado,))
+                    registro = linhas[0] if linhas else None
                     
                     if registro:
                         st.success(f"✅ Registro encontrado!")
@@ -1040,18 +968,14 @@ def operacao_update_ui(conexao, tabela):
                             if st.button("✅ Salvar Alterações", type="primary"):
                                 if novos_valores:
                                     try:
-                                        cursor = conexao.cursor()
-                                        
-                                        # Construir query UPDATE
-                                        set_clause = ", ".join([f"`{col}` = %s" for col in novos_valores.keys()])
-                                        valores = list(novos_valores.values()) + [id_selecionado]
-                                        
-                                        query = f"UPDATE `{tabela}` SET {set_clause} WHERE `{coluna_id}` = %s"
-                                        cursor.execute(query, valores)
+                                        # UPDATE preparado por conjunto de colunas alteradas
+                                        linhas_afetadas, _ = executar_preparado(
+                                            conexao, banco, tabela, "atualizar",
+                                            list(novos_valores.keys()) + [coluna_id],
+                                            list(novos_valores.values()) + [id_selecionado]
+                                        )
                                         conexao.commit()
-                                        
-                                        linhas_afetadas = cursor.rowcount
-                                        cursor.close()
+                                        invalidar_grade(banco, tabela)
                                         
                                         if linhas_afetadas > 0:
                                             st.success(f"✅ Registro atualizado com sucesso!")
@@ -1096,13 +1020,21 @@ def operacao_delete_ui(conexao, tabela):
     """Interface para excluir registros"""
     st.subheader(f"🗑️ Excluir Registro de '{tabela}'")
     
+    modo = st.radio("Modo:", ["Um registro", "Em lote (por filtro)", "Arquivar antigos"], horizontal=True,
+                    key=f"modo_delete_{tabela}")
+    if modo == "Em lote (por filtro)":
+        # Milhares de linhas: filtro + simulação + execução em blocos pela chave
+        mostrar_operacao_lote(conexao, conexao.database, tabela, "excluir", chave="formularios")
+        return
+    if modo == "Arquivar antigos":
+        # Move (não só apaga) as linhas mais antigas que a idade da política
+        mostrar_arquivamento(conexao, conexao.database, tabela, chave="formularios")
+        return
+    
     try:
         # Primeiro, listar registros
-        cursor = conexao.cursor()
-        cursor.execute(f"SELECT * FROM `{tabela}` LIMIT 30")
-        registros = cursor.fetchall()
-        colunas = [desc[0] for desc in cursor.description]
-        cursor.close()
+        banco = conexao.database
+        registros, colunas = consultar_preparado(conexao, banco, tabela, "primeiros", valores=(30,))
         
         if registros:
             st.warning("⚠️ **ATENÇÃO:** Esta operação é irreversível!")
@@ -1167,17 +1099,16 @@ def operacao_delete_ui(conexao, tabela):
                     with col1:
                         if st.button("🗑️ Confirmar Exclusão", type="primary", disabled=(confirmacao != "EXCLUIR")):
                             try:
-                                cursor = conexao.cursor()
-                                
-                                # Excluir cada registro
+                                # Excluir cada registro (mesmo DELETE preparado, uma transação)
                                 excluidos = 0
+                                conexao.start_transaction()
                                 for id_val in ids_para_excluir:
-                                    query = f"DELETE FROM `{tabela}` WHERE `{coluna_id}` = %s"
-                                    cursor.execute(query, (id_val,))
-                                    excluidos += cursor.rowcount
+                                    afetadas, _ = executar_preparado(conexao, banco, tabela, "excluir",
+                                                                     (coluna_id,), (id_val,))
+                                    excluidos += afetadas
                                 
                                 conexao.commit()
-                                cursor.close()
+                                invalidar_grade(banco, tabela)
                                 
                                 st.success(f"✅ {excluidos} registro(s) excluído(s) com sucesso!")
                                 st.rerun()
@@ -1218,11 +1149,9 @@ def operacao_delete_ui(conexao, tabela):
                         
                         if id_para_excluir:
                             # Verificar se existe
-                            cursor = conexao.cursor()
-                            query = f"SELECT * FROM `{tabela}` WHERE `{coluna_id}` = %s"
-                            cursor.execute(query, (id_para_excluir,))
-                            registro = cursor.fetchone()
-                            cursor.close()
+                            linhas, _ = consultar_preparado(conexao, banco, tabela, "buscar_chave",
+                                                            (coluna_id,), (id_para_excluir,))
+                            registro = linhas[0] if linhas else None
                             
                             if registro:
                                 st.write("**Registro encontrado:**")
@@ -1236,11 +1165,10 @@ def operacao_delete_ui(conexao, tabela):
                                 
                                 if st.button("🗑️ Excluir Este Registro", disabled=(confirmacao != "EXCLUIR")):
                                     try:
-                                        cursor = conexao.cursor()
-                                        query = f"DELETE FROM `{tabela}` WHERE `{coluna_id}` = %s"
-                                        cursor.execute(query, (id_para_excluir,))
+                                        executar_preparado(conexao, banco, tabela, "excluir",
+                                                           (coluna_id,), (id_para_excluir,))
                                         conexao.commit()
-                                        cursor.close()
+                                        invalidar_grade(banco, tabela)
                                         
                                         st.success("✅ Registro excluído com sucesso!")
                                         st.rerun()
@@ -1265,16 +1193,15 @@ def mostrar_estatisticas(conexao, tabela):
         estrutura = obter_estrutura_tabela(conexao, tabela)
         
         if estrutura is not None:
-            # Contagem total
             cursor = conexao.cursor()
-            cursor.execute(f"SELECT COUNT(*) FROM `{tabela}`")
-            total = cursor.fetchone()[0]
             
             # Informações básicas
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.metric("📈 Total de Registros", f"{total:,}")
+                # Estimativa instantânea em tabelas grandes, COUNT(*) em segundo plano
+                mostrar_contagem(conexao, conexao.database, tabela,
+                                 rotulo="📈 Total de Registros", chave="formularios")
             
             with col2:
                 st.metric("🔧 Total de Colunas", len(estrutura))
@@ -1312,65 +1239,62 @@ def mostrar_estatisticas(conexao, tabela):
             with tab2:
                 st.write("**Análise de Dados por Coluna:**")
                 
-                # Para cada coluna, mostrar estatísticas básicas
-                for _, row in estrutura.iterrows():
-                    campo = row['Campo']
-                    tipo = row['Tipo']
-                    
-                    with st.expander(f"📊 {campo} ({tipo})"):
-                        try:
-                            # Estatísticas básicas
-                            if 'int' in tipo.lower() or 'decimal' in tipo.lower() or 'float' in tipo.lower():
-                                # Colunas numéricas
-                                cursor.execute(f"""
-                                    SELECT 
-                                        COUNT(*) as total,
-                                        COUNT(DISTINCT `{campo}`) as distintos,
-                                        MIN(`{campo}`) as minimo,
-                                        MAX(`{campo}`) as maximo,
-                                        AVG(`{campo}`) as media,
-                                        STD(`{campo}`) as desvio_padrao
-                                    FROM `{tabela}`
-                                """)
-                            else:
-                                # Colunas de texto/data
-                                cursor.execute(f"""
-                                    SELECT 
-                                        COUNT(*) as total,
-                                        COUNT(DISTINCT `{campo}`) as distintos,
-                                        MIN(`{campo}`) as minimo,
-                                        MAX(`{campo}`) as maximo
-                                    FROM `{tabela}`
-                                """)
+                # Varre a tabela inteira: só no clique, uma consulta para todas as colunas, guardada na sessão
+                chave_stats = f"estatisticas_colunas_{conexao.database}_{tabela}"
+                if st.button("📊 Analisar colunas (lê a tabela inteira)", key=f"btn_{chave_stats}"):
+                    numericas = {row['Campo'] for _, row in estrutura.iterrows()
+                                 if any(t in row['Tipo'].lower() for t in ('int', 'decimal', 'float', 'double'))}
+                    expressoes = ["COUNT(*)"]
+                    for campo in estrutura['Campo']:
+                        expressoes += [f"COUNT(DISTINCT `{campo}`)", f"MIN(`{campo}`)", f"MAX(`{campo}`)",
+                                       f"SUM(`{campo}` IS NULL)"]
+                        if campo in numericas:
+                            expressoes += [f"AVG(`{campo}`)", f"STD(`{campo}`)"]
+                    try:
+                        cursor.execute(f"SELECT {', '.join(expressoes)} FROM `{tabela}`")
+                        linha = list(cursor.fetchone())
+                        total = linha.pop(0)
+                        colunas_stats = {}
+                        for campo in estrutura['Campo']:
+                            quantidade = 6 if campo in numericas else 4
+                            valores, linha = linha[:quantidade], linha[quantidade:]
+                            colunas_stats[campo] = valores
+                        st.session_state[chave_stats] = {"total": total, "colunas": colunas_stats}
+                    except Exception as e:
+                        st.error(f"❌ Não foi possível analisar as colunas: {e}")
+                
+                analise = st.session_state.get(chave_stats)
+                if analise is None:
+                    st.caption("Contagens, distintos, mínimo/máximo e NULLs de cada coluna exigem ler "
+                               "todas as linhas: clique para analisar.")
+                else:
+                    total = analise["total"]
+                    for _, row in estrutura.iterrows():
+                        campo = row['Campo']
+                        stats = analise["colunas"].get(campo)
+                        if stats is None:
+                            continue
+                        
+                        with st.expander(f"📊 {campo} ({row['Tipo']})"):
+                            col1, col2 = st.columns(2)
                             
-                            stats = cursor.fetchone()
+                            with col1:
+                                st.metric("Total", total)
+                                st.metric("Valores Distintos", stats[0])
                             
-                            if stats:
-                                col1, col2 = st.columns(2)
-                                
-                                with col1:
-                                    st.metric("Total", stats[0])
-                                    st.metric("Valores Distintos", stats[1])
-                                
-                                with col2:
-                                    st.metric("Mínimo", stats[2])
-                                    st.metric("Máximo", stats[3])
-                                
-                                if len(stats) > 4:
-                                    st.metric("Média", f"{stats[4]:.2f}")
-                                    st.metric("Desvio Padrão", f"{stats[5]:.2f}")
+                            with col2:
+                                st.metric("Mínimo", str(stats[1]))
+                                st.metric("Máximo", str(stats[2]))
                             
-                            # Valores NULL
-                            cursor.execute(f"SELECT COUNT(*) FROM `{tabela}` WHERE `{campo}` IS NULL")
-                            null_count = cursor.fetchone()[0]
+                            if len(stats) > 4 and stats[4] is not None:
+                                st.metric("Média", f"{stats[4]:.2f}")
+                                st.metric("Desvio Padrão", f"{stats[5]:.2f}")
                             
+                            null_count = int(stats[3] or 0)
                             if null_count > 0:
                                 st.warning(f"⚠️ {null_count} valores NULL ({null_count/total*100:.1f}%)")
                             else:
                                 st.success("✅ Sem valores NULL")
-                                
-                        except Exception as e:
-                            st.info(f"Não foi possível analisar esta coluna: {e}")
             
             with tab3:
                 st.write("**Chaves e Índices:**")
@@ -1587,7 +1511,6 @@ def pagina_formularios():
             except Exception as e:
                 st.error(f"❌ Erro ao criar tabela: {e}")
         
-        conexao.close()
         return
     
     # ========== ETAPA 2: SELEÇÃO DE TABELA ==========
@@ -1632,9 +1555,7 @@ def pagina_formularios():
             
         elif operacao == "📊 Estatísticas":
             mostrar_estatisticas(conexao, tabela_selecionada)
-    
-    # Fechar conexão
-    conexao.close()
+
 
 # ============ EXECUÇÃO PRINCIPAL ============
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+# agendador_backup.py - Execute FORA do Streamlit (terminal, serviço ou cron do sistema)
+"""
+Agendador de backups automáticos
+
+    python agendador_backup.py                 # fica rodando e dispara as tarefas da agenda
+    python agendador_backup.py --uma-vez       # roda o que estiver pendente e sai (cron/Agendador do Windows)
+    python agendador_backup.py --listar        # mostra tarefas, próximas execuções e último resultado
+    python agendador_backup.py --agora empresa # backup imediato de um banco (+ retenção)
+    python agendador_backup.py --retencao empresa --simular
+
+As tarefas são cadastradas na aba "Backup Total" do sistema de backup
+(ou em backups/agenda.json). Rode a partir da pasta do projeto.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+
+from modules.backup_agenda import (RETENCAO_PADRAO, aplicar_retencao, carregar_agenda, executar_tarefa,
+                                   proxima_execucao, tarefas_pendentes)
+from modules.backup_catalogo import DIRETORIO_PADRAO
+
+INTERVALO_VERIFICACAO = 30      # segundos entre verificações da agenda
+TRAVA = "agendador.lock"
+TRAVA_EXPIRADA = 300            # sem batida há 5 min = agendador anterior morreu
+
+log = logging.getLogger("agendador_backup")
+
+
+# ============ TRAVA DE INSTÂNCIA ÚNICA ============
+def adquirir_trava(diretorio):
+    """Só um agendador por pasta de backups. A trava é renovada a cada ciclo."""
+    caminho = os.path.join(diretorio, TRAVA)
+    if os.path.exists(caminho) and time.time() - os.path.getmtime(caminho) < TRAVA_EXPIRADA:
+        return None
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(f"{os.getpid()} {datetime.now().isoformat(timespec='seconds')}\n")
+    return caminho
+
+
+def renovar_trava(caminho):
+    os.utime(caminho, None)
+
+
+def liberar_trava(caminho):
+    try:
+        os.remove(caminho)
+    except OSError:
+        pass
+
+
+# ============ COMANDOS ============
+def rodar_pendentes(diretorio, trava=None):
+    """Executa as tarefas vencidas, uma de cada vez. Retorna quantas rodaram."""
+    pendentes = tarefas_pendentes(diretorio=diretorio)
+    for tarefa, prevista in pendentes:
+        log.info("Backup de '%s' (agendado para %s)", tarefa["banco"], prevista.strftime("%Y-%m-%d %H:%M"))
+        resultado = executar_tarefa(tarefa, prevista, diretorio,
+                                    ao_progredir=lambda mensagem, _: trava and renovar_trava(trava))
+        if resultado["sucesso"]:
+            log.info(resultado["mensagem"])
+        else:
+            log.error(resultado["mensagem"])
+    return len(pendentes)
+
+
+def listar(diretorio):
+    agenda = carregar_agenda(diretorio)
+    if not agenda["tarefas"]:
+        print("Nenhuma tarefa agendada.")
+        return
+    for banco, tarefa in agenda["tarefas"].items():
+        estado = agenda["estado"].get(banco, {})
+        base = estado.get("agendada_para") or tarefa["criada_em"]
+        proxima = proxima_execucao(tarefa["cron"], max(datetime.fromisoformat(base), datetime.now()))
+        retencao = tarefa["retencao"]
+        print(f"{banco:<20} {tarefa['cron']:<16} "
+              f"{'ativo' if tarefa.get('ativo', True) else 'pausado':<8} "
+              f"próxima: {proxima:%Y-%m-%d %H:%M}  "
+              f"GFS {retencao['diarios']}d/{retencao['semanais']}s/{retencao['mensais']}m")
+        if estado:
+            situacao = "ok" if estado["sucesso"] else "FALHOU"
+            print(f"{'':<20} última: {estado['inicio']} ({situacao}, {estado['duracao']:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agendador de backups automáticos")
+    parser.add_argument("--diretorio", default=DIRETORIO_PADRAO, help="pasta dos backups")
+    parser.add_argument("--uma-vez", action="store_true", help="roda as tarefas pendentes e sai")
+    parser.add_argument("--listar", action="store_true", help="mostra a agenda")
+    parser.add_argument("--agora", metavar="BANCO", help="backup imediato de um banco")
+    parser.add_argument("--retencao", metavar="BANCO", help="aplica só a retenção de um banco")
+    parser.add_argument("--simular", action="store_true", help="com --retencao: só lista o que seria apagado")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    os.makedirs(args.diretorio, exist_ok=True)
+
+    if args.listar:
+        listar(args.diretorio)
+        return 0
+
+    if args.retencao:
+        tarefa = carregar_agenda(args.diretorio)["tarefas"].get(args.retencao, {})
+        removidos = aplicar_retencao(args.retencao, tarefa.get("retencao", RETENCAO_PADRAO),
+                                     args.diretorio, simular=args.simular)
+        for chave in removidos:
+            print(("seria apagado: " if args.simular else "apagado: ") + chave)
+        print(f"{len(removidos)} backup(s)")
+        return 0
+
+    if args.agora:
+        tarefa = carregar_agenda(args.diretorio)["tarefas"].get(args.agora) or {
+            "banco": args.agora, "cron": "manual", "retencao": dict(RETENCAO_PADRAO)
+        }
+        resultado = executar_tarefa(tarefa, diretorio=args.diretorio)
+        print(resultado["mensagem"])
+        return 0 if resultado["sucesso"] else 1
+
+    trava = adquirir_trava(args.diretorio)
+    if trava is None:
+        log.error("Já existe um agendador rodando para '%s'", args.diretorio)
+        return 1
+
+    try:
+        if args.uma_vez:
+            rodar_pendentes(args.diretorio, trava)
+            return 0
+
+        log.info("Agendador iniciado (verificando a cada %ss)", INTERVALO_VERIFICACAO)
+        while True:
+            renovar_trava(trava)
+            try:
+                rodar_pendentes(args.diretorio, trava)
+            except Exception:
+                # Uma falha inesperada não derruba o agendador
+                log.exception("Erro ao processar a agenda")
+            time.sleep(INTERVALO_VERIFICACAO)
+    except KeyboardInterrupt:
+        log.info("Agendador encerrado")
+        return 0
+    finally:
+        liberar_trava(trava)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,22 @@
 # app.py - VERSÃO FIX COM DOCKER E TODOS SEUS MÓDULOS
+import time
+_inicio_execucao = time.perf_counter()
+
 import streamlit as st
-import mysql.connector
-import pandas as pd
 import os
-import subprocess
-import time
 from datetime import datetime
+from config_global import obter_visao_geral_bancos, formatar_tamanho
+# Páginas (e as suas dependências pesadas) só são importadas ao abrir
+from modules.registro_paginas import (
+    REGISTRO_PAGINAS, obter_funcao_pagina, relatorio_importacao, registrar_tempo
+)
+from modules.mysql_prontidao import (
+    iniciar_container_async, docker_container_ativo, obter_status,
+    invalidar_status, mostrar_indicador_status
+)
+from modules.conexao_resiliente import (
+    conectar, obter_conexao_sessao, descartar_conexao_sessao, mostrar_metricas_conexao
+)
 
 # ============ CONFIGURAÇÃO ============
 st.set_page_config(
@@ -16,107 +27,44 @@ st.set_page_config(
 
 # ============ SISTEMA DOCKER MYSQL ============
 def iniciar_mysql_docker():
-    """Inicia MySQL via Docker (substitui XAMPP)"""
-    try:
-        # Verificar se Docker está instalado
-        result = subprocess.run(["docker", "--version"], capture_output=True, text=True)
-        if result.returncode != 0:
-            st.error("❌ Docker não está instalado!")
-            return False
-        
-        # Parar container existente
-        subprocess.run(["docker", "stop", "mysql_fix"], capture_output=True)
-        subprocess.run(["docker", "rm", "mysql_fix"], capture_output=True)
-        
-        # Iniciar novo container
-        cmd = [
-            "docker", "run", "-d",
-            "--name", "mysql_fix",
-            "-p", "3306:3306",
-            "-e", "MYSQL_ROOT_PASSWORD=",
-            "-e", "MYSQL_ALLOW_EMPTY_PASSWORD=yes",
-            "-v", "mysql_fix_data:/var/lib/mysql",
-            "mysql:8.0"
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            st.success("✅ MySQL Docker iniciado! Aguarde 15 segundos...")
-            time.sleep(15)  # Aguardar MySQL inicializar
-            return True
-        else:
-            st.error(f"❌ Erro: {result.stderr}")
-            return False
-            
-    except Exception as e:
-        st.error(f"❌ Erro Docker: {e}")
-        return False
+    """Inicia (ou reutiliza) o MySQL via Docker em segundo plano (substitui XAMPP)"""
+    if iniciar_container_async():
+        st.success("✅ Arranque do MySQL Docker iniciado! O estado aparece na barra lateral.")
+        return True
+    
+    st.info("⏳ O MySQL Docker já está iniciando...")
+    return False
 
 def verificar_mysql_docker():
-    """Verifica se MySQL Docker está rodando"""
-    try:
-        result = subprocess.run(
-            ["docker", "ps", "--filter", "name=mysql_fix", "--format", "{{.Status}}"],
-            capture_output=True, text=True
-        )
-        return "Up" in result.stdout
-    except:
-        return False
+    """Verifica se MySQL Docker está rodando (resultado em cache)"""
+    return docker_container_ativo()
 
 # ============ CONEXÃO INTELIGENTE ============
 def conectar_mysql():
     """Tenta conectar ao MySQL (Docker ou XAMPP)"""
     
-    # Primeiro, tenta conectar normalmente
+    # Nada escutando na porta: não vale a pena esperar pelo timeout
+    if not obter_status()["porta_aberta"]:
+        return None
+    
+    # Primeiro, tenta conectar normalmente (com retentativas em erros transitórios)
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            port=3306,
-            connection_timeout=5
-        )
-        return conexao
+        return conectar(timeout=5)
     except:
         pass
     
     # Se falhou, verifica Docker
     if verificar_mysql_docker():
         try:
-            conexao = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                port=3306,
-                connection_timeout=10
-            )
-            return conexao
+            return conectar(timeout=10)
         except Exception as e:
             st.error(f"❌ Docker rodando mas conexão falhou: {e}")
     
     return None
 
 def get_conexao():
-    """Obtém conexão com tratamento de erro"""
-    if "conexao_mysql" not in st.session_state:
-        st.session_state.conexao_mysql = None
-    
-    # Se não tem conexão ou conexão está morta
-    if not st.session_state.conexao_mysql:
-        st.session_state.conexao_mysql = conectar_mysql()
-        return st.session_state.conexao_mysql
-    
-    # Verificar se conexão ainda está ativa
-    try:
-        if st.session_state.conexao_mysql.is_connected():
-            return st.session_state.conexao_mysql
-        else:
-            st.session_state.conexao_mysql = conectar_mysql()
-            return st.session_state.conexao_mysql
-    except:
-        st.session_state.conexao_mysql = conectar_mysql()
-        return st.session_state.conexao_mysql
+    """Obtém conexão viva da sessão (ping só após inatividade, reconexão automática)"""
+    return obter_conexao_sessao("conexao_mysql", conectar_nova=conectar_mysql)
 
 # ============ FUNÇÕES AUXILIARES ============
 def obter_bancos_mysql():
@@ -159,6 +107,7 @@ def verificar_tabelas_duplicadas_entre_bancos():
                 st.write(f"- `{tabela}` → Bancos: {bancos}")
             
             st.error("Isso pode causar confusão nas relações. Considere renomear ou remover as duplicatas.")
+            st.caption("Para ver se o conteúdo delas é igual, use 🧮 Comparar Dados (dois bancos).")
         
         return duplicadas
     except:
@@ -181,7 +130,7 @@ with st.sidebar:
     conexao = get_conexao()
     status_docker = verificar_mysql_docker()
     
-    if conexao and conexao.is_connected():
+    if conexao:  # get_conexao já garante que está viva
         st.success("✅ **MySQL Conectado**")
         try:
             cursor = conexao.cursor()
@@ -201,6 +150,10 @@ with st.sidebar:
     else:
         st.warning("⚡ XAMPP/Tradicional")
     
+    # Prontidão do MySQL (não bloqueia o script)
+    mostrar_indicador_status()
+    mostrar_metricas_conexao()
+    
     st.markdown("---")
     
     # ============ SELEÇÃO DE BANCO (SISTEMA SIMPLES) ============
@@ -214,11 +167,7 @@ with st.sidebar:
     def listar_bancos_sidebar():
         """Lista bancos para a sidebar"""
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password=""
-            )
+            conn = conectar()
             cursor = conn.cursor()
             cursor.execute("SHOW DATABASES")
             todos = [db[0] for db in cursor.fetchall()]
@@ -259,12 +208,7 @@ with st.sidebar:
         # Mostrar informações do banco ativo
         if st.session_state.banco_ativo:
             try:
-                conn = mysql.connector.connect(
-                    host="localhost",
-                    user="root",
-                    password="",
-                    database=st.session_state.banco_ativo
-                )
+                conn = conectar(st.session_state.banco_ativo)
                 cursor = conn.cursor()
                 cursor.execute("SHOW TABLES")
                 tabelas = cursor.fetchall()
@@ -313,6 +257,9 @@ with st.sidebar:
         ("📚 Guia MySQL", "manual"),
         ("🎯 Exercícios", "exercicios"),
         ("💾 Backup", "backup"),
+        ("🧮 Comparar Dados", "comparar_dados"),
+        ("🧬 Comparar Esquemas", "comparar_esquemas"),
+        ("🎲 Gerar Dados", "gerar_dados"),
     ]
     
     for texto, pagina_nome in paginas:
@@ -336,7 +283,8 @@ with st.sidebar:
     
     with col2:
         if st.button("🔄 Reconectar", help="Tenta reconectar", use_container_width=True):
-            st.session_state.conexao_mysql = None
+            descartar_conexao_sessao("conexao_mysql")
+            invalidar_status()
             st.rerun()
     
     st.markdown("---")
@@ -357,7 +305,7 @@ def pagina_home():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if conexao and conexao.is_connected():
+        if conexao:
             st.success("✅ Conectado")
         else:
             st.error("❌ Desconectado")
@@ -368,13 +316,26 @@ def pagina_home():
         else:
             st.info("⚡ XAMPP")
     
+    # Visão geral de todos os bancos numa única consulta (cache do processo)
+    visao = obter_visao_geral_bancos() if conexao else {}
+    
     with col3:
-        bancos = obter_bancos_mysql()
-        st.metric("Bancos", len(bancos))
+        st.metric("Bancos", len(visao))
     
     with col4:
         st.metric("Hora", datetime.now().strftime("%H:%M"))
     
+    if visao:
+        col_tab, col_reg, col_tam = st.columns(3)
+        with col_tab:
+            st.metric("Tabelas", sum(info['tabelas'] for info in visao.values()))
+        with col_reg:
+            registros = sum(info['registros_estimados'] for info in visao.values())
+            st.metric("Registros (estimativa)", f"≈ {registros:,}")
+        with col_tam:
+            tamanho = sum(info['tamanho_bytes'] for info in visao.values())
+            st.metric("Tamanho Total", formatar_tamanho(tamanho))
+    
     st.markdown("---")
     
     # Solução do Problema
@@ -388,8 +349,7 @@ def pagina_home():
         
         if st.button("🚀 INICIAR MYSQL DOCKER AGORA", type="primary", use_container_width=True):
             if iniciar_mysql_docker():
-                st.success("✅ MySQL Docker iniciado! Reconectando...")
-                time.sleep(5)
+                st.session_state.conexao_mysql = None  # Reconecta quando o MySQL estiver pronto
                 st.rerun()
         
         st.markdown("""
@@ -418,6 +378,9 @@ def pagina_home():
         ("📚 Guia MySQL", "manual", "manual.py", "Documentação"),
         ("🎯 Exercícios", "exercicios", "exercicios.py", "Pratique SQL"),
         ("💾 Backup", "backup", "backup_restore.py", "Backup e restore"),
+        ("🧮 Comparar Dados", "comparar_dados", "comparacao_dados.py", "Diferenças entre tabelas/bancos"),
+        ("🧬 Comparar Esquemas", "comparar_esquemas", "comparacao_esquema.py", "Script de migração entre bancos"),
+        ("🎲 Gerar Dados", "gerar_dados", "gerador_dados.py", "Dados sintéticos para testes de carga"),
         
     ]
     
@@ -452,37 +415,24 @@ def pagina_home():
         with st.expander("Ver módulos faltantes"):
             for f in faltantes:
                 st.write(f"- {f}")
+    
+    # Relatório de arranque
+    registrar_tempo("app.py (execução até home)", time.perf_counter() - _inicio_execucao)
+    with st.expander("⏱️ Tempos de carregamento"):
+        st.caption("Páginas são importadas só quando abertas; o tempo fica registado na primeira vez.")
+        for nome, segundos in relatorio_importacao():
+            st.write(f"- `{nome}`: {segundos * 1000:.0f} ms")
 
 # ============ CARREGADOR DE MÓDULOS SEGURO ============
 def carregar_modulo_seguro(modulo_nome, funcao_principal=None):
-    """Carrega módulos com tratamento de erro"""
+    """Carrega módulos com tratamento de erro (import memoizado no registro)"""
     try:
-        # Tentar importar diretamente
-        modulo = __import__(modulo_nome)
+        funcao = obter_funcao_pagina(modulo_nome, funcao_principal)
         
-        if funcao_principal:
-            # Executar função principal do módulo
-            if hasattr(modulo, funcao_principal):
-                getattr(modulo, funcao_principal)()
-            else:
-                # Tentar nome alternativo
-                funcoes_possiveis = ['main', 'pagina_principal', 'interface_principal', 
-                                    'pagina_' + modulo_nome, modulo_nome + '_main']
-                
-                for funcao in funcoes_possiveis:
-                    if hasattr(modulo, funcao):
-                        getattr(modulo, funcao)()
-                        return
-                
-                # Se não encontrou função, assumir que módulo executa diretamente
-                if callable(modulo):
-                    modulo()
-                else:
-                    st.error(f"Módulo {modulo_nome} não tem função principal clara")
+        if funcao:
+            funcao()
         else:
-            # Módulo auto-executável
-            if callable(modulo):
-                modulo()
+            st.error(f"Módulo {modulo_nome} não tem função principal clara")
         
     except Exception as e:
         st.error(f"❌ Erro ao carregar {modulo_nome}: {str(e)[:100]}")
@@ -534,23 +484,8 @@ def verificar_banco_pagina():
 def main():
     pagina = st.session_state.pagina
     
-    # Mapeamento de páginas e suas funções principais
-    mapeamento = {
-        "home": (pagina_home,),
-        "criar_banco": ("criar_banco", "pagina_criar_banco"),
-        "criar_tabelas": ("criar_tabelas", "pagina_criar_tabelas"),
-        "criar_consultas": ("criar_consultas", "interface_consulta_visual"),
-        "relacoes": ("relacoes_1", "pagina_relacoes"),  # Note: relacoes_1.py
-        "Formularios": ("Formularios", "pagina_formularios"),
-        "query_editor": ("query_editor", "pagina_query_editor"),
-        "manual": ("manual", "pagina_guia"),
-        "exercicios": ("exercicios", "pagina_exercicios"),
-        "backup": ("backup_restore", "main"),
-        "listar_bancos": ("listar_bancos", "main"),
-    }
-    
-    # Verificar se página existe no mapeamento
-    if pagina not in mapeamento:
+    # Verificar se página existe no registro
+    if pagina != "home" and pagina not in REGISTRO_PAGINAS:
         st.error(f"Página '{pagina}' não encontrada!")
         if st.button("🏠 Voltar para Home"):
             st.session_state.pagina = "home"
@@ -563,7 +498,7 @@ def main():
         return
     
     # Para outras páginas, carregar módulo
-    info = mapeamento[pagina]
+    modulo_nome, funcao = REGISTRO_PAGINAS[pagina]
     
     # Adicionar botão de voltar no topo
     col_top1, col_top2 = st.columns([1, 5])
@@ -578,17 +513,7 @@ def main():
     st.markdown("---")
     
     # Carregar módulo
-    if len(info) == 2:
-        modulo_nome, funcao = info
-        carregar_modulo_seguro(modulo_nome, funcao)
-    else:
-        # Backup é especial
-        if pagina == "backup":
-            try:
-                import backup_restore
-                backup_restore.main()
-            except Exception as e:
-                st.error(f"Erro backup: {e}")
+    carregar_modulo_seguro(modulo_nome, funcao)
     
     # Rodapé com status
     st.markdown("---")
@@ -596,7 +521,7 @@ def main():
     conexao = get_conexao()
     docker_status = "🐳 Docker" if verificar_mysql_docker() else "⚡ XAMPP"
     
-    if conexao and conexao.is_connected():
+    if conexao:
         try:
             cursor = conexao.cursor()
             cursor.execute("SELECT DATABASE()")
@@ -613,10 +538,7 @@ def main():
 # ============ PONTO DE ENTRADA COM TRATAMENTO ============
 if __name__ == "__main__":
     try:
-        # Verificar dependências
-        import mysql.connector
-        
-        # Executar app
+        # Executar app (dependência ausente aparece como ImportError dos módulos)
         main()
         
     except ImportError as e:
@@ -629,9 +551,8 @@ if __name__ == "__main__":
         # Solução emergencial
         if st.button("🔄 Tentar Solução Emergencial"):
             try:
-                # Tentar iniciar Docker
+                # Tentar iniciar Docker (em segundo plano; o estado aparece na barra lateral)
                 iniciar_mysql_docker()
-                time.sleep(10)
                 st.rerun()
             except:
                 st.error("Falha na solução emergencial")
\ No newline at end of file
@@ -7,6 +7,14 @@ import zipfile
 import shutil
 from io import BytesIO
 
+from modules.backup_snapshot import executar_backup_snapshot, restaurar_snapshot, eh_snapshot, snapshot_autonomo
+from modules.backup_catalogo import (carregar_catalogo, coletar_objetos_orfaos,
+                                     registrar_no_catalogo, verificar_backup)
+from modules.backup_agenda import (RETENCAO_PADRAO, carregar_agenda, proxima_execucao, remover_tarefa,
+                                   salvar_tarefa)
+from modules.conexao_resiliente import conectar
+from modules.copia_dados import mostrar_copia_dados
+
 # Tentar importar módulos personalizados
 try:
     from modules.backup_utils import backup_key, generate_unique_id
@@ -128,6 +136,15 @@ BACKUP_DIR = "backups"
 AUTO_BACKUP_DIR = os.path.join(BACKUP_DIR, "automaticos")
 MANUAL_BACKUP_DIR = os.path.join(BACKUP_DIR, "manuais")
 
+# Opções do agendamento -> expressão cron (None remove a tarefa)
+INTERVALOS_AGENDA = {
+    "Desativado": None,
+    "Diariamente": "0 2 * * *",
+    "Semanalmente": "0 3 * * 0",
+    "Mensalmente": "0 4 1 * *",
+    "Personalizado (cron)": "",
+}
+
 # Criar diretórios se não existirem
 for dir_path in [BACKUP_DIR, AUTO_BACKUP_DIR, MANUAL_BACKUP_DIR]:
     os.makedirs(dir_path, exist_ok=True)
@@ -136,12 +153,7 @@ for dir_path in [BACKUP_DIR, AUTO_BACKUP_DIR, MANUAL_BACKUP_DIR]:
 def listar_bancos():
     """Lista todos os bancos disponíveis"""
     try:
-        import mysql.connector
-        conexao_temp = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao_temp = conectar()
         
         cursor = conexao_temp.cursor()
         cursor.execute("SHOW DATABASES")
@@ -163,19 +175,11 @@ def executar_backup_python(banco_nome, destino_dir, tipo="manual"):
     """Executa backup usando apenas Python (sem mysqldump)"""
     try:
         st.write(f"🔍 DEBUG: Iniciando backup do banco '{banco_nome}'...")
-        import mysql.connector
-        from mysql.connector import errors
-        
         st.write(f"🔍 DEBUG: Conectando ao MySQL...")
         
         # Conectar ao banco
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=banco_nome
-        )
-        cursor = conexao.cursor(dictionary=True)
+        conexao = conectar(banco_nome)
+        cursor = conexao.cursor()
         
         st.write(f"✅ DEBUG: Conexão estabelecida!")
         
@@ -194,14 +198,14 @@ def executar_backup_python(banco_nome, destino_dir, tipo="manual"):
             
             # 1. Listar todas as tabelas
             cursor.execute("SHOW TABLES")
-            tabelas = [list(t.values())[0] for t in cursor.fetchall()]
+            tabelas = [t[0] for t in cursor.fetchall()]
             
             for tabela in tabelas:
                 # 2. Obter estrutura da tabela (CREATE TABLE)
                 cursor.execute(f"SHOW CREATE TABLE `{tabela}`")
                 create_table = cursor.fetchone()
                 f.write(f"--\n-- Estrutura para tabela `{tabela}`\n--\n")
-                f.write(f"{create_table['Create Table']};\n\n")
+                f.write(f"{create_table[1]};\n\n")
                 
                 # 3. Obter dados da tabela
                 cursor.execute(f"SELECT * FROM `{tabela}`")
@@ -211,7 +215,7 @@ def executar_backup_python(banco_nome, destino_dir, tipo="manual"):
                     f.write(f"--\n-- Dump de dados para tabela `{tabela}`\n--\n")
                     
                     # Obter nomes das colunas
-                    colunas = list(dados[0].keys())
+                    colunas = cursor.column_names
                     colunas_str = ", ".join([f"`{c}`" for c in colunas])
                     
                     f.write(f"INSERT INTO `{tabela}` ({colunas_str}) VALUES\n")
@@ -219,7 +223,7 @@ def executar_backup_python(banco_nome, destino_dir, tipo="manual"):
                     valores_linhas = []
                     for linha in dados:
                         valores = []
-                        for valor in linha.values():
+                        for valor in linha:
                             if valor is None:
                                 valores.append("NULL")
                             elif isinstance(valor, (int, float)):
@@ -255,7 +259,7 @@ def executar_backup_python(banco_nome, destino_dir, tipo="manual"):
         tamanho_mb = os.path.getsize(caminho_zip) / (1024 * 1024)
         
         registrar_log_backup(banco_nome, nome_arquivo.replace('.sql', '.zip'), 
-                           tipo, tamanho_mb)
+                           tipo, tamanho_mb, caminho=caminho_zip)
         
         return {
             "sucesso": True,
@@ -270,6 +274,41 @@ def executar_backup_python(banco_nome, destino_dir, tipo="manual"):
             "mensagem": f"❌ Erro no backup Python: {e}"
         }
 
+def executar_backup_colunar(banco_nome, destino_dir, tipo="manual"):
+    """Backup em snapshot colunar (DDL + Parquet por tabela + manifesto)"""
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    def ao_progredir(mensagem, fracao):
+        progress_bar.progress(fracao)
+        status_text.text(mensagem)
+    
+    # O snapshot registra-se sozinho no catálogo (precisa das referências aos objetos)
+    resultado = executar_backup_snapshot(banco_nome, destino_dir, ao_progredir, tipo,
+                                         diretorio_catalogo=BACKUP_DIR)
+    progress_bar.empty()
+    status_text.empty()
+    
+    if resultado["sucesso"]:
+        registrar_log_backup(banco_nome, os.path.basename(resultado["arquivo"]),
+                             tipo, resultado["tamanho_mb"])
+    return resultado
+
+def executar_restore_colunar(arquivo_backup, banco_destino):
+    """Restaura um snapshot colunar (LOAD DATA, com fallback para executemany)"""
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    def ao_progredir(mensagem, fracao):
+        progress_bar.progress(fracao)
+        status_text.text(mensagem)
+    
+    resultado = restaurar_snapshot(arquivo_backup, banco_destino, ao_progredir=ao_progredir,
+                                   diretorio_catalogo=BACKUP_DIR)
+    progress_bar.empty()
+    status_text.empty()
+    return resultado
+
 def executar_backup(banco_nome, destino_dir, tipo="manual"):
     """Executa backup de um banco específico"""
     try:
@@ -333,7 +372,7 @@ def executar_backup(banco_nome, destino_dir, tipo="manual"):
             
             # Registrar no log
             registrar_log_backup(banco_nome, nome_arquivo.replace('.sql', '.zip'), 
-                               tipo, tamanho_mb)
+                               tipo, tamanho_mb, caminho=caminho_zip)
             
             return {
                 "sucesso": True,
@@ -368,7 +407,7 @@ def executar_backup(banco_nome, destino_dir, tipo="manual"):
                     tamanho_mb = os.path.getsize(caminho_zip) / (1024 * 1024)
                     
                     registrar_log_backup(banco_nome, nome_arquivo.replace('.sql', '.zip'), 
-                                       tipo, tamanho_mb)
+                                       tipo, tamanho_mb, caminho=caminho_zip)
                     
                     return {
                         "sucesso": True,
@@ -393,6 +432,10 @@ def executar_backup(banco_nome, destino_dir, tipo="manual"):
 def executar_restore(arquivo_backup, banco_destino):
     """Restaura um banco a partir de um arquivo de backup"""
     try:
+        # Snapshot colunar tem restore próprio
+        if eh_snapshot(arquivo_backup):
+            return executar_restore_colunar(arquivo_backup, banco_destino)
+        
         # Verificar se estamos em modo alternativo
         if hasattr(st.session_state, 'usar_modo_alternativo') and st.session_state.usar_modo_alternativo:
             # Usar método Python para restore
@@ -430,12 +473,7 @@ def executar_restore(arquivo_backup, banco_destino):
             caminho_sql = arquivo_backup
         
         # Verificar se banco existe, se não, criar
-        import mysql.connector
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""  # XAMPP geralmente não tem senha
-        )
+        conexao = conectar()
         cursor = conexao.cursor()
         
         # Criar banco se não existir
@@ -517,11 +555,7 @@ def executar_restore_python(arquivo_backup, banco_destino):
             sql_content = f.read()
         
         # Conectar ao MySQL
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         cursor = conexao.cursor()
         
         # Criar banco se não existir
@@ -573,8 +607,29 @@ def executar_restore_python(arquivo_backup, banco_destino):
             "mensagem": f"❌ Erro no restore Python: {e}"
         }
 
-def registrar_log_backup(banco, arquivo, tipo, tamanho_mb):
-    """Registra backup em arquivo de log"""
+def catalogar_backup_sql(banco, caminho, tipo):
+    """
+    Registra um backup SQL no catálogo (SHA-256 do arquivo).
+    Sem CHECKSUM TABLE: rodado depois do dump ele não descreveria o snapshot
+    que o mysqldump gravou, então o backup .sql fica sem assinatura de conteúdo.
+    """
+    dados = {
+        "banco": banco,
+        "tipo": tipo,
+        "formato": "sql",
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    
+    try:
+        registrar_no_catalogo(caminho, dados, BACKUP_DIR)
+    except OSError as e:
+        st.warning(f"⚠️ Backup criado, mas não foi registrado no catálogo: {e}")
+
+def registrar_log_backup(banco, arquivo, tipo, tamanho_mb, caminho=None):
+    """Registra backup em arquivo de log (e no catálogo, quando o caminho é informado)"""
+    if caminho:
+        catalogar_backup_sql(banco, caminho, tipo)
+    
     log_path = os.path.join(BACKUP_DIR, "backup_log.csv")
     log_entry = {
         "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -593,9 +648,28 @@ def registrar_log_backup(banco, arquivo, tipo, tamanho_mb):
     
     df_log.to_csv(log_path, index=False)
 
+def ler_backup_para_download(caminho):
+    """
+    Bytes do backup para o st.download_button.
+    Snapshot deduplicado vira uma cópia temporária autônoma, apagada após a leitura.
+    Chamar só a partir de um clique: gerar a cópia lê todos os objetos da tabela.
+    """
+    destino = snapshot_autonomo(caminho, BACKUP_DIR)
+    try:
+        with open(destino, "rb") as f:
+            return f.read()
+    finally:
+        if destino != caminho:
+            os.remove(destino)
+
 def listar_backups_disponiveis():
-    """Lista todos os backups disponíveis"""
+    """
+    Lista todos os backups disponíveis, com dados do catálogo:
+    conteudo = início da assinatura de conteúdo; identico_a = backup mais antigo
+    com os mesmos dados (mesmo banco e mesmos CHECKSUM TABLE).
+    """
     backups = []
+    catalogo = carregar_catalogo(BACKUP_DIR)
     
     for root, dirs, files in os.walk(BACKUP_DIR):
         for file in files:
@@ -603,16 +677,32 @@ def listar_backups_disponiveis():
                 caminho = os.path.join(root, file)
                 tamanho_mb = os.path.getsize(caminho) / (1024 * 1024)
                 data_criacao = datetime.fromtimestamp(os.path.getctime(caminho))
+                chave = os.path.relpath(caminho, BACKUP_DIR).replace(os.sep, "/")
+                entrada = catalogo.get(chave, {})
                 
                 backups.append({
                     "nome": file,
                     "caminho": caminho,
                     "tamanho_mb": round(tamanho_mb, 2),
                     "data": data_criacao.strftime("%Y-%m-%d %H:%M:%S"),
-                    "tipo": "automático" if "automaticos" in caminho else "manual"
+                    "tipo": "automático" if "automaticos" in caminho else "manual",
+                    "formato": entrada.get("formato") or ("snapshot" if eh_snapshot(caminho) else "sql"),
+                    "banco": entrada.get("banco"),
+                    "assinatura": entrada.get("assinatura"),
+                    "conteudo": (entrada.get("assinatura") or "")[:12],
+                    "identico_a": ""
                 })
     
-    return sorted(backups, key=lambda x: x["data"], reverse=True)
+    backups.sort(key=lambda x: x["data"])
+    primeiro_por_conteudo = {}
+    for backup in backups:
+        if not backup["assinatura"]:
+            continue
+        original = primeiro_por_conteudo.setdefault((backup["banco"], backup["assinatura"]), backup["nome"])
+        if original != backup["nome"]:
+            backup["identico_a"] = original
+    
+    return backups[::-1]
 
 def backup_todos_bancos():
     """Realiza backup de todos os bancos de uma vez"""
@@ -746,11 +836,12 @@ def main():
                     st.rerun()
     
     # Tabs principais
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "📦 Backup Individual", 
         "🚀 Backup Completo", 
         "🔄 Restaurar", 
-        "📊 Histórico"
+        "📊 Histórico",
+        "🔁 Copiar"
     ])
     
     with tab1:
@@ -770,6 +861,13 @@ def main():
                 help="Deixe em branco para usar nome automático"
             )
             
+            formato_backup = st.radio(
+                "Formato do backup:",
+                ["SQL (zip)", "Snapshot colunar (Parquet)"],
+                horizontal=True,
+                help="O snapshot guarda o DDL e um Parquet por tabela: menor e muito mais rápido de restaurar"
+            )
+            
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("💾 Criar Backup", use_container_width=True):
@@ -778,11 +876,18 @@ def main():
                         feedback_container.info("🔄 Iniciando backup...")
                         
                         with st.spinner(f"Criando backup de '{banco_selecionado}'..."):
-                            resultado = executar_backup(
-                                banco_selecionado, 
-                                MANUAL_BACKUP_DIR,
-                                "manual"
-                            )
+                            if formato_backup.startswith("Snapshot"):
+                                resultado = executar_backup_colunar(
+                                    banco_selecionado,
+                                    MANUAL_BACKUP_DIR,
+                                    "manual"
+                                )
+                            else:
+                                resultado = executar_backup(
+                                    banco_selecionado, 
+                                    MANUAL_BACKUP_DIR,
+                                    "manual"
+                                )
                         
                         feedback_container.empty()  # Limpa a mensagem
                         
@@ -797,20 +902,24 @@ def main():
                                 st.info(f"📍 Local: {os.path.dirname(resultado['arquivo'])}")
                                 
                                 # Botão para download
-                                with open(resultado['arquivo'], "rb") as f:
-                                    st.download_button(
-                                        label="⬇️ Baixar Backup Agora",
-                                        data=f,
-                                        file_name=os.path.basename(resultado['arquivo']),
-                                        mime="application/zip",
-                                        use_container_width=True
-                                    )
+                                # Snapshot deduplicado: baixa uma cópia com os Parquet embutidos
+                                st.download_button(
+                                    label="⬇️ Baixar Backup Agora",
+                                    data=ler_backup_para_download(resultado['arquivo']),
+                                    file_name=os.path.basename(resultado['arquivo']),
+                                    mime="application/zip",
+                                    use_container_width=True
+                                )
                         else:
                             st.error(resultado["mensagem"])
                             st.toast("❌ Erro no backup", icon="❌")
             
             with col2:
                 if st.button("📥 Ver Backups Criados ", use_container_width=True):
+                    st.session_state.ver_backups_banco = banco_selecionado
+                
+                # Fica aberto entre reruns para o selectbox e o preparo do download funcionarem
+                if st.session_state.get("ver_backups_banco") == banco_selecionado:
                     backups = listar_backups_disponiveis()
                     backups_banco = [b for b in backups if banco_selecionado in b["nome"]]
                     
@@ -825,15 +934,25 @@ def main():
                             idx = opcoes.index(selecao)
                             backup = backups_banco[idx]
                             
-                            # Botão de download
-                            with open(backup['caminho'], "rb") as f:
+                            # Download montado só no clique (snapshot deduplicado vira cópia temporária)
+                            preparado = st.session_state.get("backup_preparado")
+                            if preparado and preparado[0] == backup['caminho']:
                                 st.download_button(
                                     label=f"⬇️ Baixar {backup['nome']}",
-                                    data=f,
+                                    data=preparado[1],
                                     file_name=backup["nome"],
                                     mime="application/zip",
                                     use_container_width=True
                                 )
+                            elif st.button("📦 Preparar download", use_container_width=True):
+                                try:
+                                    st.session_state.backup_preparado = (
+                                        backup['caminho'], ler_backup_para_download(backup['caminho'])
+                                    )
+                                except Exception as e:
+                                    st.error(f"❌ Erro ao preparar o download: {e}")
+                                else:
+                                    st.rerun()
                             
                             # Informações
                             st.info(f"**Tamanho:** {backup['tamanho_mb']} MB")
@@ -865,17 +984,82 @@ def main():
                         st.write(f"{status} {banco}")
         
         with col2:
-            # Agendamento simples
+            # Agendamento: executado pelo agendador_backup.py, fora do Streamlit
             st.markdown("#### ⏰ Agendamento")
-            intervalo = st.selectbox(
-                "Backup automático a cada:",
-                ["Desativado", "Diariamente", "Semanalmente", "Mensalmente"],
-                key=backup_key("agendamento")
-            )
+            bancos_agenda = listar_bancos()
+            if bancos_agenda:
+                banco_agenda = st.selectbox("Banco:", bancos_agenda, key=backup_key("agenda_banco"))
+                tarefa_atual = carregar_agenda(BACKUP_DIR)["tarefas"].get(banco_agenda)
+                
+                opcoes_intervalo = list(INTERVALOS_AGENDA.keys())
+                if tarefa_atual is None:
+                    indice_intervalo = 0
+                elif tarefa_atual["cron"] in INTERVALOS_AGENDA.values():
+                    indice_intervalo = list(INTERVALOS_AGENDA.values()).index(tarefa_atual["cron"])
+                else:
+                    indice_intervalo = opcoes_intervalo.index("Personalizado (cron)")
+                
+                intervalo = st.selectbox(
+                    "Backup automático a cada:",
+                    opcoes_intervalo,
+                    index=indice_intervalo,
+                    key=backup_key("agendamento")
+                )
+                if intervalo == "Personalizado (cron)":
+                    cron = st.text_input(
+                        "Expressão cron:",
+                        value=tarefa_atual["cron"] if tarefa_atual else "0 2 * * *",
+                        help="minuto hora dia mês dia-da-semana (ex: 30 1 * * 1-5)",
+                        key=backup_key("agenda_cron")
+                    )
+                else:
+                    cron = INTERVALOS_AGENDA[intervalo]
+                
+                retencao_atual = tarefa_atual["retencao"] if tarefa_atual else RETENCAO_PADRAO
+                col_d, col_s, col_m = st.columns(3)
+                with col_d:
+                    diarios = st.number_input("Diários", 0, 365, retencao_atual["diarios"],
+                                              key=backup_key("agenda_diarios"))
+                with col_s:
+                    semanais = st.number_input("Semanais", 0, 104, retencao_atual["semanais"],
+                                               key=backup_key("agenda_semanais"))
+                with col_m:
+                    mensais = st.number_input("Mensais", 0, 120, retencao_atual["mensais"],
+                                              key=backup_key("agenda_mensais"))
+                
+                if st.button("💾 Salvar Agendamento", use_container_width=True,
+                             key=generate_unique_id("btn_salvar_agenda")):
+                    if cron is None:
+                        remover_tarefa(banco_agenda, BACKUP_DIR)
+                        st.success(f"Agendamento de '{banco_agenda}' removido")
+                    else:
+                        try:
+                            salvar_tarefa(banco_agenda, cron,
+                                          {"diarios": diarios, "semanais": semanais, "mensais": mensais},
+                                          diretorio=BACKUP_DIR)
+                            st.success(f"✅ Próximo backup de '{banco_agenda}': "
+                                       f"{proxima_execucao(cron):%d/%m/%Y %H:%M}")
+                        except ValueError as e:
+                            st.error(f"❌ Expressão inválida: {e}")
             
-            if intervalo != "Desativado":
-                st.info(f"Backups automáticos serão executados {intervalo.lower()}")
-                st.caption("Os backups automáticos são salvos em backups/automaticos/")
+            agenda = carregar_agenda(BACKUP_DIR)
+            if agenda["tarefas"]:
+                linhas_agenda = []
+                for banco, tarefa in agenda["tarefas"].items():
+                    estado = agenda["estado"].get(banco, {})
+                    linhas_agenda.append({
+                        "banco": banco,
+                        "cron": tarefa["cron"],
+                        "retenção": "{diarios}d / {semanais}s / {mensais}m".format(**tarefa["retencao"]),
+                        "última": estado.get("inicio", "-"),
+                        "duração (s)": estado.get("duracao"),
+                        "resultado": ("✅" if estado.get("sucesso") else "❌") if estado else "-"
+                    })
+                st.dataframe(pd.DataFrame(linhas_agenda), use_container_width=True, hide_index=True)
+            
+            st.caption("Os backups rodam no agendador, fora desta página: "
+                       "`python agendador_backup.py` (ou `--uma-vez` no cron / Agendador de Tarefas). "
+                       "São salvos em backups/automaticos/ e os antigos são apagados pela retenção.")
     
     with tab3:
         st.subheader("Restaurar Banco de Dados")
@@ -886,7 +1070,7 @@ def main():
         if backups:
             # Criar lista para selectbox
             opcoes_backup = [
-                f"{b['nome']} ({b['tipo']}, {b['data']}, {b['tamanho_mb']}MB)" 
+                f"{b['nome']} ({b['tipo']}, {b['formato']}, {b['data']}, {b['tamanho_mb']}MB)" 
                 for b in backups
             ]
             
@@ -975,24 +1159,68 @@ def main():
                 st.metric("Espaço Total", f"{round(tamanho_total, 1)} MB")
             with col3:
                 manuais = sum(1 for b in backups if b["tipo"] == "manual")
-                st.metric("Backups Manuais", manuais)
+                duplicados = sum(1 for b in backups if b["identico_a"])
+                st.metric("Backups Manuais", manuais,
+                          delta=f"{duplicados} com conteúdo repetido" if duplicados else None,
+                          delta_color="off")
             
             # Tabela de backups
             df_backups = pd.DataFrame(backups)
             st.dataframe(
-                df_backups[["nome", "tipo", "tamanho_mb", "data"]],
+                df_backups[["nome", "tipo", "formato", "tamanho_mb", "data", "conteudo", "identico_a"]],
                 use_container_width=True,
                 column_config={
                     "nome": "Arquivo",
                     "tipo": "Tipo",
+                    "formato": "Formato",
                     "tamanho_mb": st.column_config.NumberColumn(
                         "Tamanho (MB)",
                         format="%.2f MB"
                     ),
-                    "data": "Data"
+                    "data": "Data",
+                    "conteudo": "Conteúdo",
+                    "identico_a": "Idêntico a"
                 }
             )
             
+            # Verificação sem restaurar
+            with st.expander("🔐 Verificar Integridade"):
+                st.caption("Confere o SHA-256 do arquivo, o CRC do zip e, nos snapshots, "
+                           "o hash e o nº de linhas de cada tabela. Nada é restaurado.")
+                
+                verificar_idx = st.selectbox(
+                    "Backup:",
+                    range(len(backups)),
+                    format_func=lambda x: backups[x]["nome"],
+                    key=backup_key("verificar_select")
+                )
+                
+                col_um, col_todos = st.columns(2)
+                with col_um:
+                    verificar_um = st.button("🔍 Verificar", use_container_width=True,
+                                             key=generate_unique_id("btn_verificar"))
+                with col_todos:
+                    verificar_todos = st.button("🔍 Verificar Todos", use_container_width=True,
+                                                key=generate_unique_id("btn_verificar_todos"))
+                
+                if verificar_um or verificar_todos:
+                    alvos = backups if verificar_todos else [backups[verificar_idx]]
+                    with st.spinner("Verificando..."):
+                        for backup in alvos:
+                            try:
+                                relatorio = verificar_backup(backup["caminho"], BACKUP_DIR)
+                            except Exception as e:
+                                relatorio = {"ok": False, "problemas": [str(e)], "avisos": [],
+                                             "verificados": 0}
+                            
+                            for aviso in relatorio["avisos"]:
+                                st.warning(f"⚠️ {backup['nome']}: {aviso}")
+                            if relatorio["ok"]:
+                                st.success(f"✅ {backup['nome']}: íntegro "
+                                           f"({relatorio['verificados']} verificações)")
+                            else:
+                                st.error(f"❌ {backup['nome']}: " + "; ".join(relatorio["problemas"]))
+            
             # Opção para limpar backups antigos
             with st.expander("🗑️ Gerenciar Espaço"):
                 st.warning("Excluir backups antigos libera espaço em disco.")
@@ -1002,9 +1230,18 @@ def main():
                 if st.button("Limpar Backups Antigos", type="secondary", key=generate_unique_id("btn_limpar_backups")):
                     # Implementar lógica de limpeza
                     st.info(f"Esta funcionalidade excluiria backups com mais de {dias} dias")
+                
+                # Objetos de snapshots deduplicados que nenhum backup usa mais
+                if st.button("🧹 Remover Objetos Sem Referência", key=generate_unique_id("btn_objetos_orfaos")):
+                    removidos, liberados = coletar_objetos_orfaos(BACKUP_DIR)
+                    st.success(f"✅ {removidos} objetos removidos ({liberados / (1024 * 1024):.2f} MB liberados)")
         else:
             st.info("📭 Nenhum backup registrado ainda.")
     
+    with tab5:
+        # Cópia direta entre bancos/servidores, sem arquivo intermediário
+        mostrar_copia_dados()
+    
     # Rodapé
     st.markdown("---")
     st.caption(f"📁 Backups salvos em: `{os.path.abspath(BACKUP_DIR)}`")
@@ -7,9 +7,11 @@ import pandas as pd
 from datetime import datetime
 from config_global import (
     listar_bancos_disponiveis, get_banco_ativo, set_banco_ativo,
-    obter_info_banco, criar_novo_banco, limpar_cache_banco
+    obter_info_banco, criar_novo_banco, limpar_cache_banco,
+    obter_visao_geral_bancos, formatar_tamanho
 )
 from componentes import componente_selecao_banco, componente_resumo_banco
+from modules.conexao_resiliente import conectar
 
 def pagina_listar_bancos():
     """Página principal para listar e gerenciar bancos de dados"""
@@ -204,12 +206,14 @@ def mostrar_card_banco(banco_nome):
 def mostrar_bancos_lista(bancos):
     """Mostra bancos em lista de tabela"""
     dados = []
+    visao = obter_visao_geral_bancos()
     
     for banco in bancos:
-        info = obter_info_banco(banco)
+        info = visao.get(banco) or obter_info_banco(banco)
         dados.append({
             'Nome': banco,
             'Tabelas': info['tabelas'],
+            'Registros (est.)': info['registros_estimados'],
             'Tamanho': info['tamanho'],
             'Status': info['status'],
             'Ativo': '✅' if banco == get_banco_ativo() else ''
@@ -225,6 +229,7 @@ def mostrar_bancos_lista(bancos):
         column_config={
             "Nome": st.column_config.TextColumn("Banco", width="medium"),
             "Tabelas": st.column_config.NumberColumn("Tabelas", format="%d"),
+            "Registros (est.)": st.column_config.NumberColumn("Registros (est.)", format="%d"),
             "Tamanho": st.column_config.TextColumn("Tamanho"),
             "Status": st.column_config.TextColumn("Status", width="small"),
             "Ativo": st.column_config.TextColumn("Ativo", width="small")
@@ -313,20 +318,17 @@ def mostrar_bancos_detalhado(bancos):
                         st.error("❌ Falha na conexão")
 
 def mostrar_estatisticas_sistema(bancos):
-    """Mostra estatísticas do sistema"""
-    total_tabelas = 0
-    total_bancos = len(bancos)
-    bancos_com_tabelas = 0
+    """Mostra estatísticas do sistema (uma única consulta agregada em cache)"""
+    visao = obter_visao_geral_bancos()
+    infos = [visao[b] for b in bancos if b in visao]
     
-    # Coletar dados
-    for banco in bancos:
-        info = obter_info_banco(banco)
-        total_tabelas += info['tabelas']
-        if info['tabelas'] > 0:
-            bancos_com_tabelas += 1
+    total_bancos = len(bancos)
+    total_tabelas = sum(info['tabelas'] for info in infos)
+    total_bytes = sum(info['tamanho_bytes'] for info in infos)
+    total_registros = sum(info['registros_estimados'] for info in infos)
     
     # Métricas principais
-    col_stat1, col_stat2, col_stat3 = st.columns(3)
+    col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
     
     with col_stat1:
         st.metric("Total de Bancos", total_bancos)
@@ -341,16 +343,17 @@ def mostrar_estatisticas_sistema(bancos):
         else:
             st.metric("Média Tabelas/Banco", "0")
     
+    with col_stat4:
+        st.metric("Tamanho Total", formatar_tamanho(total_bytes))
+        st.caption(f"≈ {total_registros:,} registros (estimativa)")
+    
     # Distribuição
     st.markdown("##### 📊 Distribuição de Tabelas")
     
-    dados_dist = []
-    for banco in bancos[:10]:  # Limitar a 10 para o gráfico
-        info = obter_info_banco(banco)
-        dados_dist.append({
-            'Banco': banco,
-            'Tabelas': info['tabelas']
-        })
+    dados_dist = [
+        {'Banco': info['nome'], 'Tabelas': info['tabelas']}
+        for info in infos[:10]  # Limitar a 10 para o gráfico
+    ]
     
     if dados_dist:
         df_dist = pd.DataFrame(dados_dist)
@@ -360,7 +363,7 @@ def mostrar_estatisticas_sistema(bancos):
     banco_ativo = get_banco_ativo()
     if banco_ativo:
         st.markdown(f"##### 🎯 Banco Ativo: **{banco_ativo}**")
-        info_ativo = obter_info_banco(banco_ativo)
+        info_ativo = visao.get(banco_ativo) or obter_info_banco(banco_ativo)
         
         col_ativo1, col_ativo2 = st.columns(2)
         
@@ -402,15 +405,7 @@ def pagina_detalhes_banco():
     st.markdown("### 🔍 Informações Técnicas")
     
     try:
-        import mysql.connector
-        
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=banco_nome,
-            port=3306
-        )
+        conexao = conectar(banco_nome)
         
         cursor = conexao.cursor()
         
@@ -489,6 +484,11 @@ def pagina_detalhes_banco():
         
     except Exception as e:
         st.error(f"❌ Erro ao obter detalhes: {e}")
+    
+    # Fragmentação, estatísticas e fila de ANALYZE/OPTIMIZE
+    st.markdown("---")
+    from modules.manutencao_tabelas import mostrar_manutencao
+    mostrar_manutencao(banco_nome)
 
 # ============ PONTO DE ENTRADA ============
 def main():
@@ -4,10 +4,11 @@ Configurações globais compartilhadas por TODAS as páginas
 Fica no MESMO diretório que app.py
 """
 import streamlit as st
-import mysql.connector
 from mysql.connector import Error
-import subprocess
+import threading
 import time
+from modules.mysql_prontidao import docker_container_ativo
+from modules.conexao_resiliente import conectar, obter_conexao_sessao
 
 # ============ INICIALIZAÇÃO DOS ESTADOS GLOBAIS ============
 def init_global_state():
@@ -37,42 +38,21 @@ def init_global_state():
 
 # ============ CONEXÃO INTELIGENTE ============
 def verificar_docker_mysql():
-    """Verifica se MySQL Docker está rodando"""
-    try:
-        result = subprocess.run(
-            ["docker", "ps", "--filter", "name=mysql_fix", "--format", "{{.Status}}"],
-            capture_output=True, text=True
-        )
-        return "Up" in result.stdout
-    except:
-        return False
+    """Verifica se MySQL Docker está rodando (resultado em cache, ver mysql_prontidao)"""
+    return docker_container_ativo()
 
 def conectar_mysql_basico():
     """Tenta conectar ao MySQL (Docker ou XAMPP)"""
-    # Primeiro, tenta conectar normalmente
+    # Primeiro, tenta conectar normalmente (com retentativas em erros transitórios)
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            port=3306,
-            connection_timeout=5
-        )
-        return conexao
+        return conectar(timeout=5)
     except Error as e:
         st.error(f"❌ Erro conexão básica: {e}")
     
     # Se falhou, verifica Docker
     if verificar_docker_mysql():
         try:
-            conexao = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                port=3306,
-                connection_timeout=10
-            )
-            return conexao
+            return conectar(timeout=10)
         except Exception as e:
             st.error(f"❌ Docker rodando mas conexão falhou: {e}")
     
@@ -82,54 +62,25 @@ def get_conexao_global():
     """
     Retorna conexão ao banco ativo.
     Se não houver banco ativo, retorna conexão sem database.
+    A conexão é reaproveitada entre reruns e só recebe ping após ficar ociosa.
     """
-    # Verificar se há conexão ativa e válida
-    if (st.session_state.conexao_global and 
-        hasattr(st.session_state.conexao_global, 'is_connected') and
-        st.session_state.conexao_global.is_connected()):
-        return st.session_state.conexao_global
+    banco = st.session_state.banco_ativo
     
-    # Se não há banco ativo, retornar conexão básica
-    if not st.session_state.banco_ativo:
-        try:
-            conexao = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                port=3306
-            )
-            st.session_state.conexao_global = conexao
+    try:
+        conexao = obter_conexao_sessao("conexao_global", banco=banco)
+        if conexao:
             return conexao
-        except Exception as e:
-            st.error(f"❌ Erro de conexão geral: {e}")
-            return None
+    except Error as e:
+        st.error(f"❌ Erro ao conectar ao banco '{banco}': {e}")
     
-    # Criar nova conexão ao banco ativo
+    # Sem servidor ou sem acesso ao banco: tenta sem database
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=st.session_state.banco_ativo,
-            port=3306
-        )
+        conexao = conectar()
         st.session_state.conexao_global = conexao
         return conexao
-    except Error as e:
-        st.error(f"❌ Erro ao conectar ao banco '{st.session_state.banco_ativo}': {e}")
-        
-        # Tentar reconectar sem database
-        try:
-            conexao = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                port=3306
-            )
-            st.session_state.conexao_global = conexao
-            return conexao
-        except:
-            return None
+    except Exception as e:
+        st.error(f"❌ Erro de conexão geral: {e}")
+        return None
 
 # ============ FUNÇÕES PARA ACESSO GLOBAL ============
 def get_banco_ativo():
@@ -149,7 +100,7 @@ def set_banco_ativo(nome_banco):
     if banco_anterior != nome_banco:
         st.session_state.cache_tabelas = {}
     
-    return nome_banivo
+    return nome_banco
 
 def limpar_cache_banco():
     """Limpa cache quando muda de banco"""
@@ -167,6 +118,8 @@ def limpar_cache_banco():
             else:
                 del st.session_state[key]
     
+    invalidar_visao_geral_bancos()
+    
     # Forçar recarregamento em todas as páginas
     if 'buscar_relacoes' in st.session_state:
         st.session_state.buscar_relacoes = False
@@ -175,6 +128,9 @@ def limpar_cache_banco():
 
 def listar_bancos_disponiveis(forcar_atualizacao=False):
     """Lista todos os bancos do MySQL (com cache)"""
+    if forcar_atualizacao:
+        invalidar_visao_geral_bancos()
+    
     if (not forcar_atualizacao and 
         st.session_state.bancos_disponiveis and 
         len(st.session_state.bancos_disponiveis) > 0):
@@ -212,13 +168,7 @@ def listar_tabelas_banco(banco_nome, forcar_atualizacao=False):
         return st.session_state.cache_tabelas[banco_nome]
     
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=banco_nome,
-            port=3306
-        )
+        conexao = conectar(banco_nome)
         
         cursor = conexao.cursor()
         cursor.execute("SHOW TABLES")
@@ -248,13 +198,7 @@ def get_status_sistema():
 def conectar_banco_especifico(nome_banco):
     """Conecta a um banco específico e torna ativo"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=nome_banco,
-            port=3306
-        )
+        conexao = conectar(nome_banco)
         
         set_banco_ativo(nome_banco)
         st.session_state.conexao_global = conexao
@@ -287,56 +231,101 @@ def criar_novo_banco(nome_banco):
         st.error(f"❌ Erro ao criar banco '{nome_banco}': {e}")
         return False
 
-def obter_info_banco(banco_nome):
-    """Obtém informações detalhadas do banco"""
+# ============ VISÃO GERAL DE TODOS OS BANCOS (CACHE DO PROCESSO) ============
+# Uma única consulta agregada ao information_schema alimenta todos os dashboards
+VISAO_GERAL_TTL_SEGUNDOS = 30
+_cache_visao_geral = {"dados": None, "atualizado_em": 0.0}
+_lock_visao_geral = threading.Lock()
+
+def formatar_tamanho(tamanho_bytes):
+    """Converte bytes para texto legível"""
+    tamanho_bytes = tamanho_bytes or 0
+    if tamanho_bytes < 1024:
+        return f"{tamanho_bytes} bytes"
+    elif tamanho_bytes < 1024*1024:
+        return f"{tamanho_bytes/1024:.2f} KB"
+    else:
+        return f"{tamanho_bytes/(1024*1024):.2f} MB"
+
+def _consultar_visao_geral_bancos():
+    """Executa a consulta agregada por schema (uma conexão, uma query)"""
+    conexao = conectar()
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=banco_nome,
-            port=3306
-        )
-        
         cursor = conexao.cursor()
-        
-        # Contar tabelas
-        cursor.execute("SHOW TABLES")
-        tabelas = cursor.fetchall()
-        num_tabelas = len(tabelas)
-        
-        # Estimar tamanho
         cursor.execute("""
-            SELECT SUM(data_length + index_length) as tamanho_bytes
-            FROM information_schema.TABLES 
-            WHERE table_schema = %s
-        """, (banco_nome,))
-        
-        tamanho_result = cursor.fetchone()
-        tamanho_bytes = tamanho_result[0] if tamanho_result[0] else 0
-        
+            SELECT s.SCHEMA_NAME,
+                   COUNT(t.TABLE_NAME) AS num_tabelas,
+                   COALESCE(SUM(t.DATA_LENGTH), 0) AS dados_bytes,
+                   COALESCE(SUM(t.INDEX_LENGTH), 0) AS indices_bytes,
+                   COALESCE(SUM(t.TABLE_ROWS), 0) AS registros_estimados
+            FROM information_schema.SCHEMATA s
+            LEFT JOIN information_schema.TABLES t
+                ON t.TABLE_SCHEMA = s.SCHEMA_NAME
+            WHERE s.SCHEMA_NAME NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+            GROUP BY s.SCHEMA_NAME
+            ORDER BY s.SCHEMA_NAME
+        """)
+        linhas = cursor.fetchall()
         cursor.close()
+    finally:
         conexao.close()
-        
-        # Converter tamanho
-        if tamanho_bytes < 1024:
-            tamanho_str = f"{tamanho_bytes} bytes"
-        elif tamanho_bytes < 1024*1024:
-            tamanho_str = f"{tamanho_bytes/1024:.2f} KB"
-        else:
-            tamanho_str = f"{tamanho_bytes/(1024*1024):.2f} MB"
-        
-        return {
-            'nome': banco_nome,
-            'tabelas': num_tabelas,
-            'tamanho': tamanho_str,
+    
+    visao = {}
+    for nome, num_tabelas, dados_bytes, indices_bytes, registros in linhas:
+        tamanho_bytes = int(dados_bytes) + int(indices_bytes)
+        visao[nome] = {
+            'nome': nome,
+            'tabelas': int(num_tabelas),
+            'tamanho': formatar_tamanho(tamanho_bytes),
+            'tamanho_bytes': tamanho_bytes,
+            'dados_bytes': int(dados_bytes),
+            'indices_bytes': int(indices_bytes),
+            'registros_estimados': int(registros),
             'status': '✅ Disponível'
         }
-        
+    return visao
+
+def obter_visao_geral_bancos(forcar_atualizacao=False):
+    """
+    Retorna {banco: info} para todos os bancos do servidor.
+    Resultado compartilhado por todas as sessões durante VISAO_GERAL_TTL_SEGUNDOS.
+    """
+    with _lock_visao_geral:
+        dados = _cache_visao_geral["dados"]
+        idade = time.time() - _cache_visao_geral["atualizado_em"]
+        if not forcar_atualizacao and dados is not None and idade < VISAO_GERAL_TTL_SEGUNDOS:
+            return dados
+    
+    try:
+        dados = _consultar_visao_geral_bancos()
     except Exception as e:
-        return {
-            'nome': banco_nome,
-            'tabelas': 0,
-            'tamanho': '0 bytes',
-            'status': f'❌ Erro: {str(e)[:50]}'
-        }
\ No newline at end of file
+        st.error(f"❌ Erro ao obter visão geral dos bancos: {e}")
+        return {}
+    
+    with _lock_visao_geral:
+        _cache_visao_geral["dados"] = dados
+        _cache_visao_geral["atualizado_em"] = time.time()
+    return dados
+
+def invalidar_visao_geral_bancos():
+    """Força nova consulta na próxima chamada (após criar/remover bancos ou tabelas)"""
+    with _lock_visao_geral:
+        _cache_visao_geral["dados"] = None
+        _cache_visao_geral["atualizado_em"] = 0.0
+
+def obter_info_banco(banco_nome):
+    """Obtém informações detalhadas do banco (a partir da visão geral em cache)"""
+    info = obter_visao_geral_bancos().get(banco_nome)
+    if info:
+        return info
+    
+    return {
+        'nome': banco_nome,
+        'tabelas': 0,
+        'tamanho': '0 bytes',
+        'tamanho_bytes': 0,
+        'dados_bytes': 0,
+        'indices_bytes': 0,
+        'registros_estimados': 0,
+        'status': '❌ Erro: banco não encontrado'
+    }
\ No newline at end of file
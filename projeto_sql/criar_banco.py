@@ -1,37 +1,21 @@
 import streamlit as st
 import re
 import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+from modules.conexao_resiliente import conectar, obter_conexao_sessao
 
 # ============ SISTEMA DE CONEXÃO ============
 def conectar_banco(database=None):
     """Conecta ao MySQL usando a conexão existente ou cria nova"""
-    # Primeiro, tenta usar a conexão do app.py
-    if "conexao_mysql" in st.session_state and st.session_state.conexao_mysql:
-        conexao = st.session_state.conexao_mysql
-        
-        # Se pediu banco específico, tenta usar
-        if database and database != conexao.database:
-            try:
-                cursor = conexao.cursor()
-                cursor.execute(f"USE {database}")
-                cursor.close()
-                conexao.database = database
-                return conexao
-            except:
-                pass
+    # Primeiro, tenta usar a conexão do app.py (USE só quando o banco muda, via usar_banco)
+    conexao = obter_conexao_sessao("conexao_mysql", banco=database, criar=False)
+    if conexao:
         return conexao
     
-    # Se não tem conexão no session_state, cria nova
+    # Se não tem conexão no session_state (ou o banco não pôde ser selecionado), cria nova
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=database
-        )
+        conexao = conectar(database)
         return conexao
     except Error as e:
         st.error(f"Erro: {e}")
@@ -41,11 +25,7 @@ def listar_bancos():
     """Lista todos os bancos disponíveis"""
     try:
         # Cria nova conexão sem banco específico para ver TODOS os bancos
-        conexao_temp = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao_temp = conectar()
         
         cursor = conexao_temp.cursor()
         cursor.execute("SHOW DATABASES")
@@ -67,11 +47,7 @@ def listar_bancos():
 def criar_banco_dados(nome_banco):
     """Cria um novo banco de dados"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         
         cursor = conexao.cursor()
         # Usar backticks para lidar com nomes especiais
@@ -95,11 +71,7 @@ def excluir_banco_dados(nome_banco):
             st.error("❌ Não é possível excluir bancos de dados do sistema!")
             return False
             
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         
         cursor = conexao.cursor()
         # Usar backticks para lidar com nomes especiais
@@ -307,11 +279,7 @@ if __name__ == "__main__":
     
     # Testar conexão básica
     try:
-        conexao_test = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao_test = conectar()
         conexao_test.close()
         st.session_state.conexao_disponivel = True
     except Exception as e:
@@ -1,40 +1,24 @@
 import streamlit as st
 import re
-import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
 import json
 from modules.listar_banco import pagina_listar_bancos
+from modules.conexao_resiliente import conectar, obter_conexao_sessao
+from modules.exportacao import mostrar_exportacao
+from modules.resultados import dataframe_do_cursor
 
 # ============ SISTEMA DE CONEXÃO ============
 def conectar_banco(database=None):
     """Conecta ao MySQL usando a conexão existente ou cria nova"""
-    # Primeiro, tenta usar a conexão do app.py
-    if "conexao_mysql" in st.session_state and st.session_state.conexao_mysql:
-        conexao = st.session_state.conexao_mysql
-        
-        # Se pediu banco específico, tenta usar
-        if database and database != conexao.database:
-            try:
-                cursor = conexao.cursor()
-                cursor.execute(f"USE {database}")
-                cursor.close()
-                conexao.database = database
-                return conexao
-            except:
-                pass
+    # Primeiro, tenta usar a conexão do app.py (viva e no banco pedido)
+    conexao = obter_conexao_sessao("conexao_mysql", banco=database, criar=False)
+    if conexao:
         return conexao
     
     # Se não tem conexão no session_state, cria nova
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=database
-        )
-        return conexao
+        return conectar(database)
     except Error as e:
         st.error(f"Erro: {e}")
         return None
@@ -43,11 +27,7 @@ def listar_bancos():
     """Lista todos os bancos disponíveis"""
     try:
         # Cria nova conexão sem banco específico para ver TODOS os bancos
-        conexao_temp = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao_temp = conectar()
         
         cursor = conexao_temp.cursor()
         cursor.execute("SHOW DATABASES")
@@ -805,13 +785,12 @@ def interface_consulta_visual():
             # Executa consulta
             if st.button("▶️ Executar Consulta SQL", type="primary", use_container_width=True):
                 try:
-                    cursor = conexao.cursor(dictionary=True)
+                    cursor = conexao.cursor()
                     cursor.execute(sql)
-                    resultados = cursor.fetchall()
+                    df = dataframe_do_cursor(cursor)
                     cursor.close()
                     
-                    if resultados:
-                        df = pd.DataFrame(resultados)
+                    if not df.empty:
                         st.subheader("📊 Resultados:")
                         st.dataframe(df, use_container_width=True)
                         
@@ -827,46 +806,8 @@ def interface_consulta_visual():
                         with col4:
                             st.metric("Tipo", "SELECT")
                         
-                        # Opções para exportar
-                        st.subheader("📤 Exportar Resultados:")
-                        col_exp1, col_exp2, col_exp3 = st.columns(3)
-                        
-                        with col_exp1:
-                            csv = df.to_csv(index=False).encode('utf-8')
-                            st.download_button(
-                                label="📥 Download CSV",
-                                data=csv,
-                                file_name=f"consulta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                                mime="text/csv",
-                                use_container_width=True
-                            )
-                        
-                        with col_exp2:
-                            # Exportar para Excel
-                            import io
-                            from openpyxl import Workbook
-                            
-                            output = io.BytesIO()
-                            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                                df.to_excel(writer, index=False, sheet_name='Consulta')
-                            
-                            st.download_button(
-                                label="📊 Download Excel",
-                                data=output.getvalue(),
-                                file_name=f"consulta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                use_container_width=True
-                            )
-                        
-                        with col_exp3:
-                            json_str = df.to_json(orient='records', indent=2)
-                            st.download_button(
-                                label="📄 Download JSON",
-                                data=json_str,
-                                file_name=f"consulta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                                mime="application/json",
-                                use_container_width=True
-                            )
+                        # Exportação em streaming (abaixo, sobrevive aos reruns)
+                        st.session_state.sql_exportacao = (sql, banco_selecionado)
                         
                     else:
                         st.info("✅ Consulta executada com sucesso, mas sem resultados.")
@@ -874,6 +815,16 @@ def interface_consulta_visual():
                 except Error as e:
                     st.error(f"❌ Erro ao executar consulta: {e}")
                     st.error(f"SQL problemático: ```{sql}```")
+            
+            # Exportar a última consulta executada (relida em lotes, sem DataFrame)
+            exportacao = st.session_state.get("sql_exportacao")
+            if exportacao and exportacao[0] == sql:
+                st.subheader("📤 Exportar Resultados:")
+                mostrar_exportacao(
+                    exportacao[0], banco=exportacao[1],
+                    nome_base=f"consulta_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                    chave="criar_consultas"
+                )
 
 # ============ EXECUÇÃO PRINCIPAL ============
 if __name__ == "__main__":
@@ -7,9 +7,9 @@ from modules.tabela_visualizar import pagina_visualizar_tabela
 from modules.tabela_tipos import mostrar_tabela_tipos
 from modules.tabela_editar import pagina_editar_tabela
 from modules.tabela_excluir import pagina_excluir_tabela
-from relacoes import pagina_relacoes # NOVO IMPORT
 from modules.tabela_criar_heranca import pagina_criar_tabela_com_heranca
 from modules.listar_banco import pagina_listar_bancos
+from modules.manutencao_tabelas import mostrar_manutencao
 import os
 import sys
 
@@ -99,11 +99,15 @@ def pagina_criar_tabelas():
         pagina_excluir_tabela()
     
     elif opcao == "Visualizar_relacoes":  # NOVO - Página de Relações
+        from relacoes import pagina_relacoes  # import preguiçoso (networkx/matplotlib)
         pagina_relacoes()
         
     elif opcao == "listar_bancos":  # ← NOVA OPÇÃO
         pagina_listar_bancos()    
     
+    elif opcao == "manutencao_tabelas":
+        mostrar_manutencao(menu_estado.get("banco_selecionado"))
+    
     elif opcao == "listar_tabelas":
         st.header("📋 Tabelas do Banco")
         
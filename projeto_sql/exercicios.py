@@ -3,6 +3,8 @@ import streamlit as st
 
 def pagina_exercicios():
     st.title("🎯 Exercícios MySQL")
+    st.caption("Para testar o desempenho das consultas com volume real, popule `produtos`, "
+               "`clientes`, `pedidos` e `vendas` na página 🎲 Gerar Dados.")
     
     # Seletor de nível
     st.subheader("Escolha o nível de dificuldade:")
@@ -1,16 +1,13 @@
 import streamlit as st
-import mysql.connector
 from mysql.connector import Error
+from config_global import obter_visao_geral_bancos, invalidar_visao_geral_bancos
+from modules.conexao_resiliente import conectar
 
 # ============ FUNÇÕES BÁSICAS ============
 def listar_bancos_local():
     """Lista bancos do MySQL"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         cursor = conexao.cursor()
         cursor.execute("SHOW DATABASES")
         todos_bancos = [db[0] for db in cursor.fetchall()]
@@ -124,6 +121,7 @@ def pagina_listar_bancos():
     
     with col_atualizar:
         if st.button("🔄 Atualizar Lista", use_container_width=True):
+            invalidar_visao_geral_bancos()
             st.rerun()
     
     with col_criar:
@@ -157,17 +155,14 @@ def pagina_listar_bancos():
                 
                 if criar and nome:
                     try:
-                        conexao = mysql.connector.connect(
-                            host="localhost",
-                            user="root",
-                            password=""
-                        )
+                        conexao = conectar()
                         cursor = conexao.cursor()
                         cursor.execute(f"CREATE DATABASE `{nome}`")
                         conexao.commit()
                         cursor.close()
                         conexao.close()
                         
+                        invalidar_visao_geral_bancos()
                         st.success(f"✅ Banco '{nome}' criado com sucesso!")
                         st.session_state.criando_banco = False
                         st.session_state.banco_ativo = nome
@@ -184,6 +179,9 @@ def pagina_listar_bancos():
     # Mostrar bancos em cards
     st.subheader(f"📁 Bancos encontrados: {len(bancos)}")
     
+    # Tabelas/tamanho de todos os bancos numa única consulta (cache do processo)
+    visao = obter_visao_geral_bancos()
+    
     # Layout de cards
     for i in range(0, len(bancos), 3):  # 3 colunas
         cols = st.columns(3)
@@ -202,6 +200,10 @@ def pagina_listar_bancos():
                         else:
                             st.markdown(f"### 📁 {banco}")
                         
+                        info = visao.get(banco)
+                        if info:
+                            st.caption(f"📊 {info['tabelas']} tabelas • 💾 {info['tamanho']}")
+                        
                         # Botão de ação
                         if not is_ativo:
                             if st.button("Usar Este", key=f"usar_{banco}", use_container_width=True):
@@ -0,0 +1,572 @@
+# modules/arquivamento.py
+"""
+Arquivamento e expurgo de linhas antigas
+- Política por tabela (arquivamento/politicas.json): coluna de data, idade
+  máxima (ex: 1 ano), condições extras e destino — uma tabela de arquivo no
+  mesmo banco ou arquivos Parquet/Arrow
+- O corte (NOW() - idade) é calculado uma vez ao iniciar: a execução inteira
+  usa o mesmo limite, mesmo que leve horas
+- Move em blocos pela chave, como as operações em lote: cada bloco é
+  INSERT ... SELECT + DELETE da mesma faixa numa transação só; se as
+  contagens não baterem, nada é confirmado
+- Destino em arquivo: o bloco é lido com FOR UPDATE, gravado em
+  arquivamento/arquivos/<id>/parte_NNNNN.<ext> e só então apagado; a parte
+  pendente fica no estado para a retomada não duplicar nem perder linhas
+- Pausa entre blocos, cancelar/retomar e progresso em arquivamento/execucoes/<id>.json
+"""
+import os
+import time
+import uuid
+from datetime import datetime
+
+import mysql.connector
+import streamlit as st
+
+from .backup_catalogo import gravar_json, ler_json
+from .colunar import FORMATOS_COLUNARES, escrever_colunar, pyarrow_disponivel, schema_da_tabela
+from .conexao_resiliente import conectar
+from .contagem_registros import invalidar_contagem
+from .ddl_online import referencias_externas
+from .grade_virtual import invalidar_grade, obter_chave_navegacao
+from .operacoes_lote import (CANCELADA, CONCLUIDA, EM_ANDAMENTO, FALHOU, PAUSA_PADRAO,
+                             TAMANHO_BLOCO_PADRAO, cancelamento_pedido, cancelar_lote, carregar_lote,
+                             contar_afetados, disparar_lote, editor_condicoes, encerrar_execucao,
+                             faixa_bloco, listar_lotes, montar_filtro, proximo_limite, remover_lote,
+                             retomar_lote, salvar_lote, valor_de_json, valor_para_json)
+
+DIRETORIO_ARQUIVAMENTO = "arquivamento"
+ARQUIVO_POLITICAS = os.path.join(DIRETORIO_ARQUIVAMENTO, "politicas.json")
+DIRETORIO_EXECUCOES = os.path.join(DIRETORIO_ARQUIVAMENTO, "execucoes")
+DIRETORIO_ARQUIVOS = os.path.join(DIRETORIO_ARQUIVAMENTO, "arquivos")
+
+UNIDADES = {"dias": "DAY", "meses": "MONTH", "anos": "YEAR"}
+DESTINO_TABELA = "Tabela de arquivo"
+DESTINOS = [DESTINO_TABELA] + list(FORMATOS_COLUNARES)
+_TIPOS_DATA = ("date", "datetime", "timestamp")
+
+
+# ============ POLÍTICAS ============
+def _chave_politica(banco, tabela):
+    return f"{banco}.{tabela}"
+
+
+def carregar_politicas(banco=None, arquivo=ARQUIVO_POLITICAS):
+    """{"banco.tabela": política} (só as do banco, se indicado)"""
+    politicas = ler_json(arquivo, {})
+    if banco is None:
+        return politicas
+    return {chave: politica for chave, politica in politicas.items() if politica["banco"] == banco}
+
+
+def politica_tabela(banco, tabela, arquivo=ARQUIVO_POLITICAS):
+    return ler_json(arquivo, {}).get(_chave_politica(banco, tabela))
+
+
+def salvar_politica(banco, tabela, politica, arquivo=ARQUIVO_POLITICAS):
+    """
+    politica: {"coluna", "quantidade", "unidade", "condicoes", "destino",
+               "tabela_arquivo", "tamanho_bloco", "pausa"}
+    """
+    politicas = ler_json(arquivo, {})
+    politicas[_chave_politica(banco, tabela)] = dict(politica, banco=banco, tabela=tabela)
+    gravar_json(arquivo, politicas)
+
+
+def remover_politica(banco, tabela, arquivo=ARQUIVO_POLITICAS):
+    politicas = ler_json(arquivo, {})
+    if politicas.pop(_chave_politica(banco, tabela), None) is not None:
+        gravar_json(arquivo, politicas)
+
+
+def descrever_politica(politica):
+    """Texto curto: 'criado_em com mais de 1 anos → vendas_arquivo'"""
+    extras = " AND ".join(f"{c['campo']} {c['operador']} {c['valor']}".strip()
+                          for c in politica.get("condicoes") or [])
+    destino = (f"`{politica['tabela_arquivo']}`" if politica["destino"] == DESTINO_TABELA
+               else f"arquivos {politica['destino']}")
+    texto = f"`{politica['coluna']}` com mais de {politica['quantidade']} {politica['unidade']}"
+    return f"{texto} AND {extras} → {destino}" if extras else f"{texto} → {destino}"
+
+
+# ============ METADADOS ============
+def colunas_tabela(conexao, banco, tabela):
+    """[(coluna, tipo, gerada)] na ordem da tabela"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME, DATA_TYPE, EXTRA
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = [(nome, tipo.lower(), "GENERATED" in (extra or "").upper())
+               for nome, tipo, extra in cursor.fetchall()]
+    cursor.close()
+    return colunas
+
+
+def calcular_corte(conexao, quantidade, unidade):
+    """NOW() - INTERVAL no relógio do servidor, como texto 'AAAA-MM-DD hh:mm:ss'"""
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT NOW() - INTERVAL %s {UNIDADES[unidade]}", (int(quantidade),))
+    corte = cursor.fetchone()[0]
+    cursor.close()
+    return corte.isoformat(sep=" ") if isinstance(corte, datetime) else str(corte)
+
+
+def condicoes_politica(conexao, politica):
+    """Condições do filtro com o corte congelado agora: (condicoes, corte)"""
+    corte = calcular_corte(conexao, politica["quantidade"], politica["unidade"])
+    condicoes = [{"campo": politica["coluna"], "operador": "<", "valor": corte}]
+    return condicoes + list(politica.get("condicoes") or []), corte
+
+
+def problemas_arquivamento(conexao, banco, tabela, politica):
+    """Impedimentos (lista de textos); vazia se a política pode rodar"""
+    problemas = []
+    if not obter_chave_navegacao(conexao, banco, tabela):
+        problemas.append(f"'{tabela}' não tem PRIMARY KEY nem UNIQUE NOT NULL: "
+                         "sem chave não há como mover em blocos com segurança")
+    if politica["destino"] == DESTINO_TABELA:
+        if not politica.get("tabela_arquivo"):
+            problemas.append("informe o nome da tabela de arquivo")
+        elif politica["tabela_arquivo"] == tabela:
+            problemas.append("a tabela de arquivo deve ser outra tabela")
+    elif not pyarrow_disponivel():
+        problemas.append(f"destino {politica['destino']} requer pyarrow (pip install pyarrow)")
+    return problemas
+
+
+def tabelas_dependentes(conexao, banco, tabela):
+    """Tabelas com FK apontando para esta: o DELETE pode falhar ou cascatear nelas"""
+    return sorted({origem for origem, _ in referencias_externas(conexao, banco, tabela) if origem != tabela})
+
+
+def preparar_tabela_arquivo(conexao, banco, tabela, tabela_arquivo, colunas):
+    """CREATE TABLE ... LIKE se ainda não existe; confere se as colunas copiadas existem nela"""
+    cursor = conexao.cursor()
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS `{banco}`.`{tabela_arquivo}` LIKE `{banco}`.`{tabela}`")
+    cursor.close()
+    existentes = {nome for nome, _, _ in colunas_tabela(conexao, banco, tabela_arquivo)}
+    faltando = [c for c in colunas if c not in existentes]
+    if faltando:
+        raise ValueError(f"'{tabela_arquivo}' não tem a(s) coluna(s) {', '.join(faltando)}")
+
+
+# ============ EXECUÇÃO ============
+def _ler_ultimo(lote):
+    return tuple(valor_de_json(v) for v in lote["ultimo"]) if lote["ultimo"] else None
+
+
+def _avancar(lote, limite, movidas, inicio, diretorio):
+    lote["ultimo"] = [valor_para_json(v) for v in limite]
+    lote["afetadas"] += movidas
+    lote["blocos"] += 1
+    lote["pendente"] = None
+    lote["tempo_blocos"] = round(lote.get("tempo_blocos", 0) + time.time() - inicio, 3)
+    salvar_lote(lote, diretorio)
+
+
+def _mover_para_tabela(cursor, lote, faixa, valores):
+    """INSERT ... SELECT + DELETE da faixa (sem commit); levanta RuntimeError se divergirem"""
+    origem = f"`{lote['banco']}`.`{lote['tabela']}`"
+    colunas = ", ".join(f"`{c}`" for c in lote["colunas"])
+    cursor.execute(f"INSERT INTO `{lote['banco']}`.`{lote['tabela_arquivo']}` ({colunas}) "
+                   f"SELECT {colunas} FROM {origem} WHERE {faixa}", valores)
+    copiadas = cursor.rowcount
+    cursor.execute(f"DELETE FROM {origem} WHERE {faixa}", valores)
+    if cursor.rowcount != copiadas:
+        raise RuntimeError(f"{copiadas} linha(s) copiada(s) mas {cursor.rowcount} apagada(s); bloco desfeito")
+    return copiadas
+
+
+def _mover_para_arquivo(conexao, cursor, lote, faixa, valores, limite, parte, schema, diretorio):
+    """Grava a faixa numa parte e apaga (sem commit); a parte fica pendente no estado até o commit"""
+    extensao = FORMATOS_COLUNARES[lote["destino"]][0]
+    nome = f"parte_{parte:05d}.{extensao}"
+    lote["pendente"] = {"parte": parte, "limite": [valor_para_json(v) for v in limite], "linhas": None}
+    salvar_lote(lote, diretorio)
+
+    origem = f"`{lote['banco']}`.`{lote['tabela']}`"
+    colunas = ", ".join(f"`{c}`" for c in lote["colunas"])
+    ordem = ", ".join(f"`{c}`" for c in lote["chave"])
+    cursor.execute(f"SELECT {colunas} FROM {origem} WHERE {faixa} ORDER BY {ordem} FOR UPDATE", valores)
+    gravadas = escrever_colunar(cursor, os.path.join(lote["pasta"], nome), lote["destino"], schema)
+    cursor.execute(f"DELETE FROM {origem} WHERE {faixa}", valores)
+    if cursor.rowcount != gravadas:
+        raise RuntimeError(f"{gravadas} linha(s) gravada(s) mas {cursor.rowcount} apagada(s); bloco desfeito")
+
+    # Antes do commit: se o processo cair logo depois, a retomada sabe quantas foram
+    lote["pendente"]["linhas"] = gravadas
+    salvar_lote(lote, diretorio)
+    if nome not in lote["arquivos"]:
+        lote["arquivos"].append(nome)
+    return gravadas
+
+
+def _resolver_pendente(cursor, lote, filtro, params, diretorio):
+    """
+    Retomada após queda no meio de um bloco em arquivo. Se a faixa pendente já
+    não tem linhas, o DELETE foi confirmado: conta a parte e segue. Senão a
+    parte é refeita (o arquivo é sobrescrito). Retorna o número da próxima parte.
+    """
+    pendente = lote["pendente"]
+    limite = tuple(valor_de_json(v) for v in pendente["limite"])
+    faixa, valores = faixa_bloco(lote["chave"], filtro, params, _ler_ultimo(lote), limite)
+    cursor.execute(f"SELECT COUNT(*) FROM `{lote['banco']}`.`{lote['tabela']}` WHERE {faixa}", valores)
+    if cursor.fetchone()[0]:
+        return pendente["parte"]
+    nome = f"parte_{pendente['parte']:05d}.{FORMATOS_COLUNARES[lote['destino']][0]}"
+    if pendente["linhas"] and nome not in lote["arquivos"]:
+        lote["arquivos"].append(nome)
+    _avancar(lote, limite, pendente["linhas"] or 0, time.time(), diretorio)
+    return lote["blocos"] + 1
+
+
+def _executar_arquivamento(id_lote, diretorio):
+    """Corpo da thread: move blocos até acabar, ser cancelada ou falhar"""
+    lote = carregar_lote(id_lote, diretorio)
+    conexao = None
+    try:
+        conexao = conectar(lote["banco"])
+        conexao.autocommit = False
+        cursor = conexao.cursor()
+        filtro, params = montar_filtro(lote["condicoes"])
+        em_arquivo = lote["destino"] != DESTINO_TABELA
+        schema = None
+        parte = lote["blocos"] + 1
+        if em_arquivo:
+            os.makedirs(lote["pasta"], exist_ok=True)
+            schema = schema_da_tabela(conexao, lote["tabela"], ignorar_geradas=True)
+            if lote.get("pendente"):
+                parte = _resolver_pendente(cursor, lote, filtro, params, diretorio)
+                conexao.commit()
+
+        while True:
+            if cancelamento_pedido(id_lote):
+                lote["estado"] = CANCELADA
+                break
+
+            ultimo = _ler_ultimo(lote)
+            limite = proximo_limite(cursor, lote, filtro, params, ultimo)
+            conexao.commit()        # a leitura do limite não segura snapshot/locks
+            if limite is None:
+                lote["estado"] = CONCLUIDA
+                break
+
+            faixa, valores = faixa_bloco(lote["chave"], filtro, params, ultimo, limite)
+            inicio = time.time()
+            if em_arquivo:
+                movidas = _mover_para_arquivo(conexao, cursor, lote, faixa, valores, limite,
+                                              parte, schema, diretorio)
+            else:
+                movidas = _mover_para_tabela(cursor, lote, faixa, valores)
+            conexao.commit()
+            _avancar(lote, limite, movidas, inicio, diretorio)
+            parte = lote["blocos"] + 1
+
+            if lote["pausa"]:
+                time.sleep(lote["pausa"])
+
+    except Exception as e:
+        if conexao is not None:
+            try:
+                conexao.rollback()
+            except Exception:
+                pass
+        lote["estado"] = FALHOU
+        lote["erro"] = str(e)
+    finally:
+        if lote["estado"] != EM_ANDAMENTO:
+            lote["concluido_em"] = datetime.now().isoformat(timespec="seconds")
+        salvar_lote(lote, diretorio)
+        invalidar_grade(lote["banco"], lote["tabela"])
+        invalidar_contagem(lote["banco"], lote["tabela"])
+        if lote["destino"] == DESTINO_TABELA:
+            invalidar_grade(lote["banco"], lote["tabela_arquivo"])
+            invalidar_contagem(lote["banco"], lote["tabela_arquivo"])
+        if conexao is not None:
+            try:
+                conexao.close()
+            except Exception:
+                pass
+        encerrar_execucao(id_lote)
+
+
+def iniciar_arquivamento(conexao, banco, tabela, politica, diretorio=DIRETORIO_EXECUCOES):
+    """
+    Congela o corte, prepara o destino e dispara a execução em segundo plano.
+    Retorna {"sucesso", "mensagem", "id"}.
+    """
+    problemas = problemas_arquivamento(conexao, banco, tabela, politica)
+    if problemas:
+        return {"sucesso": False, "mensagem": "; ".join(problemas), "id": None}
+
+    condicoes, corte = condicoes_politica(conexao, politica)
+    try:
+        montar_filtro(condicoes)
+    except ValueError as e:
+        return {"sucesso": False, "mensagem": str(e), "id": None}
+
+    colunas = [nome for nome, _, gerada in colunas_tabela(conexao, banco, tabela) if not gerada]
+    id_lote = datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+    if politica["destino"] == DESTINO_TABELA:
+        try:
+            preparar_tabela_arquivo(conexao, banco, tabela, politica["tabela_arquivo"], colunas)
+        except (mysql.connector.Error, ValueError) as e:
+            return {"sucesso": False, "mensagem": f"Tabela de arquivo: {e}", "id": None}
+
+    lote = {
+        "id": id_lote,
+        "banco": banco,
+        "tabela": tabela,
+        "operacao": "arquivar",
+        "condicoes": condicoes,
+        "corte": corte,
+        "destino": politica["destino"],
+        "tabela_arquivo": politica.get("tabela_arquivo") if politica["destino"] == DESTINO_TABELA else None,
+        "pasta": os.path.join(DIRETORIO_ARQUIVOS, id_lote),
+        "arquivos": [],
+        "pendente": None,
+        "colunas": colunas,
+        "chave": obter_chave_navegacao(conexao, banco, tabela),
+        "tamanho_bloco": int(politica.get("tamanho_bloco") or TAMANHO_BLOCO_PADRAO),
+        "pausa": float(politica.get("pausa", PAUSA_PADRAO)),
+        "estimativa": contar_afetados(conexao, banco, tabela, condicoes),
+        "ultimo": None,
+        "afetadas": 0,
+        "blocos": 0,
+        "estado": EM_ANDAMENTO,
+        "erro": None,
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    os.makedirs(diretorio, exist_ok=True)
+    salvar_lote(lote, diretorio)
+    disparar_lote(id_lote, diretorio, _executar_arquivamento)
+    return {"sucesso": True, "mensagem": f"Arquivamento {id_lote} iniciado (corte: {corte})", "id": id_lote}
+
+
+def retomar_arquivamento(id_lote, diretorio=DIRETORIO_EXECUCOES):
+    return retomar_lote(id_lote, diretorio, _executar_arquivamento)
+
+
+def simular_politicas(conexao, banco, arquivo=ARQUIVO_POLITICAS):
+    """Contagem de cada política salva do banco, sem mover nada: [(tabela, {"linhas", "corte", "erro"})]"""
+    simulacao = []
+    for politica in carregar_politicas(banco, arquivo).values():
+        try:
+            condicoes, corte = condicoes_politica(conexao, politica)
+            simulacao.append((politica["tabela"], {
+                "linhas": contar_afetados(conexao, banco, politica["tabela"], condicoes),
+                "corte": corte, "erro": None}))
+        except (mysql.connector.Error, ValueError) as e:
+            simulacao.append((politica["tabela"], {"linhas": None, "corte": None, "erro": str(e)}))
+    return simulacao
+
+
+def iniciar_politicas(conexao, banco, arquivo=ARQUIVO_POLITICAS, diretorio=DIRETORIO_EXECUCOES):
+    """Dispara todas as políticas salvas do banco que não estão rodando: [(tabela, resultado)]"""
+    rodando = {lote["tabela"] for lote in listar_lotes(banco, diretorio=diretorio) if lote["rodando"]}
+    resultados = []
+    for politica in carregar_politicas(banco, arquivo).values():
+        if politica["tabela"] in rodando:
+            resultados.append((politica["tabela"], {"sucesso": False, "mensagem": "já está rodando"}))
+            continue
+        try:
+            resultado = iniciar_arquivamento(conexao, banco, politica["tabela"], politica, diretorio)
+        except mysql.connector.Error as e:
+            resultado = {"sucesso": False, "mensagem": str(e)}
+        resultados.append((politica["tabela"], resultado))
+    return resultados
+
+
+# ============ COMPONENTE STREAMLIT ============
+def mostrar_execucoes(banco, tabela, chave="", diretorio=DIRETORIO_EXECUCOES):
+    """Progresso dos arquivamentos da tabela, com cancelar/retomar"""
+    lotes = listar_lotes(banco, tabela, diretorio)
+    if not lotes:
+        return
+
+    st.write("**Arquivamentos desta tabela:**")
+    for lote in lotes[:10]:
+        destino = (f"`{lote['tabela_arquivo']}`" if lote["destino"] == DESTINO_TABELA
+                   else f"{len(lote['arquivos'])} arquivo(s) {lote['destino']} em `{lote['pasta']}`")
+        st.write(f"📦 antes de `{lote['corte']}` → {destino} — **{lote['estado']}** · "
+                 f"{lote['afetadas']:,} linha(s) em {lote['blocos']} bloco(s) · iniciado {lote['criado_em']}")
+
+        if lote["estimativa"]:
+            st.progress(min(1.0, lote["afetadas"] / lote["estimativa"]))
+        if lote.get("erro"):
+            st.error(f"Erro: {lote['erro']}")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if lote["rodando"] and st.button("⏹️ Cancelar", key=f"arq_cancelar_{chave}_{lote['id']}"):
+                cancelar_lote(lote["id"])
+                st.info("Parada solicitada: o bloco em curso será concluído.")
+        with col2:
+            if (not lote["rodando"] and lote["estado"] != CONCLUIDA
+                    and st.button("▶️ Retomar", key=f"arq_retomar_{chave}_{lote['id']}")):
+                resultado = retomar_arquivamento(lote["id"], diretorio)
+                (st.success if resultado["sucesso"] else st.error)(resultado["mensagem"])
+                st.rerun()
+        with col3:
+            if not lote["rodando"] and st.button("🧹 Remover do histórico",
+                                                 key=f"arq_remover_{chave}_{lote['id']}"):
+                remover_lote(lote["id"], diretorio)
+                st.rerun()
+
+    if any(lote["rodando"] for lote in lotes) and st.button("🔄 Atualizar progresso",
+                                                            key=f"arq_atualizar_{chave}"):
+        st.rerun()
+
+
+def formulario_politica(colunas, tabela, politica, chave):
+    """Campos da política (valores iniciais da política salva, se houver)"""
+    datas = [nome for nome, tipo, _ in colunas if tipo in _TIPOS_DATA]
+    if not datas:
+        st.info("A tabela não tem coluna DATE/DATETIME/TIMESTAMP para definir a idade das linhas.")
+        return None
+    politica = politica or {}
+
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        coluna = st.selectbox("Coluna de data:", datas, key=f"arq_coluna_{chave}",
+                              index=datas.index(politica["coluna"]) if politica.get("coluna") in datas else 0)
+    with col2:
+        quantidade = st.number_input("Mais antigas que:", 1, 10_000, int(politica.get("quantidade", 1)),
+                                     key=f"arq_qtd_{chave}")
+    with col3:
+        unidades = list(UNIDADES)
+        unidade = st.selectbox("Unidade:", unidades, key=f"arq_unidade_{chave}",
+                               index=unidades.index(politica.get("unidade", "anos")))
+
+    condicoes = []
+    if st.checkbox("Condições extras (AND)", value=bool(politica.get("condicoes")), key=f"arq_extras_{chave}"):
+        condicoes = editor_condicoes([nome for nome, _, _ in colunas], f"arq_{chave}")
+
+    destino = st.radio("Destino:", DESTINOS, horizontal=True, key=f"arq_destino_{chave}",
+                       index=DESTINOS.index(politica.get("destino", DESTINO_TABELA)))
+    tabela_arquivo = None
+    if destino == DESTINO_TABELA:
+        tabela_arquivo = st.text_input("Tabela de arquivo:", politica.get("tabela_arquivo") or f"{tabela}_arquivo",
+                                       key=f"arq_tabela_{chave}",
+                                       help="Criada com CREATE TABLE ... LIKE se não existir")
+    elif not pyarrow_disponivel():
+        st.warning("⚠️ Parquet/Arrow requer pyarrow (pip install pyarrow)")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        tamanho_bloco = st.number_input("Linhas por bloco:", 100, 100_000,
+                                        int(politica.get("tamanho_bloco", TAMANHO_BLOCO_PADRAO)),
+                                        step=100, key=f"arq_bloco_{chave}",
+                                        help="Cada bloco é copiado e apagado numa transação própria")
+    with col2:
+        pausa = st.number_input("Pausa entre blocos (s):", 0.0, 10.0, float(politica.get("pausa", PAUSA_PADRAO)),
+                                step=0.1, key=f"arq_pausa_{chave}")
+
+    return {
+        "coluna": coluna,
+        "quantidade": int(quantidade),
+        "unidade": unidade,
+        "condicoes": condicoes,
+        "destino": destino,
+        "tabela_arquivo": tabela_arquivo,
+        "tamanho_bloco": int(tamanho_bloco),
+        "pausa": float(pausa),
+    }
+
+
+def mostrar_arquivamento(conexao, banco, tabela, chave=""):
+    """
+    Política de arquivamento da tabela: idade, destino, simulação,
+    execução em blocos e acompanhamento.
+    """
+    chave = f"{chave}_{tabela}"
+    try:
+        colunas = colunas_tabela(conexao, banco, tabela)
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao obter colunas: {e}")
+        return
+
+    salva = politica_tabela(banco, tabela)
+    if salva:
+        st.caption(f"Política salva: {descrever_politica(salva)}")
+
+    politica = formulario_politica(colunas, tabela, salva, chave)
+    if politica is not None:
+        try:
+            dependentes = tabelas_dependentes(conexao, banco, tabela)
+        except mysql.connector.Error:
+            dependentes = []
+        if dependentes:
+            st.warning(f"⚠️ {', '.join(dependentes)} referencia(m) '{tabela}' por FK: "
+                       "o DELETE de cada bloco pode falhar ou cascatear nelas.")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button("💾 Salvar política", key=f"arq_salvar_{chave}", use_container_width=True):
+                salvar_politica(banco, tabela, politica)
+                st.success("Política salva")
+        with col2:
+            if salva and st.button("🗑️ Remover política", key=f"arq_remover_pol_{chave}",
+                                   use_container_width=True):
+                remover_politica(banco, tabela)
+                st.rerun()
+        with col3:
+            simular = st.button("🧮 Simular (contar linhas)", key=f"arq_simular_{chave}",
+                                use_container_width=True)
+
+        if simular:
+            try:
+                condicoes, corte = condicoes_politica(conexao, politica)
+                total = contar_afetados(conexao, banco, tabela, condicoes)
+                st.session_state[f"arq_simulacao_{chave}"] = politica
+                st.info(f"**{total:,}** linha(s) anteriores a `{corte}` seriam movidas "
+                        f"(~{-(-total // politica['tamanho_bloco'])} bloco(s))")
+            except (mysql.connector.Error, ValueError) as e:
+                st.error(f"Erro na simulação: {e}")
+
+        # Só executa depois de simular exatamente esta política
+        simulado = st.session_state.get(f"arq_simulacao_{chave}") == politica
+        if not simulado:
+            st.caption("Simule a política antes de executar.")
+        if st.button("▶️ Arquivar em blocos", type="primary", key=f"arq_executar_{chave}", disabled=not simulado):
+            try:
+                resultado = iniciar_arquivamento(conexao, banco, tabela, politica)
+            except mysql.connector.Error as e:
+                resultado = {"sucesso": False, "mensagem": str(e)}
+            if resultado["sucesso"]:
+                st.session_state.pop(f"arq_simulacao_{chave}", None)
+                st.success(f"✅ {resultado['mensagem']} — acompanhe abaixo.")
+            else:
+                st.error(f"❌ {resultado['mensagem']}")
+
+    outras = carregar_politicas(banco)
+    if len(outras) > 1 or (outras and not salva):
+        st.write("---")
+        st.write(f"**Políticas salvas em `{banco}`:**")
+        for politica_salva in outras.values():
+            st.write(f"- `{politica_salva['tabela']}`: {descrever_politica(politica_salva)}")
+        # Como na política da tabela: simula todas e só então libera a execução
+        chave_simulacao = f"arq_simulacao_todas_{banco}"
+        if st.button("🧮 Simular todas as políticas do banco", key=f"arq_simular_todas_{chave}"):
+            st.session_state[chave_simulacao] = {"politicas": outras,
+                                                 "resultado": simular_politicas(conexao, banco)}
+        simulacao = st.session_state.get(chave_simulacao)
+        simulado = simulacao is not None and simulacao["politicas"] == outras
+        if simulado:
+            for nome, previsto in simulacao["resultado"]:
+                if previsto["erro"]:
+                    st.error(f"{nome}: {previsto['erro']}")
+                else:
+                    st.info(f"{nome}: **{previsto['linhas']:,}** linha(s) anteriores a `{previsto['corte']}`")
+        else:
+            st.caption("Simule as políticas antes de executar todas.")
+        if st.button("▶️ Executar todas as políticas do banco", key=f"arq_todas_{chave}",
+                     disabled=not simulado):
+            st.session_state.pop(chave_simulacao, None)
+            for nome, resultado in iniciar_politicas(conexao, banco):
+                (st.success if resultado["sucesso"] else st.error)(f"{nome}: {resultado['mensagem']}")
+
+    st.write("---")
+    mostrar_execucoes(banco, tabela, chave)
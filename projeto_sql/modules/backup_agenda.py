@@ -0,0 +1,262 @@
+# modules/backup_agenda.py
+"""
+Agendamento de backups automáticos (usado pelo agendador_backup.py)
+- Expressões cron de 5 campos por banco (minuto hora dia mês dia-da-semana)
+- Retenção GFS: mantém N diários, N semanais e N mensais de cada banco
+- Agenda e estado das execuções em backups/agenda.json
+Os backups rodam num processo separado, nunca dentro da sessão do Streamlit.
+"""
+import os
+from datetime import datetime, timedelta
+
+from .backup_catalogo import (DIRETORIO_PADRAO, atualizar_no_catalogo, bloqueio_arquivo, carregar_catalogo,
+                              coletar_objetos_orfaos, gravar_json, ler_json, remover_do_catalogo)
+from .backup_snapshot import executar_backup_snapshot
+
+ARQUIVO_AGENDA = "agenda.json"
+PASTA_AUTOMATICOS = "automaticos"
+TIPO_AUTOMATICO = "automático"
+
+RETENCAO_PADRAO = {"diarios": 7, "semanais": 4, "mensais": 6}
+
+ATALHOS_CRON = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 2 * * *",
+    "@weekly": "0 3 * * 0",
+    "@monthly": "0 4 1 * *",
+}
+
+# (mínimo, máximo) de cada campo
+_LIMITES_CRON = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+# ============ CRON ============
+def _interpretar_campo(campo, minimo, maximo):
+    """'*', '5', '1-5', '*/15', '1,15,30', '10-50/10' -> conjunto de valores"""
+    valores = set()
+    for parte in campo.split(","):
+        intervalo, _, passo = parte.partition("/")
+        passo = int(passo) if passo else 1
+        if intervalo == "*":
+            inicio, fim = minimo, maximo
+        elif "-" in intervalo:
+            inicio, fim = (int(v) for v in intervalo.split("-", 1))
+        else:
+            inicio = int(intervalo)
+            fim = maximo if passo > 1 else inicio
+        if not (minimo <= inicio <= fim <= maximo) or passo < 1:
+            raise ValueError(f"campo cron fora do intervalo: '{parte}'")
+        valores.update(range(inicio, fim + 1, passo))
+    return valores
+
+
+def interpretar_cron(expressao):
+    """
+    Retorna (minutos, horas, dias, meses, dias_semana, dia_restrito, semana_restrita).
+    Levanta ValueError se a expressão for inválida.
+    """
+    expressao = ATALHOS_CRON.get(expressao.strip(), expressao.strip())
+    campos = expressao.split()
+    if len(campos) != 5:
+        raise ValueError("a expressão cron precisa de 5 campos: minuto hora dia mês dia-da-semana")
+
+    conjuntos = [_interpretar_campo(campo, *limites) for campo, limites in zip(campos, _LIMITES_CRON)]
+    conjuntos[4] = {d % 7 for d in conjuntos[4]}   # 7 também é domingo
+    return tuple(conjuntos) + (campos[2] != "*", campos[4] != "*")
+
+
+def _dia_confere(momento, dias, dias_semana, dia_restrito, semana_restrita):
+    dia_semana = (momento.weekday() + 1) % 7      # cron: 0 = domingo
+    if dia_restrito and semana_restrita:
+        # Como no cron: basta um dos dois campos
+        return momento.day in dias or dia_semana in dias_semana
+    return momento.day in dias and dia_semana in dias_semana
+
+
+def proxima_execucao(expressao, apos=None):
+    """Primeiro minuto estritamente depois de 'apos' que satisfaz a expressão"""
+    minutos, horas, dias, meses, dias_semana, dia_restrito, semana_restrita = interpretar_cron(expressao)
+    momento = (apos or datetime.now()).replace(second=0, microsecond=0) + timedelta(minutes=1)
+    limite = momento + timedelta(days=366 * 5)
+
+    # Avança por mês/dia/hora inteiros quando o campo maior já não confere
+    while momento < limite:
+        if momento.month not in meses:
+            ano, mes = (momento.year + 1, 1) if momento.month == 12 else (momento.year, momento.month + 1)
+            momento = momento.replace(year=ano, month=mes, day=1, hour=0, minute=0)
+        elif not _dia_confere(momento, dias, dias_semana, dia_restrito, semana_restrita):
+            momento = (momento + timedelta(days=1)).replace(hour=0, minute=0)
+        elif momento.hour not in horas:
+            momento = (momento + timedelta(hours=1)).replace(minute=0)
+        elif momento.minute not in minutos:
+            momento += timedelta(minutes=1)
+        else:
+            return momento
+    raise ValueError(f"a expressão '{expressao}' nunca ocorre")
+
+
+# ============ AGENDA ============
+def _caminho_agenda(diretorio):
+    return os.path.join(diretorio, ARQUIVO_AGENDA)
+
+
+def carregar_agenda(diretorio=DIRETORIO_PADRAO):
+    """{"tarefas": {banco: tarefa}, "estado": {banco: última execução}}"""
+    agenda = ler_json(_caminho_agenda(diretorio), {})   # gravar_json troca o arquivo de forma atômica
+    agenda.setdefault("tarefas", {})
+    agenda.setdefault("estado", {})
+    return agenda
+
+
+def salvar_tarefa(banco, cron, retencao=None, ativo=True, diretorio=DIRETORIO_PADRAO):
+    """Cria/atualiza o agendamento de um banco. Levanta ValueError se o cron for inválido."""
+    interpretar_cron(cron)
+    with bloqueio_arquivo(_caminho_agenda(diretorio)):
+        agenda = ler_json(_caminho_agenda(diretorio), {})
+        agenda.setdefault("tarefas", {})[banco] = {
+            "banco": banco,
+            "cron": cron.strip(),
+            "retencao": dict(RETENCAO_PADRAO, **(retencao or {})),
+            "ativo": ativo,
+            # Sem execução anterior, a próxima conta a partir do cadastro
+            "criada_em": datetime.now().isoformat(timespec="seconds"),
+        }
+        gravar_json(_caminho_agenda(diretorio), agenda)
+
+
+def remover_tarefa(banco, diretorio=DIRETORIO_PADRAO):
+    with bloqueio_arquivo(_caminho_agenda(diretorio)):
+        agenda = ler_json(_caminho_agenda(diretorio), {})
+        agenda.get("tarefas", {}).pop(banco, None)
+        gravar_json(_caminho_agenda(diretorio), agenda)
+
+
+def _registrar_estado(banco, estado, diretorio):
+    with bloqueio_arquivo(_caminho_agenda(diretorio)):
+        agenda = ler_json(_caminho_agenda(diretorio), {})
+        agenda.setdefault("estado", {})[banco] = estado
+        gravar_json(_caminho_agenda(diretorio), agenda)
+
+
+def tarefas_pendentes(agora=None, diretorio=DIRETORIO_PADRAO):
+    """
+    Tarefas ativas cuja próxima execução (a partir da última) já passou.
+    Execuções perdidas com o agendador parado rodam uma única vez.
+    """
+    agora = agora or datetime.now()
+    agenda = carregar_agenda(diretorio)
+    pendentes = []
+    for banco, tarefa in agenda["tarefas"].items():
+        if not tarefa.get("ativo", True):
+            continue
+        base = agenda["estado"].get(banco, {}).get("agendada_para") or tarefa["criada_em"]
+        try:
+            prevista = proxima_execucao(tarefa["cron"], datetime.fromisoformat(base))
+        except ValueError:
+            continue
+        if prevista <= agora:
+            # Várias execuções perdidas viram uma só (a mais recente)
+            seguinte = proxima_execucao(tarefa["cron"], prevista)
+            while seguinte <= agora:
+                prevista, seguinte = seguinte, proxima_execucao(tarefa["cron"], seguinte)
+            pendentes.append((tarefa, prevista))
+    return pendentes
+
+
+# ============ RETENÇÃO GFS ============
+def selecionar_mantidos(backups, diarios, semanais, mensais):
+    """
+    backups: [(chave, datetime)]. Retorna o conjunto de chaves a manter:
+    o mais recente de cada um dos últimos N dias, N semanas ISO e N meses
+    (um mesmo backup pode contar como diário, semanal e mensal).
+    """
+    ordenados = sorted(backups, key=lambda b: b[1], reverse=True)
+    # O backup mais recente nunca é apagado, mesmo com retenção zerada
+    mantidos = {ordenados[0][0]} if ordenados else set()
+    for quantidade, periodo in (
+        (diarios, lambda d: d.date()),
+        (semanais, lambda d: d.isocalendar()[:2]),
+        (mensais, lambda d: (d.year, d.month)),
+    ):
+        vistos = set()
+        for chave, momento in ordenados:
+            if len(vistos) >= quantidade:
+                break
+            if periodo(momento) not in vistos:
+                vistos.add(periodo(momento))
+                mantidos.add(chave)
+    return mantidos
+
+
+def aplicar_retencao(banco, retencao=None, diretorio=DIRETORIO_PADRAO, simular=False):
+    """
+    Apaga os backups automáticos de 'banco' fora da política GFS
+    (backups manuais nunca são tocados) e depois os objetos sem referência.
+    Retorna a lista de arquivos removidos (ou que seriam, com simular=True).
+    """
+    retencao = dict(RETENCAO_PADRAO, **(retencao or {}))
+    candidatos = [
+        (chave, datetime.fromisoformat(entrada["criado_em"]))
+        for chave, entrada in carregar_catalogo(diretorio).items()
+        if entrada.get("banco") == banco and entrada.get("tipo") == TIPO_AUTOMATICO
+        and entrada.get("criado_em") and os.path.exists(os.path.join(diretorio, chave))
+    ]
+    mantidos = selecionar_mantidos(candidatos, retencao["diarios"], retencao["semanais"],
+                                   retencao["mensais"])
+
+    removidos = [chave for chave, _ in candidatos if chave not in mantidos]
+    if simular:
+        return removidos
+
+    for chave in removidos:
+        caminho = os.path.join(diretorio, chave)
+        os.remove(caminho)
+        remover_do_catalogo(caminho, diretorio)
+    if removidos:
+        coletar_objetos_orfaos(diretorio)
+    return removidos
+
+
+# ============ EXECUÇÃO ============
+def executar_tarefa(tarefa, agendada_para=None, diretorio=DIRETORIO_PADRAO, ao_progredir=None):
+    """
+    Snapshot colunar do banco em <diretorio>/automaticos + retenção.
+    Grava no catálogo o tempo de backup e de limpeza; retorna o resultado do backup.
+    """
+    banco = tarefa["banco"]
+    destino = os.path.join(diretorio, PASTA_AUTOMATICOS)
+    os.makedirs(destino, exist_ok=True)
+    agendada_para = agendada_para or datetime.now()
+    inicio = datetime.now()
+
+    resultado = executar_backup_snapshot(banco, destino, ao_progredir, TIPO_AUTOMATICO,
+                                         diretorio_catalogo=diretorio)
+    duracao_backup = (datetime.now() - inicio).total_seconds()
+
+    removidos = []
+    duracao_retencao = 0.0
+    if resultado["sucesso"]:
+        inicio_retencao = datetime.now()
+        removidos = aplicar_retencao(banco, tarefa.get("retencao"), diretorio)
+        duracao_retencao = (datetime.now() - inicio_retencao).total_seconds()
+        atualizar_no_catalogo(resultado["arquivo"], {
+            "agendamento": {
+                "cron": tarefa["cron"],
+                "agendada_para": agendada_para.isoformat(timespec="minutes"),
+                "atraso": round((inicio - agendada_para).total_seconds(), 1),
+                "duracao_backup": round(duracao_backup, 3),
+                "duracao_retencao": round(duracao_retencao, 3),
+                "removidos": len(removidos),
+            }
+        }, diretorio)
+
+    _registrar_estado(banco, {
+        "agendada_para": agendada_para.isoformat(timespec="minutes"),
+        "inicio": inicio.isoformat(timespec="seconds"),
+        "duracao": round(duracao_backup + duracao_retencao, 3),
+        "sucesso": resultado["sucesso"],
+        "mensagem": resultado["mensagem"],
+        "arquivo": os.path.basename(resultado["arquivo"]) if resultado["sucesso"] else None,
+        "removidos": removidos,
+    }, diretorio)
+    return resultado
@@ -0,0 +1,335 @@
+# modules/backup_catalogo.py
+"""
+Catálogo de backups (backups/catalogo.json) e armazém de objetos
+- SHA-256 de cada arquivo e CHECKSUM TABLE de cada tabela no momento do backup
+- Assinatura de conteúdo: backups com a mesma assinatura têm os mesmos dados
+- Verificação de um arquivo sem restaurar (re-hash dos membros)
+- Objetos por conteúdo (backups/objetos): tabelas que não mudaram entre
+  snapshots não são exportadas nem gravadas de novo
+Não depende do Streamlit (usado também pelo agendador).
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:             # Windows (XAMPP)
+    fcntl = None
+    import msvcrt
+
+DIRETORIO_PADRAO = "backups"
+ARQUIVO_CATALOGO = "catalogo.json"
+PASTA_OBJETOS = "objetos"
+INDICE_OBJETOS = "indice.json"
+BLOCO_HASH = 1024 * 1024
+CARENCIA_OBJETOS = 3600         # objetos recentes podem ser de um snapshot ainda em curso
+
+_lock = threading.Lock()
+
+
+# ============ HASH ============
+def sha256_arquivo(arquivo):
+    """SHA-256 de um caminho ou de um arquivo já aberto (lido em blocos)"""
+    digest = hashlib.sha256()
+    if isinstance(arquivo, str):
+        with open(arquivo, "rb") as f:
+            for bloco in iter(lambda: f.read(BLOCO_HASH), b""):
+                digest.update(bloco)
+    else:
+        for bloco in iter(lambda: arquivo.read(BLOCO_HASH), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def _sha256_texto(texto):
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def checksums_tabelas(conexao, banco, tabelas):
+    """
+    {tabela: {"checksum": int|None, "ddl_sha256": str}}
+    CHECKSUM TABLE lê a tabela no servidor (sem trazer linhas para o Python).
+    O AUTO_INCREMENT do DDL é ignorado: não altera os dados.
+    """
+    resultado = {}
+    if not tabelas:
+        return resultado
+
+    cursor = conexao.cursor()
+    lista = ", ".join(f"`{banco}`.`{t}`" for t in tabelas)
+    cursor.execute(f"CHECKSUM TABLE {lista}")
+    for nome_completo, checksum in cursor.fetchall():
+        tabela = nome_completo.split(".", 1)[1] if "." in nome_completo else nome_completo
+        resultado[tabela] = {"checksum": checksum}
+
+    for tabela in tabelas:
+        cursor.execute(f"SHOW CREATE TABLE `{banco}`.`{tabela}`")
+        ddl = re.sub(r"\s+AUTO_INCREMENT=\d+", "", cursor.fetchone()[1])
+        resultado.setdefault(tabela, {"checksum": None})["ddl_sha256"] = _sha256_texto(ddl)
+    cursor.close()
+    return resultado
+
+
+def assinatura_conteudo(checksums):
+    """Hash único do conteúdo de um banco (ordem das tabelas não importa)"""
+    if not checksums or any(c.get("checksum") is None for c in checksums.values()):
+        return None
+    return _sha256_texto(json.dumps(checksums, sort_keys=True))
+
+
+# ============ CATÁLOGO ============
+def _caminho_catalogo(diretorio):
+    return os.path.join(diretorio, ARQUIVO_CATALOGO)
+
+
+def ler_json(caminho, padrao):
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return padrao
+
+
+def gravar_json(caminho, dados):
+    """Grava de forma atômica (temp + replace), para não corromper em paralelo"""
+    pasta = os.path.dirname(caminho) or "."
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+    with os.fdopen(descritor, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+@contextmanager
+def bloqueio_arquivo(caminho):
+    """
+    Trava para ler-alterar-gravar um JSON: o agendador_backup roda em outro
+    processo e grava os mesmos arquivos, então o threading.Lock não basta.
+    Usa um arquivo "<caminho>.lock" (fcntl no Linux, msvcrt no Windows).
+    """
+    pasta = os.path.dirname(caminho) or "."
+    os.makedirs(pasta, exist_ok=True)
+    with _lock, open(caminho + ".lock", "a+b") as trava:
+        if fcntl:
+            fcntl.flock(trava.fileno(), fcntl.LOCK_EX)
+        else:
+            trava.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(trava.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:     # LK_LOCK desiste após ~10 s; continua esperando
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(trava.fileno(), fcntl.LOCK_UN)
+            else:
+                trava.seek(0)
+                msvcrt.locking(trava.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _chave_arquivo(diretorio, caminho):
+    return os.path.relpath(os.path.abspath(caminho), os.path.abspath(diretorio)).replace(os.sep, "/")
+
+
+def carregar_catalogo(diretorio=DIRETORIO_PADRAO):
+    """{caminho relativo: entrada}"""
+    with _lock:
+        return ler_json(_caminho_catalogo(diretorio), {})
+
+
+def entrada_catalogo(caminho, diretorio=DIRETORIO_PADRAO):
+    return carregar_catalogo(diretorio).get(_chave_arquivo(diretorio, caminho))
+
+
+def registrar_no_catalogo(caminho, dados, diretorio=DIRETORIO_PADRAO):
+    """Acrescenta/atualiza a entrada do arquivo (calcula o SHA-256 do arquivo)"""
+    entrada = {
+        "arquivo": os.path.basename(caminho),
+        "registrado_em": datetime.now().isoformat(timespec="seconds"),
+        "bytes": os.path.getsize(caminho),
+        "sha256": sha256_arquivo(caminho),
+    }
+    entrada.update(dados)
+    if "tabelas" in entrada and "assinatura" not in entrada:
+        entrada["assinatura"] = assinatura_conteudo(entrada["tabelas"])
+
+    with bloqueio_arquivo(_caminho_catalogo(diretorio)):
+        catalogo = ler_json(_caminho_catalogo(diretorio), {})
+        catalogo[_chave_arquivo(diretorio, caminho)] = entrada
+        gravar_json(_caminho_catalogo(diretorio), catalogo)
+    return entrada
+
+
+def atualizar_no_catalogo(caminho, dados, diretorio=DIRETORIO_PADRAO):
+    """Junta dados a uma entrada existente (sem recalcular o SHA-256)"""
+    with bloqueio_arquivo(_caminho_catalogo(diretorio)):
+        catalogo = ler_json(_caminho_catalogo(diretorio), {})
+        chave = _chave_arquivo(diretorio, caminho)
+        if chave in catalogo:
+            catalogo[chave].update(dados)
+            gravar_json(_caminho_catalogo(diretorio), catalogo)
+
+
+def remover_do_catalogo(caminho, diretorio=DIRETORIO_PADRAO):
+    with bloqueio_arquivo(_caminho_catalogo(diretorio)):
+        catalogo = ler_json(_caminho_catalogo(diretorio), {})
+        catalogo.pop(_chave_arquivo(diretorio, caminho), None)
+        gravar_json(_caminho_catalogo(diretorio), catalogo)
+
+
+# ============ OBJETOS POR CONTEÚDO ============
+def caminho_objeto(sha256, diretorio=DIRETORIO_PADRAO):
+    return os.path.join(diretorio, PASTA_OBJETOS, sha256[:2], f"{sha256}.parquet")
+
+
+def chave_objeto(banco, tabela, checksum):
+    """Chave do índice: mesma tabela, mesmos dados, mesmo DDL"""
+    return f"{banco}.{tabela}:{checksum['checksum']}:{checksum['ddl_sha256']}"
+
+
+def objeto_reutilizavel(chave, diretorio=DIRETORIO_PADRAO):
+    """Entrada do índice para a chave, se o objeto ainda existir em disco"""
+    with _lock:
+        indice = ler_json(os.path.join(diretorio, PASTA_OBJETOS, INDICE_OBJETOS), {})
+    entrada = indice.get(chave)
+    if entrada and os.path.exists(caminho_objeto(entrada["objeto"], diretorio)):
+        return entrada
+    return None
+
+
+def guardar_objeto(caminho_arquivo, sha256, chave=None, dados=None, diretorio=DIRETORIO_PADRAO):
+    """
+    Move o arquivo para o armazém (ou descarta se o objeto já existe)
+    e, com chave, registra no índice para ser reaproveitado.
+    """
+    destino = caminho_objeto(sha256, diretorio)
+    if os.path.exists(destino):
+        os.remove(caminho_arquivo)
+    else:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(caminho_arquivo, destino)
+
+    if chave:
+        caminho_indice = os.path.join(diretorio, PASTA_OBJETOS, INDICE_OBJETOS)
+        with bloqueio_arquivo(caminho_indice):
+            indice = ler_json(caminho_indice, {})
+            indice[chave] = dict(dados or {}, objeto=sha256)
+            gravar_json(caminho_indice, indice)
+    return destino
+
+
+def coletar_objetos_orfaos(diretorio=DIRETORIO_PADRAO):
+    """Apaga objetos que nenhum backup do catálogo referencia. Retorna (qtd, bytes)."""
+    referenciados = set()
+    for chave, entrada in carregar_catalogo(diretorio).items():
+        # Backup apagado do disco não segura mais os seus objetos
+        if os.path.exists(os.path.join(diretorio, chave)):
+            referenciados.update(entrada.get("objetos", []))
+
+    pasta = os.path.join(diretorio, PASTA_OBJETOS)
+    removidos, liberados = 0, 0
+    for raiz, _, arquivos in os.walk(pasta):
+        for nome in arquivos:
+            if not nome.endswith(".parquet"):
+                continue
+            caminho = os.path.join(raiz, nome)
+            if (nome[:-len(".parquet")] not in referenciados
+                    and time.time() - os.path.getmtime(caminho) > CARENCIA_OBJETOS):
+                liberados += os.path.getsize(caminho)
+                os.remove(caminho)
+                removidos += 1
+
+    if removidos:
+        caminho_indice = os.path.join(pasta, INDICE_OBJETOS)
+        with bloqueio_arquivo(caminho_indice):
+            indice = ler_json(caminho_indice, {})
+            indice = {k: v for k, v in indice.items()
+                      if os.path.exists(caminho_objeto(v["objeto"], diretorio))}
+            gravar_json(caminho_indice, indice)
+    return removidos, liberados
+
+
+# ============ VERIFICAÇÃO ============
+def verificar_backup(caminho, diretorio=DIRETORIO_PADRAO):
+    """
+    Confere um backup sem restaurar:
+    - SHA-256 do arquivo contra o catálogo
+    - CRC dos membros do zip
+    - snapshots: SHA-256 e nº de linhas de cada tabela contra o manifesto
+    Retorna {"ok": bool, "problemas": [str], "avisos": [str], "verificados": int}.
+    """
+    problemas = []
+    avisos = []
+    verificados = 0
+
+    entrada = entrada_catalogo(caminho, diretorio)
+    if entrada is None:
+        avisos.append("sem registro no catálogo (SHA-256 do arquivo não conferido)")
+    elif sha256_arquivo(caminho) != entrada["sha256"]:
+        problemas.append("SHA-256 do arquivo difere do catálogo")
+    else:
+        verificados += 1
+
+    if not zipfile.is_zipfile(caminho):
+        if not caminho.endswith(".sql"):
+            problemas.append("arquivo não é um zip válido")
+        return {"ok": not problemas, "problemas": problemas, "avisos": avisos,
+                "verificados": verificados}
+
+    with zipfile.ZipFile(caminho) as zipf:
+        corrompido = zipf.testzip()
+        if corrompido:
+            problemas.append(f"CRC inválido no membro '{corrompido}'")
+
+        if "manifest.json" not in zipf.namelist():
+            return {"ok": not problemas, "problemas": problemas, "avisos": avisos,
+                    "verificados": verificados}
+
+        manifesto = json.loads(zipf.read("manifest.json").decode("utf-8"))
+        for tabela in manifesto["tabelas"]:
+            if tabela.get("arquivo"):
+                with zipf.open(tabela["arquivo"]) as membro:
+                    sha = sha256_arquivo(membro)
+                origem = None
+            else:
+                origem = caminho_objeto(tabela["objeto"], diretorio)
+                if not os.path.exists(origem):
+                    problemas.append(f"{tabela['nome']}: objeto {tabela['objeto'][:12]} ausente")
+                    continue
+                sha = sha256_arquivo(origem)
+
+            if sha != tabela["sha256"]:
+                problemas.append(f"{tabela['nome']}: SHA-256 não confere")
+                continue
+
+            linhas = _linhas_parquet(zipf, tabela, origem)
+            if linhas is not None and linhas != tabela["linhas"]:
+                problemas.append(f"{tabela['nome']}: {linhas} linhas (manifesto: {tabela['linhas']})")
+                continue
+            verificados += 1
+
+    return {"ok": not problemas, "problemas": problemas, "avisos": avisos,
+            "verificados": verificados}
+
+
+def _linhas_parquet(zipf, tabela, origem):
+    """Nº de linhas pelo rodapé do Parquet (None se o pyarrow não estiver instalado)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    if origem:
+        return pq.ParquetFile(origem).metadata.num_rows
+    with tempfile.TemporaryDirectory(prefix="verificar_") as pasta_temp:
+        return pq.ParquetFile(zipf.extract(tabela["arquivo"], pasta_temp)).metadata.num_rows
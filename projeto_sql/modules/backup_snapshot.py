@@ -0,0 +1,419 @@
+# modules/backup_snapshot.py
+"""
+Backup em snapshot colunar
+Um .zip (sem recompressão) com:
+    manifest.json          -> banco, data, tabelas, linhas, sha256 e CHECKSUM TABLE
+    schema.sql             -> SHOW CREATE TABLE de todas as tabelas
+    dados/<tabela>.parquet -> dados da tabela (zstd), lidos em lotes
+Deduplicado (padrão), os Parquet ficam no armazém de objetos do catálogo
+(backups/objetos/<sha256>.parquet) e tabelas sem alterações são reaproveitadas.
+O restore recria as tabelas e carrega via LOAD DATA LOCAL INFILE quando o
+servidor permite, senão via executemany em lotes.
+Não depende do Streamlit: o progresso é informado por callback.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from .backup_catalogo import (DIRETORIO_PADRAO, caminho_objeto, checksums_tabelas, chave_objeto,
+                              guardar_objeto, objeto_reutilizavel, registrar_no_catalogo,
+                              sha256_arquivo)
+from .colunar import (abrir_colunar, escrever_colunar, importar_pyarrow, inserir_lotes, schema_da_tabela,
+                      tipo_mysql_campo)
+from .conexao_resiliente import conectar
+
+FORMATO_SNAPSHOT = "snapshot-colunar"
+VERSAO_SNAPSHOT = 2             # 2: tabelas podem apontar para objetos deduplicados
+SUFIXO_SNAPSHOT = "_snapshot.zip"
+MANIFESTO = "manifest.json"
+PASTA_DADOS = "dados"
+
+# Erros que indicam LOAD DATA LOCAL desativado no servidor/cliente
+ERROS_LOCAL_INFILE = {1148, 2068, 3948}
+
+
+# ============ AUXILIARES ============
+def eh_snapshot(caminho):
+    """Indica se o arquivo é um snapshot colunar (zip com manifest.json)"""
+    if not caminho.endswith(".zip") or not zipfile.is_zipfile(caminho):
+        return False
+    with zipfile.ZipFile(caminho) as zipf:
+        return MANIFESTO in zipf.namelist()
+
+
+def ler_manifesto(caminho):
+    with zipfile.ZipFile(caminho) as zipf:
+        return json.loads(zipf.read(MANIFESTO).decode("utf-8"))
+
+
+def _avisar(ao_progredir, mensagem, fracao):
+    if ao_progredir:
+        ao_progredir(mensagem, fracao)
+
+
+# ============ BACKUP ============
+def _exportar_tabela(banco, tabela, caminho):
+    """Grava uma tabela em Parquet; retorna (linhas, colunas gravadas)"""
+    conexao = conectar(banco)
+    try:
+        schema = schema_da_tabela(conexao, tabela, ignorar_geradas=True)
+        colunas = ", ".join(f"`{campo.name}`" for campo in schema)
+        cursor = conexao.cursor(buffered=False)
+        try:
+            cursor.execute(f"SELECT {colunas} FROM `{tabela}`")
+            linhas = escrever_colunar(cursor, caminho, "Parquet", schema)
+        finally:
+            cursor.close()
+        return linhas, [campo.name for campo in schema]
+    finally:
+        conexao.close()
+
+
+def executar_backup_snapshot(banco_nome, destino_dir, ao_progredir=None, tipo="manual",
+                             deduplicar=True, diretorio_catalogo=DIRETORIO_PADRAO):
+    """
+    Cria {banco}_{timestamp}_snapshot.zip em destino_dir e registra no catálogo.
+
+    deduplicar: os Parquet vão para o armazém de objetos (diretorio_catalogo/objetos)
+    e o zip guarda só manifesto + schema. Tabelas cujo CHECKSUM TABLE e DDL não
+    mudaram desde o último snapshot não são exportadas de novo.
+
+    Retorna {"sucesso", "arquivo", "tamanho_mb", "mensagem", "manifesto"}.
+    """
+    try:
+        importar_pyarrow()
+        inicio = time.time()
+
+        conexao = conectar(banco_nome)
+        cursor = conexao.cursor()
+        cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+        tabelas = [linha[0] for linha in cursor.fetchall()]
+        ddls = {}
+        for tabela in tabelas:
+            cursor.execute(f"SHOW CREATE TABLE `{tabela}`")
+            ddls[tabela] = cursor.fetchone()[1]
+        cursor.close()
+        checksums = checksums_tabelas(conexao, banco_nome, tabelas)
+        conexao.close()
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        nome_arquivo = f"{banco_nome}_{timestamp}{SUFIXO_SNAPSHOT}"
+        caminho_zip = os.path.join(destino_dir, nome_arquivo)
+
+        manifesto = {
+            "formato": FORMATO_SNAPSHOT,
+            "versao": VERSAO_SNAPSHOT,
+            "banco": banco_nome,
+            "criado_em": datetime.now().isoformat(timespec="seconds"),
+            "formato_dados": "parquet",
+            "deduplicado": deduplicar,
+            "tabelas": []
+        }
+
+        with tempfile.TemporaryDirectory(prefix="snapshot_") as pasta_temp, \
+                zipfile.ZipFile(caminho_zip, "w", zipfile.ZIP_STORED) as zipf:
+            schema_sql = ["SET FOREIGN_KEY_CHECKS=0;", ""]
+            for tabela in tabelas:
+                schema_sql += [f"-- Estrutura para tabela `{tabela}`", ddls[tabela] + ";", ""]
+            schema_sql.append("SET FOREIGN_KEY_CHECKS=1;")
+            zipf.writestr("schema.sql", "\n".join(schema_sql), zipfile.ZIP_DEFLATED)
+
+            exportadas = {}
+            for indice, tabela in enumerate(tabelas):
+                checksum = checksums.get(tabela, {})
+                reaproveitado = None
+                if deduplicar and checksum.get("checksum") is not None:
+                    reaproveitado = objeto_reutilizavel(chave_objeto(banco_nome, tabela, checksum),
+                                                        diretorio_catalogo)
+                if reaproveitado:
+                    _avisar(ao_progredir, f"{tabela} sem alterações ({indice + 1}/{len(tabelas)})",
+                            indice / max(len(tabelas), 1))
+                    manifesto["tabelas"].append({
+                        "nome": tabela,
+                        "arquivo": None,
+                        "objeto": reaproveitado["objeto"],
+                        "linhas": reaproveitado["linhas"],
+                        "colunas": reaproveitado["colunas"],
+                        "bytes": reaproveitado["bytes"],
+                        "sha256": reaproveitado["objeto"],
+                        "checksum": checksum["checksum"],
+                        "ddl": ddls[tabela],
+                        "reaproveitado": True,
+                        "duracao": 0.0
+                    })
+                    continue
+
+                _avisar(ao_progredir, f"Exportando {tabela} ({indice + 1}/{len(tabelas)})",
+                        indice / max(len(tabelas), 1))
+                inicio_tabela = time.time()
+                caminho_parquet = os.path.join(pasta_temp, f"{indice}.parquet")
+                linhas, colunas = _exportar_tabela(banco_nome, tabela, caminho_parquet)
+                sha = sha256_arquivo(caminho_parquet)
+
+                entrada = {
+                    "nome": tabela,
+                    "arquivo": None,
+                    "objeto": sha,
+                    "linhas": linhas,
+                    "colunas": colunas,
+                    "bytes": os.path.getsize(caminho_parquet),
+                    "sha256": sha,
+                    "checksum": checksum.get("checksum"),
+                    "ddl": ddls[tabela],
+                    "reaproveitado": False,
+                    "duracao": round(time.time() - inicio_tabela, 3)
+                }
+                if deduplicar:
+                    exportadas[tabela] = (caminho_parquet, entrada)
+                else:
+                    entrada["arquivo"] = f"{PASTA_DADOS}/{tabela}.parquet"
+                    # Parquet já vem comprimido (zstd): guardar sem recomprimir
+                    zipf.write(caminho_parquet, entrada["arquivo"], zipfile.ZIP_STORED)
+                    os.remove(caminho_parquet)
+                manifesto["tabelas"].append(entrada)
+
+            if exportadas:
+                # Só indexa o objeto se a tabela não mudou durante a exportação:
+                # senão o checksum apontaria para dados de outro momento
+                conexao = conectar(banco_nome)
+                depois = checksums_tabelas(conexao, banco_nome, list(exportadas))
+                conexao.close()
+                for tabela, (caminho_parquet, entrada) in exportadas.items():
+                    estavel = depois.get(tabela) == checksums.get(tabela) and entrada["checksum"] is not None
+                    guardar_objeto(
+                        caminho_parquet, entrada["sha256"],
+                        chave=chave_objeto(banco_nome, tabela, checksums[tabela]) if estavel else None,
+                        dados={k: entrada[k] for k in ("linhas", "colunas", "bytes")},
+                        diretorio=diretorio_catalogo
+                    )
+
+            manifesto["duracao"] = round(time.time() - inicio, 3)
+            manifesto["total_linhas"] = sum(t["linhas"] for t in manifesto["tabelas"])
+            zipf.writestr(MANIFESTO, json.dumps(manifesto, indent=2, ensure_ascii=False),
+                          zipfile.ZIP_DEFLATED)
+
+        reaproveitadas = sum(1 for t in manifesto["tabelas"] if t["reaproveitado"])
+        registrar_no_catalogo(caminho_zip, {
+            "banco": banco_nome,
+            "tipo": tipo,
+            "formato": "snapshot",
+            "criado_em": manifesto["criado_em"],
+            "duracao": manifesto["duracao"],
+            "tabelas": checksums,
+            "objetos": [t["objeto"] for t in manifesto["tabelas"] if not t["arquivo"]],
+            "reaproveitadas": reaproveitadas,
+        }, diretorio_catalogo)
+
+        _avisar(ao_progredir, "Backup concluído", 1.0)
+        tamanho_mb = os.path.getsize(caminho_zip) / (1024 * 1024)
+        mensagem = (f"✅ Snapshot de '{banco_nome}' criado: {len(tabelas)} tabelas, "
+                    f"{manifesto['total_linhas']:,} linhas em {manifesto['duracao']:.1f}s")
+        if reaproveitadas:
+            mensagem += f" ({reaproveitadas} sem alterações, reaproveitadas)"
+        return {
+            "sucesso": True,
+            "arquivo": caminho_zip,
+            "tamanho_mb": round(tamanho_mb, 2),
+            "mensagem": mensagem,
+            "manifesto": manifesto
+        }
+
+    except Exception as e:
+        return {
+            "sucesso": False,
+            "mensagem": f"❌ Erro no snapshot colunar: {e}"
+        }
+
+
+def snapshot_autonomo(caminho, diretorio_catalogo=DIRETORIO_PADRAO):
+    """
+    Para download/cópia: um snapshot deduplicado depende de backups/objetos.
+    Gera num arquivo temporário um zip com os Parquet embutidos.
+    Snapshots que já são autônomos (e .sql/.zip comuns) voltam sem cópia.
+    """
+    if not eh_snapshot(caminho):
+        return caminho
+    manifesto = ler_manifesto(caminho)
+    if all(t.get("arquivo") for t in manifesto["tabelas"]):
+        return caminho
+
+    descritor, destino = tempfile.mkstemp(prefix="snapshot_autonomo_", suffix=SUFIXO_SNAPSHOT)
+    os.close(descritor)
+    try:
+        with zipfile.ZipFile(caminho) as origem, \
+                zipfile.ZipFile(destino, "w", zipfile.ZIP_STORED) as zipf:
+            zipf.writestr("schema.sql", origem.read("schema.sql"), zipfile.ZIP_DEFLATED)
+            for tabela in manifesto["tabelas"]:
+                if tabela.get("arquivo"):
+                    with origem.open(tabela["arquivo"]) as membro, \
+                            zipf.open(tabela["arquivo"], "w") as saida:
+                        shutil.copyfileobj(membro, saida, 1024 * 1024)
+                else:
+                    tabela["arquivo"] = f"{PASTA_DADOS}/{tabela['nome']}.parquet"
+                    zipf.write(caminho_objeto(tabela["objeto"], diretorio_catalogo),
+                               tabela["arquivo"], zipfile.ZIP_STORED)
+            manifesto["deduplicado"] = False
+            zipf.writestr(MANIFESTO, json.dumps(manifesto, indent=2, ensure_ascii=False),
+                          zipfile.ZIP_DEFLATED)
+    except Exception:
+        os.remove(destino)
+        raise
+    return destino
+
+
+# ============ RESTORE ============
+def _escapar_tsv(valor):
+    """Valor -> bytes no formato padrão do LOAD DATA (tab, \\N para NULL)"""
+    if valor is None:
+        return b"\\N"
+    if isinstance(valor, bool):
+        dados = b"1" if valor else b"0"
+    elif isinstance(valor, (bytes, bytearray)):
+        dados = bytes(valor)
+    elif isinstance(valor, timedelta):
+        micros = valor // timedelta(microseconds=1)
+        sinal = "-" if micros < 0 else ""
+        segundos, micros = divmod(abs(micros), 1_000_000)
+        horas, resto = divmod(segundos, 3600)
+        minutos, segundos = divmod(resto, 60)
+        dados = f"{sinal}{horas}:{minutos:02d}:{segundos:02d}.{micros:06d}".encode()
+    elif isinstance(valor, datetime):
+        dados = valor.strftime("%Y-%m-%d %H:%M:%S.%f").encode()
+    elif isinstance(valor, (date, Decimal, int, float)):
+        dados = str(valor).encode()
+    else:
+        dados = str(valor).encode("utf-8")
+    return (dados.replace(b"\\", b"\\\\").replace(b"\t", b"\\t")
+            .replace(b"\n", b"\\n").replace(b"\0", b"\\0"))
+
+
+def _carregar_load_data(conexao, tabela, schema, lotes, pasta_temp):
+    """
+    Converte os lotes num TSV temporário e carrega com LOAD DATA LOCAL INFILE.
+    Colunas BIT passam por variável: o texto "5" iria como bytes ASCII para o
+    campo, então o valor é convertido com CAST(... AS UNSIGNED) no SET.
+    """
+    caminho_tsv = os.path.join(pasta_temp, "carga.tsv")
+    linhas = 0
+    with open(caminho_tsv, "wb") as tsv:
+        for lote in lotes:
+            colunas_lote = [coluna.to_pylist() for coluna in lote.columns]
+            for linha in zip(*colunas_lote):
+                tsv.write(b"\t".join(_escapar_tsv(v) for v in linha) + b"\n")
+                linhas += 1
+
+    bits = [indice for indice, campo in enumerate(schema)
+            if tipo_mysql_campo(campo).lower().startswith("bit")]
+    lista_colunas = ", ".join(f"@bit_{i}" if i in bits else f"`{campo.name}`"
+                              for i, campo in enumerate(schema))
+    atribuicoes = ", ".join(f"`{schema[i].name}` = CAST(@bit_{i} AS UNSIGNED)" for i in bits)
+    cursor = conexao.cursor()
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE `{tabela}` CHARACTER SET binary "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({lista_colunas})" + (f" SET {atribuicoes}" if atribuicoes else ""),
+            (caminho_tsv,)
+        )
+        conexao.commit()
+    finally:
+        cursor.close()
+        os.remove(caminho_tsv)
+    return linhas
+
+
+def _carregar_tabela(conexao, tabela, caminho_parquet, metodo, pasta_temp):
+    """Carrega um Parquet na tabela; retorna (linhas, método efetivamente usado)"""
+    schema, lotes, _ = abrir_colunar(caminho_parquet)
+    if metodo == "LOAD DATA":
+        try:
+            return _carregar_load_data(conexao, tabela, schema, lotes, pasta_temp), metodo
+        except Exception as e:
+            if getattr(e, "errno", None) not in ERROS_LOCAL_INFILE:
+                raise
+            # local_infile desligado: segue com INSERTs em lote
+            schema, lotes, _ = abrir_colunar(caminho_parquet)
+    return inserir_lotes(conexao, tabela, schema, lotes), "executemany"
+
+
+def restaurar_snapshot(arquivo_backup, banco_destino, usar_load_data=True, ao_progredir=None,
+                       diretorio_catalogo=DIRETORIO_PADRAO):
+    """
+    Restaura um snapshot colunar em banco_destino (tabelas existentes são recriadas).
+    Confere o sha256 de cada membro (ou objeto deduplicado) antes de carregar.
+    Retorna {"sucesso", "mensagem", "linhas", "metodo"}.
+    """
+    try:
+        importar_pyarrow()
+        inicio = time.time()
+        manifesto = ler_manifesto(arquivo_backup)
+        if manifesto.get("formato") != FORMATO_SNAPSHOT:
+            return {"sucesso": False, "mensagem": "❌ Arquivo não é um snapshot colunar"}
+
+        conexao = conectar()
+        cursor = conexao.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{banco_destino}`")
+        cursor.close()
+        conexao.close()
+
+        conexao = conectar(banco_destino, allow_local_infile=usar_load_data)
+        cursor = conexao.cursor()
+        cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+        cursor.execute("SET UNIQUE_CHECKS=0")
+
+        tabelas = manifesto["tabelas"]
+        for tabela in tabelas:
+            cursor.execute(f"DROP TABLE IF EXISTS `{tabela['nome']}`")
+            cursor.execute(tabela["ddl"])
+        cursor.close()
+
+        metodo = "LOAD DATA" if usar_load_data else "executemany"
+        total = 0
+        with zipfile.ZipFile(arquivo_backup) as zipf, \
+                tempfile.TemporaryDirectory(prefix="restore_") as pasta_temp:
+            for indice, tabela in enumerate(tabelas):
+                _avisar(ao_progredir, f"Restaurando {tabela['nome']} ({indice + 1}/{len(tabelas)})",
+                        indice / max(len(tabelas), 1))
+
+                if tabela.get("arquivo"):
+                    caminho_parquet = zipf.extract(tabela["arquivo"], pasta_temp)
+                else:
+                    # Objeto do armazém: lido no lugar, sem cópia
+                    caminho_parquet = caminho_objeto(tabela["objeto"], diretorio_catalogo)
+                    if not os.path.exists(caminho_parquet):
+                        raise FileNotFoundError(
+                            f"objeto da tabela '{tabela['nome']}' não está em {diretorio_catalogo}")
+                if sha256_arquivo(caminho_parquet) != tabela["sha256"]:
+                    raise ValueError(f"checksum inválido para a tabela '{tabela['nome']}'")
+
+                linhas, metodo = _carregar_tabela(conexao, tabela["nome"], caminho_parquet,
+                                                  metodo, pasta_temp)
+                total += linhas
+                if tabela.get("arquivo"):
+                    os.remove(caminho_parquet)
+
+        cursor = conexao.cursor()
+        cursor.execute("SET UNIQUE_CHECKS=1")
+        cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+        cursor.close()
+        conexao.close()
+
+        _avisar(ao_progredir, "Restore concluído", 1.0)
+        return {
+            "sucesso": True,
+            "linhas": total,
+            "metodo": metodo,
+            "mensagem": (f"✅ Banco '{banco_destino}' restaurado do snapshot: {len(tabelas)} tabelas, "
+                         f"{total:,} linhas via {metodo} em {time.time() - inicio:.1f}s")
+        }
+
+    except Exception as e:
+        return {
+            "sucesso": False,
+            "mensagem": f"❌ Erro no restore do snapshot: {e}"
+        }
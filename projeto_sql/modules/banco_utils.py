@@ -4,16 +4,12 @@ Utilitários para gerenciamento de banco de dados
 SEM dependências circulares
 """
 import streamlit as st
-import mysql.connector
+from .conexao_resiliente import conectar
 
 def listar_bancos():
     """Lista todos os bancos disponíveis"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         cursor = conexao.cursor()
         cursor.execute("SHOW DATABASES")
         bancos = [b[0] for b in cursor.fetchall()]
@@ -0,0 +1,139 @@
+# modules/busca_indexada.py
+"""
+Busca guiada pelos índices da coluna
+- exato / intervalo: '=' e BETWEEN, que usam qualquer índice B-tree da coluna
+- prefixo: LIKE 'termo%' (usa o índice B-tree em colunas de texto)
+- texto: MATCH ... AGAINST quando há índice FULLTEXT
+- contém: LIKE '%termo%' só como último recurso: não usa índice e varre
+  a tabela, por isso vem com a estimativa de linhas lidas do EXPLAIN
+As consultas passam pelo cache de comandos preparados.
+"""
+from .comandos_preparados import consultar_dataframe_preparado, montar_sql
+
+TIPOS_TEXTO = {"char", "varchar", "tinytext", "text", "mediumtext", "longtext", "enum", "set"}
+
+ROTULOS_MODO = {
+    "exato": "🎯 Valor exato",
+    "intervalo": "↔️ Intervalo",
+    "prefixo": "🔤 Começa com",
+    "texto": "📚 Texto completo (FULLTEXT)",
+    "contem": "🐢 Contém (sem índice)",
+}
+
+# modo -> operação do cache de comandos preparados
+_OPERACOES = {
+    "exato": "buscar_igual",
+    "intervalo": "buscar_intervalo",
+    "prefixo": "buscar_like",
+    "contem": "buscar_like",
+    "texto": "buscar_texto",
+}
+
+
+def perfil_coluna(conexao, banco, tabela, coluna):
+    """
+    {"coluna", "tipo", "texto": bool, "indice": nome do índice B-tree que começa
+     pela coluna (PRIMARY preferido) ou None, "unico": bool,
+     "fulltext": colunas do índice FULLTEXT com a coluna ou None}
+    """
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT DATA_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (banco, tabela, coluna))
+    linha = cursor.fetchone()
+    tipo = (linha[0] if linha else "").lower()
+
+    cursor.execute("""
+        SELECT INDEX_NAME, COLUMN_NAME, SEQ_IN_INDEX, NON_UNIQUE, INDEX_TYPE
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME = 'PRIMARY' DESC, NON_UNIQUE, INDEX_NAME, SEQ_IN_INDEX
+    """, (banco, tabela))
+    indices = {}
+    for nome, col, seq, nao_unico, tipo_indice in cursor.fetchall():
+        indice = indices.setdefault(nome, {"colunas": [], "unico": not nao_unico, "tipo": tipo_indice})
+        indice["colunas"].append(col)
+    cursor.close()
+
+    perfil = {"coluna": coluna, "tipo": tipo, "texto": tipo in TIPOS_TEXTO,
+              "indice": None, "unico": False, "fulltext": None}
+    for nome, indice in indices.items():
+        if indice["tipo"] == "FULLTEXT":
+            if coluna in indice["colunas"] and perfil["fulltext"] is None:
+                perfil["fulltext"] = indice["colunas"]
+        elif indice["colunas"][0] == coluna and perfil["indice"] is None:
+            # Só a primeira coluna do índice serve para '=', BETWEEN e prefixo
+            perfil["indice"] = nome
+            perfil["unico"] = indice["unico"] and len(indice["colunas"]) == 1
+    return perfil
+
+
+def modos_busca(perfil):
+    """Modos aplicáveis à coluna, do mais barato para o mais caro"""
+    modos = []
+    if perfil["fulltext"]:
+        modos.append("texto")
+    modos.append("exato")
+    if perfil["indice"]:
+        # Prefixo e intervalo só compensam com índice; sem ele seriam varreduras como o "contém"
+        if perfil["texto"]:
+            modos.append("prefixo")
+        modos.append("intervalo")
+    modos.append("contem")
+    return modos
+
+
+def descrever_perfil(perfil):
+    """Texto curto sobre os índices da coluna"""
+    partes = []
+    if perfil["indice"]:
+        tipo = "único" if perfil["unico"] else "B-tree"
+        partes.append(f"🔑 índice {tipo} `{perfil['indice']}`")
+    if perfil["fulltext"]:
+        partes.append(f"📚 FULLTEXT ({', '.join(perfil['fulltext'])})")
+    if not partes:
+        return "⚠️ coluna sem índice: toda busca nela varre a tabela"
+    return " · ".join(partes)
+
+
+def _escapar_like(termo):
+    return termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def parametros_busca(perfil, modo, termo, termo_fim=None):
+    """(operação, colunas, valores) para o cache de comandos preparados"""
+    coluna = perfil["coluna"]
+    if modo == "exato":
+        return _OPERACOES[modo], (coluna,), (termo,)
+    if modo == "intervalo":
+        return _OPERACOES[modo], (coluna,), (termo, termo_fim)
+    if modo == "prefixo":
+        return _OPERACOES[modo], (coluna,), (f"{_escapar_like(termo)}%",)
+    if modo == "texto":
+        return _OPERACOES[modo], tuple(perfil["fulltext"]), (termo,)
+    return _OPERACOES["contem"], (coluna,), (f"%{_escapar_like(termo)}%",)
+
+
+def estimar_busca(conexao, banco, tabela, perfil, modo, termo, termo_fim=None):
+    """
+    EXPLAIN da busca: {"linhas": estimativa de linhas lidas, "acesso": type do
+    EXPLAIN ('ALL' = varredura completa), "indice": índice usado ou None}
+    """
+    operacao, colunas, valores = parametros_busca(perfil, modo, termo, termo_fim)
+    cursor = conexao.cursor()
+    cursor.execute("EXPLAIN " + montar_sql(operacao, banco, tabela, colunas), valores)
+    plano = cursor.fetchone()
+    nomes = list(cursor.column_names)
+    cursor.fetchall()
+    cursor.close()
+    if not plano:
+        return {"linhas": None, "acesso": None, "indice": None}
+    plano = dict(zip(nomes, plano))
+    return {"linhas": plano.get("rows"), "acesso": plano.get("type"), "indice": plano.get("key")}
+
+
+def executar_busca(conexao, banco, tabela, perfil, modo, termo, termo_fim=None):
+    """DataFrame tipado com até 100 registros"""
+    operacao, colunas, valores = parametros_busca(perfil, modo, termo, termo_fim)
+    return consultar_dataframe_preparado(conexao, banco, tabela, operacao, colunas, valores)
@@ -0,0 +1,393 @@
+# modules/colunar.py
+"""
+Formatos colunares: Parquet e Arrow IPC
+- Tipos Arrow derivados do DESCRIBE (o tipo MySQL original vai nos metadados
+  de cada coluna, para a importação recriar a tabela igual)
+- Escrita em grupos de linhas a partir de um cursor não bufferizado
+- Importação de Parquet/Arrow com INSERTs em lote (executemany)
+O pyarrow é opcional: sem ele as funções levantam ImportError com a instrução.
+"""
+import re
+import time
+
+import streamlit as st
+
+from .conexao_resiliente import conectar
+from .tabela_utils import converter_tipo_access_para_mysql
+
+LINHAS_POR_GRUPO = 65_536       # linhas por row group / record batch
+LOTE_INSERCAO = 5000            # linhas por executemany na importação
+COMPRESSAO = "zstd"
+
+# formato -> (extensão, mime)
+FORMATOS_COLUNARES = {
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+_CHAVE_TIPO_MYSQL = b"mysql_type"
+
+# Tipos de cursor.description (FieldType) -> nome de tipo MySQL
+_TIPOS_CURSOR = {
+    "TINY": "tinyint", "SHORT": "smallint", "INT24": "mediumint", "LONG": "int",
+    "LONGLONG": "bigint", "FLOAT": "float", "DOUBLE": "double",
+    "DECIMAL": "decimal(65,30)", "NEWDECIMAL": "decimal(65,30)",
+    "DATE": "date", "NEWDATE": "date", "DATETIME": "datetime", "TIMESTAMP": "timestamp",
+    "TIME": "time", "YEAR": "year", "BIT": "bit", "JSON": "json",
+    "ENUM": "varchar", "SET": "varchar",
+    "VARCHAR": "varchar", "VAR_STRING": "varchar", "STRING": "char",
+    "TINY_BLOB": "blob", "MEDIUM_BLOB": "blob", "LONG_BLOB": "blob", "BLOB": "blob",
+    "GEOMETRY": "blob",
+}
+_FAMILIA_TEXTO_BINARIO = {"varchar", "char", "blob"}
+
+
+def importar_pyarrow():
+    """Importa pyarrow sob demanda (dependência opcional)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401 (registra pyarrow.parquet)
+        import pyarrow.ipc      # noqa: F401
+        return pyarrow
+    except ImportError:
+        raise ImportError("Formatos Parquet/Arrow exigem o pyarrow: pip install pyarrow")
+
+
+def pyarrow_disponivel():
+    try:
+        importar_pyarrow()
+        return True
+    except ImportError:
+        return False
+
+
+# ============ MAPEAMENTO DE TIPOS ============
+def tipo_arrow(tipo_mysql):
+    """Converte um tipo do DESCRIBE (ex: 'int(10) unsigned', 'decimal(10,2)') em tipo Arrow"""
+    pa = importar_pyarrow()
+    tipo = tipo_mysql.lower().strip()
+    nome_base = re.match(r"[a-z]+", tipo)
+    base = nome_base.group(0) if nome_base else tipo
+    argumentos = re.search(r"\(([^)]*)\)", tipo)
+    sem_sinal = "unsigned" in tipo
+
+    inteiros = {
+        "tinyint": (pa.int8(), pa.uint8()),
+        "smallint": (pa.int16(), pa.uint16()),
+        "mediumint": (pa.int32(), pa.uint32()),
+        "int": (pa.int32(), pa.uint32()),
+        "integer": (pa.int32(), pa.uint32()),
+        "bigint": (pa.int64(), pa.uint64()),
+    }
+    if base in inteiros:
+        return inteiros[base][1 if sem_sinal else 0]
+    if base in ("bool", "boolean"):
+        return pa.bool_()
+    if base == "bit":
+        return pa.int64()
+    if base == "year":
+        return pa.int16()
+    if base == "float":
+        return pa.float32()
+    if base in ("double", "real"):
+        return pa.float64()
+    if base in ("decimal", "numeric", "dec", "fixed"):
+        precisao, escala = 10, 0
+        if argumentos:
+            partes = [int(p) for p in argumentos.group(1).split(",") if p.strip()]
+            precisao = partes[0]
+            escala = partes[1] if len(partes) > 1 else 0
+        return pa.decimal128(precisao, escala) if precisao <= 38 else pa.decimal256(precisao, escala)
+    if base == "date":
+        return pa.date32()
+    if base in ("datetime", "timestamp"):
+        return pa.timestamp("us")
+    if base == "time":
+        return pa.duration("us")
+    if base in ("binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob",
+                "geometry", "point", "linestring", "polygon"):
+        return pa.binary()
+    # char, varchar, text, enum, set, json...
+    return pa.string()
+
+
+def tipo_mysql(tipo):
+    """
+    Tipo MySQL para uma coluna Arrow sem metadados (arquivo de outra origem).
+    Usa as equivalências Access -> MySQL de tabela_utils quando existem.
+    """
+    pa = importar_pyarrow()
+    t = pa.types
+    if t.is_boolean(tipo):
+        return converter_tipo_access_para_mysql("Sim/Não")
+    if t.is_int8(tipo) or t.is_uint8(tipo):
+        return "TINYINT" + (" UNSIGNED" if t.is_uint8(tipo) else "")
+    if t.is_int16(tipo) or t.is_uint16(tipo):
+        return "SMALLINT" + (" UNSIGNED" if t.is_uint16(tipo) else "")
+    if t.is_int32(tipo) or t.is_uint32(tipo):
+        return converter_tipo_access_para_mysql("Número") + (" UNSIGNED" if t.is_uint32(tipo) else "")
+    if t.is_integer(tipo):
+        return "BIGINT" + (" UNSIGNED" if t.is_uint64(tipo) else "")
+    if t.is_float32(tipo):
+        return "FLOAT"
+    if t.is_floating(tipo):
+        return "DOUBLE"
+    if t.is_decimal(tipo):
+        return f"DECIMAL({min(tipo.precision, 65)},{min(tipo.scale, 30)})"
+    if t.is_date(tipo):
+        return "DATE"
+    if t.is_timestamp(tipo):
+        return converter_tipo_access_para_mysql("Data/Hora")
+    if t.is_duration(tipo) or t.is_time(tipo):
+        return "TIME"
+    if t.is_binary(tipo) or t.is_large_binary(tipo) or t.is_fixed_size_binary(tipo):
+        return converter_tipo_access_para_mysql("Anexo")
+    # Texto de tamanho desconhecido: TEXT evita truncar
+    return converter_tipo_access_para_mysql("Memorando")
+
+
+def _campo(pa, nome, tipo_sql, nulo=True):
+    return pa.field(nome, tipo_arrow(tipo_sql), nullable=nulo,
+                    metadata={_CHAVE_TIPO_MYSQL: tipo_sql.encode("utf-8")})
+
+
+def schema_da_tabela(conexao, tabela, ignorar_geradas=False):
+    """
+    Schema Arrow a partir do DESCRIBE da tabela
+    ignorar_geradas: omite colunas GENERATED (não aceitam INSERT)
+    """
+    pa = importar_pyarrow()
+    cursor = conexao.cursor()
+    cursor.execute(f"DESCRIBE `{tabela}`")
+    estrutura = cursor.fetchall()
+    cursor.close()
+
+    campos = []
+    for coluna in estrutura:
+        if ignorar_geradas and "GENERATED" in str(coluna[5]).upper():
+            continue
+        tipo_sql = coluna[1].decode() if isinstance(coluna[1], (bytes, bytearray)) else coluna[1]
+        campos.append(_campo(pa, coluna[0], tipo_sql, coluna[2] == "YES"))
+    return pa.schema(campos, metadata={b"tabela": tabela.encode("utf-8")})
+
+
+def schema_do_cursor(cursor, primeiras_linhas):
+    """
+    Schema Arrow para o resultado de uma consulta qualquer.
+    Texto vs binário é decidido pelo primeiro valor não nulo da coluna.
+    """
+    pa = importar_pyarrow()
+    from mysql.connector import FieldType
+
+    campos = []
+    for indice, descricao in enumerate(cursor.description):
+        tipo_sql = _TIPOS_CURSOR.get(FieldType.get_info(descricao[1]), "varchar")
+        if tipo_sql in _FAMILIA_TEXTO_BINARIO:
+            exemplo = next((l[indice] for l in primeiras_linhas if l[indice] is not None), None)
+            tipo_sql = "blob" if isinstance(exemplo, (bytes, bytearray)) else "text"
+        campos.append(_campo(pa, descricao[0], tipo_sql))
+    return pa.schema(campos)
+
+
+# ============ CONVERSÃO DE LOTES ============
+def _normalizar(valor, tipo, pa):
+    """Ajusta valores do conector ao tipo Arrow da coluna"""
+    if valor is None:
+        return None
+    if isinstance(valor, set):
+        valor = ",".join(sorted(valor))
+    if pa.types.is_string(tipo) and isinstance(valor, (bytes, bytearray)):
+        return valor.decode("utf-8", errors="replace")
+    if pa.types.is_binary(tipo) and isinstance(valor, str):
+        return valor.encode("utf-8")
+    if pa.types.is_binary(tipo) and isinstance(valor, bytearray):
+        return bytes(valor)
+    return valor
+
+
+def lote_para_arrow(linhas, schema):
+    """Lista de tuplas -> RecordBatch (coluna a coluna)"""
+    pa = importar_pyarrow()
+    colunas = list(zip(*linhas)) if linhas else [[] for _ in schema]
+    arrays = [
+        pa.array([_normalizar(v, campo.type, pa) for v in valores], type=campo.type)
+        for valores, campo in zip(colunas, schema)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# ============ ESCRITA ============
+def escrever_colunar(cursor, caminho, formato="Parquet", schema=None, ao_progredir=None):
+    """
+    Lê o cursor em grupos de LINHAS_POR_GRUPO e grava Parquet ou Arrow IPC.
+    Sem schema, ele é deduzido do cursor. Retorna o total de linhas.
+    """
+    pa = importar_pyarrow()
+    linhas = cursor.fetchmany(LINHAS_POR_GRUPO)
+    if schema is None:
+        schema = schema_do_cursor(cursor, linhas)
+
+    if formato == "Parquet":
+        escritor = pa.parquet.ParquetWriter(caminho, schema, compression=COMPRESSAO)
+        gravar = escritor.write_batch
+    else:
+        opcoes = pa.ipc.IpcWriteOptions(compression=COMPRESSAO)
+        escritor = pa.ipc.new_file(caminho, schema, options=opcoes)
+        gravar = escritor.write_batch
+
+    total = 0
+    try:
+        while linhas:
+            gravar(lote_para_arrow(linhas, schema))
+            total += len(linhas)
+            if ao_progredir:
+                ao_progredir(total)
+            linhas = cursor.fetchmany(LINHAS_POR_GRUPO)
+    finally:
+        escritor.close()
+    return total
+
+
+# ============ LEITURA / IMPORTAÇÃO ============
+def abrir_colunar(arquivo):
+    """
+    Abre Parquet ou Arrow IPC (caminho ou arquivo enviado).
+    Retorna (schema, iterador de RecordBatch, total de linhas).
+    """
+    pa = importar_pyarrow()
+    nome = getattr(arquivo, "name", str(arquivo)).lower()
+
+    if nome.endswith((".arrow", ".feather", ".ipc")):
+        leitor = pa.ipc.open_file(arquivo)
+        lotes = (leitor.get_batch(i) for i in range(leitor.num_record_batches))
+        total = sum(leitor.get_batch(i).num_rows for i in range(leitor.num_record_batches))
+        return leitor.schema, lotes, total
+
+    parquet = pa.parquet.ParquetFile(arquivo)
+    return (parquet.schema_arrow,
+            parquet.iter_batches(batch_size=LOTE_INSERCAO),
+            parquet.metadata.num_rows)
+
+
+def tipo_mysql_campo(campo):
+    """Tipo MySQL de um campo: o original gravado nos metadados, senão o equivalente do tipo Arrow"""
+    metadados = campo.metadata or {}
+    if _CHAVE_TIPO_MYSQL in metadados:
+        return metadados[_CHAVE_TIPO_MYSQL].decode("utf-8")
+    return tipo_mysql(campo.type)
+
+
+def ddl_criar_tabela(tabela, schema):
+    """CREATE TABLE a partir do schema (usa o tipo MySQL original quando gravado)"""
+    definicoes = []
+    for campo in schema:
+        nulo = "" if campo.nullable else " NOT NULL"
+        definicoes.append(f"`{campo.name}` {tipo_mysql_campo(campo)}{nulo}")
+    return f"CREATE TABLE IF NOT EXISTS `{tabela}` (\n    " + ",\n    ".join(definicoes) + "\n)"
+
+
+def inserir_lotes(conexao, tabela, schema, lotes, ao_progredir=None):
+    """
+    INSERT em lote (executemany) de RecordBatches numa tabela existente,
+    com commit a cada lote. Retorna o total de linhas.
+    """
+    colunas = [campo.name for campo in schema]
+    sql_insert = (
+        f"INSERT INTO `{tabela}` ({', '.join(f'`{c}`' for c in colunas)}) "
+        f"VALUES ({', '.join(['%s'] * len(colunas))})"
+    )
+
+    total = 0
+    cursor = conexao.cursor()
+    try:
+        for lote in lotes:
+            valores = list(zip(*(coluna.to_pylist() for coluna in lote.columns)))
+            if not valores:
+                continue
+            cursor.executemany(sql_insert, valores)
+            conexao.commit()
+            total += len(valores)
+            if ao_progredir:
+                ao_progredir(total)
+    finally:
+        cursor.close()
+    return total
+
+
+def importar_colunar(arquivo, banco, tabela, criar_tabela=True, ao_progredir=None):
+    """
+    Carrega um arquivo Parquet/Arrow numa tabela com executemany em lotes.
+    Retorna {"linhas", "duracao", "criada"}.
+    """
+    schema, lotes, _ = abrir_colunar(arquivo)
+
+    inicio = time.time()
+    conexao = conectar(banco)
+    criada = False
+    try:
+        if criar_tabela:
+            cursor = conexao.cursor()
+            cursor.execute("SHOW TABLES LIKE %s", (tabela,))
+            if not cursor.fetchall():
+                cursor.execute(ddl_criar_tabela(tabela, schema))
+                criada = True
+            cursor.close()
+
+        total = inserir_lotes(conexao, tabela, schema, lotes, ao_progredir)
+    except Exception:
+        conexao.rollback()
+        raise
+    finally:
+        conexao.close()
+
+    return {"linhas": total, "duracao": time.time() - inicio, "criada": criada}
+
+
+# ============ COMPONENTE STREAMLIT ============
+def mostrar_importacao_colunar(banco, tabela_padrao="", chave="importar"):
+    """Upload de Parquet/Arrow e carga numa tabela (nova ou existente)"""
+    arquivo = st.file_uploader(
+        "Arquivo Parquet ou Arrow:",
+        type=["parquet", "arrow", "feather"],
+        key=f"{chave}_arquivo"
+    )
+    if not arquivo:
+        return
+
+    try:
+        schema, _, total_linhas = abrir_colunar(arquivo)
+    except ImportError as e:
+        st.error(f"⚠️ {e}")
+        return
+    except Exception as e:
+        st.error(f"❌ Arquivo inválido: {e}")
+        return
+
+    nome_sugerido = (schema.metadata or {}).get(b"tabela", b"").decode("utf-8") or tabela_padrao
+    st.caption(f"📦 {len(schema)} colunas • {total_linhas:,} linhas")
+
+    col_tabela, col_criar = st.columns([2, 1])
+    with col_tabela:
+        tabela = st.text_input("Tabela de destino:", value=nome_sugerido, key=f"{chave}_tabela")
+    with col_criar:
+        criar = st.checkbox("Criar se não existir", value=True, key=f"{chave}_criar")
+
+    with st.expander("🔍 DDL gerado"):
+        st.code(ddl_criar_tabela(tabela or "tabela", schema), language="sql")
+
+    if st.button("📥 Importar", type="primary", key=f"{chave}_importar", disabled=not tabela):
+        progresso = st.empty()
+        try:
+            arquivo.seek(0)
+            resultado = importar_colunar(
+                arquivo, banco, tabela, criar,
+                ao_progredir=lambda n: progresso.caption(f"⏳ {n:,} de {total_linhas:,} linhas...")
+            )
+            progresso.empty()
+            st.success(
+                f"✅ {resultado['linhas']:,} linhas importadas em '{tabela}' "
+                f"({resultado['duracao']:.1f}s){' — tabela criada' if resultado['criada'] else ''}"
+            )
+        except Exception as e:
+            progresso.empty()
+            st.error(f"❌ Erro na importação: {e}")
@@ -0,0 +1,176 @@
+# modules/comandos_preparados.py
+"""
+Cache de comandos preparados para as operações repetitivas dos formulários
+- Chave: (banco, tabela, operação, colunas) -> cursor prepared=True cujo
+  comando já foi analisado e planejado no servidor; repetir a operação
+  (inclusive em outro rerun) só envia os valores, pelo protocolo binário
+- O cache acompanha a conexão da sessão (obter_conexao_sessao): se ela for
+  refeita (connection_id novo) os comandos antigos são descartados
+- Número de comandos por conexão limitado (LRU): cada um ocupa um
+  statement no servidor
+"""
+import threading
+import weakref
+from collections import OrderedDict
+
+import mysql.connector
+
+MAXIMO_COMANDOS = 32        # por conexão
+
+# conexão -> {"connection_id": int, "comandos": OrderedDict(chave -> (cursor, sql))}
+_caches = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_metricas = {
+    "preparados": 0,
+    "reaproveitados": 0,
+    "descartados": 0,
+}
+
+
+def _contar(metrica, quantidade=1):
+    with _lock:
+        _metricas[metrica] += quantidade
+
+
+def metricas_preparados():
+    """Cópia das métricas acumuladas no processo"""
+    with _lock:
+        return dict(_metricas)
+
+
+# ============ SQL DAS OPERAÇÕES ============
+def montar_sql(operacao, banco, tabela, colunas=()):
+    """
+    SQL parametrizado de cada operação:
+        inserir        colunas = campos do INSERT
+        atualizar      colunas = campos do SET + coluna chave (última)
+        excluir        colunas = (coluna chave,)
+        buscar_chave   colunas = (coluna chave,)
+        buscar_like    colunas = campos comparados com LIKE (AND), até 100 linhas
+        buscar_igual   colunas = (coluna,), até 100 linhas
+        buscar_intervalo colunas = (coluna,); parâmetros = início, fim (BETWEEN)
+        buscar_texto   colunas = colunas do índice FULLTEXT (MATCH ... AGAINST)
+        primeiros      sem colunas; parâmetro = LIMIT
+    """
+    alvo = f"`{banco}`.`{tabela}`"
+    if operacao == "inserir":
+        campos = ", ".join(f"`{c}`" for c in colunas)
+        return f"INSERT INTO {alvo} ({campos}) VALUES ({', '.join(['%s'] * len(colunas))})"
+    if operacao == "atualizar":
+        *campos, chave = colunas
+        atribuicoes = ", ".join(f"`{c}` = %s" for c in campos)
+        return f"UPDATE {alvo} SET {atribuicoes} WHERE `{chave}` = %s"
+    if operacao == "excluir":
+        return f"DELETE FROM {alvo} WHERE `{colunas[0]}` = %s"
+    if operacao == "buscar_chave":
+        return f"SELECT * FROM {alvo} WHERE `{colunas[0]}` = %s"
+    if operacao == "buscar_like":
+        condicoes = " AND ".join(f"`{c}` LIKE %s" for c in colunas)
+        return f"SELECT * FROM {alvo} WHERE {condicoes} LIMIT 100"
+    if operacao == "buscar_igual":
+        return f"SELECT * FROM {alvo} WHERE `{colunas[0]}` = %s LIMIT 100"
+    if operacao == "buscar_intervalo":
+        return f"SELECT * FROM {alvo} WHERE `{colunas[0]}` BETWEEN %s AND %s ORDER BY `{colunas[0]}` LIMIT 100"
+    if operacao == "buscar_texto":
+        campos = ", ".join(f"`{c}`" for c in colunas)
+        return f"SELECT * FROM {alvo} WHERE MATCH({campos}) AGAINST (%s IN BOOLEAN MODE) LIMIT 100"
+    if operacao == "primeiros":
+        return f"SELECT * FROM {alvo} LIMIT %s"
+    raise ValueError(f"operação desconhecida: {operacao}")
+
+
+# ============ CACHE POR CONEXÃO ============
+def _fechar(cursor):
+    try:
+        cursor.close()      # libera o statement no servidor
+    except Exception:
+        pass
+
+
+def _comandos_da_conexao(conexao):
+    """OrderedDict de comandos da conexão (zerado se ela foi reconectada)"""
+    connection_id = conexao.connection_id
+    descartados = 0
+    with _lock:
+        cache = _caches.get(conexao)
+        if cache is None or cache["connection_id"] != connection_id:
+            # Após reconnect() os statements antigos não existem mais no servidor
+            descartados = len(cache["comandos"]) if cache else 0
+            cache = {"connection_id": connection_id, "comandos": OrderedDict()}
+            _caches[conexao] = cache
+    if descartados:
+        _contar("descartados", descartados)
+    return cache["comandos"]
+
+
+def _obter_comando(conexao, banco, tabela, operacao, colunas):
+    chave = (banco, tabela, operacao, colunas)
+    comandos = _comandos_da_conexao(conexao)
+    if chave in comandos:
+        comandos.move_to_end(chave)
+        _contar("reaproveitados")
+        return comandos[chave]
+
+    comando = (conexao.cursor(prepared=True), montar_sql(operacao, banco, tabela, colunas))
+    comandos[chave] = comando
+    _contar("preparados")
+    while len(comandos) > MAXIMO_COMANDOS:
+        _, (antigo, _) = comandos.popitem(last=False)
+        _fechar(antigo)
+        _contar("descartados")
+    return comando
+
+
+def descartar_preparados(conexao, tabela=None):
+    """Fecha os comandos da conexão (só os de uma tabela, se indicada), ex: após DDL"""
+    with _lock:
+        cache = _caches.get(conexao)
+    if cache is None:
+        return
+    for chave in list(cache["comandos"]):
+        if tabela is None or chave[1] == tabela:
+            _fechar(cache["comandos"].pop(chave)[0])
+            _contar("descartados")
+
+
+def _executar(conexao, banco, tabela, operacao, colunas, valores):
+    colunas = tuple(colunas)
+    cursor, sql = _obter_comando(conexao, banco, tabela, operacao, colunas)
+    try:
+        # Mesmo objeto sql a cada execução: o cursor reconhece e não prepara de novo
+        cursor.execute(sql, tuple(valores))
+    except (mysql.connector.IntegrityError, mysql.connector.DataError):
+        # Erro nos valores (chave duplicada, valor inválido): o comando continua válido
+        raise
+    except mysql.connector.Error:
+        # Comando inválido (tabela alterada/removida, conexão caída): prepara de novo na próxima
+        comandos = _comandos_da_conexao(conexao)
+        if comandos.pop((banco, tabela, operacao, colunas), None) is not None:
+            _fechar(cursor)
+            _contar("descartados")
+        raise
+    return cursor
+
+
+# ============ API ============
+def executar_preparado(conexao, banco, tabela, operacao, colunas, valores):
+    """INSERT/UPDATE/DELETE preparado. Retorna (linhas afetadas, último id inserido)."""
+    cursor = _executar(conexao, banco, tabela, operacao, colunas, valores)
+    return cursor.rowcount, cursor.lastrowid
+
+
+def consultar_preparado(conexao, banco, tabela, operacao, colunas=(), valores=()):
+    """SELECT preparado. Retorna (linhas, nomes das colunas); lê tudo para liberar a conexão."""
+    cursor = _executar(conexao, banco, tabela, operacao, colunas, valores)
+    linhas = cursor.fetchall()
+    return linhas, list(cursor.column_names)
+
+
+def consultar_dataframe_preparado(conexao, banco, tabela, operacao, colunas=(), valores=()):
+    """SELECT preparado direto para o DataFrame tipado"""
+    # Import tardio: resultados traz pandas, e este módulo é carregado por
+    # conexao_resiliente (toda página) só pelas métricas
+    from .resultados import dataframe_do_cursor
+
+    cursor = _executar(conexao, banco, tabela, operacao, colunas, valores)
+    return dataframe_do_cursor(cursor, cursor.fetchall())
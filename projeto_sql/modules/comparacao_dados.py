@@ -0,0 +1,409 @@
+# modules/comparacao_dados.py
+"""
+Comparação de dados entre duas tabelas (ou entre as tabelas de mesmo nome
+de dois bancos) sem trazer as linhas para o Python
+- Cada bloco da chave vira uma linha só: COUNT(*) e BIT_XOR de um hash de 64
+  bits da linha (MD5 de todas as colunas + marcação de NULLs), calculados no
+  servidor
+- Blocos iguais são descartados; blocos divergentes são subdivididos até
+  ficarem pequenos, e só então as chaves + hash das linhas são lidas e
+  comparadas: o resultado são as linhas exatas que faltam ou diferem
+- As duas tabelas são lidas no mesmo snapshot consistente (mesma conexão)
+As funções de comparação não usam o Streamlit (o progresso é informado por
+callback); só a página, no fim do módulo, depende dele.
+"""
+import time
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from .conexao_resiliente import obter_conexao_sessao
+from .grade_virtual import condicao_keyset, obter_chave_navegacao
+
+TAMANHO_BLOCO_PADRAO = 10_000   # linhas por bloco na primeira passada
+DIVISOES = 8                    # sub-blocos de um bloco divergente
+LIMITE_FOLHA = 200              # abaixo disto as linhas do bloco são comparadas uma a uma
+MAXIMO_DIFERENCAS = 1000
+BANCOS_SISTEMA = ("information_schema", "mysql", "performance_schema", "sys")
+
+# Tipos de diferença
+SO_ORIGEM = "só na origem"
+SO_DESTINO = "só no destino"
+DIFERENTE = "diferente"
+
+
+# ============ METADADOS ============
+def _colunas(conexao, banco, tabela):
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+    return colunas
+
+
+def listar_tabelas(conexao, banco):
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT TABLE_NAME FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
+    """, (banco,))
+    tabelas = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+    return tabelas
+
+
+def expressao_hash(colunas):
+    """Hash de 64 bits da linha; ISNULL distingue NULL de '' e de 'NULL'"""
+    valores = ", ".join(f"`{c}`" for c in colunas)
+    nulos = ", ".join(f"ISNULL(`{c}`)" for c in colunas)
+    return f"CAST(CONV(LEFT(MD5(CONCAT_WS('#', {valores}, CONCAT({nulos}))), 16), 16, 10) AS UNSIGNED)"
+
+
+# ============ FAIXAS DA CHAVE ============
+def condicao_faixa(chave, inicio, fim):
+    """(inicio, fim] da chave; None = sem limite daquele lado. Retorna (sql, params)."""
+    partes = []
+    params = []
+    if inicio is not None:
+        condicao, valores = condicao_keyset(chave, inicio, ">")
+        partes.append(condicao)
+        params.extend(valores)
+    if fim is not None:
+        condicao, valores = condicao_keyset(chave, fim, ">")
+        partes.append(f"NOT {condicao}")
+        params.extend(valores)
+    return (" AND ".join(partes) or "1 = 1"), params
+
+
+class _Comparacao:
+    """Estado de uma comparação: as duas tabelas, a chave, o hash e os contadores"""
+
+    def __init__(self, conexao, origem, destino, chave, colunas):
+        self.conexao = conexao
+        self.cursor = conexao.cursor()
+        self.origem = f"`{origem[0]}`.`{origem[1]}`"
+        self.destino = f"`{destino[0]}`.`{destino[1]}`"
+        self.chave = chave
+        self.lista_chave = ", ".join(f"`{c}`" for c in chave)
+        self.hash = expressao_hash(colunas)
+        self.consultas = 0
+        self.blocos = 0
+
+    def _executar(self, sql, params):
+        self.consultas += 1
+        self.cursor.execute(sql, params)
+        return self.cursor.fetchall()
+
+    def resumo(self, alvo, inicio, fim):
+        """(linhas, checksum) da faixa, calculados no servidor"""
+        faixa, params = condicao_faixa(self.chave, inicio, fim)
+        linhas, checksum = self._executar(
+            f"SELECT COUNT(*), COALESCE(BIT_XOR({self.hash}), 0) FROM {alvo} WHERE {faixa}", params)[0]
+        return int(linhas), int(checksum)
+
+    def limites(self, alvo, inicio, fim, passo, maximo=None):
+        """Chaves a cada 'passo' linhas dentro da faixa (keyset: cada salto lê só 'passo' entradas)"""
+        limites = []
+        atual = inicio
+        while maximo is None or len(limites) < maximo:
+            faixa, params = condicao_faixa(self.chave, atual, fim)
+            linha = self._executar(f"SELECT {self.lista_chave} FROM {alvo} WHERE {faixa} "
+                                   f"ORDER BY {self.lista_chave} LIMIT 1 OFFSET {int(passo) - 1}", params)
+            if not linha:
+                break
+            atual = tuple(linha[0])
+            if fim is not None and atual == tuple(fim):
+                break
+            limites.append(atual)
+        return limites
+
+    def hashes(self, alvo, inicio, fim):
+        """{chave: hash} das linhas da faixa (só para faixas pequenas)"""
+        faixa, params = condicao_faixa(self.chave, inicio, fim)
+        n = len(self.chave)
+        return {tuple(linha[:n]): linha[n] for linha in
+                self._executar(f"SELECT {self.lista_chave}, {self.hash} FROM {alvo} WHERE {faixa}", params)}
+
+
+def _faixas(limites, inicio, fim):
+    """[(inicio, l1), (l1, l2), ..., (ln, fim)]"""
+    pontos = [inicio] + list(limites) + [fim]
+    return list(zip(pontos[:-1], pontos[1:]))
+
+
+# ============ COMPARAÇÃO ============
+def comparar_tabelas(conexao, origem, destino, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                     maximo_diferencas=MAXIMO_DIFERENCAS, ao_progredir=None):
+    """
+    origem, destino: (banco, tabela) no mesmo servidor.
+    Retorna {"sucesso", "mensagem", "diferencas": [{"tipo", "chave"}], "truncado",
+             "chave", "colunas", "colunas_ignoradas", "linhas_origem", "linhas_destino",
+             "blocos", "consultas", "duracao"}.
+    """
+    inicio_execucao = time.time()
+    chave = obter_chave_navegacao(conexao, *origem)
+    if not chave:
+        return {"sucesso": False, "mensagem": f"'{origem[1]}' não tem PRIMARY KEY nem UNIQUE NOT NULL"}
+    colunas_origem = _colunas(conexao, *origem)
+    colunas_destino = _colunas(conexao, *destino)
+    if not colunas_destino:
+        return {"sucesso": False, "mensagem": f"'{destino[0]}.{destino[1]}' não existe"}
+    faltando = [c for c in chave if c not in colunas_destino]
+    if faltando:
+        return {"sucesso": False, "mensagem": f"o destino não tem a(s) coluna(s) da chave: {', '.join(faltando)}"}
+    comuns = [c for c in colunas_origem if c in colunas_destino]
+    ignoradas = sorted(set(colunas_origem) ^ set(colunas_destino))
+
+    # As duas tabelas no mesmo instante: mudanças durante a comparação não geram falsos positivos
+    conexao.rollback()      # encerra a transação implícita das leituras de metadados
+    conexao.start_transaction(consistent_snapshot=True, readonly=True)
+    try:
+        comparacao = _Comparacao(conexao, origem, destino, chave, comuns)
+        diferencas = []
+        truncado = False
+
+        # Primeira passada: blocos pela chave da origem; a última faixa é aberta,
+        # então linhas do destino além da última chave da origem também entram
+        pendentes = [(inicio, fim, True) for inicio, fim in
+                     _faixas(comparacao.limites(comparacao.origem, None, None, tamanho_bloco), None, None)]
+        total_inicial = len(pendentes)
+        iniciais = 0
+        linhas_origem = linhas_destino = 0
+
+        while pendentes:
+            inicio, fim, inicial = pendentes.pop(0)
+            comparacao.blocos += 1
+            n_origem, soma_origem = comparacao.resumo(comparacao.origem, inicio, fim)
+            n_destino, soma_destino = comparacao.resumo(comparacao.destino, inicio, fim)
+            if inicial:
+                # Totais e progresso só pelos blocos da primeira passada (os sub-blocos repetiriam linhas)
+                iniciais += 1
+                linhas_origem += n_origem
+                linhas_destino += n_destino
+                if ao_progredir:
+                    ao_progredir(f"Bloco {iniciais}/{total_inicial}", iniciais / max(total_inicial, 1))
+            if (n_origem, soma_origem) == (n_destino, soma_destino):
+                continue
+
+            maior = max(n_origem, n_destino)
+            if maior > LIMITE_FOLHA:
+                # Subdivide pela tabela com mais linhas na faixa
+                alvo = comparacao.origem if n_origem >= n_destino else comparacao.destino
+                passo = -(-maior // DIVISOES)
+                limites = comparacao.limites(alvo, inicio, fim, passo, DIVISOES - 1)
+                if limites:
+                    # Sub-blocos divergentes antes dos próximos blocos da primeira passada
+                    pendentes[0:0] = [(a, b, False) for a, b in _faixas(limites, inicio, fim)]
+                    continue
+
+            hashes_origem = comparacao.hashes(comparacao.origem, inicio, fim)
+            hashes_destino = comparacao.hashes(comparacao.destino, inicio, fim)
+            for valor in sorted(hashes_origem.keys() | hashes_destino.keys()):
+                if valor not in hashes_destino:
+                    tipo = SO_ORIGEM
+                elif valor not in hashes_origem:
+                    tipo = SO_DESTINO
+                elif hashes_origem[valor] != hashes_destino[valor]:
+                    tipo = DIFERENTE
+                else:
+                    continue
+                diferencas.append({"tipo": tipo, "chave": valor})
+            if len(diferencas) >= maximo_diferencas:
+                diferencas = diferencas[:maximo_diferencas]
+                truncado = True
+                break
+
+        comparacao.cursor.close()
+    finally:
+        conexao.rollback()
+
+    duracao = time.time() - inicio_execucao
+    if truncado:
+        mensagem = f"⚠️ Mais de {maximo_diferencas} diferença(s): comparação interrompida"
+    elif diferencas:
+        mensagem = f"❌ {len(diferencas)} linha(s) diferente(s)"
+    else:
+        mensagem = f"✅ Tabelas iguais ({linhas_origem:,} linhas)"
+    return {
+        "sucesso": True,
+        "mensagem": mensagem,
+        "diferencas": diferencas,
+        "truncado": truncado,
+        "chave": chave,
+        "colunas": comuns,
+        "colunas_ignoradas": ignoradas,
+        "linhas_origem": linhas_origem,
+        "linhas_destino": linhas_destino,
+        "blocos": comparacao.blocos,
+        "consultas": comparacao.consultas,
+        "duracao": round(duracao, 3),
+    }
+
+
+def comparar_bancos(conexao, banco_origem, banco_destino, tamanho_bloco=TAMANHO_BLOCO_PADRAO, ao_progredir=None):
+    """
+    Compara as tabelas de mesmo nome dos dois bancos.
+    Retorna {"resultados": {tabela: resultado}, "so_origem": [...], "so_destino": [...]}.
+    """
+    tabelas_origem = listar_tabelas(conexao, banco_origem)
+    tabelas_destino = listar_tabelas(conexao, banco_destino)
+    comuns = [t for t in tabelas_origem if t in tabelas_destino]
+    resultados = {}
+    for indice, tabela in enumerate(comuns):
+        if ao_progredir:
+            ao_progredir(f"Comparando {tabela} ({indice + 1}/{len(comuns)})", indice / max(len(comuns), 1))
+        try:
+            resultados[tabela] = comparar_tabelas(conexao, (banco_origem, tabela), (banco_destino, tabela),
+                                                  tamanho_bloco)
+        except mysql.connector.Error as e:
+            resultados[tabela] = {"sucesso": False, "mensagem": str(e)}
+    if ao_progredir:
+        ao_progredir("Comparação concluída", 1.0)
+    return {
+        "resultados": resultados,
+        "so_origem": [t for t in tabelas_origem if t not in tabelas_destino],
+        "so_destino": [t for t in tabelas_destino if t not in tabelas_origem],
+    }
+
+
+def linhas_por_chave(conexao, banco, tabela, chave, chaves, colunas=None):
+    """As linhas completas das chaves indicadas (para mostrar as diferenças lado a lado)"""
+    if not chaves:
+        return pd.DataFrame(columns=colunas or [])
+    lista = ", ".join(f"`{c}`" for c in colunas) if colunas else "*"
+    igualdade = "(" + " AND ".join(f"`{c}` = %s" for c in chave) + ")"
+    params = [v for valor in chaves for v in valor]
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT {lista} FROM `{banco}`.`{tabela}` WHERE "
+                   + " OR ".join([igualdade] * len(chaves)), params)
+    df = pd.DataFrame(cursor.fetchall(), columns=list(cursor.column_names))
+    cursor.close()
+    return df
+
+
+# ============ COMPONENTE STREAMLIT ============
+def _listar_bancos(conexao):
+    cursor = conexao.cursor()
+    cursor.execute("SHOW DATABASES")
+    bancos = [linha[0] for linha in cursor.fetchall() if linha[0] not in BANCOS_SISTEMA]
+    cursor.close()
+    return bancos
+
+
+def _mostrar_resultado(conexao, origem, destino, resultado):
+    """Métricas, lista de diferenças e as primeiras linhas divergentes dos dois lados"""
+    if not resultado["sucesso"]:
+        st.error(f"❌ {resultado['mensagem']}")
+        return
+    (st.success if not resultado["diferencas"] else st.warning)(resultado["mensagem"])
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Linhas na origem", f"{resultado['linhas_origem']:,}")
+    col2.metric("Linhas no destino", f"{resultado['linhas_destino']:,}")
+    col3.metric("Blocos verificados", resultado["blocos"])
+    col4.metric("Tempo", f"{resultado['duracao']:.1f}s")
+    if resultado["colunas_ignoradas"]:
+        st.caption("Colunas fora da comparação (existem só de um lado): "
+                   + ", ".join(resultado["colunas_ignoradas"]))
+    if not resultado["diferencas"]:
+        return
+
+    tabela_diferencas = pd.DataFrame(
+        [{"tipo": d["tipo"], **dict(zip(resultado["chave"], d["chave"]))} for d in resultado["diferencas"]])
+    st.dataframe(tabela_diferencas, use_container_width=True)
+
+    amostra = [d["chave"] for d in resultado["diferencas"][:50]]
+    with st.expander(f"🔎 Linhas divergentes (primeiras {len(amostra)})"):
+        try:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"**Origem** `{origem[0]}.{origem[1]}`")
+                st.dataframe(linhas_por_chave(conexao, *origem, resultado["chave"], amostra,
+                                              resultado["colunas"]), use_container_width=True)
+            with col2:
+                st.write(f"**Destino** `{destino[0]}.{destino[1]}`")
+                st.dataframe(linhas_por_chave(conexao, *destino, resultado["chave"], amostra,
+                                              resultado["colunas"]), use_container_width=True)
+        except mysql.connector.Error as e:
+            st.error(f"Erro ao ler as linhas: {e}")
+
+
+def pagina_comparar_dados():
+    """Página: comparar duas tabelas ou dois bancos por checksums em blocos"""
+    st.title("🧮 Comparar Dados")
+    st.caption("Checksums por blocos da chave calculados no servidor; só os blocos divergentes "
+               "são detalhados até as linhas exatas.")
+    conexao = obter_conexao_sessao("conexao_mysql")
+    if conexao is None:
+        st.error("❌ Erro ao conectar ao MySQL")
+        return
+
+    bancos = _listar_bancos(conexao)
+    if not bancos:
+        st.info("📭 Nenhum banco de dados encontrado.")
+        return
+
+    modo = st.radio("Comparar:", ["Duas tabelas", "Dois bancos (tabelas de mesmo nome)"],
+                    horizontal=True, key="comparar_modo")
+    col1, col2 = st.columns(2)
+    with col1:
+        banco_origem = st.selectbox("Banco de origem:", bancos, key="comparar_banco_origem")
+        tabela_origem = None
+        if modo == "Duas tabelas":
+            tabela_origem = st.selectbox("Tabela de origem:", listar_tabelas(conexao, banco_origem),
+                                         key="comparar_tabela_origem")
+    with col2:
+        banco_destino = st.selectbox("Banco de destino:", bancos, key="comparar_banco_destino")
+        tabela_destino = None
+        if modo == "Duas tabelas":
+            tabelas_destino = listar_tabelas(conexao, banco_destino)
+            indice = tabelas_destino.index(tabela_origem) if tabela_origem in tabelas_destino else 0
+            tabela_destino = st.selectbox("Tabela de destino:", tabelas_destino, index=indice,
+                                          key="comparar_tabela_destino")
+    tamanho_bloco = st.number_input("Linhas por bloco:", 1000, 1_000_000, TAMANHO_BLOCO_PADRAO, step=1000,
+                                    key="comparar_bloco",
+                                    help="Blocos maiores = menos consultas; os divergentes são subdivididos")
+
+    if modo == "Duas tabelas":
+        pronto = bool(tabela_origem and tabela_destino) and (banco_origem, tabela_origem) != (banco_destino,
+                                                                                              tabela_destino)
+        if st.button("🧮 Comparar", type="primary", key="comparar_tabelas", disabled=not pronto):
+            barra = st.progress(0.0)
+            try:
+                resultado = comparar_tabelas(conexao, (banco_origem, tabela_origem),
+                                             (banco_destino, tabela_destino), tamanho_bloco,
+                                             ao_progredir=lambda texto, fracao: barra.progress(fracao, text=texto))
+            except mysql.connector.Error as e:
+                resultado = {"sucesso": False, "mensagem": str(e)}
+            barra.empty()
+            _mostrar_resultado(conexao, (banco_origem, tabela_origem), (banco_destino, tabela_destino),
+                               resultado)
+    else:
+        if st.button("🧮 Comparar bancos", type="primary", key="comparar_bancos",
+                     disabled=banco_origem == banco_destino):
+            barra = st.progress(0.0)
+            relatorio = comparar_bancos(conexao, banco_origem, banco_destino, tamanho_bloco,
+                                        lambda texto, fracao: barra.progress(fracao, text=texto))
+            barra.empty()
+            if relatorio["so_origem"]:
+                st.warning("Só na origem: " + ", ".join(f"`{t}`" for t in relatorio["so_origem"]))
+            if relatorio["so_destino"]:
+                st.warning("Só no destino: " + ", ".join(f"`{t}`" for t in relatorio["so_destino"]))
+            resumo = [{"tabela": tabela,
+                       "resultado": resultado["mensagem"],
+                       "diferenças": len(resultado.get("diferencas", [])),
+                       "linhas origem": resultado.get("linhas_origem"),
+                       "linhas destino": resultado.get("linhas_destino")}
+                      for tabela, resultado in relatorio["resultados"].items()]
+            if resumo:
+                st.dataframe(pd.DataFrame(resumo), use_container_width=True)
+            for tabela, resultado in relatorio["resultados"].items():
+                if not resultado["sucesso"] or resultado["diferencas"]:
+                    with st.expander(f"`{tabela}`"):
+                        _mostrar_resultado(conexao, (banco_origem, tabela), (banco_destino, tabela),
+                                           resultado)
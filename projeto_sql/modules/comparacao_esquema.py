@@ -0,0 +1,473 @@
+# modules/comparacao_esquema.py
+"""
+Diferença de esquema entre dois bancos e script de migração
+- Cada esquema é carregado com quatro consultas em lote ao information_schema
+  (tabelas, colunas, índices, FKs), não uma por tabela
+- Compara tabelas, colunas, índices e FKs e gera o script que deixa o
+  destino igual à origem, na ordem que as FKs exigem:
+    1. DROP FOREIGN KEY das FKs removidas/alteradas
+    2. um ALTER TABLE por tabela existente (colunas, índices, opções)
+    3. CREATE TABLE das novas, pais antes dos filhos
+    4. ADD FOREIGN KEY das FKs novas/alteradas
+    5. DROP TABLE das que só existem no destino (filhos antes), se pedido
+- Estimativa por comando, opcional: algoritmo aceito pelo servidor (teste numa
+  cópia vazia, como no editor de tabelas) e se reconstrói uma tabela grande
+Renomeações de colunas aparecem como remover + adicionar.
+"""
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from .comandos_preparados import descartar_preparados
+from .conexao_resiliente import obter_conexao_sessao
+from .copia_dados import niveis_copia
+from .ddl_online import LIMIAR_COPIA_DIRETA, ROTULOS_ALGORITMO, analisar_alter, estimar_custo, montar_alter
+
+BANCOS_SISTEMA = ("information_schema", "mysql", "performance_schema", "sys")
+
+# Cláusulas de um ALTER que, mesmo INPLACE, reescrevem a tabela inteira
+_RECONSTROEM = re.compile(r"^\s*(MODIFY|CHANGE|ADD\s+COLUMN|DROP\s+COLUMN|ADD\s+PRIMARY|DROP\s+PRIMARY|ENGINE)",
+                          re.I)
+
+
+# ============ CARGA DO ESQUEMA ============
+def carregar_esquema(conexao, banco):
+    """
+    {tabela: {"motor", "comentario", "linhas", "colunas": OrderedDict, "indices": {}, "fks": {}}}
+    em quatro consultas ao information_schema.
+    """
+    cursor = conexao.cursor()
+    esquema = OrderedDict()
+    cursor.execute("""
+        SELECT TABLE_NAME, ENGINE, TABLE_COMMENT, TABLE_ROWS
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
+    """, (banco,))
+    for nome, motor, comentario, linhas in cursor.fetchall():
+        esquema[nome] = {"motor": motor, "comentario": comentario or "", "linhas": int(linhas or 0),
+                         "colunas": OrderedDict(), "indices": OrderedDict(), "fks": OrderedDict()}
+
+    cursor.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT, EXTRA,
+               COLLATION_NAME, COLUMN_COMMENT, GENERATION_EXPRESSION
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """, (banco,))
+    for tabela, nome, tipo, nulo, padrao, extra, collation, comentario, geracao in cursor.fetchall():
+        if tabela in esquema:
+            esquema[tabela]["colunas"][nome] = {
+                "tipo": tipo, "nulo": nulo == "YES", "padrao": padrao, "extra": (extra or "").lower(),
+                "collation": collation, "comentario": comentario or "", "geracao": geracao or "",
+            }
+
+    cursor.execute("""
+        SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, INDEX_TYPE, COLUMN_NAME, SUB_PART
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    """, (banco,))
+    for tabela, nome, nao_unico, tipo, coluna, parte in cursor.fetchall():
+        if tabela in esquema:
+            indice = esquema[tabela]["indices"].setdefault(
+                nome, {"unico": not int(nao_unico), "tipo": tipo, "colunas": []})
+            indice["colunas"].append((coluna, int(parte) if parte else None))
+
+    cursor.execute("""
+        SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_SCHEMA,
+               k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME, r.UPDATE_RULE, r.DELETE_RULE
+        FROM information_schema.KEY_COLUMN_USAGE k
+        JOIN information_schema.REFERENTIAL_CONSTRAINTS r
+          ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+         AND r.TABLE_NAME = k.TABLE_NAME
+        WHERE k.TABLE_SCHEMA = %s AND k.REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+    """, (banco,))
+    for tabela, nome, coluna, banco_ref, tabela_ref, coluna_ref, ao_atualizar, ao_excluir in cursor.fetchall():
+        if tabela in esquema:
+            fk = esquema[tabela]["fks"].setdefault(nome, {
+                "colunas": [], "proprio_banco": banco_ref == banco, "banco_ref": banco_ref,
+                "tabela_ref": tabela_ref, "colunas_ref": [], "ao_atualizar": ao_atualizar,
+                "ao_excluir": ao_excluir})
+            fk["colunas"].append(coluna)
+            fk["colunas_ref"].append(coluna_ref)
+    cursor.close()
+    return esquema
+
+
+def dependencias_esquema(esquema):
+    """{tabela: {pais no mesmo banco}} a partir das FKs carregadas"""
+    return {nome: {fk["tabela_ref"] for fk in tabela["fks"].values() if fk["proprio_banco"]}
+            for nome, tabela in esquema.items()}
+
+
+# ============ DEFINIÇÕES SQL ============
+def _texto(valor):
+    return "'" + str(valor).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _padrao(coluna):
+    """Cláusula DEFAULT; o information_schema do MySQL e do MariaDB representam de formas diferentes"""
+    padrao = coluna["padrao"]
+    if padrao is None or coluna["geracao"]:
+        return ""
+    if padrao.upper() == "NULL":
+        return " DEFAULT NULL"
+    if padrao.startswith("'") and padrao.endswith("'") and len(padrao) >= 2:
+        return f" DEFAULT {padrao}"             # MariaDB: literal já entre aspas
+    if re.match(r"^(current_timestamp|now|localtimestamp)\b", padrao, re.I):
+        return f" DEFAULT {padrao}"
+    if "default_generated" in coluna["extra"] or re.match(r"^\w+\(.*\)$", padrao):
+        return f" DEFAULT ({padrao})"           # expressão
+    if re.match(r"^b'[01]*'$", padrao):
+        return f" DEFAULT {padrao}"
+    return f" DEFAULT {_texto(padrao)}"
+
+
+def definicao_coluna(nome, coluna):
+    """`nome` tipo ... como em CREATE/ALTER TABLE"""
+    partes = [f"`{nome}` {coluna['tipo']}"]
+    if coluna["collation"]:
+        partes.append(f"COLLATE {coluna['collation']}")
+    if coluna["geracao"]:
+        armazenada = "STORED" if "stored" in coluna["extra"] else "VIRTUAL"
+        partes.append(f"GENERATED ALWAYS AS ({coluna['geracao']}) {armazenada}")
+    partes.append("NULL" if coluna["nulo"] else "NOT NULL")
+    sql = " ".join(partes) + _padrao(coluna)
+    if "auto_increment" in coluna["extra"]:
+        sql += " AUTO_INCREMENT"
+    atualizacao = re.search(r"on update (\S+(?:\(\d*\))?)", coluna["extra"])
+    if atualizacao:
+        sql += f" ON UPDATE {atualizacao.group(1).upper()}"
+    if coluna["comentario"]:
+        sql += f" COMMENT {_texto(coluna['comentario'])}"
+    return sql
+
+
+def definicao_indice(nome, indice):
+    colunas = ", ".join(f"`{c}`({parte})" if parte else f"`{c}`" for c, parte in indice["colunas"])
+    if nome == "PRIMARY":
+        return f"PRIMARY KEY ({colunas})"
+    if indice["tipo"] in ("FULLTEXT", "SPATIAL"):
+        return f"{indice['tipo']} INDEX `{nome}` ({colunas})"
+    return f"{'UNIQUE ' if indice['unico'] else ''}INDEX `{nome}` ({colunas})"
+
+
+def definicao_fk(nome, fk, banco_destino):
+    """FK apontando para o banco de destino quando a referência é do próprio banco"""
+    banco_ref = banco_destino if fk["proprio_banco"] else fk["banco_ref"]
+    colunas = ", ".join(f"`{c}`" for c in fk["colunas"])
+    referencias = ", ".join(f"`{c}`" for c in fk["colunas_ref"])
+    return (f"CONSTRAINT `{nome}` FOREIGN KEY ({colunas}) REFERENCES `{banco_ref}`.`{fk['tabela_ref']}` "
+            f"({referencias}) ON DELETE {fk['ao_excluir']} ON UPDATE {fk['ao_atualizar']}")
+
+
+def _fk_igual(a, b):
+    chaves = ("colunas", "proprio_banco", "tabela_ref", "colunas_ref", "ao_atualizar", "ao_excluir")
+    return all(a[k] == b[k] for k in chaves) and (a["proprio_banco"] or a["banco_ref"] == b["banco_ref"])
+
+
+# ============ DIFERENÇA ============
+def diferencas_tabela(nome, origem, destino):
+    """
+    Cláusulas do ALTER que levam a tabela do destino à definição da origem
+    e as FKs a remover/adicionar: {"clausulas", "descricoes", "fks_remover", "fks_adicionar"}.
+    """
+    remover_indices, remover_colunas, modificar, adicionar_colunas, adicionar_indices = [], [], [], [], []
+    descricoes = []
+
+    for indice, definicao in destino["indices"].items():
+        if indice not in origem["indices"] or origem["indices"][indice] != definicao:
+            remover_indices.append("DROP PRIMARY KEY" if indice == "PRIMARY" else f"DROP INDEX `{indice}`")
+            if indice not in origem["indices"]:
+                descricoes.append(f"remover índice {indice}")
+    for coluna in destino["colunas"]:
+        if coluna not in origem["colunas"]:
+            remover_colunas.append(f"DROP COLUMN `{coluna}`")
+            descricoes.append(f"remover coluna {coluna}")
+
+    anterior = None
+    for coluna, definicao in origem["colunas"].items():
+        if coluna not in destino["colunas"]:
+            posicao = f" AFTER `{anterior}`" if anterior else " FIRST"
+            adicionar_colunas.append(f"ADD COLUMN {definicao_coluna(coluna, definicao)}{posicao}")
+            descricoes.append(f"adicionar coluna {coluna}")
+        elif destino["colunas"][coluna] != definicao:
+            modificar.append(f"MODIFY COLUMN {definicao_coluna(coluna, definicao)}")
+            descricoes.append(f"alterar coluna {coluna}")
+        anterior = coluna
+
+    for indice, definicao in origem["indices"].items():
+        if indice not in destino["indices"] or destino["indices"][indice] != definicao:
+            adicionar_indices.append(f"ADD {definicao_indice(indice, definicao)}")
+            descricoes.append(f"{'alterar' if indice in destino['indices'] else 'adicionar'} índice {indice}")
+
+    opcoes = []
+    if (origem["motor"] or "").lower() != (destino["motor"] or "").lower():
+        opcoes.append(f"ENGINE={origem['motor']}")
+        descricoes.append(f"motor {destino['motor']} → {origem['motor']}")
+    if origem["comentario"] != destino["comentario"]:
+        opcoes.append(f"COMMENT={_texto(origem['comentario'])}")
+        descricoes.append("comentário da tabela")
+
+    fks_remover = [fk for fk, definicao in destino["fks"].items()
+                   if fk not in origem["fks"] or not _fk_igual(origem["fks"][fk], definicao)]
+    fks_adicionar = [fk for fk, definicao in origem["fks"].items()
+                     if fk not in destino["fks"] or not _fk_igual(definicao, destino["fks"][fk])]
+    return {
+        "clausulas": remover_indices + remover_colunas + modificar + adicionar_colunas + adicionar_indices + opcoes,
+        "descricoes": descricoes,
+        "fks_remover": fks_remover,
+        "fks_adicionar": fks_adicionar,
+    }
+
+
+def _ddl_criacao(conexao, banco, tabela):
+    cursor = conexao.cursor()
+    cursor.execute(f"SHOW CREATE TABLE `{banco}`.`{tabela}`")
+    ddl = cursor.fetchone()[1]
+    cursor.close()
+    return re.sub(r"\s+AUTO_INCREMENT=\d+", "", ddl)
+
+
+def gerar_migracao(conexao, banco_origem, banco_destino, remover_extras=False, analisar=False):
+    """
+    Compara os esquemas e gera os comandos, em ordem.
+    Retorna {"comandos": [{"fase", "tabela", "sql", "descricao", "algoritmo", "reconstroi",
+                          "linhas", "segundos"}],
+             "novas", "extras", "alteradas", "sem_verificacao"}.
+    analisar: testa cada ALTER numa cópia vazia no destino para saber o algoritmo aceito
+              (cria e remove tabelas auxiliares no banco de destino; só a pedido).
+    """
+    origem = carregar_esquema(conexao, banco_origem)
+    destino = carregar_esquema(conexao, banco_destino)
+    niveis, sem_verificacao = niveis_copia(list(origem), dependencias_esquema(origem))
+    ordem = [tabela for nivel in niveis for tabela in nivel]
+    novas = [t for t in ordem if t not in destino]
+    extras = [t for t in destino if t not in origem]
+    comuns = [t for t in ordem if t in destino]
+
+    diferencas = {t: diferencas_tabela(t, origem[t], destino[t]) for t in comuns}
+    comandos = []
+
+    def adicionar(fase, tabela, sql, descricao, **estimativa):
+        comandos.append({"fase": fase, "tabela": tabela, "sql": sql, "descricao": descricao,
+                         "algoritmo": estimativa.get("algoritmo"), "reconstroi": estimativa.get("reconstroi", False),
+                         "linhas": estimativa.get("linhas", 0), "segundos": estimativa.get("segundos")})
+
+    # 1. FKs removidas ou alteradas saem antes de mexer em colunas e índices
+    for tabela in comuns:
+        fks = diferencas[tabela]["fks_remover"]
+        if fks:
+            adicionar(1, tabela, montar_alter(banco_destino, tabela, [f"DROP FOREIGN KEY `{fk}`" for fk in fks]),
+                      "remover FK " + ", ".join(fks), algoritmo="INPLACE")
+
+    # 2. Um ALTER por tabela: o servidor reconstrói (no máximo) uma vez
+    for tabela in comuns:
+        clausulas = diferencas[tabela]["clausulas"]
+        if not clausulas:
+            continue
+        estimativa = {"linhas": destino[tabela]["linhas"]}
+        if analisar:
+            analise = analisar_alter(conexao, banco_destino, tabela, clausulas)
+            estimativa.update(algoritmo=analise["algoritmo"], linhas=analise["linhas"],
+                              segundos=analise["segundos_copia"])
+            if analise["erro"]:
+                estimativa["algoritmo"] = None
+        algoritmo = estimativa.get("algoritmo")
+        estimativa["reconstroi"] = (algoritmo == "COPY" or (algoritmo != "INSTANT"
+                                                             and any(_RECONSTROEM.match(c) for c in clausulas)))
+        adicionar(2, tabela, montar_alter(banco_destino, tabela, clausulas),
+                  ", ".join(diferencas[tabela]["descricoes"]), **estimativa)
+
+    # 3. Tabelas novas, pais antes dos filhos (FKs em ciclo pedem FOREIGN_KEY_CHECKS=0)
+    for tabela in novas:
+        ddl = _ddl_criacao(conexao, banco_origem, tabela)
+        ddl = ddl.replace(f"CREATE TABLE `{tabela}`", f"CREATE TABLE `{banco_destino}`.`{tabela}`", 1)
+        adicionar(3, tabela, ddl, "criar tabela")
+
+    # 4. FKs novas ou alteradas, com todas as tabelas e colunas já no lugar
+    for tabela in comuns:
+        fks = diferencas[tabela]["fks_adicionar"]
+        if fks:
+            linhas = destino[tabela]["linhas"]
+            clausulas = [f"ADD {definicao_fk(fk, origem[tabela]['fks'][fk], banco_destino)}" for fk in fks]
+            # Com FOREIGN_KEY_CHECKS=1 o servidor valida as linhas existentes copiando a tabela
+            adicionar(4, tabela, montar_alter(banco_destino, tabela, clausulas), "adicionar FK " + ", ".join(fks),
+                      algoritmo="COPY", reconstroi=True, linhas=linhas,
+                      segundos=estimar_custo(conexao, banco_destino, tabela)["segundos_copia"] if analisar else None)
+
+    # 5. Tabelas que só existem no destino, filhos antes dos pais
+    if remover_extras and extras:
+        niveis_extras, _ = niveis_copia(extras, dependencias_esquema(destino))
+        for nivel in reversed(niveis_extras):
+            for tabela in nivel:
+                adicionar(5, tabela, f"DROP TABLE `{banco_destino}`.`{tabela}`", "remover tabela",
+                          linhas=destino[tabela]["linhas"])
+
+    return {
+        "comandos": comandos,
+        "novas": novas,
+        "extras": extras,
+        "alteradas": [t for t in comuns if diferencas[t]["clausulas"] or diferencas[t]["fks_remover"]
+                      or diferencas[t]["fks_adicionar"]],
+        "sem_verificacao": [t for t in sem_verificacao if t in novas],
+    }
+
+
+_TITULOS_FASE = {
+    1: "Remover FKs alteradas/removidas",
+    2: "Alterar tabelas existentes",
+    3: "Criar tabelas novas",
+    4: "Adicionar FKs",
+    5: "Remover tabelas que não existem na origem",
+}
+
+
+def script_migracao(migracao, banco_origem, banco_destino):
+    """Texto do script .sql, com fases comentadas e avisos de reconstrução"""
+    linhas = [f"-- Migração de esquema: `{banco_destino}` → igual a `{banco_origem}`",
+              f"-- Gerado em {datetime.now().isoformat(sep=' ', timespec='seconds')}", ""]
+    fase_atual = None
+    ciclo = bool(migracao["sem_verificacao"])
+    for comando in migracao["comandos"]:
+        if comando["fase"] != fase_atual:
+            if fase_atual == 3 and ciclo:
+                linhas += ["SET FOREIGN_KEY_CHECKS=1;", ""]
+            fase_atual = comando["fase"]
+            linhas += [f"-- {fase_atual}. {_TITULOS_FASE[fase_atual]}"]
+            if fase_atual == 3 and ciclo:
+                linhas.append("SET FOREIGN_KEY_CHECKS=0;")
+        if comando["reconstroi"] and comando["linhas"] >= LIMIAR_COPIA_DIRETA:
+            linhas.append(f"-- ⚠ reconstrói `{comando['tabela']}` (~{comando['linhas']:,} linhas)")
+        linhas += [comando["sql"] + ";", ""]
+    if fase_atual == 3 and ciclo:
+        linhas.append("SET FOREIGN_KEY_CHECKS=1;")
+    if not migracao["comandos"]:
+        linhas.append("-- Esquemas iguais: nada a fazer")
+    return "\n".join(linhas)
+
+
+def aplicar_migracao(conexao, migracao):
+    """Executa os comandos em ordem, parando no primeiro erro: {"sucesso", "mensagem", "executados"}"""
+    cursor = conexao.cursor()
+    executados = 0
+    ciclo = bool(migracao["sem_verificacao"])
+    try:
+        for comando in migracao["comandos"]:
+            if ciclo and comando["fase"] == 3:
+                cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+            try:
+                cursor.execute(comando["sql"])
+            except mysql.connector.Error as e:
+                return {"sucesso": False, "executados": executados,
+                        "mensagem": f"Erro em `{comando['tabela']}` ({comando['descricao']}): {e}"}
+            finally:
+                if ciclo and comando["fase"] == 3:
+                    cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+            executados += 1
+    finally:
+        cursor.close()
+    return {"sucesso": True, "executados": executados, "mensagem": f"{executados} comando(s) aplicado(s)"}
+
+
+# ============ COMPONENTE STREAMLIT ============
+def _listar_bancos(conexao):
+    cursor = conexao.cursor()
+    cursor.execute("SHOW DATABASES")
+    bancos = [linha[0] for linha in cursor.fetchall() if linha[0] not in BANCOS_SISTEMA]
+    cursor.close()
+    return bancos
+
+
+def _formatar_segundos(segundos):
+    if segundos is None:
+        return "—"
+    return f"{segundos:.0f}s" if segundos < 120 else f"{segundos / 60:.0f} min"
+
+
+def pagina_comparar_esquemas():
+    """Página: diferença de esquema entre dois bancos e script de migração"""
+    st.title("🧬 Comparar Esquemas")
+    st.caption("O script deixa o banco de destino com a mesma estrutura do banco de origem.")
+    conexao = obter_conexao_sessao("conexao_mysql")
+    if conexao is None:
+        st.error("❌ Erro ao conectar ao MySQL")
+        return
+
+    bancos = _listar_bancos(conexao)
+    if len(bancos) < 2:
+        st.info("São necessários ao menos dois bancos.")
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        banco_origem = st.selectbox("Origem (modelo):", bancos, key="esquema_origem")
+    with col2:
+        banco_destino = st.selectbox("Destino (será alterado):", bancos, index=1, key="esquema_destino")
+    col1, col2 = st.columns(2)
+    with col1:
+        remover_extras = st.checkbox("Remover tabelas que só existem no destino", key="esquema_extras")
+    with col2:
+        analisar = st.checkbox("Estimar custo no servidor", key="esquema_analisar",
+                               help="Testa cada ALTER numa cópia vazia para saber se reconstrói a tabela: "
+                                    "cria e remove tabelas auxiliares no banco de destino")
+
+    chave_resultado = f"esquema_migracao_{banco_origem}_{banco_destino}"
+    if st.button("🧬 Comparar", type="primary", key="esquema_comparar", disabled=banco_origem == banco_destino):
+        with st.spinner("Comparando esquemas..."):
+            try:
+                st.session_state[chave_resultado] = gerar_migracao(conexao, banco_origem, banco_destino,
+                                                                   remover_extras, analisar)
+            except mysql.connector.Error as e:
+                st.error(f"Erro na comparação: {e}")
+
+    migracao = st.session_state.get(chave_resultado)
+    if not migracao:
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tabelas novas", len(migracao["novas"]))
+    col2.metric("Tabelas alteradas", len(migracao["alteradas"]))
+    col3.metric("Só no destino", len(migracao["extras"]))
+    grandes = [c for c in migracao["comandos"] if c["reconstroi"] and c["linhas"] >= LIMIAR_COPIA_DIRETA]
+    col4.metric("Reconstruções grandes", len(grandes))
+    if not migracao["comandos"]:
+        st.success("✅ Esquemas iguais")
+        return
+
+    tabela_comandos = pd.DataFrame([{
+        "fase": c["fase"],
+        "tabela": c["tabela"],
+        "alteração": c["descricao"],
+        "algoritmo": ROTULOS_ALGORITMO.get(c["algoritmo"], "—") if c["algoritmo"] else "—",
+        "reconstrói": "⚠️ sim" if c["reconstroi"] and c["linhas"] >= LIMIAR_COPIA_DIRETA
+                      else ("sim" if c["reconstroi"] else "não"),
+        "linhas": c["linhas"],
+        "tempo estimado": _formatar_segundos(c["segundos"]) if c["reconstroi"] else "—",
+    } for c in migracao["comandos"]])
+    st.dataframe(tabela_comandos, use_container_width=True)
+    if grandes:
+        st.warning(f"⚠️ {len(grandes)} comando(s) reconstroem tabelas com mais de {LIMIAR_COPIA_DIRETA:,} "
+                   "linhas: prefira aplicá-los pelo editor de tabelas (modo online/tabela sombra).")
+
+    script = script_migracao(migracao, banco_origem, banco_destino)
+    st.code(script, language="sql")
+    st.download_button("⬇️ Baixar script", script, file_name=f"migracao_{banco_destino}.sql",
+                       mime="text/plain", key="esquema_baixar")
+
+    confirmacao = st.text_input(f"Digite '{banco_destino}' para aplicar no destino:", key="esquema_confirma")
+    if st.button("▶️ Aplicar no destino", key="esquema_aplicar", disabled=confirmacao != banco_destino):
+        with st.spinner("Aplicando..."):
+            resultado = aplicar_migracao(conexao, migracao)
+            # Conexão da sessão: os comandos preparados dela apontam para a estrutura antiga
+            descartar_preparados(conexao)
+        if resultado["sucesso"]:
+            st.success(f"✅ {resultado['mensagem']}")
+            st.session_state.pop(chave_resultado, None)
+        else:
+            st.error(f"❌ {resultado['mensagem']} — {resultado['executados']} comando(s) já aplicados")
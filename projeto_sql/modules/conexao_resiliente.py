@@ -0,0 +1,248 @@
+# modules/conexao_resiliente.py
+"""
+Camada de conexão resiliente usada por todas as páginas
+- Guarda a hora do último uso e só faz ping() depois de um tempo ocioso
+  (is_connected() a cada acesso custava uma ida ao servidor por rerun)
+- Reconecta com tentativas limitadas e jitter em erros transitórios (2006/2013)
+- Mantém métricas de conexões, pings e reconexões para todo o processo
+"""
+import random
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import errorcode
+import streamlit as st
+
+from .comandos_preparados import metricas_preparados
+
+OCIOSO_PING_SEGUNDOS = 30      # abaixo disto a conexão é considerada viva sem ping
+MAX_TENTATIVAS = 3
+ESPERA_BASE = 0.2              # segundos; dobra a cada tentativa (+ jitter)
+ESPERA_MAXIMA = 2.0
+
+# MySQL server has gone away / Lost connection
+ERROS_TRANSITORIOS = {
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_SERVER_LOST_EXTENDED,
+}
+
+_CHAVE_ULTIMO_USO = "_conexoes_ultimo_uso"
+_CHAVE_BANCO_ATUAL = "_conexoes_banco_atual"
+
+_lock = threading.Lock()
+_metricas = {
+    "conexoes_abertas": 0,
+    "pings": 0,
+    "reconexoes": 0,
+    "retentativas": 0,
+    "falhas": 0,
+}
+
+
+# ============ MÉTRICAS ============
+def _contar(metrica, quantidade=1):
+    with _lock:
+        _metricas[metrica] += quantidade
+
+
+def metricas_conexao():
+    """Cópia das métricas acumuladas no processo"""
+    with _lock:
+        return dict(_metricas)
+
+
+def mostrar_metricas_conexao():
+    """Resumo curto das métricas (sidebar / home)"""
+    metricas = metricas_conexao()
+    preparados = metricas_preparados()
+    st.caption(
+        f"🔌 Conexões: {metricas['conexoes_abertas']} • "
+        f"Pings: {metricas['pings']} • "
+        f"Reconexões: {metricas['reconexoes']} • "
+        f"Falhas: {metricas['falhas']} • "
+        f"Comandos preparados: {preparados['preparados']} "
+        f"({preparados['reaproveitados']} reaproveitados)"
+    )
+
+
+# ============ RETENTATIVAS ============
+def erro_transitorio(erro):
+    """Indica se o erro justifica nova tentativa"""
+    return isinstance(erro, mysql.connector.Error) and erro.errno in ERROS_TRANSITORIOS
+
+
+def _esperar(tentativa):
+    """Backoff exponencial com jitter total"""
+    limite = min(ESPERA_MAXIMA, ESPERA_BASE * (2 ** tentativa))
+    time.sleep(random.uniform(0, limite))
+
+
+def com_retentativa(funcao, *args, tentativas=MAX_TENTATIVAS, **kwargs):
+    """
+    Executa funcao(*args, **kwargs) repetindo em erros transitórios.
+    Outros erros (sintaxe, permissão...) sobem de imediato.
+    """
+    for tentativa in range(tentativas):
+        try:
+            return funcao(*args, **kwargs)
+        except mysql.connector.Error as e:
+            if not erro_transitorio(e) or tentativa == tentativas - 1:
+                _contar("falhas")
+                raise
+            _contar("retentativas")
+            _esperar(tentativa)
+
+
+def conectar(banco=None, timeout=None, **opcoes):
+    """
+    Abre uma conexão nova (com retentativas); levanta mysql.connector.Error
+    timeout: connection_timeout (no conector Python puro vale também para as
+             consultas, por isso fica vazio em exportações/backups longos)
+    opcoes: argumentos extra do mysql.connector.connect (ex: allow_local_infile)
+    """
+    config = {
+        "host": "localhost",
+        "user": "root",
+        "password": "",
+        "port": 3306
+    }
+    if timeout is not None:
+        config["connection_timeout"] = timeout
+    if banco:
+        config["database"] = banco
+    config.update(opcoes)
+
+    conexao = com_retentativa(mysql.connector.connect, **config)
+    _contar("conexoes_abertas")
+    return conexao
+
+
+# ============ CONEXÕES DA SESSÃO ============
+def _marcar_uso(chave, conexao):
+    usos = st.session_state.setdefault(_CHAVE_ULTIMO_USO, {})
+    usos[chave] = (id(conexao), time.time())
+
+
+def _usada_recentemente(chave, conexao):
+    uso = st.session_state.get(_CHAVE_ULTIMO_USO, {}).get(chave)
+    return bool(uso and uso[0] == id(conexao)
+                and time.time() - uso[1] < OCIOSO_PING_SEGUNDOS)
+
+
+def _banco_atual(chave, conexao):
+    """Database selecionado na conexão da sessão, se conhecido (sem ida ao servidor)"""
+    registro = st.session_state.get(_CHAVE_BANCO_ATUAL, {}).get(chave)
+    return registro[1] if registro and registro[0] == id(conexao) else None
+
+
+def _registrar_banco(chave, conexao, banco):
+    st.session_state.setdefault(_CHAVE_BANCO_ATUAL, {})[chave] = (id(conexao), banco)
+
+
+def esquecer_banco_sessao(chave="conexao_mysql"):
+    """Descarta o database memorizado (ex: depois de um USE fora de usar_banco)"""
+    st.session_state.get(_CHAVE_BANCO_ATUAL, {}).pop(chave, None)
+
+
+def usar_banco(conexao, banco, chave="conexao_mysql"):
+    """
+    Seleciona o database na conexão da sessão só quando ele muda: o database
+    atual fica memorizado por conexão, e um USE repetido custaria uma ida ao
+    servidor a cada rerun. Levanta mysql.connector.Error se o USE falhar.
+    """
+    if _banco_atual(chave, conexao) == banco:
+        return
+    try:
+        conexao.database = banco
+    except mysql.connector.Error:
+        esquecer_banco_sessao(chave)
+        raise
+    _registrar_banco(chave, conexao, banco)
+
+
+def _reviver(conexao):
+    """Ping barato; se falhar, reconecta com jitter. Retorna True se ficou viva."""
+    _contar("pings")
+    try:
+        conexao.ping(reconnect=False)
+        return True
+    except mysql.connector.Error:
+        pass
+
+    for tentativa in range(MAX_TENTATIVAS):
+        try:
+            conexao.reconnect(attempts=1)
+            _contar("reconexoes")
+            return True
+        except mysql.connector.Error:
+            _esperar(tentativa)
+
+    _contar("falhas")
+    return False
+
+
+def obter_conexao_sessao(chave="conexao_mysql", banco=None, criar=True, conectar_nova=None):
+    """
+    Retorna a conexão guardada em st.session_state[chave], garantindo que está viva.
+
+    - Usada há menos de OCIOSO_PING_SEGUNDOS: devolvida sem ida ao servidor
+    - Ociosa: ping(); se caiu, reconecta com retentativas
+    - banco: troca o database atual só se for diferente do memorizado (usar_banco);
+             se o USE falhar retorna None, nunca a conexão apontando para outro banco
+    - criar: abre uma nova (conectar_nova() ou conectar(banco)) quando não há/morreu
+    """
+    conexao = st.session_state.get(chave)
+
+    if conexao is not None and not _usada_recentemente(chave, conexao):
+        # Uma reconexão volta ao database da configuração original
+        esquecer_banco_sessao(chave)
+        if not _reviver(conexao):
+            conexao = None
+            st.session_state[chave] = None
+
+    if conexao is None:
+        if not criar:
+            return None
+        try:
+            conexao = conectar_nova() if conectar_nova else conectar(banco)
+        except mysql.connector.Error:
+            conexao = None
+        st.session_state[chave] = conexao
+        if conexao is None:
+            return None
+        if banco and not conectar_nova:
+            _registrar_banco(chave, conexao, banco)
+
+    # Ler conexao.database custaria um SELECT DATABASE(): o database atual fica memorizado
+    if banco:
+        try:
+            usar_banco(conexao, banco, chave)
+        except mysql.connector.Error as e:
+            # Caiu entre o último uso e agora: uma reconexão e nova tentativa
+            if not erro_transitorio(e):
+                return None     # banco inexistente/sem permissão: não devolve a conexão em outro banco
+            if not _reviver(conexao):
+                descartar_conexao_sessao(chave)
+                return None
+            try:
+                usar_banco(conexao, banco, chave)
+            except mysql.connector.Error:
+                return None
+
+    _marcar_uso(chave, conexao)
+    return conexao
+
+
+def descartar_conexao_sessao(chave="conexao_mysql"):
+    """Fecha e remove a conexão da sessão (ex: botão Reconectar)"""
+    conexao = st.session_state.get(chave)
+    st.session_state[chave] = None
+    st.session_state.get(_CHAVE_ULTIMO_USO, {}).pop(chave, None)
+    esquecer_banco_sessao(chave)
+    if conexao is not None:
+        try:
+            conexao.close()
+        except Exception:
+            pass
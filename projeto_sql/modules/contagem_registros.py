@@ -0,0 +1,185 @@
+# modules/contagem_registros.py
+"""
+Serviço de contagem de registros
+Usa TABLE_ROWS do information_schema como estimativa instantânea e
+calcula o COUNT(*) exato em segundo plano (thread própria, conexão própria),
+guardando o resultado em cache com a hora do cálculo.
+"""
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+from .conexao_resiliente import conectar
+
+# Abaixo deste número de linhas estimadas o COUNT(*) é barato: conta na hora
+LIMIAR_CONTAGEM_EXATA = 100_000
+
+# Cache compartilhado por todas as sessões do processo
+# chave: (banco, tabela) -> {"total", "exato", "atualizado_em"}
+_cache_contagens = {}
+_contagens_em_curso = set()
+_lock = threading.Lock()
+
+
+def _conectar(banco):
+    """Abre uma conexão dedicada (conexões não são compartilháveis entre threads)"""
+    return conectar(banco)
+
+
+def obter_estimativa_registros(conexao, banco, tabela):
+    """Retorna TABLE_ROWS do information_schema (None se não disponível)"""
+    try:
+        cursor = conexao.cursor()
+        cursor.execute("""
+            SELECT TABLE_ROWS
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """, (banco, tabela))
+        resultado = cursor.fetchone()
+        cursor.close()
+        if resultado and resultado[0] is not None:
+            return int(resultado[0])
+        return None
+    except Exception:
+        return None
+
+
+def contar_registros_exato(conexao, banco, tabela):
+    """Executa SELECT COUNT(*) na conexão indicada"""
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM `{banco}`.`{tabela}`")
+    total = cursor.fetchone()[0]
+    cursor.close()
+    return int(total)
+
+
+def _guardar_contagem(banco, tabela, total, exato):
+    """Atualiza o cache com o resultado e a hora"""
+    with _lock:
+        _cache_contagens[(banco, tabela)] = {
+            "total": total,
+            "exato": exato,
+            "atualizado_em": datetime.now()
+        }
+
+
+def _contar_em_segundo_plano(banco, tabela):
+    """Corpo da thread: conta com conexão própria e guarda no cache"""
+    try:
+        conexao = _conectar(banco)
+        try:
+            total = contar_registros_exato(conexao, banco, tabela)
+        finally:
+            conexao.close()
+        _guardar_contagem(banco, tabela, total, True)
+    except Exception:
+        pass
+    finally:
+        with _lock:
+            _contagens_em_curso.discard((banco, tabela))
+
+
+def solicitar_contagem_exata(banco, tabela):
+    """
+    Agenda o COUNT(*) exato em segundo plano.
+    Retorna False se já existe uma contagem em curso para esta tabela.
+    """
+    chave = (banco, tabela)
+    with _lock:
+        if chave in _contagens_em_curso:
+            return False
+        _contagens_em_curso.add(chave)
+
+    thread = threading.Thread(
+        target=_contar_em_segundo_plano,
+        args=(banco, tabela),
+        daemon=True
+    )
+    thread.start()
+    return True
+
+
+def contagem_em_curso(banco, tabela):
+    """Indica se há um COUNT(*) em segundo plano para a tabela"""
+    with _lock:
+        return (banco, tabela) in _contagens_em_curso
+
+
+def obter_contagem(conexao, banco, tabela):
+    """
+    Retorna a contagem de registros sem bloquear em tabelas grandes:
+        {"total": int, "exato": bool, "atualizado_em": datetime|None, "calculando": bool}
+
+    1. Tabelas pequenas (estimativa < LIMIAR_CONTAGEM_EXATA) contam na hora
+    2. Tabelas grandes com valor exato em cache usam-no (com a hora do cálculo)
+    3. Caso contrário devolve a estimativa e agenda a contagem exata
+    """
+    estimativa = obter_estimativa_registros(conexao, banco, tabela)
+
+    if estimativa is not None and estimativa >= LIMIAR_CONTAGEM_EXATA:
+        with _lock:
+            em_cache = _cache_contagens.get((banco, tabela))
+        if em_cache and em_cache["exato"]:
+            return {**em_cache, "calculando": contagem_em_curso(banco, tabela)}
+    else:
+        try:
+            total = contar_registros_exato(conexao, banco, tabela)
+            _guardar_contagem(banco, tabela, total, True)
+            return {
+                "total": total,
+                "exato": True,
+                "atualizado_em": datetime.now(),
+                "calculando": False
+            }
+        except Exception:
+            if estimativa is None:
+                return {"total": 0, "exato": False, "atualizado_em": None, "calculando": False}
+
+    solicitar_contagem_exata(banco, tabela)
+    return {
+        "total": estimativa,
+        "exato": False,
+        "atualizado_em": None,
+        "calculando": True
+    }
+
+
+def invalidar_contagem(banco, tabela=None):
+    """Remove do cache a contagem de uma tabela (ou de todo o banco)"""
+    with _lock:
+        for chave in list(_cache_contagens.keys()):
+            if chave[0] == banco and (tabela is None or chave[1] == tabela):
+                del _cache_contagens[chave]
+
+
+def formatar_contagem(contagem):
+    """Texto curto para métricas: '≈ 1,234,567' para estimativas"""
+    if contagem["exato"]:
+        return f"{contagem['total']:,}"
+    return f"≈ {contagem['total']:,}"
+
+
+def mostrar_contagem(conexao, banco, tabela, rotulo="Total de Registros", chave=""):
+    """
+    Componente Streamlit: métrica com a contagem, indicação de estimativa
+    e botão para pedir a contagem exata.
+    Retorna o dicionário de contagem.
+    """
+    contagem = obter_contagem(conexao, banco, tabela)
+    st.metric(rotulo, formatar_contagem(contagem))
+
+    if contagem["exato"] and contagem["atualizado_em"]:
+        st.caption(f"🕒 Contagem exata às {contagem['atualizado_em'].strftime('%H:%M:%S')}")
+    elif contagem["calculando"]:
+        st.caption("⏳ Estimativa (information_schema) - contagem exata em curso")
+    else:
+        st.caption("📐 Estimativa (information_schema)")
+
+    if st.button("🔢 Contar exato", key=f"contar_exato_{chave}_{banco}_{tabela}",
+                 disabled=contagem_em_curso(banco, tabela)):
+        invalidar_contagem(banco, tabela)
+        solicitar_contagem_exata(banco, tabela)
+        st.info("⏳ Contagem exata agendada. Atualize a página em instantes.")
+
+    return contagem
@@ -0,0 +1,604 @@
+# modules/copia_dados.py
+"""
+Cópia direta de tabelas/bancos, sem passar por backup + restore
+- Mesmo servidor: INSERT INTO destino SELECT ... FROM origem em blocos pela
+  chave (os dados não saem do servidor)
+- Outro servidor: leituras em blocos pela chave na origem e executemany no
+  destino, cada lado com seu pool de conexões
+- Ordem pelas FKs: as tabelas são agrupadas em níveis (pais antes dos
+  filhos); as tabelas de um mesmo nível são copiadas em paralelo
+- Tabelas em ciclo, autorreferentes ou com pai fora da cópia são carregadas
+  com FOREIGN_KEY_CHECKS=0 na sessão que as copia
+- Ponto de retomada por tabela (última chave confirmada) em copias/<id>.json:
+  se o processo cair, a cópia continua do último bloco confirmado
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import mysql.connector
+from mysql.connector import pooling
+import streamlit as st
+
+from .conexao_resiliente import com_retentativa, conectar
+from .grade_virtual import condicao_keyset, obter_chave_navegacao
+from .operacoes_lote import (CANCELADA, CONCLUIDA, EM_ANDAMENTO, FALHOU, cancelamento_pedido, cancelar_lote,
+                             carregar_lote, disparar_lote, encerrar_execucao, faixa_bloco, listar_lotes,
+                             proximo_limite, remover_lote, retomar_lote, salvar_lote, valor_de_json,
+                             valor_para_json)
+
+DIRETORIO_COPIAS = "copias"
+TAMANHO_BLOCO_PADRAO = 5000
+PARALELISMO_PADRAO = 4
+PARALELISMO_MAXIMO = 8
+BANCOS_SISTEMA = ("information_schema", "mysql", "performance_schema", "sys")
+
+# Estado de cada tabela dentro da cópia
+PENDENTE = "pendente"
+COPIANDO = "copiando"
+COPIADA = "copiada"
+
+_lock = threading.Lock()
+_senhas = {}        # id da cópia -> senha do servidor de destino (nunca vai para o JSON)
+
+
+# ============ SERVIDORES ============
+def configuracao_servidor(servidor=None, senha=""):
+    """Parâmetros de conexão; servidor None = o mesmo servidor local do app"""
+    if not servidor:
+        return {}
+    return {"host": servidor["host"], "port": int(servidor["port"]), "user": servidor["user"], "password": senha}
+
+
+def _conectar_lado(copia, lado, banco=None):
+    servidor = copia["destino"]["servidor"] if lado == "destino" else None
+    return conectar(banco, **configuracao_servidor(servidor, _senhas.get(copia["id"], "")))
+
+
+def _abrir_pool(copia, lado, tamanho):
+    """Pool de conexões de um lado da cópia, já no banco daquele lado"""
+    config = {"host": "localhost", "user": "root", "password": "", "port": 3306,
+              "database": copia[lado]["banco"]}
+    if lado == "destino":
+        config.update(configuracao_servidor(copia["destino"]["servidor"], _senhas.get(copia["id"], "")))
+    return com_retentativa(pooling.MySQLConnectionPool, pool_name=f"copia_{copia['id']}_{lado}"[:64],
+                           pool_size=tamanho, **config)
+
+
+def mesmo_servidor(copia):
+    return not copia["destino"]["servidor"]
+
+
+# ============ DEPENDÊNCIAS ============
+def listar_tabelas_base(conexao, banco):
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT TABLE_NAME FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
+    """, (banco,))
+    tabelas = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+    return tabelas
+
+
+def dependencias_fk(conexao, banco):
+    """{tabela: {tabelas referenciadas por FK}} (grafo de relacionamentos do banco)"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT DISTINCT TABLE_NAME, REFERENCED_TABLE_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = %s AND REFERENCED_TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+    """, (banco, banco))
+    dependencias = {}
+    for tabela, pai in cursor.fetchall():
+        dependencias.setdefault(tabela, set()).add(pai)
+    cursor.close()
+    return dependencias
+
+
+def niveis_copia(tabelas, dependencias):
+    """
+    Agrupa as tabelas em níveis: cada nível só depende dos anteriores.
+    Retorna (niveis, sem_verificacao): tabelas em ciclo, autorreferentes ou com
+    pai fora da seleção precisam de FOREIGN_KEY_CHECKS=0 para carregar.
+    """
+    selecionadas = set(tabelas)
+    sem_verificacao = {t for t in tabelas
+                       if t in dependencias.get(t, set()) or dependencias.get(t, set()) - selecionadas}
+    restantes = set(tabelas)
+    prontas = set()
+    niveis = []
+    while restantes:
+        nivel = sorted(t for t in restantes
+                       if (dependencias.get(t, set()) & selecionadas) - {t} <= prontas)
+        if not nivel:
+            # Ciclo: o que sobrou vai junto no último nível, sem verificação de FK
+            nivel = sorted(restantes)
+            sem_verificacao |= restantes
+        niveis.append(nivel)
+        prontas |= set(nivel)
+        restantes -= set(nivel)
+    return niveis, sorted(sem_verificacao)
+
+
+def _colunas_copiaveis(conexao, banco, tabela):
+    """Colunas na ordem da tabela, sem as GENERATED (não aceitam INSERT)"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND EXTRA NOT LIKE '%%GENERATED%%'
+        ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+    return colunas
+
+
+def _linhas_estimadas(conexao, banco):
+    cursor = conexao.cursor()
+    cursor.execute("SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s",
+                   (banco,))
+    estimativas = {nome: int(linhas or 0) for nome, linhas in cursor.fetchall()}
+    cursor.close()
+    return estimativas
+
+
+# ============ ESTADO ============
+def _salvar(copia, diretorio):
+    """As threads das tabelas gravam o mesmo estado: uma de cada vez"""
+    with _lock:
+        salvar_lote(copia, diretorio)
+
+
+def _atualizar(estado, **campos):
+    """
+    Muda o estado de uma tabela sob _lock: outra thread do nível pode estar
+    serializando o mesmo dicionário em _salvar
+    """
+    with _lock:
+        estado.update(campos)
+
+
+def resumo_copia(copia):
+    """{"tabelas", "copiadas", "linhas", "estimativa"}"""
+    tabelas = copia["tabelas"].values()
+    return {
+        "tabelas": len(copia["tabelas"]),
+        "copiadas": sum(1 for t in tabelas if t["estado"] == COPIADA),
+        "linhas": sum(t["linhas"] for t in tabelas),
+        "estimativa": sum(t["estimativa"] for t in tabelas),
+    }
+
+
+# ============ CÓPIA DE UMA TABELA ============
+def _copiar_no_servidor(cursor, conexao, copia, nome, estado, diretorio):
+    """Mesmo servidor: INSERT ... SELECT por faixa da chave, um commit por bloco"""
+    origem, destino = copia["origem"]["banco"], copia["destino"]["banco"]
+    colunas = ", ".join(f"`{c}`" for c in estado["colunas"])
+    insercao = f"INSERT INTO `{destino}`.`{nome}` ({colunas}) SELECT {colunas} FROM `{origem}`.`{nome}`"
+
+    if not estado["chave"]:
+        # Sem chave não há blocos: uma instrução só, refeita do zero se interrompida
+        cursor.execute(f"DELETE FROM `{destino}`.`{nome}`")
+        cursor.execute(insercao)
+        conexao.commit()
+        _atualizar(estado, linhas=cursor.rowcount)
+        return True
+
+    referencia = {"chave": estado["chave"], "banco": origem, "tabela": nome,
+                  "tamanho_bloco": copia["tamanho_bloco"]}
+    while not cancelamento_pedido(copia["id"]):
+        ultimo = tuple(valor_de_json(v) for v in estado["ultimo"]) if estado["ultimo"] else None
+        limite = proximo_limite(cursor, referencia, "1 = 1", [], ultimo)
+        if limite is None:
+            conexao.commit()
+            return True
+        faixa, valores = faixa_bloco(estado["chave"], "1 = 1", [], ultimo, limite)
+        cursor.execute(f"{insercao} WHERE {faixa}", valores)
+        copiadas = cursor.rowcount
+        conexao.commit()
+        _atualizar(estado, linhas=estado["linhas"] + copiadas,
+                   ultimo=[valor_para_json(v) for v in limite])
+        _salvar(copia, diretorio)
+    return False
+
+
+def _copiar_entre_servidores(cursor_origem, conexao_destino, copia, nome, estado, diretorio):
+    """Outro servidor: SELECT por keyset na origem, executemany no destino, um commit por bloco"""
+    colunas = ", ".join(f"`{c}`" for c in estado["colunas"])
+    cursor_destino = conexao_destino.cursor()
+    insercao = (f"INSERT INTO `{nome}` ({colunas}) "
+                f"VALUES ({', '.join(['%s'] * len(estado['colunas']))})")
+    try:
+        if not estado["chave"]:
+            # Sem chave: leitura contínua em lotes, refeita do zero se interrompida
+            cursor_destino.execute(f"DELETE FROM `{nome}`")
+            _atualizar(estado, linhas=0)
+            cursor_origem.execute(f"SELECT {colunas} FROM `{nome}`")
+            while True:
+                linhas = cursor_origem.fetchmany(copia["tamanho_bloco"])
+                if not linhas:
+                    break
+                cursor_destino.executemany(insercao, linhas)
+                _atualizar(estado, linhas=estado["linhas"] + len(linhas))
+            conexao_destino.commit()
+            return True
+
+        posicoes = [estado["colunas"].index(c) for c in estado["chave"]]
+        ordem = ", ".join(f"`{c}`" for c in estado["chave"])
+        while not cancelamento_pedido(copia["id"]):
+            condicao, valores = "1 = 1", []
+            if estado["ultimo"]:
+                ultimo = tuple(valor_de_json(v) for v in estado["ultimo"])
+                condicao, valores = condicao_keyset(estado["chave"], ultimo, ">")
+            cursor_origem.execute(f"SELECT {colunas} FROM `{nome}` WHERE {condicao} "
+                                  f"ORDER BY {ordem} LIMIT {int(copia['tamanho_bloco'])}", valores)
+            linhas = cursor_origem.fetchall()
+            if not linhas:
+                return True
+            cursor_destino.executemany(insercao, linhas)
+            conexao_destino.commit()
+            _atualizar(estado, linhas=estado["linhas"] + len(linhas),
+                       ultimo=[valor_para_json(linhas[-1][i]) for i in posicoes])
+            _salvar(copia, diretorio)
+        return False
+    finally:
+        cursor_destino.close()
+
+
+def _reconciliar(cursor, copia, nome, estado):
+    """
+    Tabela interrompida no meio: o bloco pode ter sido confirmado sem o ponto
+    de retomada ter sido gravado. A última chave presente no destino é a verdade.
+    """
+    alvo = f"`{copia['destino']['banco']}`.`{nome}`" if mesmo_servidor(copia) else f"`{nome}`"
+    ordem = ", ".join(f"`{c}` DESC" for c in estado["chave"])
+    cursor.execute(f"SELECT {', '.join(f'`{c}`' for c in estado['chave'])} FROM {alvo} ORDER BY {ordem} LIMIT 1")
+    linha = cursor.fetchone()
+    cursor.execute(f"SELECT COUNT(*) FROM {alvo}")
+    _atualizar(estado, ultimo=[valor_para_json(v) for v in linha] if linha else None,
+               linhas=int(cursor.fetchone()[0]))
+
+
+def _copiar_tabela(copia, nome, pool_origem, pool_destino, diretorio):
+    """Corpo de uma thread do nível: copia a tabela até o fim ou até o cancelamento"""
+    estado = copia["tabelas"][nome]
+    conexao_origem = pool_origem.get_connection() if pool_origem else None
+    conexao_destino = pool_destino.get_connection()
+    try:
+        inicio = time.time()
+        cursor = conexao_destino.cursor()
+        if estado["estado"] == COPIANDO and estado["chave"]:
+            _reconciliar(cursor, copia, nome, estado)
+        _atualizar(estado, estado=COPIANDO, erro=None)
+        if nome in copia["sem_verificacao"]:
+            cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+        try:
+            if conexao_origem is None:
+                concluida = _copiar_no_servidor(cursor, conexao_destino, copia, nome, estado, diretorio)
+            else:
+                cursor_origem = conexao_origem.cursor()
+                try:
+                    concluida = _copiar_entre_servidores(cursor_origem, conexao_destino, copia, nome,
+                                                         estado, diretorio)
+                finally:
+                    cursor_origem.close()
+        finally:
+            if nome in copia["sem_verificacao"]:
+                cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+            cursor.close()
+        _atualizar(estado, estado=COPIADA if concluida else estado["estado"],
+                   duracao=round(estado.get("duracao", 0) + time.time() - inicio, 3))
+    except Exception as e:
+        try:
+            conexao_destino.rollback()
+        except Exception:
+            pass
+        _atualizar(estado, erro=str(e))
+        raise
+    finally:
+        _salvar(copia, diretorio)
+        for conexao in (conexao_origem, conexao_destino):
+            if conexao is not None:
+                try:
+                    conexao.close()     # volta para o pool
+                except Exception:
+                    pass
+
+
+# ============ EXECUÇÃO ============
+def _preparar_destino(copia):
+    """CREATE DATABASE e recriação das tabelas da cópia a partir do DDL da origem"""
+    conexao_origem = _conectar_lado(copia, "origem", copia["origem"]["banco"])
+    try:
+        cursor = conexao_origem.cursor()
+        ddls = {}
+        for nome in copia["tabelas"]:
+            cursor.execute(f"SHOW CREATE TABLE `{nome}`")
+            ddls[nome] = cursor.fetchone()[1]
+        cursor.close()
+    finally:
+        conexao_origem.close()
+
+    conexao = _conectar_lado(copia, "destino")
+    try:
+        cursor = conexao.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{copia['destino']['banco']}`")
+        cursor.execute(f"USE `{copia['destino']['banco']}`")
+        cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+        for nivel in reversed(copia["niveis"]):
+            for nome in nivel:
+                cursor.execute(f"DROP TABLE IF EXISTS `{nome}`")
+        for nivel in copia["niveis"]:
+            for nome in nivel:
+                cursor.execute(ddls[nome])
+        cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+        cursor.close()
+    finally:
+        conexao.close()
+
+
+def _executar_copia(id_copia, diretorio):
+    """Thread coordenadora: prepara o destino uma vez e copia nível por nível"""
+    copia = carregar_lote(id_copia, diretorio)
+    pools = []
+    try:
+        if not copia["preparada"]:
+            _preparar_destino(copia)
+            copia["preparada"] = True
+            _salvar(copia, diretorio)
+
+        paralelismo = max(1, min(int(copia["paralelismo"]), PARALELISMO_MAXIMO))
+        pool_origem = None if mesmo_servidor(copia) else _abrir_pool(copia, "origem", paralelismo)
+        pool_destino = _abrir_pool(copia, "destino", paralelismo)
+        pools = [p for p in (pool_origem, pool_destino) if p is not None]
+
+        for nivel in copia["niveis"]:
+            faltando = [nome for nome in nivel if copia["tabelas"][nome]["estado"] != COPIADA]
+            if not faltando:
+                continue
+            # Filhos só começam depois que todos os pais deste nível terminaram
+            with ThreadPoolExecutor(max_workers=min(paralelismo, len(faltando))) as executor:
+                tarefas = [executor.submit(_copiar_tabela, copia, nome, pool_origem, pool_destino, diretorio)
+                           for nome in faltando]
+                erros = [tarefa.exception() for tarefa in tarefas if tarefa.exception()]
+            if erros:
+                raise erros[0]
+            if cancelamento_pedido(id_copia):
+                break
+
+        copia["estado"] = (CONCLUIDA if all(t["estado"] == COPIADA for t in copia["tabelas"].values())
+                           else CANCELADA)
+        copia["linhas"] = resumo_copia(copia)["linhas"]
+
+    except Exception as e:
+        copia["estado"] = FALHOU
+        copia["erro"] = str(e)
+    finally:
+        if copia["estado"] != EM_ANDAMENTO:
+            copia["concluido_em"] = datetime.now().isoformat(timespec="seconds")
+        _salvar(copia, diretorio)
+        for pool in pools:
+            try:
+                pool._remove_connections()
+            except Exception:
+                pass
+        encerrar_execucao(id_copia)
+
+
+def iniciar_copia(banco_origem, tabelas, banco_destino, servidor=None, senha="",
+                  paralelismo=PARALELISMO_PADRAO, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                  diretorio=DIRETORIO_COPIAS):
+    """
+    Registra e dispara a cópia em segundo plano. As tabelas selecionadas são
+    recriadas no destino a partir do DDL da origem.
+    servidor: None (mesmo servidor) ou {"host", "port", "user"}; a senha fica só em memória.
+    Retorna {"sucesso", "mensagem", "id"}.
+    """
+    if not tabelas:
+        return {"sucesso": False, "mensagem": "selecione ao menos uma tabela", "id": None}
+    if not servidor and banco_origem == banco_destino:
+        return {"sucesso": False, "mensagem": "no mesmo servidor o banco de destino deve ser outro", "id": None}
+
+    conexao = conectar(banco_origem)
+    try:
+        niveis, sem_verificacao = niveis_copia(tabelas, dependencias_fk(conexao, banco_origem))
+        estimativas = _linhas_estimadas(conexao, banco_origem)
+        estados = {
+            nome: {
+                "estado": PENDENTE,
+                "chave": obter_chave_navegacao(conexao, banco_origem, nome),
+                "colunas": _colunas_copiaveis(conexao, banco_origem, nome),
+                "estimativa": estimativas.get(nome, 0),
+                "ultimo": None,
+                "linhas": 0,
+                "erro": None,
+            }
+            for nome in tabelas
+        }
+    finally:
+        conexao.close()
+
+    id_copia = datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+    copia = {
+        "id": id_copia,
+        "banco": banco_origem,
+        "tabela": None,
+        "origem": {"banco": banco_origem},
+        "destino": {"banco": banco_destino, "servidor": dict(servidor) if servidor else None},
+        "niveis": niveis,
+        "sem_verificacao": sem_verificacao,
+        "tabelas": estados,
+        "paralelismo": int(paralelismo),
+        "tamanho_bloco": int(tamanho_bloco),
+        "preparada": False,
+        "estado": EM_ANDAMENTO,
+        "erro": None,
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    _senhas[id_copia] = senha
+    os.makedirs(diretorio, exist_ok=True)
+    _salvar(copia, diretorio)
+    disparar_lote(id_copia, diretorio, _executar_copia)
+    return {"sucesso": True, "id": id_copia,
+            "mensagem": f"Cópia {id_copia} iniciada: {len(tabelas)} tabela(s) em {len(niveis)} nível(is)"}
+
+
+def retomar_copia(id_copia, senha=None, diretorio=DIRETORIO_COPIAS):
+    """Continua do último bloco confirmado de cada tabela (senha: se o processo foi reiniciado)"""
+    if senha is not None:
+        _senhas[id_copia] = senha
+    return retomar_lote(id_copia, diretorio, _executar_copia)
+
+
+def listar_copias(banco=None, diretorio=DIRETORIO_COPIAS):
+    return listar_lotes(banco, diretorio=diretorio)
+
+
+# ============ COMPONENTE STREAMLIT ============
+def _listar_bancos():
+    conexao = conectar()
+    try:
+        cursor = conexao.cursor()
+        cursor.execute("SHOW DATABASES")
+        bancos = [linha[0] for linha in cursor.fetchall() if linha[0] not in BANCOS_SISTEMA]
+        cursor.close()
+    finally:
+        conexao.close()
+    return bancos
+
+
+def mostrar_copias(diretorio=DIRETORIO_COPIAS):
+    """Progresso das cópias, por tabela, com cancelar/retomar"""
+    copias = listar_copias(diretorio=diretorio)
+    if not copias:
+        return
+
+    st.write("**Cópias:**")
+    for copia in copias[:10]:
+        resumo = resumo_copia(copia)
+        servidor = copia["destino"]["servidor"]
+        destino = (f"`{servidor['host']}:{servidor['port']}`/" if servidor else "") + f"`{copia['destino']['banco']}`"
+        st.write(f"🔁 `{copia['origem']['banco']}` → {destino} — **{copia['estado']}** · "
+                 f"{resumo['copiadas']}/{resumo['tabelas']} tabela(s), {resumo['linhas']:,} linha(s) · "
+                 f"iniciada {copia['criado_em']}")
+        if resumo["estimativa"]:
+            st.progress(min(1.0, resumo["linhas"] / resumo["estimativa"]))
+        if copia.get("erro"):
+            st.error(f"Erro: {copia['erro']}")
+
+        with st.expander("Tabelas", expanded=False):
+            for numero, nivel in enumerate(copia["niveis"], 1):
+                for nome in nivel:
+                    tabela = copia["tabelas"][nome]
+                    aviso = f" ❌ {tabela['erro']}" if tabela.get("erro") else ""
+                    st.write(f"Nível {numero} · `{nome}` — {tabela['estado']} · "
+                             f"{tabela['linhas']:,} / ~{tabela['estimativa']:,}{aviso}")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if copia["rodando"] and st.button("⏹️ Cancelar", key=f"copia_cancelar_{copia['id']}"):
+                cancelar_lote(copia["id"])
+                st.info("Parada solicitada: os blocos em curso serão concluídos.")
+        with col2:
+            if not copia["rodando"] and copia["estado"] != CONCLUIDA:
+                senha = None
+                if servidor and copia["id"] not in _senhas:
+                    senha = st.text_input("Senha do destino:", type="password", key=f"copia_senha_{copia['id']}")
+                if st.button("▶️ Retomar", key=f"copia_retomar_{copia['id']}"):
+                    resultado = retomar_copia(copia["id"], senha, diretorio)
+                    (st.success if resultado["sucesso"] else st.error)(resultado["mensagem"])
+                    st.rerun()
+        with col3:
+            if not copia["rodando"] and st.button("🧹 Remover do histórico", key=f"copia_remover_{copia['id']}"):
+                remover_lote(copia["id"], diretorio)
+                st.rerun()
+
+    if any(copia["rodando"] for copia in copias) and st.button("🔄 Atualizar progresso", key="copia_atualizar"):
+        st.rerun()
+
+
+def mostrar_copia_dados():
+    """Formulário de cópia: origem, tabelas, destino (mesmo ou outro servidor), paralelismo"""
+    st.subheader("Copiar Tabelas / Banco")
+    st.caption("Cópia direta, sem arquivo intermediário: pais antes dos filhos, "
+               "tabelas independentes em paralelo, retomável do último bloco.")
+    try:
+        bancos = _listar_bancos()
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao listar bancos: {e}")
+        return
+    if not bancos:
+        st.info("📭 Nenhum banco de dados encontrado.")
+        return
+
+    banco_origem = st.selectbox("Banco de origem:", bancos, key="copia_origem")
+    try:
+        conexao = conectar(banco_origem)
+        try:
+            todas = listar_tabelas_base(conexao, banco_origem)
+            dependencias = dependencias_fk(conexao, banco_origem)
+        finally:
+            conexao.close()
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao ler a origem: {e}")
+        return
+
+    tabelas = st.multiselect("Tabelas:", todas, default=todas, key=f"copia_tabelas_{banco_origem}",
+                             help="Todas = o banco inteiro")
+
+    tipo_destino = st.radio("Destino:", ["Mesmo servidor", "Outro servidor"], horizontal=True,
+                            key="copia_tipo_destino")
+    servidor = None
+    senha = ""
+    if tipo_destino == "Outro servidor":
+        col1, col2, col3, col4 = st.columns([3, 1, 2, 2])
+        with col1:
+            host = st.text_input("Host:", key="copia_host")
+        with col2:
+            porta = st.number_input("Porta:", 1, 65535, 3306, key="copia_porta")
+        with col3:
+            usuario = st.text_input("Usuário:", "root", key="copia_usuario")
+        with col4:
+            senha = st.text_input("Senha:", type="password", key="copia_senha")
+        servidor = {"host": host, "port": int(porta), "user": usuario} if host else None
+    banco_destino = st.text_input("Banco de destino:", f"{banco_origem}_copia", key="copia_destino")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        paralelismo = st.slider("Tabelas em paralelo:", 1, PARALELISMO_MAXIMO, PARALELISMO_PADRAO,
+                                key="copia_paralelismo")
+    with col2:
+        tamanho_bloco = st.number_input("Linhas por bloco:", 500, 100_000, TAMANHO_BLOCO_PADRAO, step=500,
+                                        key="copia_bloco", help="Cada bloco é confirmado sozinho (ponto de retomada)")
+
+    if tabelas:
+        niveis, sem_verificacao = niveis_copia(tabelas, dependencias)
+        with st.expander(f"🔗 Ordem da cópia ({len(niveis)} nível(is))"):
+            for numero, nivel in enumerate(niveis, 1):
+                st.write(f"**Nível {numero}:** " + ", ".join(f"`{t}`" for t in nivel))
+            if sem_verificacao:
+                st.caption("Sem verificação de FK (ciclo, autorreferência ou pai fora da seleção): "
+                           + ", ".join(sem_verificacao))
+
+    pronto = bool(tabelas and banco_destino and (tipo_destino == "Mesmo servidor" or servidor))
+    st.warning(f"⚠️ As tabelas selecionadas serão recriadas (DROP + CREATE) em `{banco_destino}`.")
+    confirmar = st.checkbox("Entendo que os dados dessas tabelas no destino serão substituídos",
+                            key="copia_confirmar")
+    if st.button("▶️ Copiar", type="primary", key="copia_iniciar", disabled=not (pronto and confirmar)):
+        try:
+            resultado = iniciar_copia(banco_origem, tabelas, banco_destino, servidor, senha,
+                                      paralelismo, tamanho_bloco)
+        except mysql.connector.Error as e:
+            resultado = {"sucesso": False, "mensagem": str(e)}
+        if resultado["sucesso"]:
+            st.success(f"✅ {resultado['mensagem']} — acompanhe abaixo.")
+        else:
+            st.error(f"❌ {resultado['mensagem']}")
+
+    st.write("---")
+    mostrar_copias()
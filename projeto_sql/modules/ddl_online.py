@@ -0,0 +1,621 @@
+# modules/ddl_online.py
+"""
+ALTER TABLE sem travar a tabela (DDL online)
+- Pede explicitamente ALGORITHM=INSTANT e, se o servidor recusar,
+  ALGORITHM=INPLACE, LOCK=NONE: a recusa é imediata, antes de qualquer trabalho
+- A análise roda o ALTER numa cópia VAZIA da tabela (CREATE TABLE ... LIKE),
+  então dá para saber o algoritmo aceito sem tocar nos dados
+- Quando só resta cópia (ALGORITHM=COPY), tabelas pequenas são alteradas
+  direto; nas grandes o usuário escolhe entre o ALTER bloqueante e a
+  tabela sombra: tabela nova já alterada, cópia em blocos pela chave,
+  gatilhos replicando as escritas concorrentes e RENAME atômico no fim
+- Modo fila: as alterações do editor são acumuladas na sessão e aplicadas
+  num único ALTER (uma reconstrução só), com prévia do DDL e do custo
+"""
+import hashlib
+import re
+import time
+
+import mysql.connector
+import streamlit as st
+
+from .comandos_preparados import descartar_preparados
+from .conexao_resiliente import conectar
+from .contagem_registros import invalidar_contagem, obter_estimativa_registros
+from .grade_virtual import condicao_keyset, invalidar_grade, obter_chave_navegacao, obter_colunas
+
+LIMIAR_COPIA_DIRETA = 50_000    # abaixo disto (linhas estimadas) o ALTER com cópia é rápido
+TAXA_COPIA_PADRAO = 20_000      # linhas/s usadas na estimativa antes de medir
+TAMANHO_BLOCO_COPIA = 2_000
+PAUSA_ENTRE_BLOCOS = 0.05
+
+# Recusas do servidor para o algoritmo/lock pedido
+_ERROS_ALGORITMO = {
+    1845,   # ER_ALTER_OPERATION_NOT_SUPPORTED
+    1846,   # ER_ALTER_OPERATION_NOT_SUPPORTED_REASON
+    1800,   # ER_UNKNOWN_ALTER_ALGORITHM (servidor que não conhece INSTANT)
+    1064,   # servidor antigo sem ALGORITHM=INSTANT
+}
+
+ROTULOS_ALGORITMO = {
+    "INSTANT": "⚡ INSTANT (só metadados)",
+    "INPLACE": "🟢 INPLACE, LOCK=NONE (leituras e escritas liberadas)",
+    "COPY": "🐢 COPY (reconstrói a tabela)",
+}
+
+
+# ============ SQL ============
+def montar_alter(banco, tabela, clausulas, algoritmo=None):
+    """
+    ALTER TABLE com as cláusulas e, opcionalmente, o algoritmo pedido.
+    PARTITION BY / REMOVE PARTITIONING não levam vírgula e vão por último.
+    """
+    particao = [c for c in clausulas if re.match(r"\s*(PARTITION\s+BY|REMOVE\s+PARTITIONING)\b", c, re.I)]
+    partes = [c for c in clausulas if c not in particao]
+    if algoritmo == "INSTANT":
+        partes.append("ALGORITHM=INSTANT")
+    elif algoritmo == "INPLACE":
+        partes.append("ALGORITHM=INPLACE, LOCK=NONE")
+    trechos = [f"ALTER TABLE `{banco}`.`{tabela}`", ", ".join(partes)] + particao
+    return " ".join(t for t in trechos if t)
+
+
+def _nome_auxiliar(tabela, sufixo):
+    """Nome de tabela/gatilho auxiliar dentro do limite de 64 caracteres"""
+    nome = f"_{tabela}_{sufixo}"
+    if len(nome) > 64:
+        nome = f"_{hashlib.sha1(tabela.encode('utf-8')).hexdigest()[:20]}_{sufixo}"
+    return nome
+
+
+def motor_tabela(conexao, banco, tabela):
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT ENGINE FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+    """, (banco, tabela))
+    linha = cursor.fetchone()
+    cursor.close()
+    return linha[0] if linha else None
+
+
+def garantir_innodb(conexao, banco, tabela):
+    """ENGINE=InnoDB só quando a tabela ainda não é InnoDB (senão seria uma reconstrução inútil)"""
+    if (motor_tabela(conexao, banco, tabela) or "").lower() == "innodb":
+        return False
+    cursor = conexao.cursor()
+    cursor.execute(f"ALTER TABLE `{banco}`.`{tabela}` ENGINE=InnoDB")
+    cursor.close()
+    return True
+
+
+# ============ ANÁLISE ============
+def estimar_custo(conexao, banco, tabela, taxa=TAXA_COPIA_PADRAO):
+    """{"linhas", "bytes", "segundos_copia"}: tamanho da tabela e tempo estimado de uma reconstrução"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT DATA_LENGTH + INDEX_LENGTH FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+    """, (banco, tabela))
+    linha = cursor.fetchone()
+    cursor.close()
+    linhas = obter_estimativa_registros(conexao, banco, tabela) or 0
+    return {
+        "linhas": linhas,
+        "bytes": int(linha[0] or 0) if linha else 0,
+        "segundos_copia": linhas / taxa if taxa else None,
+    }
+
+
+def analisar_alter(conexao, banco, tabela, clausulas):
+    """
+    Descobre o algoritmo menos bloqueante aceito, testando numa cópia vazia.
+    Retorna {"algoritmo": "INSTANT"|"INPLACE"|"COPY"|None, "erro": str|None, **estimar_custo}.
+    algoritmo None = o ALTER falha mesmo sem dados (erro de sintaxe, coluna inexistente...).
+    """
+    teste = _nome_auxiliar(tabela, "ddl_teste")
+    cursor = conexao.cursor()
+    resultado = {"algoritmo": None, "erro": None}
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS `{banco}`.`{teste}`")
+        cursor.execute(f"CREATE TABLE `{banco}`.`{teste}` LIKE `{banco}`.`{tabela}`")
+        for algoritmo in ("INSTANT", "INPLACE", None):
+            try:
+                cursor.execute(montar_alter(banco, teste, clausulas, algoritmo))
+                resultado["algoritmo"] = algoritmo or "COPY"
+                break
+            except mysql.connector.Error as e:
+                if algoritmo is None or e.errno not in _ERROS_ALGORITMO:
+                    resultado["erro"] = str(e)
+                    break
+    finally:
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS `{banco}`.`{teste}`")
+        finally:
+            cursor.close()
+    resultado.update(estimar_custo(conexao, banco, tabela))
+    return resultado
+
+
+# ============ EXECUÇÃO DIRETA ============
+def aplicar_alter(conexao, banco, tabela, clausulas, permitir_copia=None):
+    """
+    Executa o ALTER com INSTANT, depois INPLACE/LOCK=NONE.
+    Se só houver COPY: executa quando a tabela é pequena (ou permitir_copia=True);
+    nas grandes devolve pendente=True para o usuário escolher o modo.
+    Retorna {"sucesso", "mensagem", "algoritmo", "pendente"}.
+    """
+    cursor = conexao.cursor()
+    try:
+        for algoritmo in ("INSTANT", "INPLACE"):
+            try:
+                cursor.execute(montar_alter(banco, tabela, clausulas, algoritmo))
+                return {"sucesso": True, "algoritmo": algoritmo, "pendente": False,
+                        "mensagem": f"Alteração aplicada com ALGORITHM={algoritmo}"}
+            except mysql.connector.Error as e:
+                if e.errno not in _ERROS_ALGORITMO:
+                    return {"sucesso": False, "algoritmo": None, "pendente": False, "mensagem": str(e)}
+
+        if permitir_copia is None:
+            linhas = obter_estimativa_registros(conexao, banco, tabela) or 0
+            permitir_copia = linhas < LIMIAR_COPIA_DIRETA
+        if not permitir_copia:
+            return {"sucesso": False, "algoritmo": "COPY", "pendente": True,
+                    "mensagem": "Esta alteração exige reconstruir a tabela (ALGORITHM=COPY)"}
+
+        try:
+            cursor.execute(montar_alter(banco, tabela, clausulas))
+        except mysql.connector.Error as e:
+            return {"sucesso": False, "algoritmo": "COPY", "pendente": False, "mensagem": str(e)}
+        return {"sucesso": True, "algoritmo": "COPY", "pendente": False,
+                "mensagem": "Alteração aplicada com cópia da tabela (ALGORITHM=COPY)"}
+    finally:
+        cursor.close()
+        invalidar_grade(banco, tabela)
+        # Comandos preparados da tabela foram planejados com a estrutura antiga
+        descartar_preparados(conexao, tabela)
+
+
+# ============ TABELA SOMBRA ============
+def referencias_externas(conexao, banco, tabela):
+    """FKs que impedem a tabela sombra: [(tabela, constraint)] de/para a tabela"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT TABLE_NAME, CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE REFERENCED_TABLE_NAME IS NOT NULL
+          AND ((TABLE_SCHEMA = %s AND TABLE_NAME = %s)
+               OR (REFERENCED_TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME = %s))
+        GROUP BY TABLE_NAME, CONSTRAINT_NAME
+    """, (banco, tabela, banco, tabela))
+    referencias = cursor.fetchall()
+    cursor.close()
+    return referencias
+
+
+def gatilhos_da_tabela(conexao, banco, tabela):
+    """TRIGGERs da própria tabela: o RENAME da troca os deixaria na tabela antiga"""
+    cursor = conexao.cursor()
+    cursor.execute("SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+                   "WHERE EVENT_OBJECT_SCHEMA = %s AND EVENT_OBJECT_TABLE = %s", (banco, tabela))
+    gatilhos = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+    return gatilhos
+
+
+def _renomeacoes(clausulas):
+    """{antigo: novo} das cláusulas CHANGE COLUMN / RENAME COLUMN"""
+    renomes = {}
+    for clausula in clausulas:
+        m = (re.match(r"\s*CHANGE\s+(?:COLUMN\s+)?`([^`]+)`\s+`([^`]+)`", clausula, re.I)
+             or re.match(r"\s*RENAME\s+COLUMN\s+`([^`]+)`\s+TO\s+`([^`]+)`", clausula, re.I))
+        if m:
+            renomes[m.group(1)] = m.group(2)
+    return renomes
+
+
+def _gatilhos(banco, tabela, nova, origem, destino, chave):
+    """SQL dos gatilhos que replicam INSERT/UPDATE/DELETE da tabela original na sombra"""
+    alvo = f"`{banco}`.`{nova}`"
+    lista_destino = ", ".join(f"`{c}`" for c in destino)
+    novos = ", ".join(f"NEW.`{c}`" for c in origem)
+    mapa = dict(zip(origem, destino))
+    onde_antigo = " AND ".join(f"`{mapa[c]}` <=> OLD.`{c}`" for c in chave)
+    substituir = f"REPLACE INTO {alvo} ({lista_destino}) VALUES ({novos})"
+    excluir = f"DELETE IGNORE FROM {alvo} WHERE {onde_antigo}"
+    base = f"ON `{banco}`.`{tabela}` FOR EACH ROW"
+    return {
+        _nome_auxiliar(tabela, "osc_ins"): f"AFTER INSERT {base} {substituir}",
+        _nome_auxiliar(tabela, "osc_upd"): f"AFTER UPDATE {base} BEGIN {excluir}; {substituir}; END",
+        _nome_auxiliar(tabela, "osc_del"): f"AFTER DELETE {base} {excluir}",
+    }
+
+
+def _limite_bloco(cursor, banco, tabela, chave, ultimo, tamanho):
+    """Chave da última linha do próximo bloco (None quando acabou)"""
+    colunas = ", ".join(f"`{c}`" for c in chave)
+    onde, params = ("", [])
+    if ultimo is not None:
+        condicao, params = condicao_keyset(chave, ultimo, ">")
+        onde = f"WHERE {condicao}"
+    base = f"SELECT {colunas} FROM `{banco}`.`{tabela}` {onde} ORDER BY "
+    cursor.execute(base + ", ".join(f"`{c}`" for c in chave) + f" LIMIT 1 OFFSET {int(tamanho) - 1}", params)
+    linha = cursor.fetchone()
+    if linha is None:
+        cursor.execute(base + ", ".join(f"`{c}` DESC" for c in chave) + " LIMIT 1", params)
+        linha = cursor.fetchone()
+    return tuple(linha) if linha else None
+
+
+def copiar_com_tabela_sombra(banco, tabela, clausulas, ao_progredir=None, manter_antiga=True,
+                             tamanho_bloco=TAMANHO_BLOCO_COPIA, pausa=PAUSA_ENTRE_BLOCOS):
+    """
+    Alteração online por tabela sombra (conexão própria, autocommit).
+    A troca só acontece se a sombra tiver o mesmo nº de linhas da original;
+    por padrão a original fica guardada como _<tabela>_antigo.
+    ao_progredir(copiadas, total_estimado, segundos_restantes) a cada bloco.
+    Retorna {"sucesso", "mensagem", "copiadas", "duracao"}.
+    """
+    inicio = time.time()
+    nova = _nome_auxiliar(tabela, "novo")
+    antiga = _nome_auxiliar(tabela, "antigo")
+    conexao = conectar(banco, autocommit=True)
+    cursor = conexao.cursor()
+    gatilhos = {}
+    renomeada = False
+    copiadas = 0
+    try:
+        if referencias_externas(conexao, banco, tabela):
+            return {"sucesso": False, "copiadas": 0, "duracao": 0.0,
+                    "mensagem": "a tabela participa de FOREIGN KEYs: a tabela sombra não as preservaria"}
+        if gatilhos_da_tabela(conexao, banco, tabela):
+            return {"sucesso": False, "copiadas": 0, "duracao": 0.0,
+                    "mensagem": "a tabela tem TRIGGERs próprios: na troca eles ficariam com a tabela antiga"}
+        chave = obter_chave_navegacao(conexao, banco, tabela)
+        if not chave:
+            return {"sucesso": False, "copiadas": 0, "duracao": 0.0,
+                    "mensagem": "a tabela sombra exige PRIMARY KEY ou UNIQUE NOT NULL"}
+        cursor.execute("SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+                       (banco, antiga))
+        if cursor.fetchone():
+            return {"sucesso": False, "copiadas": 0, "duracao": 0.0,
+                    "mensagem": f"`{antiga}` (original de uma troca anterior) ainda existe: remova-a antes"}
+
+        # 1. Tabela nova, vazia, já com a alteração
+        cursor.execute(f"DROP TABLE IF EXISTS `{banco}`.`{nova}`")
+        cursor.execute(f"CREATE TABLE `{banco}`.`{nova}` LIKE `{banco}`.`{tabela}`")
+        cursor.execute(montar_alter(banco, nova, clausulas))
+
+        # 2. Colunas que existem nas duas (seguindo renomeações)
+        renomes = _renomeacoes(clausulas)
+        colunas_novas = {nome for nome, _ in obter_colunas(conexao, banco, nova)}
+        origem, destino = [], []
+        for nome, _ in obter_colunas(conexao, banco, tabela):
+            if renomes.get(nome, nome) in colunas_novas:
+                origem.append(nome)
+                destino.append(renomes.get(nome, nome))
+        if any(c not in origem for c in chave):
+            raise ValueError("a alteração remove colunas da chave: a cópia por blocos não é possível")
+
+        # 3. Gatilhos: escritas concorrentes vão também para a sombra
+        for nome, corpo in _gatilhos(banco, tabela, nova, origem, destino, chave).items():
+            cursor.execute(f"CREATE TRIGGER `{banco}`.`{nome}` {corpo}")
+            gatilhos[nome] = True
+
+        # 4. Cópia em blocos pela chave. Sem IGNORE (que viraria truncamento/conversão em aviso):
+        #    só a linha que os gatilhos já gravaram (mais nova) é mantida como está
+        total = obter_estimativa_registros(conexao, banco, tabela) or 0
+        lista_origem = ", ".join(f"`{c}`" for c in origem)
+        lista_destino = ", ".join(f"`{c}`" for c in destino)
+        # Qualificada: a coluna existe na sombra e na original (sem isso, erro 1052 de ambiguidade)
+        chave_destino = f"`{banco}`.`{nova}`.`{renomes.get(chave[0], chave[0])}`"
+        ultimo = None
+        inicio_copia = time.time()
+        while True:
+            limite = _limite_bloco(cursor, banco, tabela, chave, ultimo, tamanho_bloco)
+            if limite is None:
+                break
+            condicoes, params = [], []
+            if ultimo is not None:
+                condicao, params = condicao_keyset(chave, ultimo, ">")
+                condicoes.append(condicao)
+            condicao, params_limite = condicao_keyset(chave, limite, ">")
+            condicoes.append(f"NOT {condicao}")
+            cursor.execute(
+                f"INSERT INTO `{banco}`.`{nova}` ({lista_destino}) "
+                f"SELECT {lista_origem} FROM `{banco}`.`{tabela}` "
+                f"WHERE {' AND '.join(condicoes)} LOCK IN SHARE MODE "
+                f"ON DUPLICATE KEY UPDATE {chave_destino} = {chave_destino}",
+                list(params) + list(params_limite)
+            )
+            copiadas += cursor.rowcount
+            ultimo = limite
+
+            if ao_progredir:
+                decorrido = time.time() - inicio_copia
+                taxa = copiadas / decorrido if decorrido > 0 else TAXA_COPIA_PADRAO
+                restantes = max(0, total - copiadas) / taxa if taxa else None
+                ao_progredir(copiadas, max(total, copiadas), restantes)
+            if pausa:
+                time.sleep(pausa)
+
+        # 5. Conferência: as duas contagens no mesmo comando leem o mesmo snapshot
+        #    (os gatilhos gravam na mesma transação da escrita original)
+        cursor.execute(f"SELECT (SELECT COUNT(*) FROM `{banco}`.`{tabela}`), "
+                       f"(SELECT COUNT(*) FROM `{banco}`.`{nova}`)")
+        linhas_original, linhas_sombra = cursor.fetchone()
+        if linhas_original != linhas_sombra:
+            raise ValueError(f"a tabela sombra tem {linhas_sombra:,} linhas e a original {linhas_original:,} "
+                             "(ex: duplicatas num novo índice UNIQUE); a original não foi alterada")
+
+        # 6. Troca atômica; os gatilhos vão junto com a tabela antiga e são removidos
+        cursor.execute(f"RENAME TABLE `{banco}`.`{tabela}` TO `{banco}`.`{antiga}`, "
+                       f"`{banco}`.`{nova}` TO `{banco}`.`{tabela}`")
+        renomeada = True
+        for nome in list(gatilhos):
+            cursor.execute(f"DROP TRIGGER IF EXISTS `{banco}`.`{nome}`")
+            gatilhos.pop(nome)
+        if not manter_antiga:
+            cursor.execute(f"DROP TABLE `{banco}`.`{antiga}`")
+
+        return {"sucesso": True, "copiadas": copiadas, "duracao": round(time.time() - inicio, 1),
+                "mensagem": f"Tabela reconstruída online: {copiadas:,} linhas copiadas"
+                            + (f" (original mantida como `{antiga}`)" if manter_antiga else "")}
+
+    except (mysql.connector.Error, ValueError) as e:
+        return {"sucesso": False, "copiadas": copiadas, "duracao": round(time.time() - inicio, 1),
+                "mensagem": str(e)}
+    finally:
+        # Falha antes da troca: a original continua intacta, só limpa os auxiliares
+        for nome in gatilhos:
+            try:
+                cursor.execute(f"DROP TRIGGER IF EXISTS `{banco}`.`{nome}`")
+            except mysql.connector.Error:
+                pass
+        if not renomeada:
+            try:
+                cursor.execute(f"DROP TABLE IF EXISTS `{banco}`.`{nova}`")
+            except mysql.connector.Error:
+                pass
+        cursor.close()
+        conexao.close()
+        invalidar_grade(banco, tabela)
+        invalidar_contagem(banco, tabela)
+
+
+# ============ COMPONENTES STREAMLIT ============
+def _formatar_duracao(segundos):
+    if segundos is None:
+        return "?"
+    if segundos < 60:
+        return f"{segundos:.0f}s"
+    if segundos < 3600:
+        return f"{segundos / 60:.1f} min"
+    return f"{segundos / 3600:.1f} h"
+
+
+def registrar_pendente(banco, tabela, clausulas, descricao):
+    """Guarda na sessão um ALTER que exige cópia, para o usuário escolher o modo"""
+    st.session_state[f"ddl_pendente_{banco}_{tabela}"] = {"clausulas": list(clausulas), "descricao": descricao}
+
+
+def mostrar_ddl_pendente(conexao, banco, tabela):
+    """
+    Painel do ALTER que só roda com cópia da tabela: estimativa de tempo,
+    ALTER bloqueante x tabela sombra online. Retorna True se havia pendência.
+    """
+    chave = f"ddl_pendente_{banco}_{tabela}"
+    pendente = st.session_state.get(chave)
+    if not pendente:
+        return False
+
+    with st.container(border=True):
+        st.markdown(f"##### ⏳ Alteração pendente: {pendente['descricao']}")
+        st.code(montar_alter(banco, tabela, pendente["clausulas"]), language="sql")
+
+        custo = estimar_custo(conexao, banco, tabela)
+        st.warning(
+            f"O servidor não aceita INSTANT nem INPLACE/LOCK=NONE para esta alteração: "
+            f"a tabela (~{custo['linhas']:,} linhas, {custo['bytes'] / 1024 / 1024:.1f} MB) "
+            f"precisa ser reconstruída. Tempo estimado: ~{_formatar_duracao(custo['segundos_copia'])}."
+        )
+
+        modo = st.radio(
+            "Como aplicar:",
+            ["🌓 Tabela sombra (online)", "🔒 ALTER direto (bloqueia escritas durante a cópia)"],
+            key=f"{chave}_modo"
+        )
+        manter = False
+        if modo.startswith("🌓"):
+            referencias = referencias_externas(conexao, banco, tabela)
+            if referencias:
+                st.error("A tabela participa de FOREIGN KEYs "
+                         f"({', '.join(f'{t}.{c}' for t, c in referencias)}): use o ALTER direto.")
+            gatilhos = gatilhos_da_tabela(conexao, banco, tabela)
+            if gatilhos:
+                st.error(f"A tabela tem TRIGGERs ({', '.join(gatilhos)}): use o ALTER direto.")
+            manter = st.checkbox("Manter a tabela original (renomeada) após a troca", value=True,
+                                 key=f"{chave}_manter")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("▶️ Aplicar", type="primary", key=f"{chave}_aplicar"):
+                if modo.startswith("🌓"):
+                    barra = st.progress(0.0)
+                    status = st.empty()
+
+                    def progresso(copiadas, total, restantes):
+                        barra.progress(min(1.0, copiadas / total) if total else 1.0)
+                        status.text(f"{copiadas:,} de ~{total:,} linhas · "
+                                    f"restante ~{_formatar_duracao(restantes)}")
+
+                    resultado = copiar_com_tabela_sombra(banco, tabela, pendente["clausulas"],
+                                                         progresso, manter_antiga=manter)
+                    # A cópia usa conexão própria; os preparados da sessão apontam para a tabela trocada
+                    descartar_preparados(conexao, tabela)
+                else:
+                    resultado = aplicar_alter(conexao, banco, tabela, pendente["clausulas"],
+                                              permitir_copia=True)
+                if resultado["sucesso"]:
+                    st.session_state.pop(chave, None)
+                    st.success(f"✅ {resultado['mensagem']}")
+                else:
+                    st.error(f"❌ {resultado['mensagem']}")
+        with col2:
+            if st.button("❌ Descartar", key=f"{chave}_descartar"):
+                st.session_state.pop(chave, None)
+                st.rerun()
+    return True
+
+
+def executar_alter_interativo(conexao, banco, tabela, clausulas, descricao):
+    """
+    Para os formulários de edição: no modo fila só enfileira; senão aplica
+    online quando possível e, se a alteração exigir cópia de uma tabela
+    grande, deixa pendente para escolha.
+    Retorna o resultado de aplicar_alter (+ "enfileirado").
+    """
+    if modo_fila(banco, tabela):
+        for clausula in clausulas:
+            enfileirar(banco, tabela, clausula, descricao)
+        return {"sucesso": True, "algoritmo": None, "pendente": False, "enfileirado": True,
+                "mensagem": f"Alteração enfileirada: {descricao}"}
+    resultado = aplicar_alter(conexao, banco, tabela, clausulas)
+    if resultado["pendente"]:
+        registrar_pendente(banco, tabela, clausulas, descricao)
+    return resultado
+
+
+# ============ FILA DE ALTERAÇÕES ============
+def _chave_fila(banco, tabela):
+    return f"ddl_fila_{banco}_{tabela}"
+
+
+def modo_fila(banco, tabela):
+    """True quando o editor está acumulando alterações em vez de executá-las"""
+    return bool(st.session_state.get(f"ddl_modo_fila_{banco}_{tabela}"))
+
+
+def fila_alteracoes(banco, tabela):
+    """[{"clausula", "descricao"}] na ordem em que foram enfileiradas"""
+    return st.session_state.setdefault(_chave_fila(banco, tabela), [])
+
+
+def enfileirar(banco, tabela, clausula, descricao):
+    """Acrescenta uma cláusula à fila (cláusula repetida, ex: ENGINE=InnoDB, entra uma vez só)"""
+    fila = fila_alteracoes(banco, tabela)
+    if all(item["clausula"] != clausula for item in fila):
+        fila.append({"clausula": clausula, "descricao": descricao})
+
+
+def descrever_analise(analise):
+    """Texto do custo previsto a partir de analisar_alter"""
+    algoritmo = analise["algoritmo"]
+    if algoritmo == "INSTANT":
+        return "⚡ INSTANT: só metadados, sem reconstruir a tabela"
+    tamanho = f"~{analise['linhas']:,} linhas, {analise['bytes'] / 1024 / 1024:.1f} MB"
+    tempo = _formatar_duracao(analise["segundos_copia"])
+    if algoritmo == "INPLACE":
+        return (f"🟢 INPLACE, LOCK=NONE: reconstrução/índice online ({tamanho}), "
+                f"leituras e escritas liberadas; ~{tempo}")
+    return f"🐢 COPY: reconstrução com cópia ({tamanho}), escritas bloqueadas; ~{tempo}"
+
+
+def _formulario_indice(conexao, banco, tabela):
+    """Enfileira ADD INDEX / DROP INDEX"""
+    colunas = [nome for nome, _ in obter_colunas(conexao, banco, tabela)]
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY'
+        ORDER BY INDEX_NAME
+    """, (banco, tabela))
+    indices = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("###### ➕ Novo índice")
+        escolhidas = st.multiselect("Colunas (na ordem)", colunas, key=f"fila_idx_colunas_{banco}_{tabela}")
+        unico = st.checkbox("UNIQUE", key=f"fila_idx_unico_{banco}_{tabela}")
+        nome = st.text_input("Nome", value=f"idx_{'_'.join(escolhidas)}"[:64] if escolhidas else "",
+                             key=f"fila_idx_nome_{banco}_{tabela}_{'_'.join(escolhidas)}")
+        if st.button("📥 Enfileirar índice", disabled=not (escolhidas and nome), key=f"fila_idx_add_{banco}_{tabela}"):
+            lista = ", ".join(f"`{c}`" for c in escolhidas)
+            enfileirar(banco, tabela, f"ADD {'UNIQUE ' if unico else ''}INDEX `{nome}` ({lista})",
+                       f"índice `{nome}` ({', '.join(escolhidas)})")
+            st.rerun()
+    with col2:
+        st.markdown("###### ➖ Remover índice")
+        if indices:
+            indice = st.selectbox("Índice", indices, key=f"fila_idx_remover_{banco}_{tabela}")
+            if st.button("📥 Enfileirar remoção", key=f"fila_idx_drop_{banco}_{tabela}"):
+                enfileirar(banco, tabela, f"DROP INDEX `{indice}`", f"remover o índice `{indice}`")
+                st.rerun()
+        else:
+            st.caption("Sem índices secundários")
+
+
+def mostrar_fila_alteracoes(conexao, banco, tabela):
+    """
+    Painel do modo fila: liga/desliga, lista as alterações, prévia do ALTER
+    combinado com o algoritmo aceito e o custo estimado, aplica tudo de uma vez
+    """
+    st.toggle(
+        "📦 Acumular alterações e aplicar num único ALTER TABLE",
+        key=f"ddl_modo_fila_{banco}_{tabela}",
+        help="Cada ALTER separado pode reconstruir a tabela; enfileiradas, elas viram uma reconstrução só"
+    )
+    fila = fila_alteracoes(banco, tabela)
+    if not modo_fila(banco, tabela) and not fila:
+        return
+
+    with st.container(border=True):
+        st.markdown(f"##### 📦 Alterações enfileiradas ({len(fila)})")
+        if modo_fila(banco, tabela):
+            with st.expander("🔑 Índices", expanded=False):
+                _formulario_indice(conexao, banco, tabela)
+
+        if not fila:
+            st.caption("Use as ações acima: com o modo fila ligado elas entram aqui em vez de executar.")
+            return
+
+        for i, item in enumerate(fila):
+            col1, col2 = st.columns([6, 1])
+            with col1:
+                st.markdown(f"{i + 1}. {item['descricao']}  \n`{item['clausula']}`")
+            with col2:
+                if st.button("🗑️", key=f"fila_remover_{banco}_{tabela}_{i}"):
+                    fila.pop(i)
+                    st.rerun()
+
+        clausulas = [item["clausula"] for item in fila]
+        st.code(montar_alter(banco, tabela, clausulas), language="sql")
+
+        if st.button("🔍 Analisar custo", key=f"fila_analisar_{banco}_{tabela}"):
+            try:
+                analise = analisar_alter(conexao, banco, tabela, clausulas)
+                if analise["algoritmo"] is None:
+                    st.error(f"❌ O ALTER combinado falha: {analise['erro']}")
+                else:
+                    st.info(descrever_analise(analise))
+                    if len(fila) > 1 and analise["algoritmo"] != "INSTANT":
+                        st.caption(f"Separadas, estas {len(fila)} alterações poderiam reconstruir "
+                                   f"a tabela até {len(fila)} vezes.")
+            except mysql.connector.Error as e:
+                st.error(f"❌ Não foi possível analisar: {e}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✅ Aplicar tudo", type="primary", key=f"fila_aplicar_{banco}_{tabela}"):
+                descricao = "; ".join(item["descricao"] for item in fila)
+                resultado = aplicar_alter(conexao, banco, tabela, clausulas)
+                if resultado["pendente"]:
+                    registrar_pendente(banco, tabela, clausulas, descricao)
+                if resultado["sucesso"] or resultado["pendente"]:
+                    fila.clear()
+                    st.rerun()
+                st.error(f"❌ {resultado['mensagem']}")
+        with col2:
+            if st.button("🧹 Limpar fila", key=f"fila_limpar_{banco}_{tabela}"):
+                fila.clear()
+                st.rerun()
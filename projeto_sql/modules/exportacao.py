@@ -0,0 +1,368 @@
+# modules/exportacao.py
+"""
+Exportação em streaming (CSV, NDJSON, Excel, Parquet, Arrow)
+As linhas vêm de um cursor não bufferizado, em lotes de TAMANHO_LOTE,
+direto para um arquivo temporário (opcionalmente .gz).
+Nem o DataFrame nem uma cópia do arquivo em memória são montados:
+exportar 10 milhões de linhas usa memória constante.
+Um resultado já lido (ex: Editor SQL) é exportado das linhas em memória,
+sem executar a consulta de novo.
+"""
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import streamlit as st
+
+from .conexao_resiliente import conectar
+from .colunar import FORMATOS_COLUNARES, escrever_colunar, schema_da_tabela
+
+TAMANHO_LOTE = 5000
+LINHAS_POR_PLANILHA = 1_048_575   # limite do Excel (menos o cabeçalho)
+PREFIXO_TEMP = "projeto_sql_export_"
+IDADE_MAXIMA_TEMP = 6 * 3600      # arquivos órfãos são apagados após 6h
+LIMITE_DOWNLOAD = 200 * 1024 * 1024   # acima disto o arquivo não passa pelo navegador
+DIRETORIO_EXPORTACOES = "exportacoes"
+
+# formato -> (extensão, mime, aceita gzip)
+FORMATOS = {
+    "CSV": ("csv", "text/csv", True),
+    "NDJSON": ("ndjson", "application/x-ndjson", True),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", False),
+    # Colunares: compressão zstd interna, gzip por fora não ajuda
+    "Parquet": FORMATOS_COLUNARES["Parquet"] + (False,),
+    "Arrow": FORMATOS_COLUNARES["Arrow"] + (False,),
+}
+
+
+# ============ CONVERSÃO DE VALORES ============
+def _valor_texto(valor):
+    """Valor para CSV (None vira vazio, bytes em hexadecimal)"""
+    if valor is None:
+        return ""
+    if isinstance(valor, (bytes, bytearray)):
+        return valor.hex()
+    return valor
+
+
+def _valor_json(valor):
+    """default= do json.dumps para os tipos do MySQL"""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)  # preserva a precisão
+    if isinstance(valor, timedelta):
+        return str(valor)
+    if isinstance(valor, (bytes, bytearray)):
+        return valor.hex()
+    if isinstance(valor, set):
+        return sorted(valor)
+    return str(valor)
+
+
+def _valor_excel(valor, caracteres_ilegais):
+    """Valor aceito pelo openpyxl"""
+    if isinstance(valor, (bytes, bytearray)):
+        return valor.hex()
+    if isinstance(valor, set):
+        return ",".join(sorted(valor))
+    if isinstance(valor, str):
+        return caracteres_ilegais.sub("", valor)
+    return valor
+
+
+# ============ LEITURA EM LOTES ============
+def _lotes(cursor, tamanho=TAMANHO_LOTE):
+    """Gera listas de linhas com fetchmany até o fim do resultado"""
+    while True:
+        linhas = cursor.fetchmany(tamanho)
+        if not linhas:
+            break
+        yield linhas
+
+
+class ResultadoLido:
+    """Linhas já lidas com a interface de cursor que os escritores usam (description/fetchmany)"""
+
+    def __init__(self, description, linhas):
+        self.description = description
+        self._linhas = linhas
+        self._posicao = 0
+
+    def fetchmany(self, tamanho):
+        lote = self._linhas[self._posicao:self._posicao + tamanho]
+        self._posicao += len(lote)
+        return lote
+
+    def close(self):
+        pass
+
+
+# ============ ESCRITORES ============
+def _abrir_texto(caminho, comprimir):
+    if comprimir:
+        return gzip.open(caminho, "wt", encoding="utf-8", newline="")
+    return open(caminho, "w", encoding="utf-8", newline="")
+
+
+def _escrever_csv(cursor, colunas, caminho, comprimir, ao_progredir):
+    total = 0
+    with _abrir_texto(caminho, comprimir) as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(colunas)
+        for linhas in _lotes(cursor):
+            escritor.writerows([_valor_texto(v) for v in linha] for linha in linhas)
+            total += len(linhas)
+            if ao_progredir:
+                ao_progredir(total)
+    return total
+
+
+def _escrever_ndjson(cursor, colunas, caminho, comprimir, ao_progredir):
+    total = 0
+    with _abrir_texto(caminho, comprimir) as arquivo:
+        for linhas in _lotes(cursor):
+            arquivo.writelines(
+                json.dumps(dict(zip(colunas, linha)), default=_valor_json, ensure_ascii=False) + "\n"
+                for linha in linhas
+            )
+            total += len(linhas)
+            if ao_progredir:
+                ao_progredir(total)
+    return total
+
+
+def _escrever_excel(cursor, colunas, caminho, comprimir, ao_progredir):
+    # Workbook write-only: cada linha vai para o disco, nada fica em memória
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    livro = Workbook(write_only=True)
+    planilha = None
+    linhas_planilha = LINHAS_POR_PLANILHA
+    total = 0
+
+    for linhas in _lotes(cursor):
+        for linha in linhas:
+            if linhas_planilha >= LINHAS_POR_PLANILHA:
+                planilha = livro.create_sheet(f"Dados_{len(livro.worksheets) + 1}")
+                planilha.append(list(colunas))
+                linhas_planilha = 0
+            planilha.append([_valor_excel(v, ILLEGAL_CHARACTERS_RE) for v in linha])
+            linhas_planilha += 1
+        total += len(linhas)
+        if ao_progredir:
+            ao_progredir(total)
+
+    if planilha is None:
+        livro.create_sheet("Dados_1").append(list(colunas))
+
+    livro.save(caminho)
+    return total
+
+
+_ESCRITORES = {
+    "CSV": _escrever_csv,
+    "NDJSON": _escrever_ndjson,
+    "Excel": _escrever_excel,
+}
+
+
+# ============ ARQUIVOS TEMPORÁRIOS ============
+def limpar_exportacoes_antigas(idade_maxima=IDADE_MAXIMA_TEMP):
+    """Apaga arquivos de exportação esquecidos no diretório temporário"""
+    limite = time.time() - idade_maxima
+    pasta = tempfile.gettempdir()
+    for nome in os.listdir(pasta):
+        if nome.startswith(PREFIXO_TEMP):
+            caminho = os.path.join(pasta, nome)
+            try:
+                if os.path.getmtime(caminho) < limite:
+                    os.remove(caminho)
+            except OSError:
+                pass
+
+
+def remover_exportacao(resultado):
+    """Apaga o arquivo temporário de uma exportação (os salvos no servidor ficam)"""
+    if resultado and resultado.get("caminho") and not resultado.get("salvo"):
+        try:
+            os.remove(resultado["caminho"])
+        except OSError:
+            pass
+
+
+def salvar_no_servidor(resultado, diretorio=DIRETORIO_EXPORTACOES):
+    """
+    Move o arquivo temporário para diretorio (fora da limpeza de temporários).
+    Retorna o caminho absoluto; levanta OSError em caso de falha.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    base, extensao = resultado["nome_arquivo"].split(".", 1)
+    carimbo = time.strftime("%Y%m%d_%H%M%S")
+    destino = os.path.abspath(os.path.join(diretorio, f"{base}_{carimbo}.{extensao}"))
+    shutil.move(resultado["caminho"], destino)
+    return destino
+
+
+# ============ EXPORTAÇÃO ============
+def exportar_consulta(sql, params=None, banco=None, formato="CSV", comprimir=False,
+                      nome_base="export", ao_progredir=None, tabela=None, resultado=None):
+    """
+    Executa a consulta numa conexão própria com cursor não bufferizado e
+    grava o resultado em lotes num arquivo temporário.
+    tabela: nos formatos colunares, os tipos vêm do DESCRIBE desta tabela.
+    resultado: (description, linhas) já lidos; grava deles sem ir ao servidor.
+
+    Retorna {"caminho", "nome_arquivo", "mime", "linhas", "bytes", "duracao"}.
+    Levanta mysql.connector.Error / OSError em caso de falha.
+    """
+    extensao, mime, aceita_gzip = FORMATOS[formato]
+    comprimir = comprimir and aceita_gzip
+    if comprimir:
+        extensao += ".gz"
+        mime = "application/gzip"
+
+    inicio = time.time()
+    # Conexão dedicada: um cursor não bufferizado bloqueia a conexão até o fim
+    conexao = conectar(banco) if resultado is None else None
+
+    descritor, caminho = tempfile.mkstemp(prefix=PREFIXO_TEMP, suffix="." + extensao)
+    os.close(descritor)
+    try:
+        # DESCRIBE antes: o cursor não bufferizado ocupa a conexão até o fim
+        schema = None
+        if conexao and tabela and formato in FORMATOS_COLUNARES:
+            schema = schema_da_tabela(conexao, tabela)
+
+        if conexao:
+            cursor = conexao.cursor(buffered=False)
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+        else:
+            cursor = ResultadoLido(*resultado)
+        try:
+            if formato in FORMATOS_COLUNARES:
+                linhas = escrever_colunar(cursor, caminho, formato, schema, ao_progredir)
+            else:
+                colunas = [desc[0] for desc in cursor.description or []]
+                linhas = _ESCRITORES[formato](cursor, colunas, caminho, comprimir, ao_progredir)
+        finally:
+            cursor.close()
+    except Exception:
+        os.remove(caminho)
+        raise
+    finally:
+        if conexao:
+            conexao.close()
+
+    return {
+        "caminho": caminho,
+        "nome_arquivo": f"{nome_base}.{extensao}",
+        "mime": mime,
+        "linhas": linhas,
+        "bytes": os.path.getsize(caminho),
+        "duracao": time.time() - inicio,
+    }
+
+
+# ============ COMPONENTE STREAMLIT ============
+def mostrar_exportacao(sql, params=None, banco=None, nome_base="export", chave="export",
+                       tabela=None, resultado=None):
+    """
+    Componente: escolha de formato + gzip, geração do arquivo em streaming
+    e botão de download. O último arquivo gerado fica na sessão até ser
+    substituído (ou até a limpeza de arquivos antigos).
+    O arquivo só é lido para o botão de download quando acabou de ser gerado
+    ou quando o usuário pede: st.download_button carrega os dados inteiros
+    a cada rerun em que é desenhado. Acima de LIMITE_DOWNLOAD não há botão de
+    download: o arquivo é salvo em DIRETORIO_EXPORTACOES no servidor.
+    resultado: (description, linhas) já lidos, exportados sem nova execução.
+    """
+    chave_estado = f"exportacao_{chave}"
+    # Um resultado já lido é de uma execução específica: reexecutar gera outra assinatura
+    assinatura = (sql, tuple(params or ()), banco, id(resultado[1]) if resultado else None)
+
+    col_formato, col_gzip, col_gerar = st.columns([2, 1, 1])
+
+    with col_formato:
+        formato = st.radio("Formato:", list(FORMATOS.keys()), horizontal=True,
+                           key=f"{chave_estado}_formato")
+    with col_gzip:
+        comprimir = st.checkbox("Comprimir (.gz)", key=f"{chave_estado}_gzip",
+                                disabled=not FORMATOS[formato][2])
+    with col_gerar:
+        gerar = st.button("📦 Gerar arquivo", key=f"{chave_estado}_gerar",
+                          use_container_width=True)
+
+    gerado = False
+    if gerar:
+        limpar_exportacoes_antigas()
+        remover_exportacao(st.session_state.get(chave_estado))
+        st.session_state[chave_estado] = None
+
+        progresso = st.empty()
+        try:
+            exportacao = exportar_consulta(
+                sql, params, banco, formato, comprimir, nome_base,
+                ao_progredir=lambda n: progresso.caption(f"⏳ {n:,} linhas gravadas..."),
+                tabela=tabela, resultado=resultado
+            )
+            progresso.empty()
+            exportacao["assinatura"] = assinatura
+            st.session_state[chave_estado] = exportacao
+            gerado = True
+        except Exception as e:
+            progresso.empty()
+            st.error(f"❌ Erro ao exportar: {e}")
+
+    exportacao = st.session_state.get(chave_estado)
+    if not exportacao or exportacao.get("assinatura") != assinatura:
+        return
+    if not os.path.exists(exportacao["caminho"]):
+        st.session_state[chave_estado] = None
+        return
+
+    st.caption(
+        f"✅ {exportacao['linhas']:,} linhas • {exportacao['bytes'] / 1024:,.1f} KB • "
+        f"{exportacao['duracao']:.1f}s"
+    )
+    if exportacao.get("salvo"):
+        st.success(f"💾 Arquivo salvo no servidor: `{exportacao['caminho']}`")
+        return
+    if exportacao["bytes"] > LIMITE_DOWNLOAD:
+        # download_button manteria o arquivo inteiro na memória do servidor
+        st.warning(
+            f"⚠️ Arquivo maior que {LIMITE_DOWNLOAD // (1024 * 1024)} MB: grande demais "
+            "para baixar pelo navegador. Salve-o no servidor."
+        )
+        if st.button("💾 Salvar no servidor", key=f"{chave_estado}_salvar",
+                     use_container_width=True):
+            try:
+                exportacao["caminho"] = salvar_no_servidor(exportacao)
+                exportacao["salvo"] = True
+                st.success(f"💾 Arquivo salvo no servidor: `{exportacao['caminho']}`")
+            except OSError as e:
+                st.error(f"❌ Erro ao salvar o arquivo: {e}")
+        return
+    if not gerado and not st.button(f"⬇️ Preparar download de {exportacao['nome_arquivo']}",
+                                    key=f"{chave_estado}_preparar", use_container_width=True):
+        return
+    with open(exportacao["caminho"], "rb") as arquivo:
+        dados = arquivo.read()
+    st.download_button(
+        f"⬇️ Baixar {exportacao['nome_arquivo']}",
+        dados,
+        exportacao["nome_arquivo"],
+        exportacao["mime"],
+        key=f"{chave_estado}_baixar",
+        use_container_width=True
+    )
@@ -0,0 +1,707 @@
+# modules/gerador_dados.py
+"""
+Gerador de dados sintéticos para testes de carga
+- Lê a estrutura da tabela no information_schema (tipos, tamanhos, nulos,
+  índices únicos, FKs)
+- Gera as linhas em blocos, vetorizado com NumPy:
+    FKs sorteadas entre as chaves existentes do pai (assimetria tipo Zipf:
+    poucos pais concentram a maioria dos filhos), únicos sequenciais,
+    números log-normais, datas concentradas no passado recente e textos
+    escolhidos pelo nome da coluna (nome, email, cidade, status...)
+- Carga pelo mesmo caminho em massa do restore: LOAD DATA LOCAL INFILE de um
+  TSV temporário, com fallback para executemany; duplicatas de índices
+  únicos compostos são descartadas (IGNORE) e contadas, assim como as linhas
+  que o IGNORE gravou truncadas/convertidas (lidas do SHOW WARNINGS)
+- Várias tabelas são geradas na ordem das FKs (pais antes dos filhos)
+Relatório de linhas por segundo por tabela.
+"""
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+
+import mysql.connector
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .backup_snapshot import ERROS_LOCAL_INFILE
+from .conexao_resiliente import conectar, obter_conexao_sessao
+from .copia_dados import dependencias_fk, listar_tabelas_base, niveis_copia
+
+LOTE_GERACAO = 100_000          # linhas geradas e carregadas por vez
+LOTE_INSERCAO = 5000            # linhas por executemany quando LOAD DATA não está disponível
+MAXIMO_CHAVES_PAI = 1_000_000   # chaves do pai lidas para sortear as FKs
+NULO = "\\N"                    # NULL no formato do LOAD DATA
+ERRO_DUPLICATA = 1062            # ER_DUP_ENTRY: com IGNORE a linha fica de fora
+BANCOS_SISTEMA = ("information_schema", "mysql", "performance_schema", "sys")
+
+_BITS_INTEIROS = {"tinyint": 8, "smallint": 16, "mediumint": 24, "int": 32, "integer": 32, "bigint": 64}
+_TIPOS_DECIMAIS = ("decimal", "numeric")
+_TIPOS_REAIS = ("float", "double", "real")
+_TIPOS_TEXTO = ("char", "varchar", "tinytext", "text", "mediumtext", "longtext")
+_TIPOS_BINARIOS = ("binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob")
+
+NOMES = ["Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela",
+         "João", "Juliana", "Lucas", "Mariana", "Mateus", "Natália", "Pedro", "Rafael", "Sofia",
+         "Thiago", "Vitória"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira",
+              "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida"]
+CIDADES = ["São Paulo", "Rio de Janeiro", "Belo Horizonte", "Salvador", "Fortaleza", "Curitiba",
+           "Recife", "Porto Alegre", "Manaus", "Goiânia", "Belém", "Campinas"]
+UFS = ["SP", "RJ", "MG", "BA", "CE", "PR", "PE", "RS", "AM", "GO", "PA", "SC"]
+CATEGORIAS = ["Eletrônicos", "Livros", "Roupas", "Alimentos", "Casa", "Esportes", "Brinquedos", "Beleza"]
+SITUACOES = ["ativo", "pendente", "concluido", "cancelado"]
+PALAVRAS = ["alfa", "azul", "bloco", "caixa", "campo", "claro", "dado", "forte", "grande", "linha",
+            "novo", "ponto", "prata", "rapido", "rede", "sol", "terra", "valor", "verde", "zona"]
+DOMINIOS = ["exemplo.com", "teste.com.br", "correio.net"]
+
+
+# ============ ESTRUTURA ============
+def perfil_tabela(conexao, banco, tabela):
+    """{"colunas": OrderedDict, "unicos": [[colunas]], "fks": [{"nome", "colunas", "banco_ref", "tabela_ref", "colunas_ref"}]}"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE, CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION,
+               NUMERIC_SCALE, IS_NULLABLE, COLUMN_DEFAULT, EXTRA
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = OrderedDict()
+    for nome, tipo, definicao, tamanho, precisao, escala, nulo, padrao, extra in cursor.fetchall():
+        colunas[nome] = {"tipo": tipo.lower(), "definicao": definicao.lower(),
+                         "tamanho": int(tamanho) if tamanho else None,
+                         "precisao": int(precisao) if precisao else None, "escala": int(escala or 0),
+                         "nulo": nulo == "YES", "tem_padrao": padrao is not None, "extra": (extra or "").lower()}
+
+    cursor.execute("""
+        SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND NON_UNIQUE = 0
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (banco, tabela))
+    unicos = OrderedDict()
+    for indice, coluna in cursor.fetchall():
+        unicos.setdefault(indice, []).append(coluna)
+
+    cursor.execute("""
+        SELECT CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME,
+               REFERENCED_COLUMN_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY CONSTRAINT_NAME, ORDINAL_POSITION
+    """, (banco, tabela))
+    fks = OrderedDict()
+    for nome, coluna, banco_ref, tabela_ref, coluna_ref in cursor.fetchall():
+        fk = fks.setdefault(nome, {"nome": nome, "colunas": [], "banco_ref": banco_ref,
+                                   "tabela_ref": tabela_ref, "colunas_ref": []})
+        fk["colunas"].append(coluna)
+        fk["colunas_ref"].append(coluna_ref)
+    cursor.close()
+    return {"colunas": colunas, "unicos": list(unicos.values()), "fks": list(fks.values())}
+
+
+def _omitida(coluna):
+    """Colunas que o servidor preenche sozinho"""
+    return "auto_increment" in coluna["extra"] or re.search(r"(virtual|stored) generated", coluna["extra"])
+
+
+def _limites_inteiro(coluna):
+    bits = _BITS_INTEIROS[coluna["tipo"]]
+    if "unsigned" in coluna["definicao"]:
+        return 0, 2 ** bits - 1
+    return -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+
+
+def _sem_acento(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode().lower()
+
+
+def _valores_enum(definicao):
+    return [v.replace("''", "'") for v in re.findall(r"'((?:[^']|'')*)'", definicao)]
+
+
+def pesos_zipf(quantidade, assimetria, rng):
+    """Probabilidades ~ 1/posição^assimetria, com as posições "quentes" embaralhadas (None = uniforme)"""
+    if assimetria <= 0 or quantidade <= 1:
+        return None
+    pesos = 1.0 / np.arange(1, quantidade + 1) ** assimetria
+    rng.shuffle(pesos)
+    return pesos / pesos.sum()
+
+
+def _sorteio(valores, assimetria, rng):
+    """Gerador que sorteia de uma lista fixa com a mesma distribuição em todos os blocos"""
+    valores = np.asarray(valores, dtype=str)
+    pesos = pesos_zipf(len(valores), assimetria, rng)
+    return lambda n, inicio: valores[rng.choice(len(valores), size=n, p=pesos)]
+
+
+def _truncar(valores, tamanho):
+    return valores.astype(f"<U{tamanho}") if tamanho and tamanho < 1000 else valores
+
+
+# ============ ESTRATÉGIAS POR COLUNA ============
+def estrategia_coluna(nome, coluna):
+    """Descrição de como a coluna é gerada (prévia na interface)"""
+    nome = nome.lower()
+    tipo = coluna["tipo"]
+    if _omitida(coluna):
+        return "preenchida pelo servidor"
+    if tipo in _BITS_INTEIROS:
+        if coluna["definicao"].startswith("tinyint(1)"):
+            return "booleano 0/1"
+        if "idade" in nome:
+            return "normal (média 38), 18–90"
+        if re.search(r"quant|qtd|estoque", nome):
+            return "geométrica (1, 2, 3...)"
+        return "log-normal (mediana 100)"
+    if tipo in _TIPOS_DECIMAIS or tipo in _TIPOS_REAIS:
+        return "log-normal (mediana 50)"
+    if tipo in ("date", "datetime", "timestamp"):
+        return "datas recentes mais frequentes"
+    if tipo in ("time", "year"):
+        return "uniforme"
+    if tipo in ("enum", "set"):
+        return "valores da lista, com assimetria"
+    if tipo in _TIPOS_TEXTO:
+        for padrao, descricao in _PADROES_TEXTO:
+            if re.search(padrao, nome):
+                return descricao
+        return "palavras"
+    if tipo == "json" or tipo in _TIPOS_BINARIOS:
+        return "valores aleatórios"
+    return "não suportado" + (" (fica com o padrão/NULL)" if coluna["nulo"] or coluna["tem_padrao"] else "")
+
+
+_PADROES_TEXTO = [
+    (r"e-?mail", "email"),
+    (r"telefone|celular|fone", "telefone"),
+    (r"cpf|cnpj|cep", "dígitos"),
+    (r"cidade|municipio", "cidade"),
+    (r"estado|^uf$|_uf$", "UF"),
+    (r"categoria", "categoria"),
+    (r"status|situacao", "situação"),
+    (r"produto|titulo", "produto"),
+    (r"nome|cliente|responsavel|autor|usuario", "nome e sobrenome"),
+    (r"descricao|observ|texto|coment|obs", "frase"),
+]
+
+
+def _gerador_texto(nome, coluna, assimetria, rng, token):
+    """Gerador vetorizado de textos; o nome da coluna escolhe o tipo de conteúdo"""
+    nome = nome.lower()
+    nomes = np.array(NOMES)
+    sobrenomes = np.array(SOBRENOMES)
+    palavras = np.array(PALAVRAS)
+    descricao = next((d for padrao, d in _PADROES_TEXTO if re.search(padrao, nome)), "palavras")
+
+    if descricao == "email":
+        locais = np.array([_sem_acento(n) for n in NOMES])
+        sobrenomes_email = np.array([_sem_acento(s) for s in SOBRENOMES])
+        dominios = np.array(DOMINIOS)
+        def gerar(n, inicio):
+            sequencia = np.char.add(token, np.arange(inicio, inicio + n).astype(str))
+            local = np.char.add(np.char.add(locais[rng.integers(0, len(locais), n)], "."),
+                                sobrenomes_email[rng.integers(0, len(sobrenomes_email), n)])
+            return np.char.add(np.char.add(np.char.add(local, sequencia), "@"),
+                               dominios[rng.integers(0, len(dominios), n)])
+        return gerar
+    if descricao == "telefone":
+        return lambda n, inicio: np.char.add(
+            np.char.add("(", rng.integers(11, 100, n).astype(str)),
+            np.char.add(") 9", rng.integers(10_000_000, 100_000_000, n).astype(str)))
+    if descricao == "dígitos":
+        digitos = {"cpf": 11, "cnpj": 14, "cep": 8}[re.search(r"cpf|cnpj|cep", nome).group(0)]
+        return lambda n, inicio: np.char.zfill(rng.integers(0, 10 ** digitos, n, dtype=np.int64).astype(str),
+                                               digitos)
+    if descricao == "cidade":
+        return _sorteio(CIDADES, assimetria, rng)
+    if descricao == "UF":
+        return _sorteio(UFS, assimetria, rng)
+    if descricao == "categoria":
+        return _sorteio(CATEGORIAS, assimetria, rng)
+    if descricao == "situação":
+        return _sorteio(SITUACOES, assimetria, rng)
+    if descricao == "produto":
+        categorias = np.array(CATEGORIAS)
+        return lambda n, inicio: np.char.add(
+            np.char.add(categorias[rng.integers(0, len(categorias), n)], " "),
+            np.char.add(np.char.add(palavras[rng.integers(0, len(palavras), n)], " "),
+                        rng.integers(100, 1000, n).astype(str)))
+    if descricao == "nome e sobrenome":
+        return lambda n, inicio: np.char.add(np.char.add(nomes[rng.integers(0, len(nomes), n)], " "),
+                                             sobrenomes[rng.integers(0, len(sobrenomes), n)])
+    if descricao == "frase":
+        def gerar(n, inicio):
+            quantidade = rng.integers(3, 13)
+            frase = palavras[rng.integers(0, len(palavras), n)]
+            for _ in range(quantidade - 1):
+                frase = np.char.add(np.char.add(frase, " "), palavras[rng.integers(0, len(palavras), n)])
+            return frase
+        return gerar
+    return lambda n, inicio: np.char.add(np.char.add(palavras[rng.integers(0, len(palavras), n)], "-"),
+                                         rng.integers(0, 10_000, n).astype(str))
+
+
+def _gerador_coluna(nome, coluna, opcoes, rng, token):
+    """Gerador vetorizado (n, inicio) -> array de textos, ou None se o tipo não é suportado"""
+    tipo = coluna["tipo"]
+    nome_min = nome.lower()
+    if tipo in _BITS_INTEIROS:
+        minimo, maximo = _limites_inteiro(coluna)
+        if coluna["definicao"].startswith("tinyint(1)"):
+            return lambda n, inicio: rng.integers(0, 2, n).astype(str)
+        if "idade" in nome_min:
+            return lambda n, inicio: np.clip(np.rint(rng.normal(38, 14, n)), 18, 90).astype(np.int64).astype(str)
+        if re.search(r"quant|qtd|estoque", nome_min):
+            return lambda n, inicio: np.minimum(rng.geometric(0.35, n), maximo).astype(str)
+        if nome_min == "ano":
+            return lambda n, inicio: rng.integers(1990, datetime.now().year + 1, n).astype(str)
+        return lambda n, inicio: np.clip(np.rint(rng.lognormal(np.log(100), 1.2, n)),
+                                         max(minimo, 1), maximo).astype(np.int64).astype(str)
+    if tipo in _TIPOS_DECIMAIS:
+        escala = coluna["escala"]
+        maximo = 10.0 ** ((coluna["precisao"] or 10) - escala) - 10.0 ** -escala
+        return lambda n, inicio: np.char.mod(f"%.{escala}f",
+                                             np.minimum(rng.lognormal(np.log(50), 1.0, n), maximo))
+    if tipo in _TIPOS_REAIS:
+        return lambda n, inicio: np.char.mod("%.2f", rng.lognormal(np.log(50), 1.0, n))
+    if tipo in ("date", "datetime", "timestamp"):
+        agora = np.datetime64(datetime.now().replace(microsecond=0), "s")
+        periodo = opcoes["dias_historico"] * 86_400
+        if tipo == "timestamp":
+            periodo = min(periodo, int((agora - np.datetime64("1970-01-02", "s")).astype(np.int64)))
+        unidade = "D" if tipo == "date" else "s"
+        def gerar(n, inicio):
+            # potência > 1 concentra as datas perto de hoje
+            atraso = ((1 - rng.power(1 + opcoes["assimetria"], n)) * periodo).astype("timedelta64[s]")
+            return np.char.replace(np.datetime_as_string(agora - atraso, unit=unidade), "T", " ")
+        return gerar
+    if tipo == "time":
+        def gerar(n, inicio):
+            segundos = rng.integers(0, 86_400, n)
+            partes = [np.char.zfill(p.astype(str), 2) for p in (segundos // 3600, segundos // 60 % 60, segundos % 60)]
+            return np.char.add(np.char.add(np.char.add(partes[0], ":"), np.char.add(partes[1], ":")), partes[2])
+        return gerar
+    if tipo == "year":
+        return lambda n, inicio: rng.integers(1990, datetime.now().year + 1, n).astype(str)
+    if tipo in ("enum", "set"):
+        valores = _valores_enum(coluna["definicao"])
+        return _sorteio(valores, opcoes["assimetria"], rng) if valores else None
+    if tipo in _TIPOS_TEXTO:
+        return _gerador_texto(nome, coluna, opcoes["assimetria"], rng, token)
+    if tipo == "json":
+        return lambda n, inicio: np.char.add(np.char.add('{"valor": ', rng.integers(0, 1000, n).astype(str)), "}")
+    if tipo in _TIPOS_BINARIOS:
+        return lambda n, inicio: np.char.mod("%016x", rng.integers(0, 2 ** 62, n, dtype=np.int64))
+    return None
+
+
+def _gerador_unico(conexao, banco, tabela, nome, coluna, rng, token):
+    """Valores distintos: inteiros a partir do MAX atual, textos com sequência própria da execução"""
+    if coluna["tipo"] in _BITS_INTEIROS or coluna["tipo"] in _TIPOS_DECIMAIS:
+        cursor = conexao.cursor()
+        cursor.execute(f"SELECT COALESCE(MAX(`{nome}`), 0) FROM `{banco}`.`{tabela}`")
+        inicial = int(cursor.fetchone()[0]) + 1
+        cursor.close()
+        return lambda n, inicio: np.arange(inicial + inicio, inicial + inicio + n, dtype=np.int64).astype(str)
+    if coluna["tipo"] in _TIPOS_TEXTO:
+        base = _gerador_texto(nome, coluna, 0, rng, token)
+        tamanho = coluna["tamanho"]
+        if re.search(_PADROES_TEXTO[0][0], nome.lower()):
+            return lambda n, inicio: _truncar(base(n, inicio), tamanho)     # o email já leva a sequência
+        def gerar(n, inicio):
+            sufixo = np.char.add(f"-{token}", np.arange(inicio, inicio + n).astype(str))
+            espaco = (tamanho or 255) - len(sufixo[-1])
+            if espaco <= 0:
+                return _truncar(np.char.lstrip(sufixo, "-"), tamanho)
+            return np.char.add(_truncar(base(n, inicio), espaco), sufixo)
+        return gerar
+    return None
+
+
+def _gerador_fk(conexao, fk, unica, assimetria, rng):
+    """
+    Sorteia tuplas de chaves existentes no pai (a mesma linha para todas as colunas da FK).
+    Retorna (gerador(n, inicio) -> [arrays], quantidade de chaves).
+    unica: a FK é chave única no filho, então cada chave do pai é usada uma vez.
+    """
+    lista = ", ".join(f"`{c}`" for c in fk["colunas_ref"])
+    nao_nulos = " AND ".join(f"`{c}` IS NOT NULL" for c in fk["colunas_ref"])
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT DISTINCT {lista} FROM `{fk['banco_ref']}`.`{fk['tabela_ref']}` "
+                   f"WHERE {nao_nulos} LIMIT {MAXIMO_CHAVES_PAI}")
+    linhas = cursor.fetchall()
+    cursor.close()
+    if not linhas:
+        return None, 0
+    chaves = [np.array([v.decode() if isinstance(v, (bytes, bytearray)) else str(v) for v in coluna])
+              for coluna in zip(*linhas)]
+    if unica:
+        ordem = rng.permutation(len(linhas))
+        return (lambda n, inicio: [c[ordem[inicio:inicio + n]] for c in chaves]), len(linhas)
+    pesos = pesos_zipf(len(linhas), assimetria, rng)
+    def gerar(n, inicio):
+        indices = rng.choice(len(linhas), size=n, p=pesos)
+        return [c[indices] for c in chaves]
+    return gerar, len(linhas)
+
+
+def planejar_tabela(conexao, banco, tabela, opcoes, rng, token):
+    """
+    Monta os geradores da tabela.
+    Retorna {"colunas": [nomes], "grupos": [(colunas, gerador)], "nulaveis": {coluna},
+             "maximo": linhas possíveis ou None, "problemas": [...], "avisos": [...]}.
+    """
+    perfil = perfil_tabela(conexao, banco, tabela)
+    colunas = perfil["colunas"]
+    unicos_simples = {u[0] for u in perfil["unicos"] if len(u) == 1}
+    conjuntos_unicos = [set(u) for u in perfil["unicos"]]
+    plano = {"colunas": [], "grupos": [], "nulaveis": set(), "maximo": None, "problemas": [], "avisos": []}
+    cobertas = set()
+    referencias = {}    # coluna -> (banco, tabela, coluna) do pai que a preenche
+
+    for fk in perfil["fks"]:
+        if any(_omitida(colunas[c]) for c in fk["colunas"]):
+            continue
+        alvos = {c: (fk["banco_ref"], fk["tabela_ref"], r) for c, r in zip(fk["colunas"], fk["colunas_ref"])}
+        sobrepostas = cobertas & set(fk["colunas"])
+        if sobrepostas:
+            # Com FOREIGN_KEY_CHECKS=0 nada pegaria valores que só atendem a uma das FKs
+            if any(referencias[c] != alvos[c] for c in sobrepostas) or set(fk["colunas"]) - cobertas:
+                plano["problemas"].append(f"A FK {fk['nome']} compartilha {', '.join(sorted(sobrepostas))} "
+                                          "com outra FK: os valores sorteados não atenderiam às duas")
+            continue
+        unica = set(fk["colunas"]) in conjuntos_unicos
+        gerador, quantidade = _gerador_fk(conexao, fk, unica, opcoes["assimetria"], rng)
+        cobertas |= set(fk["colunas"])
+        referencias.update(alvos)
+        if gerador is None:
+            if all(colunas[c]["nulo"] for c in fk["colunas"]):
+                plano["avisos"].append(f"`{fk['tabela_ref']}` está vazia: {', '.join(fk['colunas'])} ficam NULL")
+                continue
+            plano["problemas"].append(f"`{fk['tabela_ref']}` não tem linhas para a FK {fk['nome']}: "
+                                      "gere os dados do pai antes")
+            continue
+        if unica:
+            plano["maximo"] = min(plano["maximo"] or quantidade, quantidade)
+        plano["grupos"].append((fk["colunas"], gerador))
+        plano["colunas"] += fk["colunas"]
+        if all(colunas[c]["nulo"] for c in fk["colunas"]) and not unica:
+            plano["nulaveis"] |= set(fk["colunas"])
+
+    for nome, coluna in colunas.items():
+        if nome in cobertas or _omitida(coluna):
+            continue
+        gerador = None
+        if nome in unicos_simples:
+            gerador = _gerador_unico(conexao, banco, tabela, nome, coluna, rng, token)
+        if gerador is None:
+            gerador = _gerador_coluna(nome, coluna, opcoes, rng, token)
+            if gerador and coluna["tipo"] in _TIPOS_TEXTO:
+                gerador = (lambda base, tamanho: lambda n, inicio: _truncar(base(n, inicio), tamanho))(
+                    gerador, coluna["tamanho"])
+            if coluna["nulo"] and nome not in unicos_simples:
+                plano["nulaveis"].add(nome)
+        if gerador is None:
+            if not (coluna["nulo"] or coluna["tem_padrao"]):
+                plano["problemas"].append(f"Tipo {coluna['definicao']} da coluna {nome} não é suportado")
+            continue
+        plano["grupos"].append(([nome], (lambda g: lambda n, inicio: [g(n, inicio)])(gerador)))
+        plano["colunas"].append(nome)
+
+    if any(len(u) > 1 and not set(u) <= cobertas for u in perfil["unicos"]):
+        plano["avisos"].append("Índices únicos compostos: linhas repetidas são descartadas na carga")
+    if not plano["colunas"] and not plano["problemas"]:
+        plano["problemas"].append("Nenhuma coluna para gerar (todas são preenchidas pelo servidor)")
+    return plano
+
+
+def gerar_bloco(plano, n, inicio, fracao_nulos, rng):
+    """Um bloco de n linhas como {coluna: array de textos}, com NULL como \\N"""
+    dados = {}
+    for colunas, gerador in plano["grupos"]:
+        for coluna, valores in zip(colunas, gerador(n, inicio)):
+            valores = valores.astype(str)
+            if coluna in plano["nulaveis"] and fracao_nulos > 0:
+                valores = np.where(rng.random(n) < fracao_nulos, NULO, valores)
+            dados[coluna] = valores
+    return dados
+
+
+# ============ CARGA ============
+def _escapar_tsv(valores):
+    """Textos no formato do LOAD DATA (ESCAPED BY '\\'); NULO fica como está"""
+    serie = pd.Series(valores)
+    especiais = serie.str.contains("[\\\\\t\n]", regex=True) & (serie != NULO)
+    if especiais.any():
+        serie[especiais] = (serie[especiais].str.replace("\\", "\\\\", regex=False)
+                            .str.replace("\t", "\\t", regex=False).str.replace("\n", "\\n", regex=False))
+    return serie
+
+
+def _linhas_com_aviso(cursor):
+    """
+    Linhas do último comando gravadas com aviso (truncamento, conversão, fora da
+    faixa): com IGNORE elas entram alteradas em vez de falhar. Duplicatas (1062)
+    não contam: já ficam fora do rowcount. Avisos além do max_error_count são
+    estimados pela proporção dos listados.
+    """
+    cursor.execute("SHOW COUNT(*) WARNINGS")
+    total = cursor.fetchone()[0]
+    if not total:
+        return 0
+    cursor.execute("SHOW WARNINGS")
+    avisos = cursor.fetchall()
+    linhas, sem_linha, relevantes = set(), 0, 0
+    for _, codigo, mensagem in avisos:
+        if int(codigo) == ERRO_DUPLICATA:
+            continue
+        relevantes += 1
+        numero = re.search(r"at row (\d+)", str(mensagem))
+        if numero:
+            linhas.add(int(numero.group(1)))
+        else:
+            sem_linha += 1
+    afetadas = len(linhas) + sem_linha
+    if total > len(avisos) and avisos:
+        afetadas += int((total - len(avisos)) * relevantes / len(avisos))
+    return afetadas
+
+
+def _carregar_load_data(conexao, banco, tabela, dados, pasta_temp):
+    """TSV temporário + LOAD DATA LOCAL INFILE ... IGNORE; retorna (linhas inseridas, linhas com aviso)"""
+    colunas = list(dados)
+    # Chaves copiadas do pai podem ter tab, quebra de linha ou barra invertida
+    linhas = _escapar_tsv(dados[colunas[0]])
+    if len(colunas) > 1:
+        linhas = linhas.str.cat([_escapar_tsv(dados[c]) for c in colunas[1:]], sep="\t")
+    caminho_tsv = os.path.join(pasta_temp, "carga.tsv")
+    with open(caminho_tsv, "w", encoding="utf-8", newline="\n") as tsv:
+        tsv.write("\n".join(linhas.tolist()))
+        tsv.write("\n")
+    cursor = conexao.cursor()
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s IGNORE INTO TABLE `{banco}`.`{tabela}` CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(f'`{c}`' for c in colunas)})",
+            (caminho_tsv,)
+        )
+        inseridas = cursor.rowcount
+        com_aviso = _linhas_com_aviso(cursor)
+        conexao.commit()
+    finally:
+        cursor.close()
+        os.remove(caminho_tsv)
+    return inseridas, com_aviso
+
+
+def _carregar_executemany(conexao, banco, tabela, dados):
+    """INSERT IGNORE em lotes; retorna (linhas inseridas, linhas com aviso)"""
+    colunas = list(dados)
+    sql = (f"INSERT IGNORE INTO `{banco}`.`{tabela}` ({', '.join(f'`{c}`' for c in colunas)}) "
+           f"VALUES ({', '.join(['%s'] * len(colunas))})")
+    valores = [[None if v == NULO else v for v in dados[c].tolist()] for c in colunas]
+    linhas = list(zip(*valores))
+    inseridas, com_aviso = 0, 0
+    cursor = conexao.cursor()
+    try:
+        for inicio in range(0, len(linhas), LOTE_INSERCAO):
+            cursor.executemany(sql, linhas[inicio:inicio + LOTE_INSERCAO])
+            inseridas += max(cursor.rowcount, 0)
+            com_aviso += _linhas_com_aviso(cursor)
+            conexao.commit()
+    finally:
+        cursor.close()
+    return inseridas, com_aviso
+
+
+def _carregar_bloco(conexao, banco, tabela, dados, metodo, pasta_temp):
+    """Retorna (linhas inseridas, linhas com aviso, método efetivamente usado)"""
+    if metodo == "LOAD DATA":
+        try:
+            return (*_carregar_load_data(conexao, banco, tabela, dados, pasta_temp), metodo)
+        except mysql.connector.Error as e:
+            if e.errno not in ERROS_LOCAL_INFILE:
+                raise
+            # local_infile desligado: segue com INSERTs em lote
+    return (*_carregar_executemany(conexao, banco, tabela, dados), "executemany")
+
+
+def _avisar(ao_progredir, mensagem, fracao):
+    if ao_progredir:
+        ao_progredir(mensagem, min(fracao, 1.0))
+
+
+def gerar_dados(banco, quantidades, assimetria=1.0, fracao_nulos=0.05, dias_historico=3 * 365, semente=None,
+                usar_load_data=True, ao_progredir=None):
+    """
+    Gera e carrega linhas sintéticas. quantidades: {tabela: linhas}; as tabelas
+    são processadas pais antes dos filhos, para as FKs sortearem chaves já carregadas.
+    Retorna {"sucesso", "mensagem", "tabelas": [{"tabela", "linhas", "descartadas", "alteradas",
+             "segundos", "linhas_por_segundo", "metodo", "avisos", "erro"}], "linhas", "linhas_por_segundo"}.
+    """
+    rng = np.random.default_rng(semente)
+    token = np.base_repr(int(time.time()), 36).lower()[-5:]
+    opcoes = {"assimetria": assimetria, "dias_historico": dias_historico}
+    total_pedido = sum(quantidades.values()) or 1
+    relatorio = []
+    geradas = 0
+    inicio_geral = time.time()
+    try:
+        conexao = conectar(banco, allow_local_infile=usar_load_data)
+    except mysql.connector.Error as e:
+        return {"sucesso": False, "mensagem": f"❌ Erro ao conectar: {e}", "tabelas": [], "linhas": 0,
+                "linhas_por_segundo": 0}
+
+    try:
+        cursor = conexao.cursor()
+        # As FKs só recebem chaves lidas do pai: a verificação linha a linha é redundante
+        cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+        cursor.close()
+        niveis, _ = niveis_copia(list(quantidades), dependencias_fk(conexao, banco))
+        metodo = "LOAD DATA" if usar_load_data else "executemany"
+
+        with tempfile.TemporaryDirectory(prefix="gerador_") as pasta_temp:
+            for tabela in (t for nivel in niveis for t in nivel):
+                pedido = quantidades[tabela]
+                resultado = {"tabela": tabela, "linhas": 0, "descartadas": 0, "alteradas": 0, "segundos": 0.0,
+                             "linhas_por_segundo": 0, "metodo": metodo, "avisos": [], "erro": None}
+                relatorio.append(resultado)
+                plano = planejar_tabela(conexao, banco, tabela, opcoes, rng, token)
+                resultado["avisos"] = plano["avisos"]
+                if plano["problemas"]:
+                    resultado["erro"] = "; ".join(plano["problemas"])
+                    geradas += pedido
+                    continue
+                alvo = pedido
+                if plano["maximo"] is not None and plano["maximo"] < pedido:
+                    alvo = plano["maximo"]
+                    resultado["avisos"].append(f"FK única: limitado a {alvo:,} linhas (chaves do pai)")
+
+                inicio_tabela = time.time()
+                for inicio in range(0, alvo, LOTE_GERACAO):
+                    n = min(LOTE_GERACAO, alvo - inicio)
+                    dados = gerar_bloco(plano, n, inicio, fracao_nulos, rng)
+                    inseridas, com_aviso, resultado["metodo"] = _carregar_bloco(
+                        conexao, banco, tabela, dados, resultado["metodo"], pasta_temp)
+                    # Linhas gravadas truncadas/convertidas não são as geradas: contam como descartadas
+                    resultado["linhas"] += inseridas - com_aviso
+                    resultado["descartadas"] += n - inseridas + com_aviso
+                    resultado["alteradas"] += com_aviso
+                    geradas += n
+                    _avisar(ao_progredir, f"{tabela}: {inicio + n:,}/{alvo:,} linhas", geradas / total_pedido)
+                geradas += pedido - alvo
+                if resultado["alteradas"]:
+                    resultado["avisos"].append(f"{resultado['alteradas']:,} linha(s) gravadas com valores "
+                                               "truncados/convertidos (SHOW WARNINGS), contadas em descartadas")
+                resultado["segundos"] = round(time.time() - inicio_tabela, 2)
+                resultado["linhas_por_segundo"] = int(resultado["linhas"] / max(resultado["segundos"], 1e-6))
+    except mysql.connector.Error as e:
+        if relatorio:
+            relatorio[-1]["erro"] = str(e)
+        return {"sucesso": False, "mensagem": f"❌ Erro na carga: {e}", "tabelas": relatorio,
+                "linhas": sum(r["linhas"] for r in relatorio), "linhas_por_segundo": 0}
+    finally:
+        conexao.close()
+
+    duracao = max(time.time() - inicio_geral, 1e-6)
+    linhas = sum(r["linhas"] for r in relatorio)
+    falhas = [r for r in relatorio if r["erro"]]
+    mensagem = f"{linhas:,} linhas em {duracao:.1f}s ({int(linhas / duracao):,} linhas/s)"
+    return {"sucesso": not falhas, "mensagem": ("✅ " if not falhas else "⚠️ ") + mensagem,
+            "tabelas": relatorio, "linhas": linhas, "linhas_por_segundo": int(linhas / duracao)}
+
+
+# ============ COMPONENTE STREAMLIT ============
+def _listar_bancos(conexao):
+    cursor = conexao.cursor()
+    cursor.execute("SHOW DATABASES")
+    bancos = [linha[0] for linha in cursor.fetchall() if linha[0] not in BANCOS_SISTEMA]
+    cursor.close()
+    return bancos
+
+
+def pagina_gerar_dados():
+    """Página: popular tabelas com dados sintéticos para testar desempenho"""
+    st.title("🎲 Gerar Dados")
+    st.caption("Linhas sintéticas coerentes com a estrutura: FKs sorteadas entre as chaves dos pais, "
+               "distribuições assimétricas e carga em massa (LOAD DATA).")
+    conexao = obter_conexao_sessao("conexao_mysql")
+    if conexao is None:
+        st.error("❌ Erro ao conectar ao MySQL")
+        return
+
+    bancos = _listar_bancos(conexao)
+    if not bancos:
+        st.info("Nenhum banco disponível.")
+        return
+    banco = st.selectbox("Banco:", bancos, key="gerador_banco")
+    tabelas = st.multiselect("Tabelas:", listar_tabelas_base(conexao, banco), key=f"gerador_tabelas_{banco}")
+    if not tabelas:
+        return
+
+    quantidades = {}
+    for tabela in tabelas:
+        with st.expander(f"📋 {tabela}"):
+            quantidades[tabela] = int(st.number_input("Linhas:", min_value=1, max_value=50_000_000,
+                                                      value=10_000, step=10_000,
+                                                      key=f"gerador_linhas_{banco}_{tabela}"))
+            # Estrutura lida uma vez por (banco, tabela), não a cada rerun
+            perfis = st.session_state.setdefault("gerador_perfis", {})
+            if (banco, tabela) not in perfis:
+                try:
+                    perfis[(banco, tabela)] = perfil_tabela(conexao, banco, tabela)
+                except mysql.connector.Error as e:
+                    st.error(f"Erro ao ler a estrutura de `{tabela}`: {e}")
+                    continue
+            perfil = perfis[(banco, tabela)]
+            fks = {c: fk["tabela_ref"] for fk in perfil["fks"] for c in fk["colunas"]}
+            unicos = {u[0] for u in perfil["unicos"] if len(u) == 1}
+            st.dataframe(pd.DataFrame([{
+                "coluna": nome,
+                "tipo": coluna["definicao"],
+                "geração": (f"chave de {fks[nome]}" if nome in fks and not _omitida(coluna)
+                            else "sequencial única" if nome in unicos and not _omitida(coluna)
+                            else estrategia_coluna(nome, coluna)),
+            } for nome, coluna in perfil["colunas"].items()]), use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        assimetria = st.slider("Assimetria", 0.0, 2.0, 1.0, 0.1, key="gerador_assimetria",
+                               help="0 = uniforme; maior = poucos pais/valores concentram mais linhas")
+    with col2:
+        fracao_nulos = st.slider("NULLs nas colunas opcionais (%)", 0, 50, 5, key="gerador_nulos") / 100
+    with col3:
+        dias_historico = int(st.number_input("Histórico de datas (dias)", min_value=1, value=3 * 365,
+                                             key="gerador_dias"))
+    col1, col2 = st.columns(2)
+    with col1:
+        semente = int(st.number_input("Semente (0 = aleatória)", min_value=0, value=0, key="gerador_semente"))
+    with col2:
+        usar_load_data = st.checkbox("Usar LOAD DATA LOCAL INFILE", value=True, key="gerador_load_data",
+                                     help="Sem permissão no servidor, a carga cai para INSERTs em lote")
+
+    total = sum(quantidades.values())
+    if st.button(f"🎲 Gerar {total:,} linhas", type="primary", key="gerador_executar"):
+        barra = st.progress(0.0, text="Preparando...")
+        resultado = gerar_dados(banco, quantidades, assimetria, fracao_nulos, dias_historico, semente or None,
+                                usar_load_data, ao_progredir=lambda mensagem, fracao: barra.progress(fracao, text=mensagem))
+        barra.empty()
+        (st.success if resultado["sucesso"] else st.error)(resultado["mensagem"])
+        if resultado["tabelas"]:
+            st.metric("Linhas/s", f"{resultado['linhas_por_segundo']:,}")
+            st.dataframe(pd.DataFrame([{
+                "tabela": r["tabela"],
+                "linhas": r["linhas"],
+                "descartadas": r["descartadas"],
+                "segundos": r["segundos"],
+                "linhas/s": r["linhas_por_segundo"],
+                "método": r["metodo"],
+                "observações": r["erro"] or "; ".join(r["avisos"]),
+            } for r in resultado["tabelas"]]), use_container_width=True, hide_index=True)
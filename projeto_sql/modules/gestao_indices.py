@@ -0,0 +1,404 @@
+# modules/gestao_indices.py
+"""
+Gestão e diagnóstico de índices
+- Lista os índices com cardinalidade (information_schema.STATISTICS) e
+  tamanho em disco (mysql.innodb_index_stats, quando acessível)
+- Redundantes: mesmas colunas de outro índice, ou prefixo à esquerda de
+  outro B-tree (o maior já atende as mesmas buscas)
+- Sem uso: performance_schema.table_io_waits_summary_by_index_usage
+  (contadores desde o último restart do servidor)
+- Sugestões a partir das consultas lentas do próprio app (registradas pelo
+  editor SQL) e, se disponível, do resumo por digest do performance_schema
+- Criação/remoção passam pelo DDL online (INPLACE, LOCK=NONE) e pela fila
+"""
+import re
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from .contagem_registros import obter_estimativa_registros
+from .ddl_online import ROTULOS_ALGORITMO, executar_alter_interativo
+
+LIMIAR_CONSULTA_LENTA = 0.5     # segundos
+MAXIMO_CONSULTAS_LENTAS = 200
+
+_consultas_lentas = deque(maxlen=MAXIMO_CONSULTAS_LENTAS)
+_lock = threading.Lock()
+
+# Comparações que um índice B-tree consegue atender
+_IGUALDADE = r"(?:=|<=>|\bIN\s*\()"
+_INTERVALO = r"(?:<=|>=|<|>|\bBETWEEN\b|\bLIKE\s+'[^%_'])"
+
+
+# ============ CONSULTAS LENTAS DO APP ============
+def registrar_consulta(banco, sql, duracao):
+    """Guarda a consulta se passou do limiar (chamado por quem executa SQL do usuário)"""
+    if duracao < LIMIAR_CONSULTA_LENTA or not banco:
+        return
+    with _lock:
+        _consultas_lentas.append({
+            "banco": banco,
+            "sql": " ".join(sql.split()),
+            "duracao": round(duracao, 3),
+            "quando": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+
+
+def consultas_lentas(banco):
+    """Consultas lentas registradas no processo para o banco (mais recentes primeiro)"""
+    with _lock:
+        return [c for c in reversed(_consultas_lentas) if c["banco"] == banco]
+
+
+def _consultas_digest(conexao, banco, limite=20):
+    """Amostras das consultas do banco que leram sem índice (performance_schema); [] se indisponível"""
+    cursor = conexao.cursor()
+    try:
+        cursor.execute("""
+            SELECT QUERY_SAMPLE_TEXT, SUM_TIMER_WAIT / COUNT_STAR / 1e12
+            FROM performance_schema.events_statements_summary_by_digest
+            WHERE SCHEMA_NAME = %s AND SUM_NO_INDEX_USED > 0
+              AND QUERY_SAMPLE_TEXT LIKE 'SELECT%%'
+            ORDER BY SUM_ROWS_EXAMINED DESC
+            LIMIT %s
+        """, (banco, limite))
+        return [{"banco": banco, "sql": " ".join(sql.split()), "duracao": round(float(media or 0), 3),
+                 "quando": "performance_schema"}
+                for sql, media in cursor.fetchall() if sql]
+    except mysql.connector.Error:
+        # MySQL < 8.0 (sem QUERY_SAMPLE_TEXT) ou performance_schema desligado
+        return []
+    finally:
+        cursor.close()
+
+
+# ============ METADADOS ============
+def listar_indices(conexao, banco, tabela):
+    """
+    {nome: {"colunas": [coluna], "unico", "tipo", "cardinalidade", "bytes"}}
+    cardinalidade = valores distintos estimados do índice completo; bytes None sem acesso a mysql.*
+    """
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT INDEX_NAME, COLUMN_NAME, NON_UNIQUE, INDEX_TYPE, CARDINALITY, SUB_PART
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME = 'PRIMARY' DESC, INDEX_NAME, SEQ_IN_INDEX
+    """, (banco, tabela))
+    indices = {}
+    for nome, coluna, nao_unico, tipo, cardinalidade, sub_parte in cursor.fetchall():
+        indice = indices.setdefault(nome, {"colunas": [], "unico": not nao_unico, "tipo": tipo,
+                                           "cardinalidade": None, "bytes": None})
+        # Prefixo de coluna (ex: nome(10)) faz parte da definição do índice
+        indice["colunas"].append(f"{coluna}({sub_parte})" if sub_parte else coluna)
+        indice["cardinalidade"] = cardinalidade
+
+    try:
+        cursor.execute("""
+            SELECT index_name, stat_value * @@innodb_page_size
+            FROM mysql.innodb_index_stats
+            WHERE database_name = %s AND table_name = %s AND stat_name = 'size'
+        """, (banco, tabela))
+        for nome, tamanho in cursor.fetchall():
+            if nome in indices:
+                indices[nome]["bytes"] = int(tamanho)
+    except mysql.connector.Error:
+        pass
+    finally:
+        cursor.close()
+    return indices
+
+
+def _prioridade(nome, indice):
+    return (nome != "PRIMARY", not indice["unico"], nome)
+
+
+def indices_redundantes(indices):
+    """
+    [(índice, coberto_por, motivo)]: duplicados e prefixos à esquerda de outro B-tree.
+    PRIMARY nunca é apontado; UNIQUE só quando o outro também garante a unicidade.
+    """
+    redundantes = []
+    btree = {nome: i for nome, i in indices.items() if i["tipo"] == "BTREE"}
+    for nome, indice in btree.items():
+        if nome == "PRIMARY":
+            continue
+        for outro_nome, outro in btree.items():
+            if outro_nome == nome:
+                continue
+            n = len(indice["colunas"])
+            if outro["colunas"][:n] != indice["colunas"]:
+                continue
+            if indice["unico"] and not (outro["unico"] and len(outro["colunas"]) == n):
+                continue    # o UNIQUE garante uma restrição que o outro não garante
+            if len(outro["colunas"]) == n:
+                # Duplicado: aponta só um dos dois (fica o PRIMARY, depois o UNIQUE, depois o de nome menor)
+                if _prioridade(nome, indice) < _prioridade(outro_nome, outro):
+                    continue
+                redundantes.append((nome, outro_nome, "duplicado"))
+            else:
+                redundantes.append((nome, outro_nome, "prefixo à esquerda"))
+            break
+    return redundantes
+
+
+def indices_sem_uso(conexao, banco, tabela):
+    """
+    Índices sem nenhuma leitura desde o restart do servidor;
+    None se o performance_schema não estiver disponível
+    """
+    cursor = conexao.cursor()
+    try:
+        cursor.execute("""
+            SELECT INDEX_NAME, COUNT_READ
+            FROM performance_schema.table_io_waits_summary_by_index_usage
+            WHERE OBJECT_SCHEMA = %s AND OBJECT_NAME = %s AND INDEX_NAME IS NOT NULL
+        """, (banco, tabela))
+        linhas = cursor.fetchall()
+    except mysql.connector.Error:
+        return None
+    finally:
+        cursor.close()
+    if not linhas:
+        return None     # instrumentação de tabelas desligada
+    return [nome for nome, leituras in linhas if not leituras and nome != "PRIMARY"]
+
+
+# ============ SUGESTÕES ============
+def _colunas_filtradas(sql, colunas, tabela):
+    """(igualdade, intervalo, ordenação) da tabela citadas na consulta, na ordem em que aparecem"""
+    ordem = ""
+    m = re.search(r"\b(?:ORDER|GROUP)\s+BY\b(.*?)(?:\bLIMIT\b|\bHAVING\b|$)", sql, re.I | re.S)
+    if m:
+        ordem = m.group(1)
+        sql = sql[:m.start()]
+    corpo = re.split(r"\bWHERE\b", sql, maxsplit=1, flags=re.I)
+    condicoes = corpo[1] if len(corpo) > 1 else ""
+    # Condições de JOIN também filtram a tabela interna da junção
+    condicoes += " " + " ".join(re.findall(r"\bON\b(.*?)(?=\bJOIN\b|$)", corpo[0], re.I | re.S))
+
+    # Qualificadores que apontam para esta tabela: o nome e os apelidos (FROM t AS x / JOIN t x)
+    proprios = {tabela.lower()} | {
+        apelido.lower() for apelido in re.findall(
+            rf"`?{re.escape(tabela)}`?\s+(?:AS\s+)?(?!(?:WHERE|JOIN|ON|LEFT|RIGHT|INNER|ORDER|GROUP|LIMIT)\b)(\w+)",
+            corpo[0], re.I)
+    }
+
+    def citada(padrao, texto, coluna):
+        nome = rf"(?<![\w`.])(?:`?(\w+)`?\.)?`?{re.escape(coluna)}`?(?![\w`])"
+        for achado in re.finditer(padrao.replace("{nome}", nome), texto, re.I):
+            qualificador = next((g for g in achado.groups() if g), None)
+            if qualificador is None or qualificador.lower() in proprios:
+                return True
+        return False
+
+    igualdade, intervalo, ordenacao = [], [], []
+    for coluna in colunas:
+        if citada(rf"{{nome}}\s*{_IGUALDADE}|=\s*{{nome}}", condicoes, coluna):
+            igualdade.append(coluna)
+        elif citada(rf"{{nome}}\s*{_INTERVALO}", condicoes, coluna):
+            intervalo.append(coluna)
+        elif citada(r"(?:^|,)\s*{nome}\s*(?:ASC|DESC)?\s*(?=,|$)", ordem.strip(), coluna):
+            ordenacao.append(coluna)
+
+    posicao = lambda c: (condicoes + " " + ordem).find(c)
+    return sorted(igualdade, key=posicao), sorted(intervalo, key=posicao), sorted(ordenacao, key=posicao)
+
+
+def _explicar(conexao, sql):
+    """Linhas do EXPLAIN como dicionários ([] se a consulta não puder ser explicada)"""
+    cursor = conexao.cursor()
+    try:
+        cursor.execute("EXPLAIN " + sql)
+        nomes = list(cursor.column_names)
+        return [dict(zip(nomes, linha)) for linha in cursor.fetchall()]
+    except mysql.connector.Error:
+        return []
+    finally:
+        cursor.close()
+
+
+def sugerir_indices(conexao, banco, tabela=None):
+    """
+    Para cada consulta lenta que varre uma tabela (EXPLAIN type ALL/index),
+    propõe índice = colunas de igualdade + 1ª de intervalo (ou as de ordenação).
+    [{"tabela", "colunas", "linhas", "sql", "duracao"}], sem repetir nem
+    sugerir o que um índice existente já cobre.
+    """
+    sugestoes = {}
+    indices_por_tabela = {}
+    for consulta in consultas_lentas(banco) + _consultas_digest(conexao, banco):
+        sql = consulta["sql"]
+        if not re.match(r"\s*(SELECT|WITH)\b", sql, re.I):
+            continue        # EXPLAIN de escrita só com a mesma consulta; não arrisca
+        for passo in _explicar(conexao, sql):
+            alvo = passo.get("table")
+            if passo.get("type") not in ("ALL", "index") or not alvo or alvo.startswith("<"):
+                continue
+            if tabela and alvo != tabela:
+                continue
+            if alvo not in indices_por_tabela:
+                # Com apelido o EXPLAIN mostra o apelido, não o nome real: fica de fora
+                existe = _tabela_existe(conexao, banco, alvo)
+                indices_por_tabela[alvo] = listar_indices(conexao, banco, alvo) if existe else None
+            indices = indices_por_tabela[alvo]
+            if indices is None:
+                continue
+
+            colunas = _colunas_tabela(conexao, banco, alvo)
+            igualdade, intervalo, ordenacao = _colunas_filtradas(sql, colunas, alvo)
+            proposta = igualdade + intervalo[:1]
+            if not intervalo:
+                proposta += [c for c in ordenacao if c not in proposta]
+            if not proposta:
+                continue
+            if any(i["colunas"][:len(proposta)] == proposta for i in indices.values()):
+                continue
+            chave = (alvo, tuple(proposta))
+            if chave not in sugestoes or (passo.get("rows") or 0) > sugestoes[chave]["linhas"]:
+                sugestoes[chave] = {"tabela": alvo, "colunas": proposta, "linhas": passo.get("rows") or 0,
+                                    "sql": sql, "duracao": consulta["duracao"]}
+    return sorted(sugestoes.values(), key=lambda s: s["linhas"], reverse=True)
+
+
+def _tabela_existe(conexao, banco, tabela):
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+    """, (banco, tabela))
+    existe = cursor.fetchone() is not None
+    cursor.close()
+    return existe
+
+
+def _colunas_tabela(conexao, banco, tabela):
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = [linha[0] for linha in cursor.fetchall()]
+    cursor.close()
+    return colunas
+
+
+# ============ DDL ============
+def nome_indice(colunas, unico=False):
+    """Nome padrão idx_a_b / uk_a_b, dentro do limite de 64 caracteres"""
+    return (("uk_" if unico else "idx_") + "_".join(re.sub(r"\W", "", c) for c in colunas))[:64]
+
+
+def criar_indice(conexao, banco, tabela, colunas, nome=None, unico=False):
+    """ADD INDEX online (ou na fila do editor). Retorna o resultado de executar_alter_interativo."""
+    nome = nome or nome_indice(colunas, unico)
+    lista = ", ".join(f"`{c}`" for c in colunas)
+    clausula = f"ADD {'UNIQUE ' if unico else ''}INDEX `{nome}` ({lista})"
+    return executar_alter_interativo(conexao, banco, tabela, [clausula], f"criar o índice `{nome}`")
+
+
+def remover_indice(conexao, banco, tabela, nome):
+    """DROP INDEX online (ou na fila do editor)"""
+    return executar_alter_interativo(conexao, banco, tabela, [f"DROP INDEX `{nome}`"],
+                                     f"remover o índice `{nome}`")
+
+
+# ============ COMPONENTES STREAMLIT ============
+def _mostrar_resultado(resultado):
+    if resultado.get("enfileirado"):
+        st.info(f"📥 {resultado['mensagem']}")
+    elif resultado["sucesso"]:
+        st.success(f"✅ {resultado['mensagem']} · {ROTULOS_ALGORITMO[resultado['algoritmo']]}")
+    elif resultado["pendente"]:
+        st.rerun()      # o painel de alteração pendente assume
+    else:
+        st.error(f"❌ {resultado['mensagem']}")
+
+
+def mostrar_gestao_indices(conexao, banco, tabela):
+    """Página de índices da tabela: situação, diagnóstico, criação e sugestões"""
+    st.subheader("🔑 Índices")
+    try:
+        indices = listar_indices(conexao, banco, tabela)
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao obter índices: {e}")
+        return
+
+    total = obter_estimativa_registros(conexao, banco, tabela) or 0
+    redundantes = indices_redundantes(indices)
+    sem_uso = indices_sem_uso(conexao, banco, tabela)
+
+    if indices:
+        marcados = {nome: f"⚠️ {motivo} de `{outro}`" for nome, outro, motivo in redundantes}
+        for nome in sem_uso or []:
+            marcados.setdefault(nome, "💤 sem leituras desde o restart")
+        df = pd.DataFrame([{
+            "Índice": nome,
+            "Colunas": ", ".join(i["colunas"]),
+            "Tipo": ("UNIQUE " if i["unico"] else "") + i["tipo"],
+            "Cardinalidade": i["cardinalidade"],
+            "Seletividade": round(i["cardinalidade"] / total, 4) if i["cardinalidade"] and total else None,
+            "Tamanho (MB)": round(i["bytes"] / 1024 / 1024, 2) if i["bytes"] is not None else None,
+            "Diagnóstico": marcados.get(nome, ""),
+        } for nome, i in indices.items()])
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        if sem_uso is None:
+            st.caption("ℹ️ performance_schema indisponível: não é possível apontar índices sem uso.")
+    else:
+        st.info("Nenhum índice definido")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### ➕ Criar índice")
+        colunas = _colunas_tabela(conexao, banco, tabela)
+        escolhidas = st.multiselect("Colunas (a ordem importa: igualdade antes de intervalo)", colunas,
+                                    key=f"indice_colunas_{banco}_{tabela}")
+        unico = st.checkbox("UNIQUE", key=f"indice_unico_{banco}_{tabela}")
+        nome = st.text_input("Nome", value=nome_indice(escolhidas, unico) if escolhidas else "",
+                             key=f"indice_nome_{banco}_{tabela}_{unico}_{'_'.join(escolhidas)}")
+        if escolhidas and any(i["colunas"][:len(escolhidas)] == escolhidas for i in indices.values()):
+            st.warning("⚠️ Um índice existente já começa por estas colunas.")
+        if st.button("✅ Criar", type="primary", disabled=not (escolhidas and nome),
+                     key=f"indice_criar_{banco}_{tabela}"):
+            _mostrar_resultado(criar_indice(conexao, banco, tabela, escolhidas, nome, unico))
+
+    with col2:
+        st.markdown("##### ➖ Remover índice")
+        removiveis = [n for n in indices if n != "PRIMARY"]
+        if removiveis:
+            sugeridos = list(dict.fromkeys([n for n, _, _ in redundantes] + (sem_uso or [])))
+            opcoes = list(dict.fromkeys(sugeridos + removiveis))
+            remover = st.selectbox("Índice", opcoes, key=f"indice_remover_{banco}_{tabela}",
+                                   format_func=lambda n: f"{n} (sugerido)" if n in sugeridos else n)
+            st.caption("Índices usados por FOREIGN KEY não podem ser removidos enquanto a FK existir.")
+            if st.button("🗑️ Remover", key=f"indice_remover_btn_{banco}_{tabela}"):
+                _mostrar_resultado(remover_indice(conexao, banco, tabela, remover))
+        else:
+            st.caption("Sem índices secundários")
+
+    st.markdown("##### 💡 Sugestões a partir de consultas lentas")
+    # A análise roda um EXPLAIN por consulta lenta: só no clique, guardada na sessão
+    chave_sugestoes = f"indice_sugestoes_{banco}_{tabela}"
+    sugestoes = st.session_state.get(chave_sugestoes)
+    rotulo = "🔍 Analisar consultas lentas" if sugestoes is None else "🔄 Analisar de novo"
+    if st.button(rotulo, key=f"indice_sugestoes_btn_{banco}_{tabela}"):
+        try:
+            sugestoes = st.session_state[chave_sugestoes] = sugerir_indices(conexao, banco, tabela)
+        except mysql.connector.Error as e:
+            st.error(f"❌ Erro ao analisar as consultas lentas: {e}")
+    if sugestoes is None:
+        return
+    if not sugestoes:
+        st.caption(f"Nenhuma consulta lenta (≥ {LIMIAR_CONSULTA_LENTA}s) varrendo `{tabela}` foi registrada "
+                   "pelo editor SQL nem pelo performance_schema.")
+    for i, sugestao in enumerate(sugestoes):
+        with st.container(border=True):
+            st.markdown(f"**`{tabela}` ({', '.join(sugestao['colunas'])})** · "
+                        f"varredura de ~{sugestao['linhas']:,} linhas · {sugestao['duracao']}s")
+            st.code(sugestao["sql"][:500], language="sql")
+            if st.button("✅ Criar este índice", key=f"indice_sugestao_{banco}_{tabela}_{i}"):
+                st.session_state.pop(chave_sugestoes, None)
+                _mostrar_resultado(criar_indice(conexao, banco, tabela, sugestao["colunas"]))
@@ -0,0 +1,411 @@
+# modules/grade_virtual.py
+"""
+Grade de dados com busca de janelas sob demanda
+- Cada página é uma janela de N linhas lida no servidor: nunca se carrega
+  a tabela inteira no Python
+- Paginação por chave (keyset): "próxima" = WHERE (ordem, chave) > última
+  linha vista, então a página 10.000 custa o mesmo que a primeira
+- Sem chave primária/única (ou ordenando por coluna que aceita NULL) usa
+  LIMIT/OFFSET, que continua certo, só fica mais lento no fim da tabela
+- Páginas ficam num cache LRU do processo (limite de páginas e de memória)
+  e a página seguinte é lida em segundo plano enquanto o usuário olha a atual
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import mysql.connector
+import streamlit as st
+
+from .conexao_resiliente import conectar
+from .contagem_registros import contar_registros_exato, formatar_contagem, obter_contagem
+from .resultados import dataframe_do_cursor
+
+TAMANHOS_PAGINA = [50, 100, 200, 500]
+MAXIMO_PAGINAS = 64                     # páginas no cache (todas as sessões)
+MAXIMO_BYTES_CACHE = 64 * 1024 * 1024   # memória aproximada das páginas em cache
+VALIDADE_PAGINA = 60                    # segundos até reler uma página do servidor
+
+# chave da janela -> {"janela": dict, "bytes": int, "lida_em": float}
+_cache_paginas = OrderedDict()
+_bytes_cache = 0
+_leituras_em_curso = set()
+_lock = threading.Lock()
+
+
+def _conectar(banco):
+    """Conexão própria para a leitura antecipada (conexões não são compartilháveis entre threads)"""
+    return conectar(banco)
+
+
+# ============ METADADOS ============
+def obter_chave_navegacao(conexao, banco, tabela):
+    """
+    Colunas que identificam uma linha: a PRIMARY KEY ou, sem ela, o primeiro
+    índice UNIQUE só com colunas NOT NULL. Lista vazia se não houver.
+    """
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT INDEX_NAME, COLUMN_NAME, NULLABLE
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND NON_UNIQUE = 0
+        ORDER BY INDEX_NAME = 'PRIMARY' DESC, INDEX_NAME, SEQ_IN_INDEX
+    """, (banco, tabela))
+    indices = OrderedDict()
+    for indice, coluna, anulavel in cursor.fetchall():
+        indices.setdefault(indice, []).append((coluna, anulavel == "YES"))
+    cursor.close()
+
+    for colunas in indices.values():
+        if not any(anulavel for _, anulavel in colunas):
+            return [coluna for coluna, _ in colunas]
+    return []
+
+
+def obter_colunas(conexao, banco, tabela):
+    """[(coluna, aceita_nulo)] na ordem da tabela"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME, IS_NULLABLE
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = [(nome, anulavel == "YES") for nome, anulavel in cursor.fetchall()]
+    cursor.close()
+    return colunas
+
+
+def plano_ordenacao(colunas, chave, ordenar_por=None):
+    """
+    (colunas do ORDER BY, usa_keyset).
+    A chave entra no fim do ORDER BY como desempate, para a ordem ser total.
+    """
+    anulaveis = {nome for nome, anulavel in colunas if anulavel}
+    if not chave:
+        return ([ordenar_por] if ordenar_por else []), False
+    if not ordenar_por or ordenar_por in chave:
+        ordem = ([ordenar_por] if ordenar_por else []) + [c for c in chave if c != ordenar_por]
+        return ordem, True
+    # NULL não se compara com '>': ordenação por coluna anulável vai por OFFSET
+    return [ordenar_por] + chave, ordenar_por not in anulaveis
+
+
+# ============ SQL DA JANELA ============
+def condicao_keyset(ordem, valores, operador):
+    """(a, b, c) > (x, y, z) expandido: o otimizador usa o índice nesta forma"""
+    partes = []
+    params = []
+    for i, coluna in enumerate(ordem):
+        iguais = [f"`{c}` = %s" for c in ordem[:i]]
+        partes.append("(" + " AND ".join(iguais + [f"`{coluna}` {operador} %s"]) + ")")
+        params.extend(valores[:i])
+        params.append(valores[i])
+    return "(" + " OR ".join(partes) + ")", params
+
+
+def _montar_consulta(banco, tabela, ordem, descendente, limite, filtro=None,
+                     depois_de=None, deslocamento=0):
+    """
+    SELECT da janela. depois_de: valores da ordem da última linha vista,
+    no sentido da leitura (descendente já considerado).
+    """
+    condicoes = []
+    params = []
+    if filtro:
+        coluna, termo = filtro
+        condicoes.append(f"CAST(`{coluna}` AS CHAR) LIKE %s")
+        params.append(f"%{termo}%")
+    if depois_de is not None:
+        condicao, valores = condicao_keyset(ordem, depois_de, "<" if descendente else ">")
+        condicoes.append(condicao)
+        params.extend(valores)
+
+    sql = f"SELECT * FROM `{banco}`.`{tabela}`"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    if ordem:
+        direcao = "DESC" if descendente else "ASC"
+        sql += " ORDER BY " + ", ".join(f"`{c}` {direcao}" for c in ordem)
+    sql += f" LIMIT {int(limite)}"
+    if deslocamento:
+        sql += f" OFFSET {int(deslocamento)}"
+    return sql, params
+
+
+def contar_filtrados(conexao, banco, tabela, filtro):
+    """COUNT(*) com o filtro da grade (sem filtro, use contagem_registros)"""
+    coluna, termo = filtro
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM `{banco}`.`{tabela}` WHERE CAST(`{coluna}` AS CHAR) LIKE %s",
+                   (f"%{termo}%",))
+    total = cursor.fetchone()[0]
+    cursor.close()
+    return int(total)
+
+
+def _ler_janela(conexao, banco, tabela, ordem, keyset, descendente, tamanho, posicao, filtro):
+    """
+    Lê uma janela no servidor.
+    posicao: ("inicio",) | ("fim",) | ("apos", valores) | ("antes", valores) | ("offset", n)
+    """
+    tipo = posicao[0]
+    # "fim" e "antes" leem no sentido inverso e desviram as linhas no Python
+    invertida = tipo in ("fim", "antes")
+    sentido = descendente != invertida
+    depois_de = posicao[1] if tipo in ("apos", "antes") else None
+    deslocamento = posicao[1] if tipo == "offset" else 0
+
+    sql, params = _montar_consulta(banco, tabela, ordem, sentido, tamanho + 1, filtro,
+                                   depois_de, deslocamento)
+    cursor = conexao.cursor()
+    try:
+        cursor.execute(sql, params)
+        linhas = cursor.fetchall()
+        ha_mais = len(linhas) > tamanho
+        linhas = linhas[:tamanho]
+        if invertida:
+            linhas.reverse()
+
+        nomes = list(cursor.column_names)
+        indices_ordem = [nomes.index(c) for c in ordem] if keyset else []
+        dados = dataframe_do_cursor(cursor, linhas)
+    finally:
+        cursor.close()
+
+    primeira = tuple(linhas[0][i] for i in indices_ordem) if linhas and keyset else None
+    ultima = tuple(linhas[-1][i] for i in indices_ordem) if linhas and keyset else None
+    return {
+        "dados": dados,
+        "primeira": primeira,
+        "ultima": ultima,
+        "ha_anteriores": ha_mais if invertida else (tipo == "apos" or deslocamento > 0),
+        "ha_seguintes": (tipo == "antes") if invertida else ha_mais,
+    }
+
+
+# ============ CACHE LRU ============
+def _chave_cache(banco, tabela, ordem, descendente, tamanho, posicao, filtro):
+    return (banco, tabela, tuple(ordem), descendente, tamanho, posicao, filtro)
+
+
+def _guardar_pagina(chave, janela):
+    global _bytes_cache
+    tamanho = int(janela["dados"].memory_usage(deep=True).sum())
+    with _lock:
+        anterior = _cache_paginas.pop(chave, None)
+        if anterior:
+            _bytes_cache -= anterior["bytes"]
+        _cache_paginas[chave] = {"janela": janela, "bytes": tamanho, "lida_em": time.time()}
+        _bytes_cache += tamanho
+        # Descarta as menos usadas (a recém-lida fica sempre)
+        while len(_cache_paginas) > 1 and (len(_cache_paginas) > MAXIMO_PAGINAS
+                                           or _bytes_cache > MAXIMO_BYTES_CACHE):
+            _, removida = _cache_paginas.popitem(last=False)
+            _bytes_cache -= removida["bytes"]
+
+
+def _pagina_em_cache(chave):
+    with _lock:
+        entrada = _cache_paginas.get(chave)
+        if entrada is None or time.time() - entrada["lida_em"] > VALIDADE_PAGINA:
+            return None
+        _cache_paginas.move_to_end(chave)
+        return entrada["janela"]
+
+
+def invalidar_grade(banco, tabela=None):
+    """Descarta as páginas em cache de uma tabela (ou de todo o banco) após alterações"""
+    global _bytes_cache
+    with _lock:
+        for chave in list(_cache_paginas.keys()):
+            if chave[0] == banco and (tabela is None or chave[1] == tabela):
+                _bytes_cache -= _cache_paginas.pop(chave)["bytes"]
+
+
+def estatisticas_cache():
+    """{"paginas", "bytes"} do cache de páginas"""
+    with _lock:
+        return {"paginas": len(_cache_paginas), "bytes": _bytes_cache}
+
+
+def buscar_janela(conexao, banco, tabela, ordem, keyset, descendente=False, tamanho=100,
+                  posicao=("inicio",), filtro=None):
+    """
+    Janela de 'tamanho' linhas (do cache quando possível). Retorna
+    {"dados": DataFrame, "primeira", "ultima", "ha_anteriores", "ha_seguintes", "do_cache"}.
+    primeira/ultima são os valores da ordem nas pontas da janela (None sem keyset).
+    """
+    chave = _chave_cache(banco, tabela, ordem, descendente, tamanho, posicao, filtro)
+    janela = _pagina_em_cache(chave)
+    if janela is not None:
+        return dict(janela, do_cache=True)
+
+    janela = _ler_janela(conexao, banco, tabela, ordem, keyset, descendente, tamanho, posicao, filtro)
+    _guardar_pagina(chave, janela)
+    return dict(janela, do_cache=False)
+
+
+def _ler_em_segundo_plano(banco, tabela, ordem, keyset, descendente, tamanho, posicao, filtro, chave):
+    try:
+        conexao = _conectar(banco)
+        try:
+            janela = _ler_janela(conexao, banco, tabela, ordem, keyset, descendente,
+                                 tamanho, posicao, filtro)
+        finally:
+            conexao.close()
+        _guardar_pagina(chave, janela)
+    except Exception:
+        pass
+    finally:
+        with _lock:
+            _leituras_em_curso.discard(chave)
+
+
+def antecipar_janela(banco, tabela, ordem, keyset, descendente, tamanho, posicao, filtro=None):
+    """Lê a janela numa thread e guarda no cache (se já não estiver lá ou sendo lida)"""
+    chave = _chave_cache(banco, tabela, ordem, descendente, tamanho, posicao, filtro)
+    if _pagina_em_cache(chave) is not None:
+        return False
+    with _lock:
+        if chave in _leituras_em_curso:
+            return False
+        _leituras_em_curso.add(chave)
+
+    threading.Thread(
+        target=_ler_em_segundo_plano,
+        args=(banco, tabela, ordem, keyset, descendente, tamanho, posicao, filtro, chave),
+        daemon=True
+    ).start()
+    return True
+
+
+# ============ COMPONENTE STREAMLIT ============
+def _estado_grade(chave, assinatura):
+    """Posição atual da grade; volta ao início quando tabela/ordem/filtro mudam"""
+    nome = f"grade_{chave}"
+    estado = st.session_state.get(nome)
+    if estado is None or estado["assinatura"] != assinatura:
+        estado = {"assinatura": assinatura, "posicao": ("inicio",), "linha": 0}
+        st.session_state[nome] = estado
+    return estado
+
+
+def _mover(estado, posicao, linha):
+    estado["posicao"] = posicao
+    estado["linha"] = linha
+    st.rerun()
+
+
+def mostrar_grade(conexao, banco, tabela, chave="", ordenar_por=None, descendente=False,
+                  filtro=None, altura=400):
+    """
+    Grade paginada da tabela com navegação ⏮️ ◀️ ▶️ ⏭️ e salto para uma linha.
+    ordenar_por/descendente/filtro vêm de quem chama (filtro = (coluna, termo)).
+    Retorna a janela exibida (dicionário de buscar_janela) ou None.
+    """
+    try:
+        colunas = obter_colunas(conexao, banco, tabela)
+        chave_tabela = obter_chave_navegacao(conexao, banco, tabela)
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao ler a estrutura de '{tabela}': {e}")
+        return None
+
+    ordem, keyset = plano_ordenacao(colunas, chave_tabela, ordenar_por)
+
+    col_tamanho, col_info = st.columns([1, 3])
+    with col_tamanho:
+        tamanho = st.selectbox("Linhas por página:", TAMANHOS_PAGINA, index=1,
+                               key=f"grade_tamanho_{chave}")
+
+    estado = _estado_grade(chave, (banco, tabela, tuple(ordem), descendente, filtro, tamanho))
+
+    if filtro:
+        total = contar_filtrados(conexao, banco, tabela, filtro)
+        total_texto = f"{total:,}"
+    else:
+        contagem = obter_contagem(conexao, banco, tabela)
+        total = contagem["total"] if contagem["exato"] else None
+        total_texto = formatar_contagem(contagem)
+
+    try:
+        janela = buscar_janela(conexao, banco, tabela, ordem, keyset, descendente, tamanho,
+                               estado["posicao"], filtro)
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao ler os registros: {e}")
+        return None
+
+    # Janela vazia fora do início (linhas apagadas no meio do caminho): recomeça
+    if janela["dados"].empty and estado["posicao"] != ("inicio",):
+        invalidar_grade(banco, tabela)
+        _mover(estado, ("inicio",), 0)
+
+    linha = estado["linha"]
+    exibidas = len(janela["dados"])
+    if linha is None and total is not None:
+        linha = max(0, total - exibidas)
+
+    with col_info:
+        if exibidas and linha is not None:
+            st.info(f"**Mostrando:** {linha + 1:,} a {linha + exibidas:,} de {total_texto}")
+        elif exibidas:
+            st.info(f"**Mostrando:** últimos {exibidas:,} de {total_texto}")
+
+    st.dataframe(janela["dados"], use_container_width=True, height=altura)
+
+    # Navegação: por chave usa as pontas da janela, sem chave usa OFFSET
+    def destino(sentido):
+        if sentido == "inicio":
+            return ("inicio",), 0
+        if sentido == "fim":
+            if keyset:
+                return ("fim",), None
+            # Sem chave a última página é um OFFSET: precisa do total exato
+            exato = total if total is not None else contar_registros_exato(conexao, banco, tabela)
+            ultima_linha = max(0, exato - tamanho)
+            return ("offset", ultima_linha), ultima_linha
+        passo = tamanho if sentido == "seguinte" else -tamanho
+        nova_linha = None if linha is None else max(0, linha + passo)
+        if not keyset:
+            return ("offset", nova_linha), nova_linha
+        if sentido == "seguinte":
+            return ("apos", janela["ultima"]), nova_linha
+        return ("antes", janela["primeira"]), nova_linha
+
+    col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
+    with col1:
+        if st.button("⏮️", key=f"grade_inicio_{chave}", disabled=not janela["ha_anteriores"]):
+            _mover(estado, *destino("inicio"))
+    with col2:
+        if st.button("◀️", key=f"grade_anterior_{chave}", disabled=not janela["ha_anteriores"]):
+            _mover(estado, *destino("anterior"))
+    with col3:
+        col_linha, col_ir = st.columns([2, 1])
+        with col_linha:
+            ir_para = st.number_input("Ir para a linha:", min_value=1, value=(linha or 0) + 1,
+                                      key=f"grade_linha_{chave}_{linha}",
+                                      label_visibility="collapsed")
+        if col_ir.button("↪️ Ir", key=f"grade_ir_{chave}"):
+            # Um único OFFSET para chegar; daqui em diante a navegação volta a ser por chave
+            _mover(estado, ("offset", int(ir_para) - 1), int(ir_para) - 1)
+    with col4:
+        if st.button("▶️", key=f"grade_seguinte_{chave}", disabled=not janela["ha_seguintes"]):
+            _mover(estado, *destino("seguinte"))
+    with col5:
+        if st.button("⏭️", key=f"grade_fim_{chave}", disabled=not janela["ha_seguintes"]):
+            _mover(estado, *destino("fim"))
+
+    # Próxima página já vai sendo lida enquanto o usuário olha esta
+    if janela["ha_seguintes"]:
+        posicao_seguinte, _ = destino("seguinte")
+        if posicao_seguinte[1] is not None:
+            antecipar_janela(banco, tabela, ordem, keyset, descendente, tamanho,
+                             posicao_seguinte, filtro)
+
+    cache = estatisticas_cache()
+    st.caption(
+        f"{'🔑 Paginação por chave' if keyset else '📐 Paginação por OFFSET (tabela sem chave única)'}"
+        f" · {'página do cache' if janela['do_cache'] else 'lida do servidor'}"
+        f" · cache: {cache['paginas']} páginas, {cache['bytes'] / 1024 / 1024:.1f} MB"
+    )
+    return janela
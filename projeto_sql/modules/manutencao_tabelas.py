@@ -0,0 +1,347 @@
+# modules/manutencao_tabelas.py
+"""
+Console de manutenção de tabelas
+- Fragmentação: DATA_FREE do information_schema.TABLES (espaço alocado e
+  não usado, recuperável com OPTIMIZE TABLE)
+- Estatísticas: última atualização em mysql.innodb_table_stats e linhas
+  modificadas desde então (INNODB_TABLESTATS.MODIFIED_COUNTER); estatística
+  velha leva o otimizador a escolher planos ruins
+- ANALYZE/OPTIMIZE rodam numa fila em segundo plano, compartilhada pelo
+  processo, com limite de execuções simultâneas: cada execução usa uma
+  conexão própria e nunca duas operações na mesma tabela ao mesmo tempo
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from .conexao_resiliente import conectar
+from .contagem_registros import invalidar_contagem
+from .grade_virtual import invalidar_grade
+
+LIMIAR_FRAGMENTACAO = 0.20              # DATA_FREE / tamanho total
+MINIMO_BYTES_LIVRES = 10 * 1024 * 1024  # abaixo disto não vale um OPTIMIZE
+LIMIAR_MODIFICACOES = 0.10              # linhas modificadas / linhas desde o último ANALYZE
+DIAS_ESTATISTICA_VELHA = 7
+MAXIMO_SIMULTANEAS = 4
+MAXIMO_HISTORICO = 200
+
+OPERACOES = {
+    "ANALYZE": "📊 ANALYZE TABLE",
+    "OPTIMIZE": "🧹 OPTIMIZE TABLE",
+}
+
+AGUARDANDO = "aguardando"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluída"
+FALHOU = "falhou"
+
+# Fila do processo: id -> tarefa (ordem de chegada)
+_tarefas = OrderedDict()
+_ids = itertools.count(1)
+_trabalhadores = 0
+_limite = {"simultaneas": 2}
+_lock = threading.Lock()
+
+
+# ============ DIAGNÓSTICO ============
+def diagnosticar_tabelas(conexao, banco):
+    """
+    [{"tabela", "motor", "linhas", "bytes", "livre", "fragmentacao", "alterada_em",
+      "estatisticas_em", "modificadas", "fragmentada", "estatistica_velha"}]
+    """
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT TABLE_NAME, ENGINE, TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH, DATA_FREE, UPDATE_TIME
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = %s AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
+    """, (banco,))
+    tabelas = cursor.fetchall()
+
+    estatisticas = {}
+    try:
+        cursor.execute("""
+            SELECT table_name, last_update, n_rows FROM mysql.innodb_table_stats
+            WHERE database_name = %s
+        """, (banco,))
+        estatisticas = {nome: (atualizada, n) for nome, atualizada, n in cursor.fetchall()}
+    except mysql.connector.Error:
+        pass
+
+    modificadas = {}
+    for tabela_sistema in ("information_schema.INNODB_TABLESTATS", "information_schema.INNODB_SYS_TABLESTATS"):
+        try:
+            # NAME = 'banco/tabela' (partições aparecem como 'banco/tabela#p#nome')
+            cursor.execute(f"SELECT NAME, MODIFIED_COUNTER FROM {tabela_sistema} WHERE NAME LIKE %s",
+                           (banco.replace("_", "\\_") + "/%",))
+            for nome, contador in cursor.fetchall():
+                tabela = nome.split("/", 1)[1].split("#", 1)[0]
+                modificadas[tabela] = modificadas.get(tabela, 0) + int(contador or 0)
+            break
+        except mysql.connector.Error:
+            continue    # 5.7 usa INNODB_SYS_TABLESTATS; sem privilégio fica sem contador
+    cursor.close()
+
+    agora = datetime.now()
+    diagnostico = []
+    for nome, motor, linhas, tamanho, livre, alterada_em in tabelas:
+        tamanho, livre, linhas = int(tamanho or 0), int(livre or 0), int(linhas or 0)
+        fragmentacao = livre / (tamanho + livre) if tamanho + livre else 0.0
+        estatisticas_em, linhas_estatistica = estatisticas.get(nome, (None, None))
+        modificada = modificadas.get(nome)
+
+        velha = False
+        if (motor or "").lower() == "innodb":
+            base = linhas_estatistica or linhas
+            if modificada is not None and base and modificada / base > LIMIAR_MODIFICACOES:
+                velha = True
+            elif estatisticas_em and alterada_em and alterada_em > estatisticas_em \
+                    and agora - estatisticas_em > timedelta(days=DIAS_ESTATISTICA_VELHA):
+                velha = True
+
+        diagnostico.append({
+            "tabela": nome,
+            "motor": motor,
+            "linhas": linhas,
+            "bytes": tamanho,
+            "livre": livre,
+            "fragmentacao": fragmentacao,
+            "alterada_em": alterada_em,
+            "estatisticas_em": estatisticas_em,
+            "modificadas": modificada,
+            "fragmentada": livre >= MINIMO_BYTES_LIVRES and fragmentacao >= LIMIAR_FRAGMENTACAO,
+            "estatistica_velha": velha,
+        })
+    return diagnostico
+
+
+# ============ FILA EM SEGUNDO PLANO ============
+def definir_limite_simultaneas(quantidade):
+    """Quantas operações podem rodar ao mesmo tempo (1..MAXIMO_SIMULTANEAS)"""
+    with _lock:
+        _limite["simultaneas"] = max(1, min(MAXIMO_SIMULTANEAS, int(quantidade)))
+    _despachar()
+
+
+def enfileirar_manutencao(banco, tabelas, operacao):
+    """Enfileira a operação para cada tabela (ignora as que já têm a mesma operação pendente)"""
+    if operacao not in OPERACOES:
+        raise ValueError(f"operação desconhecida: {operacao}")
+    novas = 0
+    with _lock:
+        pendentes = {(t["banco"], t["tabela"], t["operacao"])
+                     for t in _tarefas.values() if t["estado"] in (AGUARDANDO, EXECUTANDO)}
+        for tabela in tabelas:
+            if (banco, tabela, operacao) in pendentes:
+                continue
+            identificador = next(_ids)
+            _tarefas[identificador] = {
+                "id": identificador, "banco": banco, "tabela": tabela, "operacao": operacao,
+                "estado": AGUARDANDO, "mensagem": "", "inicio": None, "fim": None,
+            }
+            novas += 1
+        _podar_historico()
+    _despachar()
+    return novas
+
+
+def _podar_historico():
+    """Descarta as tarefas terminadas mais antigas além do limite (chamada com _lock)"""
+    excesso = len(_tarefas) - MAXIMO_HISTORICO
+    for identificador in [i for i, t in _tarefas.items() if t["estado"] in (CONCLUIDA, FALHOU)][:max(0, excesso)]:
+        del _tarefas[identificador]
+
+
+def _proxima_tarefa():
+    """Próxima tarefa aguardando cuja tabela não está em execução (chamada com _lock)"""
+    ocupadas = {(t["banco"], t["tabela"]) for t in _tarefas.values() if t["estado"] == EXECUTANDO}
+    for tarefa in _tarefas.values():
+        if tarefa["estado"] == AGUARDANDO and (tarefa["banco"], tarefa["tabela"]) not in ocupadas:
+            tarefa["estado"] = EXECUTANDO
+            tarefa["inicio"] = datetime.now()
+            return tarefa
+    return None
+
+
+def _despachar():
+    """Inicia trabalhadores até o limite de simultâneas"""
+    global _trabalhadores
+    while True:
+        with _lock:
+            if _trabalhadores >= _limite["simultaneas"] or not any(
+                    t["estado"] == AGUARDANDO for t in _tarefas.values()):
+                return
+            _trabalhadores += 1
+        threading.Thread(target=_trabalhar, daemon=True).start()
+
+
+def _executar(tarefa):
+    """ANALYZE/OPTIMIZE com conexão própria. Retorna (sucesso, mensagem)."""
+    conexao = conectar(tarefa["banco"])
+    try:
+        cursor = conexao.cursor()
+        cursor.execute(f"{tarefa['operacao']} TABLE `{tarefa['banco']}`.`{tarefa['tabela']}`")
+        # Linhas (Table, Op, Msg_type, Msg_text); InnoDB responde ao OPTIMIZE com
+        # uma 'note' ("doing recreate + analyze instead") seguida de 'status OK'
+        linhas = cursor.fetchall()
+        cursor.close()
+    finally:
+        conexao.close()
+    erros = [texto for _, _, tipo, texto in linhas if str(tipo).lower() == "error"]
+    if erros:
+        return False, "; ".join(erros)
+    return True, "; ".join(str(texto) for _, _, _, texto in linhas)
+
+
+def _trabalhar():
+    """Corpo da thread: consome a fila até não haver tarefa disponível"""
+    global _trabalhadores
+    contado = True
+    try:
+        while True:
+            with _lock:
+                if _trabalhadores > _limite["simultaneas"]:
+                    # Limite reduzido: este trabalhador sobra. Sai já descontado,
+                    # senão outro excedente veria o total antigo e sairia também
+                    _trabalhadores -= 1
+                    contado = False
+                    return
+                tarefa = _proxima_tarefa()
+            if tarefa is None:
+                return
+            sucesso, mensagem = False, "interrompida"
+            try:
+                sucesso, mensagem = _executar(tarefa)
+            except Exception as e:
+                sucesso, mensagem = False, str(e)
+            finally:
+                # Nunca deixa a tarefa presa em EXECUTANDO (bloquearia a tabela na fila)
+                with _lock:
+                    tarefa["estado"] = CONCLUIDA if sucesso else FALHOU
+                    tarefa["mensagem"] = mensagem
+                    tarefa["fim"] = datetime.now()
+            if tarefa["operacao"] == "OPTIMIZE":
+                invalidar_grade(tarefa["banco"], tarefa["tabela"])
+            invalidar_contagem(tarefa["banco"], tarefa["tabela"])
+    finally:
+        if contado:
+            with _lock:
+                _trabalhadores -= 1
+        # Tarefas podem ter sido bloqueadas pela tabela ocupada: tenta de novo
+        _despachar()
+
+
+def tarefas_manutencao(banco=None):
+    """Cópia das tarefas (de um banco, se indicado) na ordem de chegada"""
+    with _lock:
+        return [dict(t) for t in _tarefas.values() if banco is None or t["banco"] == banco]
+
+
+def limpar_concluidas(banco=None):
+    with _lock:
+        for identificador in [i for i, t in _tarefas.items()
+                              if t["estado"] in (CONCLUIDA, FALHOU) and (banco is None or t["banco"] == banco)]:
+            del _tarefas[identificador]
+
+
+# ============ COMPONENTES STREAMLIT ============
+def _formatar_bytes(valor):
+    return f"{valor / 1024 / 1024:,.1f} MB"
+
+
+def mostrar_fila(banco):
+    """Progresso da fila do banco"""
+    tarefas = tarefas_manutencao(banco)
+    if not tarefas:
+        return
+    terminadas = sum(t["estado"] in (CONCLUIDA, FALHOU) for t in tarefas)
+    st.progress(terminadas / len(tarefas), text=f"{terminadas} de {len(tarefas)} operações concluídas")
+
+    icones = {AGUARDANDO: "⏳", EXECUTANDO: "⚙️", CONCLUIDA: "✅", FALHOU: "❌"}
+    st.dataframe(pd.DataFrame([{
+        "Estado": f"{icones[t['estado']]} {t['estado']}",
+        "Operação": t["operacao"],
+        "Tabela": t["tabela"],
+        "Duração (s)": round(((t["fim"] or datetime.now()) - t["inicio"]).total_seconds(), 1) if t["inicio"] else None,
+        "Resultado": t["mensagem"],
+    } for t in tarefas]), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("🔄 Atualizar progresso", key=f"manutencao_atualizar_{banco}"):
+            st.rerun()
+    with col2:
+        if st.button("🧹 Limpar concluídas", key=f"manutencao_limpar_{banco}", disabled=not terminadas):
+            limpar_concluidas(banco)
+            st.rerun()
+
+
+def mostrar_manutencao(banco):
+    """Console de manutenção do banco: diagnóstico + fila de ANALYZE/OPTIMIZE"""
+    st.markdown("### 🛠️ Manutenção de Tabelas")
+    try:
+        conexao = conectar(banco)
+        try:
+            diagnostico = diagnosticar_tabelas(conexao, banco)
+        finally:
+            conexao.close()
+    except mysql.connector.Error as e:
+        st.error(f"❌ Erro ao diagnosticar tabelas: {e}")
+        return
+    if not diagnostico:
+        st.info("Nenhuma tabela no banco.")
+        return
+
+    fragmentadas = [d["tabela"] for d in diagnostico if d["fragmentada"]]
+    velhas = [d["tabela"] for d in diagnostico if d["estatistica_velha"]]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Tabelas", len(diagnostico))
+    col2.metric("Fragmentadas", len(fragmentadas),
+                help=f"≥ {LIMIAR_FRAGMENTACAO:.0%} do espaço livre e ≥ {_formatar_bytes(MINIMO_BYTES_LIVRES)}")
+    col3.metric("Estatísticas velhas", len(velhas),
+                help=f"> {LIMIAR_MODIFICACOES:.0%} das linhas modificadas desde o último ANALYZE")
+
+    def situacao(d):
+        alertas = []
+        if d["fragmentada"]:
+            alertas.append("🧩 fragmentada")
+        if d["estatistica_velha"]:
+            alertas.append("📉 estatística velha")
+        return " · ".join(alertas) or "✅"
+
+    st.dataframe(pd.DataFrame([{
+        "Tabela": d["tabela"],
+        "Motor": d["motor"],
+        "Linhas (est.)": d["linhas"],
+        "Tamanho (MB)": round(d["bytes"] / 1024 / 1024, 2),
+        "Livre (MB)": round(d["livre"] / 1024 / 1024, 2),
+        "Fragmentação": f"{d['fragmentacao']:.0%}",
+        "Modificadas": d["modificadas"],
+        "Estatísticas de": d["estatisticas_em"],
+        "Alterada em": d["alterada_em"],
+        "Situação": situacao(d),
+    } for d in diagnostico]), use_container_width=True, hide_index=True)
+
+    todas = [d["tabela"] for d in diagnostico]
+    operacao = st.radio("Operação", list(OPERACOES), format_func=OPERACOES.get, horizontal=True,
+                        key=f"manutencao_operacao_{banco}")
+    sugeridas = fragmentadas if operacao == "OPTIMIZE" else velhas
+    escolhidas = st.multiselect("Tabelas", todas, default=sugeridas, key=f"manutencao_tabelas_{banco}_{operacao}")
+    if operacao == "OPTIMIZE":
+        st.caption("ℹ️ No InnoDB o OPTIMIZE reconstrói a tabela (online, mas consome I/O e espaço temporário).")
+    simultaneas = st.slider("Execuções simultâneas", 1, MAXIMO_SIMULTANEAS, _limite["simultaneas"],
+                            key=f"manutencao_simultaneas_{banco}")
+    if st.button(f"▶️ Enfileirar {operacao}", type="primary", disabled=not escolhidas,
+                 key=f"manutencao_enfileirar_{banco}"):
+        definir_limite_simultaneas(simultaneas)
+        novas = enfileirar_manutencao(banco, escolhidas, operacao)
+        st.success(f"✅ {novas} operação(ões) enfileirada(s)")
+        time.sleep(0.2)     # dá tempo de a primeira aparecer como em execução
+
+    mostrar_fila(banco)
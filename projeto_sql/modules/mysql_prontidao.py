@@ -0,0 +1,316 @@
+# modules/mysql_prontidao.py
+"""
+Prontidão do MySQL (Docker ou XAMPP)
+- Inicia/reutiliza o container numa thread, sem bloquear o script Streamlit
+- Sonda a porta e um SELECT 1 com backoff exponencial
+- Guarda o status com TTL curto, compartilhado por todas as sessões
+"""
+import socket
+import subprocess
+import threading
+import time
+
+import mysql.connector
+import streamlit as st
+
+CONTAINER_PADRAO = "mysql_fix"
+PORTA_PADRAO = 3306
+IMAGEM_MYSQL = "mysql:8.0"
+
+STATUS_TTL_SEGUNDOS = 3        # status da porta / SELECT 1
+DOCKER_TTL_SEGUNDOS = 15       # resultado de `docker ps` (subprocess é caro)
+BACKOFF_INICIAL = 0.25
+BACKOFF_MAXIMO = 5.0
+TIMEOUT_PRONTIDAO = 180        # desiste ao fim de 3 minutos
+
+# Fases do arranque
+FASE_PARADO = "parado"
+FASE_INICIANDO = "iniciando"
+FASE_AGUARDANDO = "aguardando"
+FASE_PRONTO = "pronto"
+FASE_ERRO = "erro"
+
+_lock = threading.Lock()
+_arranques = {}        # container -> {"fase", "mensagem", "inicio", "duracao", "tentativas"}
+_cache_status = {}     # (host, porta) -> (momento, status)
+_cache_docker = {}     # container -> (momento, ativo)
+_cache_diagnostico = {"momento": 0.0, "dados": None}
+
+
+# ============ SONDAS ============
+def porta_aberta(host="localhost", porta=PORTA_PADRAO, timeout=0.5):
+    """Testa se há algo a escutar na porta (não fala o protocolo MySQL)"""
+    try:
+        with socket.create_connection((host, porta), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def mysql_responde(host="localhost", porta=PORTA_PADRAO, senha="", timeout=2):
+    """Abre uma conexão curta e executa SELECT 1"""
+    # Uma tentativa só, fora de conectar(): o backoff é de quem aguarda a prontidão
+    try:
+        conexao = mysql.connector.connect(
+            host=host,
+            user="root",
+            password=senha,
+            port=porta,
+            connection_timeout=timeout
+        )
+        try:
+            cursor = conexao.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+        finally:
+            conexao.close()
+        return True
+    except Exception:
+        return False
+
+
+def _executar_docker(args, timeout=30):
+    """Executa um comando docker e devolve o CompletedProcess (ou None)"""
+    try:
+        return subprocess.run(["docker"] + args, capture_output=True,
+                              text=True, timeout=timeout)
+    except Exception:
+        return None
+
+
+def docker_container_ativo(nome=CONTAINER_PADRAO, forcar=False):
+    """`docker ps` com cache: evita um subprocess a cada rerun"""
+    agora = time.time()
+    with _lock:
+        em_cache = _cache_docker.get(nome)
+    if not forcar and em_cache and agora - em_cache[0] < DOCKER_TTL_SEGUNDOS:
+        return em_cache[1]
+
+    resultado = _executar_docker(
+        ["ps", "--filter", f"name={nome}", "--format", "{{.Status}}"], timeout=5
+    )
+    ativo = bool(resultado and resultado.returncode == 0 and "Up" in resultado.stdout)
+
+    with _lock:
+        _cache_docker[nome] = (agora, ativo)
+    return ativo
+
+
+def obter_status(host="localhost", porta=PORTA_PADRAO, senha="", forcar=False):
+    """
+    Status barato e em cache:
+        {"porta_aberta": bool, "mysql_pronto": bool, "verificado_em": float}
+    O SELECT 1 só é tentado quando a porta está aberta.
+    """
+    chave = (host, porta)
+    agora = time.time()
+    with _lock:
+        em_cache = _cache_status.get(chave)
+    if not forcar and em_cache and agora - em_cache[0] < STATUS_TTL_SEGUNDOS:
+        return em_cache[1]
+
+    aberta = porta_aberta(host, porta)
+    status = {
+        "porta_aberta": aberta,
+        "mysql_pronto": aberta and mysql_responde(host, porta, senha),
+        "verificado_em": agora
+    }
+    with _lock:
+        _cache_status[chave] = (agora, status)
+    return status
+
+
+def invalidar_status():
+    """Descarta os status em cache (ex: após o usuário pedir reconexão)"""
+    with _lock:
+        _cache_status.clear()
+        _cache_docker.clear()
+
+
+# ============ ARRANQUE ASSÍNCRONO ============
+def _atualizar_arranque(nome, **campos):
+    with _lock:
+        _arranques.setdefault(nome, {}).update(campos)
+
+
+def obter_arranque(nome=CONTAINER_PADRAO):
+    """Estado do último arranque pedido para o container"""
+    with _lock:
+        return dict(_arranques.get(nome, {"fase": FASE_PARADO}))
+
+
+def aguardar_mysql(host="localhost", porta=PORTA_PADRAO, senha="",
+                   timeout=TIMEOUT_PRONTIDAO, ao_tentar=None):
+    """
+    Sonda porta + SELECT 1 com backoff exponencial até o MySQL responder.
+    Retorna o número de tentativas, ou None se esgotar o timeout.
+    """
+    limite = time.time() + timeout
+    espera = BACKOFF_INICIAL
+    tentativas = 0
+
+    while time.time() < limite:
+        tentativas += 1
+        if ao_tentar:
+            ao_tentar(tentativas)
+        if porta_aberta(host, porta) and mysql_responde(host, porta, senha):
+            return tentativas
+        time.sleep(min(espera, max(0.0, limite - time.time())))
+        espera = min(espera * 2, BACKOFF_MAXIMO)
+
+    return None
+
+
+def _arrancar_container(nome, porta, senha, argumentos_run):
+    """Corpo da thread: reutiliza ou cria o container e espera pela prontidão"""
+    inicio = time.time()
+    _atualizar_arranque(nome, fase=FASE_INICIANDO, inicio=inicio, duracao=None,
+                        tentativas=0, mensagem="Verificando Docker...")
+
+    versao = _executar_docker(["--version"], timeout=10)
+    if not versao or versao.returncode != 0:
+        _atualizar_arranque(nome, fase=FASE_ERRO, mensagem="Docker não está instalado!")
+        return
+
+    # Reutilizar container existente (mantém dados e evita recriar)
+    existente = _executar_docker(
+        ["ps", "-a", "--filter", f"name=^{nome}$", "--format", "{{.Status}}"], timeout=10
+    )
+    if existente and existente.returncode == 0 and existente.stdout.strip():
+        if "Up" in existente.stdout:
+            mensagem = "Container já estava rodando"
+        else:
+            resultado = _executar_docker(["start", nome])
+            if not resultado or resultado.returncode != 0:
+                erro = resultado.stderr if resultado else "timeout"
+                _atualizar_arranque(nome, fase=FASE_ERRO, mensagem=f"Erro ao iniciar: {erro}")
+                return
+            mensagem = "Container existente reiniciado"
+    else:
+        resultado = _executar_docker(["run", "-d", "--name", nome] + argumentos_run, timeout=300)
+        if not resultado or resultado.returncode != 0:
+            erro = resultado.stderr if resultado else "timeout"
+            _atualizar_arranque(nome, fase=FASE_ERRO, mensagem=f"Erro: {erro}")
+            return
+        mensagem = "Container criado"
+
+    _atualizar_arranque(nome, fase=FASE_AGUARDANDO, mensagem=f"{mensagem}; aguardando MySQL...")
+
+    tentativas = aguardar_mysql(
+        "localhost", porta, senha,
+        ao_tentar=lambda n: _atualizar_arranque(nome, tentativas=n)
+    )
+
+    with _lock:
+        _cache_docker.pop(nome, None)
+        _cache_status.pop(("localhost", porta), None)
+
+    if tentativas is None:
+        _atualizar_arranque(nome, fase=FASE_ERRO,
+                            mensagem=f"MySQL não respondeu em {TIMEOUT_PRONTIDAO}s")
+    else:
+        _atualizar_arranque(nome, fase=FASE_PRONTO, duracao=time.time() - inicio,
+                            mensagem=f"MySQL pronto ({tentativas} sondagens)")
+
+
+def iniciar_container_async(nome=CONTAINER_PADRAO, porta=PORTA_PADRAO, senha="",
+                            argumentos_run=None):
+    """
+    Inicia (ou reutiliza) o container numa thread e retorna de imediato.
+    Retorna False se já houver um arranque em curso.
+    """
+    if argumentos_run is None:
+        argumentos_run = [
+            "-p", f"{porta}:3306",
+            "-e", "MYSQL_ROOT_PASSWORD=",
+            "-e", "MYSQL_ALLOW_EMPTY_PASSWORD=yes",
+            "-v", f"{nome}_data:/var/lib/mysql",
+            IMAGEM_MYSQL
+        ]
+
+    with _lock:
+        fase = _arranques.get(nome, {}).get("fase")
+        if fase in (FASE_INICIANDO, FASE_AGUARDANDO):
+            return False
+        _arranques[nome] = {"fase": FASE_INICIANDO, "mensagem": "Iniciando...",
+                            "inicio": time.time(), "duracao": None, "tentativas": 0}
+
+    threading.Thread(
+        target=_arrancar_container,
+        args=(nome, porta, senha, argumentos_run),
+        daemon=True
+    ).start()
+    return True
+
+
+def parar_container(nome):
+    """Para um container (sem o remover)"""
+    resultado = _executar_docker(["stop", nome])
+    with _lock:
+        _cache_docker.pop(nome, None)
+        _arranques.pop(nome, None)
+    return bool(resultado and resultado.returncode == 0)
+
+
+def diagnostico_docker(forcar=False):
+    """Versão, engine e imagem MySQL (cache de 60s; usado pelo rundoker)"""
+    agora = time.time()
+    with _lock:
+        dados = _cache_diagnostico["dados"]
+        if not forcar and dados and agora - _cache_diagnostico["momento"] < 60:
+            return dados
+
+    versao = _executar_docker(["--version"], timeout=10)
+    info = _executar_docker(["info"], timeout=15) if versao and versao.returncode == 0 else None
+    imagens = _executar_docker(["images", "mysql"], timeout=10) if info and info.returncode == 0 else None
+
+    dados = {
+        "instalado": bool(versao and versao.returncode == 0),
+        "versao": versao.stdout.strip() if versao and versao.returncode == 0 else "",
+        "engine": bool(info and info.returncode == 0),
+        "imagem_mysql": bool(imagens and "mysql" in imagens.stdout),
+    }
+    with _lock:
+        _cache_diagnostico["momento"] = agora
+        _cache_diagnostico["dados"] = dados
+    return dados
+
+
+# ============ INDICADOR NA INTERFACE ============
+def _mostrar_arranque_em_curso(nome):
+    """Mostra o progresso do arranque; ao terminar pede um rerun completo"""
+    arranque = obter_arranque(nome)
+    if arranque.get("fase") not in (FASE_INICIANDO, FASE_AGUARDANDO):
+        st.rerun()
+    decorrido = time.time() - arranque.get("inicio", time.time())
+    st.info(f"⏳ {arranque.get('mensagem', '')} ({decorrido:.0f}s, "
+            f"{arranque.get('tentativas', 0)} sondagens)")
+
+
+# Atualização automática só durante o arranque, quando o Streamlit suporta fragments
+if hasattr(st, "fragment"):
+    _mostrar_arranque_em_curso = st.fragment(run_every=2)(_mostrar_arranque_em_curso)
+
+
+def mostrar_indicador_status(nome=CONTAINER_PADRAO, porta=PORTA_PADRAO, senha=""):
+    """Indicador não bloqueante: mostra o estado atual e retorna de imediato"""
+    arranque = obter_arranque(nome)
+    fase = arranque.get("fase", FASE_PARADO)
+
+    if fase in (FASE_INICIANDO, FASE_AGUARDANDO):
+        _mostrar_arranque_em_curso(nome)
+        return
+
+    if fase == FASE_ERRO:
+        st.error(f"❌ {arranque.get('mensagem', 'Erro no arranque')}")
+    elif fase == FASE_PRONTO and arranque.get("duracao") is not None:
+        st.caption(f"🐳 MySQL pronto em {arranque['duracao']:.1f}s")
+
+    status = obter_status(porta=porta, senha=senha)
+    if status["mysql_pronto"]:
+        st.caption("🟢 MySQL respondendo")
+    elif status["porta_aberta"]:
+        st.caption("🟡 Porta aberta, MySQL ainda não responde")
+    else:
+        st.caption("🔴 MySQL não está escutando")
@@ -0,0 +1,500 @@
+# modules/operacoes_lote.py
+"""
+UPDATE/DELETE em lote por filtro
+- Simulação: COUNT(*) com o mesmo filtro antes de executar
+- Execução em blocos pela chave (PRIMARY KEY ou UNIQUE NOT NULL): cada bloco
+  cobre N linhas que atendem ao filtro e é confirmado sozinho, então os locks
+  e o undo log ficam do tamanho do bloco, não da operação inteira
+- Pausa configurável entre blocos para não disputar com o uso normal
+- Roda em thread própria (conexão própria) e grava o progresso após cada
+  bloco em lotes/<id>.json: se o processo cair, a operação é retomada do
+  último bloco confirmado
+"""
+import base64
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from .backup_catalogo import gravar_json, ler_json
+from .conexao_resiliente import conectar
+from .contagem_registros import invalidar_contagem
+from .grade_virtual import condicao_keyset, invalidar_grade, obter_chave_navegacao, obter_colunas
+
+DIRETORIO_LOTES = "lotes"
+TAMANHO_BLOCO_PADRAO = 1000
+PAUSA_PADRAO = 0.1              # segundos entre blocos
+
+OPERADORES = ["=", "!=", ">", "<", ">=", "<=", "LIKE", "NOT LIKE", "IS NULL", "IS NOT NULL"]
+_SEM_VALOR = ("IS NULL", "IS NOT NULL")
+
+# Estados de uma operação
+EM_ANDAMENTO = "em andamento"
+INTERROMPIDA = "interrompida"
+CANCELADA = "cancelada"
+CONCLUIDA = "concluída"
+FALHOU = "falhou"
+
+_em_execucao = set()
+_cancelamentos = set()
+_lock = threading.Lock()
+
+
+# ============ FILTRO ============
+def montar_filtro(condicoes):
+    """
+    condicoes: [{"campo", "operador", "valor"}], combinadas com AND.
+    LIKE usa o valor como digitado (inclua % onde quiser o curinga).
+    Retorna (sql, params); levanta ValueError para filtro vazio ou operador inválido.
+    """
+    partes = []
+    params = []
+    for cond in condicoes:
+        operador = cond["operador"]
+        if operador not in OPERADORES:
+            raise ValueError(f"operador inválido: {operador}")
+        if operador in _SEM_VALOR:
+            partes.append(f"`{cond['campo']}` {operador}")
+        else:
+            partes.append(f"`{cond['campo']}` {operador} %s")
+            params.append(cond["valor"])
+    if not partes:
+        # Sem filtro seria a tabela inteira: exige uma condição explícita
+        raise ValueError("informe ao menos uma condição")
+    return " AND ".join(partes), params
+
+
+def contar_afetados(conexao, banco, tabela, condicoes):
+    """Simulação: quantas linhas o filtro atinge agora"""
+    filtro, params = montar_filtro(condicoes)
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM `{banco}`.`{tabela}` WHERE {filtro}", params)
+    total = cursor.fetchone()[0]
+    cursor.close()
+    return int(total)
+
+
+def amostra_afetados(conexao, banco, tabela, condicoes, limite=20):
+    """Algumas linhas que o filtro atinge, para conferência antes de executar"""
+    filtro, params = montar_filtro(condicoes)
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT * FROM `{banco}`.`{tabela}` WHERE {filtro} LIMIT {int(limite)}", params)
+    linhas = cursor.fetchall()
+    colunas = list(cursor.column_names)
+    cursor.close()
+    return linhas, colunas
+
+
+# ============ ESTADO EM DISCO ============
+def valor_para_json(valor):
+    """Valores da chave precisam ir para o JSON e voltar comparáveis no MySQL"""
+    if isinstance(valor, (bytes, bytearray)):
+        return {"base64": base64.b64encode(bytes(valor)).decode("ascii")}
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat(sep=" ") if isinstance(valor, datetime) else valor.isoformat()
+    if isinstance(valor, timedelta):
+        # Literal TIME do MySQL: str(timedelta) daria "1 day, 2:00:00" / "-1 day, 23:59:59"
+        micros = valor // timedelta(microseconds=1)
+        sinal = "-" if micros < 0 else ""
+        segundos, micros = divmod(abs(micros), 1_000_000)
+        horas, resto = divmod(segundos, 3600)
+        minutos, segundos = divmod(resto, 60)
+        fracao = f".{micros:06d}" if micros else ""
+        return f"{sinal}{horas:02d}:{minutos:02d}:{segundos:02d}{fracao}"
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def valor_de_json(valor):
+    if isinstance(valor, dict) and "base64" in valor:
+        return base64.b64decode(valor["base64"])
+    return valor
+
+
+def _caminho(id_lote, diretorio):
+    return os.path.join(diretorio, f"{id_lote}.json")
+
+
+def carregar_lote(id_lote, diretorio=DIRETORIO_LOTES):
+    return ler_json(_caminho(id_lote, diretorio), None)
+
+
+def salvar_lote(lote, diretorio):
+    lote["atualizado_em"] = datetime.now().isoformat(timespec="seconds")
+    gravar_json(_caminho(lote["id"], diretorio), lote)
+
+
+def listar_lotes(banco=None, tabela=None, diretorio=DIRETORIO_LOTES):
+    """Operações registradas (mais recentes primeiro), com 'rodando' indicando thread ativa"""
+    if not os.path.isdir(diretorio):
+        return []
+    lotes = []
+    for nome in os.listdir(diretorio):
+        if not nome.endswith(".json"):
+            continue
+        lote = ler_json(os.path.join(diretorio, nome), None)
+        if not lote or (banco and lote["banco"] != banco) or (tabela and lote["tabela"] != tabela):
+            continue
+        with _lock:
+            lote["rodando"] = lote["id"] in _em_execucao
+        # Ficou "em andamento" sem thread: o processo caiu no meio
+        if lote["estado"] == EM_ANDAMENTO and not lote["rodando"]:
+            lote["estado"] = INTERROMPIDA
+        lotes.append(lote)
+    return sorted(lotes, key=lambda l: l["criado_em"], reverse=True)
+
+
+def remover_lote(id_lote, diretorio=DIRETORIO_LOTES):
+    try:
+        os.remove(_caminho(id_lote, diretorio))
+    except OSError:
+        pass
+
+
+# ============ EXECUÇÃO EM BLOCOS ============
+def _sql_comando(lote, filtro):
+    alvo = f"`{lote['banco']}`.`{lote['tabela']}`"
+    if lote["operacao"] == "excluir":
+        return f"DELETE FROM {alvo} WHERE {filtro}", []
+    atribuicoes = ", ".join(f"`{c}` = %s" for c in lote["valores"])
+    return f"UPDATE {alvo} SET {atribuicoes} WHERE {filtro}", list(lote["valores"].values())
+
+
+def proximo_limite(cursor, lote, filtro, params, ultimo):
+    """Chave da N-ésima linha que atende ao filtro depois de 'ultimo' (ou a última, se faltarem)"""
+    chave = lote["chave"]
+    condicoes = [f"({filtro})"]
+    valores = list(params)
+    if ultimo is not None:
+        condicao, params_chave = condicao_keyset(chave, ultimo, ">")
+        condicoes.append(condicao)
+        valores.extend(params_chave)
+    colunas = ", ".join(f"`{c}`" for c in chave)
+    ordem = ", ".join(f"`{c}` ASC" for c in chave)
+    base = (f"SELECT {colunas} FROM `{lote['banco']}`.`{lote['tabela']}` "
+            f"WHERE {' AND '.join(condicoes)} ORDER BY {ordem}")
+
+    cursor.execute(f"{base} LIMIT 1 OFFSET {int(lote['tamanho_bloco']) - 1}", valores)
+    linha = cursor.fetchone()
+    if linha is None:
+        # Menos que um bloco inteiro restante: vai até a última linha do filtro
+        ordem_inversa = ", ".join(f"`{c}` DESC" for c in chave)
+        cursor.execute(base.replace(f"ORDER BY {ordem}", f"ORDER BY {ordem_inversa}") + " LIMIT 1", valores)
+        linha = cursor.fetchone()
+    return tuple(linha) if linha else None
+
+
+def faixa_bloco(chave, filtro, params, ultimo, limite):
+    """Condição da faixa (ultimo, limite] da chave com o filtro repetido: (sql, valores)"""
+    faixa = [f"({filtro})"]
+    valores = list(params)
+    if ultimo is not None:
+        condicao, params_chave = condicao_keyset(chave, ultimo, ">")
+        faixa.append(condicao)
+        valores.extend(params_chave)
+    condicao, params_chave = condicao_keyset(chave, limite, ">")
+    faixa.append(f"NOT {condicao}")
+    valores.extend(params_chave)
+    return " AND ".join(faixa), valores
+
+
+def cancelamento_pedido(id_lote):
+    """Consultado pela thread entre blocos"""
+    with _lock:
+        return id_lote in _cancelamentos
+
+
+def encerrar_execucao(id_lote):
+    """Chamado pela thread ao terminar (em finally)"""
+    with _lock:
+        _em_execucao.discard(id_lote)
+        _cancelamentos.discard(id_lote)
+
+
+def _executar_blocos(id_lote, diretorio):
+    """Corpo da thread: processa blocos até acabar, ser cancelada ou falhar"""
+    lote = carregar_lote(id_lote, diretorio)
+    conexao = None
+    try:
+        conexao = conectar(lote["banco"])
+        conexao.autocommit = False
+        cursor = conexao.cursor()
+        filtro, params = montar_filtro(lote["condicoes"])
+        chave = lote["chave"]
+
+        while True:
+            if cancelamento_pedido(id_lote):
+                lote["estado"] = CANCELADA
+                break
+
+            ultimo = tuple(valor_de_json(v) for v in lote["ultimo"]) if lote["ultimo"] else None
+            limite = proximo_limite(cursor, lote, filtro, params, ultimo)
+            conexao.commit()        # a leitura do limite não segura snapshot/locks
+            if limite is None:
+                lote["estado"] = CONCLUIDA
+                break
+
+            faixa, valores_faixa = faixa_bloco(chave, filtro, params, ultimo, limite)
+            sql, params_set = _sql_comando(lote, faixa)
+            inicio = time.time()
+            cursor.execute(sql, params_set + valores_faixa)
+            afetadas = cursor.rowcount
+            conexao.commit()
+
+            lote["ultimo"] = [valor_para_json(v) for v in limite]
+            lote["afetadas"] += afetadas
+            lote["blocos"] += 1
+            lote["tempo_blocos"] = round(lote.get("tempo_blocos", 0) + time.time() - inicio, 3)
+            salvar_lote(lote, diretorio)
+
+            if lote["pausa"]:
+                time.sleep(lote["pausa"])
+
+    except Exception as e:
+        if conexao is not None:
+            try:
+                conexao.rollback()
+            except Exception:
+                pass
+        lote["estado"] = FALHOU
+        lote["erro"] = str(e)
+    finally:
+        if lote["estado"] != EM_ANDAMENTO:
+            lote["concluido_em"] = datetime.now().isoformat(timespec="seconds")
+        salvar_lote(lote, diretorio)
+        invalidar_grade(lote["banco"], lote["tabela"])
+        invalidar_contagem(lote["banco"], lote["tabela"])
+        if conexao is not None:
+            try:
+                conexao.close()
+            except Exception:
+                pass
+        encerrar_execucao(id_lote)
+
+
+def disparar_lote(id_lote, diretorio, executor=None):
+    """Roda executor(id_lote, diretorio) numa thread, se a operação ainda não está rodando"""
+    with _lock:
+        if id_lote in _em_execucao:
+            return False
+        _em_execucao.add(id_lote)
+    threading.Thread(target=executor or _executar_blocos, args=(id_lote, diretorio), daemon=True).start()
+    return True
+
+
+def iniciar_lote(conexao, banco, tabela, operacao, condicoes, valores=None,
+                 tamanho_bloco=TAMANHO_BLOCO_PADRAO, pausa=PAUSA_PADRAO, diretorio=DIRETORIO_LOTES):
+    """
+    Registra e dispara a operação em segundo plano.
+    operacao: "atualizar" (valores = {coluna: novo valor}) ou "excluir".
+    Retorna {"sucesso", "mensagem", "id"}.
+    """
+    try:
+        montar_filtro(condicoes)
+    except ValueError as e:
+        return {"sucesso": False, "mensagem": str(e), "id": None}
+    if operacao == "atualizar" and not valores:
+        return {"sucesso": False, "mensagem": "informe ao menos uma coluna para alterar", "id": None}
+
+    chave = obter_chave_navegacao(conexao, banco, tabela)
+    if not chave:
+        return {"sucesso": False, "id": None,
+                "mensagem": f"'{tabela}' não tem PRIMARY KEY nem UNIQUE NOT NULL: "
+                            "sem chave não há como dividir em blocos com segurança"}
+    if operacao == "atualizar" and set(valores) & set(chave):
+        return {"sucesso": False, "id": None,
+                "mensagem": "a chave não pode ser alterada em lote (os blocos são definidos por ela)"}
+
+    lote = {
+        "id": datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6],
+        "banco": banco,
+        "tabela": tabela,
+        "operacao": operacao,
+        "condicoes": condicoes,
+        "valores": valores or {},
+        "chave": chave,
+        "tamanho_bloco": int(tamanho_bloco),
+        "pausa": float(pausa),
+        "estimativa": contar_afetados(conexao, banco, tabela, condicoes),
+        "ultimo": None,
+        "afetadas": 0,
+        "blocos": 0,
+        "estado": EM_ANDAMENTO,
+        "erro": None,
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    os.makedirs(diretorio, exist_ok=True)
+    salvar_lote(lote, diretorio)
+    disparar_lote(lote["id"], diretorio)
+    return {"sucesso": True, "mensagem": f"Operação {lote['id']} iniciada", "id": lote["id"]}
+
+
+def retomar_lote(id_lote, diretorio=DIRETORIO_LOTES, executor=None):
+    """Continua uma operação interrompida/cancelada/com falha a partir do último bloco confirmado"""
+    lote = carregar_lote(id_lote, diretorio)
+    if lote is None:
+        return {"sucesso": False, "mensagem": "operação não encontrada"}
+    if lote["estado"] == CONCLUIDA:
+        return {"sucesso": False, "mensagem": "operação já concluída"}
+    lote["estado"] = EM_ANDAMENTO
+    lote["erro"] = None
+    lote.pop("concluido_em", None)
+    salvar_lote(lote, diretorio)
+    if not disparar_lote(id_lote, diretorio, executor):
+        return {"sucesso": False, "mensagem": "operação já está rodando"}
+    return {"sucesso": True, "mensagem": f"Operação {id_lote} retomada"}
+
+
+def cancelar_lote(id_lote):
+    """Pede a parada; o bloco em curso termina e é confirmado"""
+    with _lock:
+        if id_lote not in _em_execucao:
+            return False
+        _cancelamentos.add(id_lote)
+    return True
+
+
+# ============ COMPONENTE STREAMLIT ============
+def editor_condicoes(colunas, chave):
+    """Condições do filtro (AND)"""
+    quantidade = st.number_input("Número de condições:", 1, 5, 1, key=f"lote_qtd_cond_{chave}")
+    condicoes = []
+    for i in range(int(quantidade)):
+        col1, col2, col3 = st.columns([3, 2, 3])
+        with col1:
+            campo = st.selectbox(f"Campo {i + 1}:", colunas, key=f"lote_campo_{chave}_{i}")
+        with col2:
+            operador = st.selectbox(f"Operador {i + 1}:", OPERADORES, key=f"lote_operador_{chave}_{i}")
+        with col3:
+            valor = ""
+            if operador not in _SEM_VALOR:
+                valor = st.text_input(f"Valor {i + 1}:", key=f"lote_valor_{chave}_{i}",
+                                      help="Em LIKE use % como curinga")
+        if operador in _SEM_VALOR or valor != "":
+            condicoes.append({"campo": campo, "operador": operador, "valor": valor})
+    return condicoes
+
+
+def mostrar_acompanhamento(banco, tabela, chave="", diretorio=DIRETORIO_LOTES):
+    """Progresso das operações em lote da tabela, com cancelar/retomar"""
+    lotes = listar_lotes(banco, tabela, diretorio)
+    if not lotes:
+        return
+
+    st.write("**Operações em lote desta tabela:**")
+    for lote in lotes[:10]:
+        rotulo = "🔄 UPDATE" if lote["operacao"] == "atualizar" else "🗑️ DELETE"
+        filtro = " AND ".join(f"{c['campo']} {c['operador']} {c['valor']}".strip() for c in lote["condicoes"])
+        st.write(f"{rotulo} `{filtro}` — **{lote['estado']}** · {lote['afetadas']:,} linha(s) "
+                 f"em {lote['blocos']} bloco(s) · iniciada {lote['criado_em']}")
+
+        if lote["estimativa"]:
+            st.progress(min(1.0, lote["afetadas"] / lote["estimativa"]))
+        if lote.get("erro"):
+            st.error(f"Erro: {lote['erro']}")
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if lote["rodando"] and st.button("⏹️ Cancelar", key=f"lote_cancelar_{chave}_{lote['id']}"):
+                cancelar_lote(lote["id"])
+                st.info("Parada solicitada: o bloco em curso será concluído.")
+        with col2:
+            if (not lote["rodando"] and lote["estado"] != CONCLUIDA
+                    and st.button("▶️ Retomar", key=f"lote_retomar_{chave}_{lote['id']}")):
+                resultado = retomar_lote(lote["id"], diretorio)
+                (st.success if resultado["sucesso"] else st.error)(resultado["mensagem"])
+                st.rerun()
+        with col3:
+            if not lote["rodando"] and st.button("🧹 Remover do histórico",
+                                                 key=f"lote_remover_{chave}_{lote['id']}"):
+                remover_lote(lote["id"], diretorio)
+                st.rerun()
+
+    if any(lote["rodando"] for lote in lotes) and st.button("🔄 Atualizar progresso",
+                                                            key=f"lote_atualizar_{chave}"):
+        st.rerun()
+
+
+def mostrar_operacao_lote(conexao, banco, tabela, operacao, chave=""):
+    """
+    Formulário de UPDATE/DELETE por filtro: condições, novos valores (UPDATE),
+    simulação, tamanho do bloco, pausa e confirmação.
+    """
+    chave = f"{chave}_{operacao}_{tabela}"
+    try:
+        colunas = [nome for nome, _ in obter_colunas(conexao, banco, tabela)]
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao obter colunas: {e}")
+        return
+
+    st.write("**Filtro (linhas que serão afetadas):**")
+    condicoes = editor_condicoes(colunas, chave)
+
+    valores = {}
+    if operacao == "atualizar":
+        st.write("**Novos valores:**")
+        alterar = st.multiselect("Colunas a alterar:", colunas, key=f"lote_colunas_{chave}")
+        for coluna in alterar:
+            col1, col2 = st.columns([3, 1])
+            with col2:
+                nulo = st.checkbox("NULL", key=f"lote_nulo_{chave}_{coluna}")
+            with col1:
+                valor = st.text_input(f"Novo valor de '{coluna}':", key=f"lote_novo_{chave}_{coluna}",
+                                      disabled=nulo)
+            valores[coluna] = None if nulo else valor
+
+    col1, col2 = st.columns(2)
+    with col1:
+        tamanho_bloco = st.number_input("Linhas por bloco:", 100, 100_000, TAMANHO_BLOCO_PADRAO,
+                                        step=100, key=f"lote_bloco_{chave}",
+                                        help="Cada bloco é confirmado sozinho (locks e undo log pequenos)")
+    with col2:
+        pausa = st.number_input("Pausa entre blocos (s):", 0.0, 10.0, PAUSA_PADRAO, step=0.1,
+                                key=f"lote_pausa_{chave}")
+
+    if not condicoes:
+        st.info("Informe ao menos uma condição de filtro.")
+    else:
+        if st.button("🧮 Simular (contar linhas)", key=f"lote_simular_{chave}"):
+            try:
+                total = contar_afetados(conexao, banco, tabela, condicoes)
+                st.session_state[f"lote_simulacao_{chave}"] = (condicoes, total)
+                linhas, nomes = amostra_afetados(conexao, banco, tabela, condicoes)
+                st.info(f"**{total:,}** linha(s) atendem ao filtro agora "
+                        f"(~{-(-total // int(tamanho_bloco))} bloco(s))")
+                if linhas:
+                    st.dataframe(pd.DataFrame(linhas, columns=nomes), use_container_width=True)
+            except (mysql.connector.Error, ValueError) as e:
+                st.error(f"Erro na simulação: {e}")
+
+        # Só executa depois de simular exatamente este filtro
+        simulacao = st.session_state.get(f"lote_simulacao_{chave}")
+        simulado = simulacao is not None and simulacao[0] == condicoes
+        acao = "ATUALIZAR" if operacao == "atualizar" else "EXCLUIR"
+        confirmacao = st.text_input(f"Digite '{acao}' para confirmar:", key=f"lote_confirma_{chave}",
+                                    disabled=not simulado)
+        if not simulado:
+            st.caption("Simule o filtro antes de executar.")
+
+        if st.button("▶️ Executar em blocos", type="primary", key=f"lote_executar_{chave}",
+                     disabled=not simulado or confirmacao != acao):
+            try:
+                resultado = iniciar_lote(conexao, banco, tabela, operacao, condicoes, valores,
+                                         tamanho_bloco, pausa)
+            except mysql.connector.Error as e:
+                resultado = {"sucesso": False, "mensagem": str(e)}
+            if resultado["sucesso"]:
+                st.session_state.pop(f"lote_simulacao_{chave}", None)
+                st.success(f"✅ {resultado['mensagem']} — acompanhe abaixo.")
+            else:
+                st.error(f"❌ {resultado['mensagem']}")
+
+    st.write("---")
+    mostrar_acompanhamento(banco, tabela, chave)
@@ -0,0 +1,506 @@
+# modules/particionamento.py
+"""
+Particionamento de tabelas (RANGE, LIST, HASH, KEY)
+- RANGE por data: uma partição por dia/mês/ano, RANGE COLUMNS para DATE e
+  DATETIME (o otimizador poda as partições fora do filtro) e
+  UNIX_TIMESTAMP() para TIMESTAMP
+- Regras do MySQL verificadas antes de gerar o DDL: toda PRIMARY KEY/UNIQUE
+  precisa conter a coluna de particionamento e tabelas particionadas não
+  aceitam FOREIGN KEY
+- Manutenção: próxima partição (REORGANIZE da partição MAXVALUE ou ADD),
+  remoção instantânea (DROP PARTITION) e arquivamento (EXCHANGE PARTITION
+  para uma tabela comum, sem copiar linhas)
+"""
+import datetime
+import re
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from .comandos_preparados import descartar_preparados
+from .ddl_online import ROTULOS_ALGORITMO, executar_alter_interativo, referencias_externas
+
+TIPOS_DATA = {"date", "datetime", "timestamp"}
+TIPOS_INTEIRO = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint"}
+
+INTERVALOS = {
+    "dia": "📅 Diário",
+    "mes": "🗓️ Mensal",
+    "ano": "📆 Anual",
+}
+
+PARTICAO_MAXIMA = "pfuturo"
+
+
+# ============ SQL ============
+def _literal(valor):
+    if isinstance(valor, (int, float)):
+        return str(valor)
+    return "'" + str(valor).replace("'", "''") + "'"
+
+
+def _tipo_base(tipo):
+    """'datetime(6)' -> 'datetime', 'int unsigned' -> 'int'"""
+    return re.split(r"[\s(]", tipo.strip().lower(), maxsplit=1)[0]
+
+
+def _somar_meses(data, meses):
+    indice = data.year * 12 + data.month - 1 + meses
+    return data.replace(year=indice // 12, month=indice % 12 + 1, day=1)
+
+
+def _avancar(data, intervalo, quantidade=1):
+    if intervalo == "dia":
+        return data + datetime.timedelta(days=quantidade)
+    if intervalo == "ano":
+        return data.replace(year=data.year + quantidade, month=1, day=1)
+    return _somar_meses(data, quantidade)
+
+
+def _inicio_periodo(data, intervalo):
+    if intervalo == "ano":
+        return data.replace(month=1, day=1)
+    if intervalo == "mes":
+        return data.replace(day=1)
+    return data
+
+
+def _nome_periodo(data, intervalo):
+    formato = {"dia": "%Y%m%d", "mes": "%Y%m", "ano": "%Y"}[intervalo]
+    return "p" + data.strftime(formato)
+
+
+def _limite_data(tipo, data):
+    """Limite VALUES LESS THAN para a coluna de data"""
+    if tipo == "timestamp":
+        return f"UNIX_TIMESTAMP('{data:%Y-%m-%d} 00:00:00')"
+    return f"'{data:%Y-%m-%d}'"
+
+
+def montar_particionamento(config):
+    """
+    Cláusula PARTITION BY a partir da configuração do assistente:
+        {"metodo": "RANGE", "coluna", "tipo", "intervalo", "inicio": date, "quantidade", "maximo": bool}
+        {"metodo": "RANGE", "coluna", "tipo", "passo", "inicio": int, "quantidade", "maximo": bool}
+        {"metodo": "LIST", "coluna", "listas": {partição: [valores]}}
+        {"metodo": "HASH" | "KEY", "coluna", "particoes": n}
+    """
+    coluna = f"`{config['coluna']}`"
+    metodo = config["metodo"]
+    if metodo in ("HASH", "KEY"):
+        return f"PARTITION BY {metodo}({coluna}) PARTITIONS {int(config['particoes'])}"
+
+    if metodo == "LIST":
+        particoes = [f"PARTITION `{nome}` VALUES IN ({', '.join(_literal(v) for v in valores)})"
+                     for nome, valores in config["listas"].items()]
+        return f"PARTITION BY LIST COLUMNS({coluna}) (\n  " + ",\n  ".join(particoes) + "\n)"
+
+    tipo = _tipo_base(config["tipo"])
+    particoes = []
+    if tipo in TIPOS_DATA:
+        intervalo = config["intervalo"]
+        periodo = _inicio_periodo(config["inicio"], intervalo)
+        for _ in range(int(config["quantidade"])):
+            proximo = _avancar(periodo, intervalo)
+            particoes.append(f"PARTITION `{_nome_periodo(periodo, intervalo)}` "
+                             f"VALUES LESS THAN ({_limite_data(tipo, proximo)})")
+            periodo = proximo
+        cabecalho = (f"PARTITION BY RANGE (UNIX_TIMESTAMP({coluna}))" if tipo == "timestamp"
+                     else f"PARTITION BY RANGE COLUMNS({coluna})")
+    else:
+        limite = int(config["inicio"])
+        for _ in range(int(config["quantidade"])):
+            limite += int(config["passo"])
+            particoes.append(f"PARTITION `p{limite}` VALUES LESS THAN ({limite})")
+        cabecalho = f"PARTITION BY RANGE ({coluna})"
+    if config.get("maximo"):
+        particoes.append(f"PARTITION `{PARTICAO_MAXIMA}` VALUES LESS THAN (MAXVALUE)")
+    return cabecalho + " (\n  " + ",\n  ".join(particoes) + "\n)"
+
+
+def problemas_particionamento(config, chaves_unicas, tem_fk):
+    """
+    Lista de impedimentos (vazia = pode particionar).
+    chaves_unicas: {nome: [colunas]} da PRIMARY KEY e dos UNIQUE.
+    """
+    problemas = []
+    if tem_fk:
+        problemas.append("tabelas particionadas não aceitam FOREIGN KEY (nem ser referenciadas por uma)")
+    tipo = _tipo_base(config.get("tipo", ""))
+    if config["metodo"] == "RANGE" and tipo not in TIPOS_DATA | TIPOS_INTEIRO:
+        problemas.append("RANGE exige coluna inteira ou de data")
+    if config["metodo"] == "HASH" and tipo not in TIPOS_INTEIRO:
+        problemas.append("HASH exige coluna inteira (use KEY para outros tipos)")
+    for nome, colunas in chaves_unicas.items():
+        if nome != "PRIMARY" and config["coluna"] not in colunas:
+            problemas.append(f"o índice UNIQUE `{nome}` precisa incluir a coluna `{config['coluna']}`")
+    return problemas
+
+
+def _limite_final(config):
+    """Literal do último VALUES LESS THAN de um RANGE do assistente (comparável direto com a coluna)"""
+    if _tipo_base(config["tipo"]) in TIPOS_DATA:
+        periodo = _inicio_periodo(config["inicio"], config["intervalo"])
+        fim = _avancar(periodo, config["intervalo"], int(config["quantidade"]))
+        return f"'{fim:%Y-%m-%d}'"
+    return str(int(config["inicio"]) + int(config["passo"]) * int(config["quantidade"]))
+
+
+def linhas_sem_particao(conexao, banco, tabela, config):
+    """
+    Nº de linhas que não cabem em nenhuma partição da configuração (RANGE sem
+    MAXVALUE acima do último limite, LIST fora das listas): o ALTER falharia
+    e uma cópia que ignorasse erros as perderia. HASH/KEY aceitam tudo.
+    """
+    coluna = f"`{config['coluna']}`"
+    if config["metodo"] == "RANGE" and not config.get("maximo"):
+        condicao = f"{coluna} >= {_limite_final(config)}"
+    elif config["metodo"] == "LIST":
+        valores = [v for lista in config["listas"].values() for v in lista]
+        condicao = f"{coluna} IS NULL OR {coluna} NOT IN ({', '.join(_literal(v) for v in valores)})"
+    else:
+        return 0
+    cursor = conexao.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM `{banco}`.`{tabela}` WHERE {condicao}")
+    quantidade = cursor.fetchone()[0]
+    cursor.close()
+    return quantidade
+
+
+def chaves_unicas_tabela(conexao, banco, tabela):
+    """{nome: [colunas]} da PRIMARY KEY e dos índices UNIQUE"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND NON_UNIQUE = 0
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+    """, (banco, tabela))
+    chaves = {}
+    for nome, coluna in cursor.fetchall():
+        chaves.setdefault(nome, []).append(coluna)
+    cursor.close()
+    return chaves
+
+
+def colunas_com_tipo(conexao, banco, tabela):
+    """[(coluna, tipo completo)] na ordem da tabela"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION
+    """, (banco, tabela))
+    colunas = [(nome, str(tipo)) for nome, tipo in cursor.fetchall()]
+    cursor.close()
+    return colunas
+
+
+def clausulas_conversao(config, chaves_unicas):
+    """
+    Cláusulas do ALTER que particiona uma tabela existente: se a PRIMARY KEY
+    não tiver a coluna de particionamento, ela é refeita com a coluna no fim
+    """
+    clausulas = []
+    primaria = chaves_unicas.get("PRIMARY")
+    if primaria and config["coluna"] not in primaria:
+        colunas = ", ".join(f"`{c}`" for c in primaria + [config["coluna"]])
+        clausulas += ["DROP PRIMARY KEY", f"ADD PRIMARY KEY ({colunas})"]
+    clausulas.append(montar_particionamento(config))
+    return clausulas
+
+
+# ============ PARTIÇÕES EXISTENTES ============
+def listar_particoes(conexao, banco, tabela):
+    """[{"nome", "metodo", "expressao", "limite", "linhas", "bytes"}]; [] se a tabela não é particionada"""
+    cursor = conexao.cursor()
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_METHOD, PARTITION_EXPRESSION, PARTITION_DESCRIPTION,
+               TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+    """, (banco, tabela))
+    particoes = [{"nome": nome, "metodo": metodo, "expressao": expressao, "limite": limite,
+                  "linhas": linhas or 0, "bytes": int(tamanho or 0)}
+                 for nome, metodo, expressao, limite, linhas, tamanho in cursor.fetchall()]
+    cursor.close()
+    return particoes
+
+
+def _valor_limite(conexao, particao):
+    """Limite da partição RANGE como date/int (None para MAXVALUE)"""
+    limite = (particao["limite"] or "").strip()
+    if limite.upper() == "MAXVALUE":
+        return None
+    if "unix_timestamp" in (particao["expressao"] or "").lower():
+        cursor = conexao.cursor()
+        cursor.execute("SELECT DATE(FROM_UNIXTIME(%s))", (int(limite),))
+        data = cursor.fetchone()[0]
+        cursor.close()
+        return data
+    texto = limite.strip("'")
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}( [\d:]+)?", texto):
+        return datetime.date.fromisoformat(texto[:10])
+    return int(texto)
+
+
+def sugerir_proximo_limite(conexao, particoes):
+    """Próximo limite repetindo o passo entre as duas últimas partições RANGE (None se não dá para inferir)"""
+    limites = [_valor_limite(conexao, p) for p in particoes if p["metodo"].startswith("RANGE")]
+    limites = [v for v in limites if v is not None]
+    if len(limites) < 2:
+        return None
+    anterior, ultimo = limites[-2:]
+    if isinstance(ultimo, datetime.date):
+        if ultimo.day == 1 and anterior.day == 1:
+            meses = (ultimo.year - anterior.year) * 12 + ultimo.month - anterior.month
+            return _somar_meses(ultimo, meses)
+    return ultimo + (ultimo - anterior)
+
+
+def adicionar_particao(conexao, banco, tabela, limite):
+    """
+    Nova partição RANGE até 'limite' (date ou int). Com partição MAXVALUE,
+    ela é dividida (REORGANIZE); senão, ADD PARTITION.
+    """
+    particoes = listar_particoes(conexao, banco, tabela)
+    expressao = (particoes[0]["expressao"] or "").lower() if particoes else ""
+    if isinstance(limite, datetime.date):
+        anterior = next((v for v in reversed([_valor_limite(conexao, p) for p in particoes]) if v is not None), None)
+        inicio = anterior or limite
+        if (inicio.month, inicio.day, limite.month, limite.day) == (1, 1, 1, 1):
+            intervalo = "ano"
+        elif inicio.day == 1 and limite.day == 1:
+            intervalo = "mes"
+        else:
+            intervalo = "dia"
+        nome = _nome_periodo(inicio, intervalo)
+        valor = _limite_data("timestamp" if "unix_timestamp" in expressao else "date", limite)
+    else:
+        nome = f"p{int(limite)}"
+        valor = str(int(limite))
+    nova = f"PARTITION `{nome}` VALUES LESS THAN ({valor})"
+
+    maxima = next((p["nome"] for p in particoes if (p["limite"] or "").upper() == "MAXVALUE"), None)
+    if maxima:
+        sql = (f"ALTER TABLE `{banco}`.`{tabela}` REORGANIZE PARTITION `{maxima}` INTO "
+               f"({nova}, PARTITION `{maxima}` VALUES LESS THAN (MAXVALUE))")
+    else:
+        sql = f"ALTER TABLE `{banco}`.`{tabela}` ADD PARTITION ({nova})"
+    cursor = conexao.cursor()
+    try:
+        cursor.execute(sql)
+        return {"sucesso": True, "mensagem": f"Partição `{nome}` criada (até {valor})"}
+    except mysql.connector.Error as e:
+        return {"sucesso": False, "mensagem": str(e)}
+    finally:
+        cursor.close()
+        descartar_preparados(conexao, tabela)
+
+
+def remover_particao(conexao, banco, tabela, particao, arquivar=False):
+    """
+    Remove a partição inteira (DROP PARTITION: instantâneo, sem DELETE linha a linha).
+    arquivar=True move antes as linhas para a tabela <tabela>_<partição>
+    com EXCHANGE PARTITION, que só troca os arquivos.
+    """
+    cursor = conexao.cursor()
+    arquivo = f"{tabela}_{particao}"[:64]
+    try:
+        if arquivar:
+            cursor.execute(f"CREATE TABLE `{banco}`.`{arquivo}` LIKE `{banco}`.`{tabela}`")
+            cursor.execute(f"ALTER TABLE `{banco}`.`{arquivo}` REMOVE PARTITIONING")
+            cursor.execute(f"ALTER TABLE `{banco}`.`{tabela}` EXCHANGE PARTITION `{particao}` "
+                           f"WITH TABLE `{banco}`.`{arquivo}`")
+        cursor.execute(f"ALTER TABLE `{banco}`.`{tabela}` DROP PARTITION `{particao}`")
+        mensagem = f"Partição `{particao}` removida"
+        if arquivar:
+            mensagem += f"; linhas arquivadas em `{arquivo}`"
+        return {"sucesso": True, "mensagem": mensagem}
+    except mysql.connector.Error as e:
+        return {"sucesso": False, "mensagem": str(e)}
+    finally:
+        cursor.close()
+        descartar_preparados(conexao, tabela)
+
+
+def particoes_anteriores(conexao, particoes, data_corte):
+    """Partições RANGE cujas linhas são todas anteriores a data_corte (limite <= corte)"""
+    antigas = []
+    for particao in particoes:
+        limite = _valor_limite(conexao, particao) if particao["metodo"].startswith("RANGE") else None
+        if isinstance(limite, datetime.date) and limite <= data_corte:
+            antigas.append(particao["nome"])
+    return antigas
+
+
+# ============ COMPONENTES STREAMLIT ============
+def formulario_particionamento(colunas, chave):
+    """
+    Assistente: escolhe método, coluna e parâmetros. colunas = [(nome, tipo)].
+    Retorna a configuração (para montar_particionamento) ou None.
+    """
+    metodo = st.selectbox(
+        "Método",
+        ["RANGE", "LIST", "HASH", "KEY"],
+        key=f"{chave}_metodo",
+        help="RANGE por data: séries temporais (retenção = remover partição). "
+             "LIST: valores fixos (ex: região). HASH/KEY: só espalhar as linhas."
+    )
+    if metodo == "RANGE":
+        candidatas = [(n, t) for n, t in colunas if _tipo_base(t) in TIPOS_DATA | TIPOS_INTEIRO]
+    elif metodo == "HASH":
+        candidatas = [(n, t) for n, t in colunas if _tipo_base(t) in TIPOS_INTEIRO]
+    else:
+        candidatas = list(colunas)
+    if not candidatas:
+        st.warning("Nenhuma coluna compatível com este método.")
+        return None
+
+    nomes = [n for n, _ in candidatas]
+    coluna = st.selectbox("Coluna", nomes, key=f"{chave}_coluna")
+    tipo = dict(candidatas)[coluna]
+    config = {"metodo": metodo, "coluna": coluna, "tipo": tipo}
+
+    if metodo in ("HASH", "KEY"):
+        config["particoes"] = st.number_input("Partições", 2, 1024, 8, key=f"{chave}_particoes")
+    elif metodo == "LIST":
+        texto = st.text_area(
+            "Uma partição por linha: nome: valor1, valor2, ...",
+            placeholder="p_sul: RS, SC, PR\np_sudeste: SP, RJ, MG, ES",
+            key=f"{chave}_listas"
+        )
+        listas = {}
+        for linha in texto.splitlines():
+            if ":" in linha:
+                nome, valores = linha.split(":", 1)
+                valores = [v.strip() for v in valores.split(",") if v.strip()]
+                if _tipo_base(tipo) in TIPOS_INTEIRO:
+                    valores = [int(v) for v in valores if re.fullmatch(r"-?\d+", v)]
+                if nome.strip() and valores:
+                    listas[re.sub(r"\W", "_", nome.strip())] = valores
+        if not listas:
+            st.info("Informe ao menos uma partição.")
+            return None
+        config["listas"] = listas
+    else:
+        col1, col2 = st.columns(2)
+        if _tipo_base(tipo) in TIPOS_DATA:
+            with col1:
+                config["intervalo"] = st.selectbox("Uma partição por", list(INTERVALOS),
+                                                   format_func=INTERVALOS.get, index=1, key=f"{chave}_intervalo")
+                config["inicio"] = st.date_input("Primeiro período", datetime.date.today().replace(day=1),
+                                                 key=f"{chave}_inicio")
+        else:
+            with col1:
+                config["inicio"] = st.number_input("Valor inicial", value=0, step=1, key=f"{chave}_inicio_num")
+                config["passo"] = st.number_input("Faixa por partição", 1, value=1_000_000, step=1000,
+                                                  key=f"{chave}_passo")
+        with col2:
+            config["quantidade"] = st.number_input("Partições a criar", 1, 1024, 12, key=f"{chave}_quantidade")
+            config["maximo"] = st.checkbox(f"Partição `{PARTICAO_MAXIMA}` (MAXVALUE) para valores acima",
+                                           value=True, key=f"{chave}_maximo")
+
+    with st.expander("👁️ DDL gerado", expanded=False):
+        st.code(montar_particionamento(config), language="sql")
+    return config
+
+
+def mostrar_particionamento(conexao, banco, tabela):
+    """Página de partições da tabela: conversão ou manutenção"""
+    st.subheader("🗂️ Particionamento")
+    try:
+        particoes = listar_particoes(conexao, banco, tabela)
+    except mysql.connector.Error as e:
+        st.error(f"Erro ao obter partições: {e}")
+        return
+
+    if not particoes:
+        st.info("A tabela não é particionada.")
+        st.markdown("##### 🔄 Converter para tabela particionada")
+        config = formulario_particionamento(colunas_com_tipo(conexao, banco, tabela), f"particionar_{banco}_{tabela}")
+        if not config:
+            return
+        chaves = chaves_unicas_tabela(conexao, banco, tabela)
+        problemas = problemas_particionamento(config, chaves, bool(referencias_externas(conexao, banco, tabela)))
+        for problema in problemas:
+            st.error(f"❌ {problema}")
+        clausulas = clausulas_conversao(config, chaves)
+        if len(clausulas) > 1:
+            st.info(f"A PRIMARY KEY será refeita incluindo `{config['coluna']}` (exigência do particionamento).")
+        st.caption("A conversão reconstrói a tabela: em tabelas grandes será oferecida a cópia online.")
+        if st.button("✅ Particionar", type="primary", disabled=bool(problemas),
+                     key=f"particionar_{banco}_{tabela}_aplicar"):
+            try:
+                fora = linhas_sem_particao(conexao, banco, tabela, config)
+            except mysql.connector.Error as e:
+                st.error(f"❌ Erro ao conferir as linhas fora das partições: {e}")
+                return
+            if fora:
+                st.error(f"❌ {fora:,} linha(s) não caberiam em nenhuma partição: "
+                         f"marque a partição `{PARTICAO_MAXIMA}` (MAXVALUE) ou amplie as faixas/listas.")
+                return
+            resultado = executar_alter_interativo(conexao, banco, tabela, clausulas,
+                                                  f"particionar por {config['metodo']} ({config['coluna']})")
+            if resultado.get("enfileirado"):
+                st.info(f"📥 {resultado['mensagem']}")
+            elif resultado["sucesso"]:
+                st.success(f"✅ Tabela particionada · {ROTULOS_ALGORITMO[resultado['algoritmo']]}")
+            elif resultado["pendente"]:
+                st.rerun()
+            else:
+                st.error(f"❌ {resultado['mensagem']}")
+        return
+
+    primeira = particoes[0]
+    st.info(f"**Método:** {primeira['metodo']} · **Expressão:** `{primeira['expressao']}` · "
+            f"**Partições:** {len(particoes)}")
+    st.dataframe(pd.DataFrame([{
+        "Partição": p["nome"],
+        "Limite / valores": p["limite"],
+        "Linhas (estimativa)": p["linhas"],
+        "Tamanho (MB)": round(p["bytes"] / 1024 / 1024, 2),
+    } for p in particoes]), use_container_width=True, hide_index=True)
+
+    if not primeira["metodo"].startswith("RANGE"):
+        st.caption("Manutenção de partições (próxima faixa, retenção) disponível para RANGE.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("##### ➕ Próxima partição")
+        sugestao = sugerir_proximo_limite(conexao, particoes)
+        texto = st.text_input("Limite (VALUES LESS THAN)", value=str(sugestao) if sugestao is not None else "",
+                              placeholder="2026-12-01 ou 5000000", key=f"particao_limite_{banco}_{tabela}")
+        if st.button("➕ Criar partição", disabled=not texto.strip(), key=f"particao_criar_{banco}_{tabela}"):
+            try:
+                limite = (datetime.date.fromisoformat(texto.strip()) if "-" in texto.strip()[1:]
+                          else int(texto.strip()))
+            except ValueError:
+                st.error("❌ Informe uma data (AAAA-MM-DD) ou um número inteiro")
+            else:
+                resultado = adicionar_particao(conexao, banco, tabela, limite)
+                if resultado["sucesso"]:
+                    st.success(f"✅ {resultado['mensagem']}")
+                    st.rerun()
+                st.error(f"❌ {resultado['mensagem']}")
+
+    with col2:
+        st.markdown("##### 🧹 Retenção")
+        corte = st.date_input("Remover dados anteriores a", datetime.date.today().replace(day=1),
+                              key=f"particao_corte_{banco}_{tabela}")
+        antigas = particoes_anteriores(conexao, particoes, corte)
+        if not antigas:
+            st.caption("Nenhuma partição inteira antes desta data.")
+        else:
+            escolhidas = st.multiselect("Partições", antigas, default=antigas, key=f"particao_antigas_{banco}_{tabela}_{corte}")
+            arquivar = st.checkbox("Arquivar em tabelas próprias antes de remover (EXCHANGE PARTITION)",
+                                   value=True, key=f"particao_arquivar_{banco}_{tabela}")
+            if st.button("🗑️ Remover partições", disabled=not escolhidas, key=f"particao_remover_{banco}_{tabela}"):
+                for particao in escolhidas:
+                    resultado = remover_particao(conexao, banco, tabela, particao, arquivar)
+                    if resultado["sucesso"]:
+                        st.success(f"✅ {resultado['mensagem']}")
+                    else:
+                        st.error(f"❌ {particao}: {resultado['mensagem']}")
+                        break
@@ -0,0 +1,85 @@
+# modules/registro_paginas.py
+"""
+Registro de páginas com importação preguiçosa
+O app.py é reexecutado pelo Streamlit a cada interação, por isso o estado
+(módulos já carregados e tempos de importação) vive aqui, num módulo normal.
+Cada página só é importada quando é aberta pela primeira vez.
+"""
+import importlib
+import threading
+import time
+
+# página -> (módulo, função principal)
+REGISTRO_PAGINAS = {
+    "criar_banco": ("criar_banco", "pagina_criar_banco"),
+    "criar_tabelas": ("criar_tabelas", "pagina_criar_tabelas"),
+    "criar_consultas": ("criar_consultas", "interface_consulta_visual"),
+    "relacoes": ("relacoes_1", "pagina_relacoes"),  # Note: relacoes_1.py
+    "Formularios": ("Formularios", "pagina_formularios"),
+    "query_editor": ("query_editor", "pagina_query_editor"),
+    "manual": ("manual", "pagina_guia"),
+    "exercicios": ("exercicios", "pagina_exercicios"),
+    "backup": ("backup_restore", "main"),
+    "listar_bancos": ("listar_bancos", "main"),
+    "comparar_dados": ("modules.comparacao_dados", "pagina_comparar_dados"),
+    "comparar_esquemas": ("modules.comparacao_esquema", "pagina_comparar_esquemas"),
+    "gerar_dados": ("modules.gerador_dados", "pagina_gerar_dados"),
+}
+
+# Nomes alternativos procurados quando a função principal não existe
+FUNCOES_ALTERNATIVAS = ['main', 'pagina_principal', 'interface_principal']
+
+_modulos_carregados = {}
+_tempos_importacao = {}
+_lock = threading.Lock()
+
+
+def obter_modulo(modulo_nome):
+    """Importa o módulo uma única vez por processo e mede o tempo gasto"""
+    with _lock:
+        if modulo_nome in _modulos_carregados:
+            return _modulos_carregados[modulo_nome]
+
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(modulo_nome)
+    duracao = time.perf_counter() - inicio
+
+    with _lock:
+        _modulos_carregados[modulo_nome] = modulo
+        _tempos_importacao.setdefault(modulo_nome, duracao)
+    return modulo
+
+
+def obter_funcao_pagina(modulo_nome, funcao_principal=None):
+    """Resolve a função de entrada de uma página (None se não existir)"""
+    modulo = obter_modulo(modulo_nome)
+
+    candidatas = []
+    if funcao_principal:
+        candidatas.append(funcao_principal)
+    candidatas += FUNCOES_ALTERNATIVAS + ['pagina_' + modulo_nome, modulo_nome + '_main']
+
+    for nome in candidatas:
+        funcao = getattr(modulo, nome, None)
+        if callable(funcao):
+            return funcao
+    return None
+
+
+def registrar_tempo(nome, duracao):
+    """Regista um tempo medido fora do registro (ex: arranque do app)"""
+    with _lock:
+        _tempos_importacao[nome] = duracao
+
+
+def relatorio_importacao():
+    """Lista [(nome, segundos)] ordenada do mais lento para o mais rápido"""
+    with _lock:
+        itens = list(_tempos_importacao.items())
+    return sorted(itens, key=lambda item: item[1], reverse=True)
+
+
+def modulo_carregado(modulo_nome):
+    """Indica se a página já foi importada neste processo"""
+    with _lock:
+        return modulo_nome in _modulos_carregados
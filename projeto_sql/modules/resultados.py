@@ -0,0 +1,146 @@
+# modules/resultados.py
+"""
+Resultados de consultas em DataFrames tipados
+- As linhas chegam em tuplas (cursor comum, sem dictionary=True)
+- Cada coluna é montada uma única vez, já no dtype certo, a partir do
+  tipo informado em cursor.description:
+      inteiros -> Int64 (UInt64 para BIGINT UNSIGNED)
+      FLOAT/DOUBLE/DECIMAL -> Float64
+      DATE/DATETIME/TIMESTAMP -> datetime64, TIME -> timedelta64
+      texto -> string, ou category quando há poucos valores distintos
+- NULL vira <NA>/NaT (nunca a string 'NULL'), então colunas numéricas
+  continuam numéricas para ordenar, filtrar e somar
+DECIMAL vira Float64 só para exibição/análise: exportações e backups
+continuam com o valor exato (modules/exportacao, modules/colunar).
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+LIMITE_CATEGORIA = 0.5      # distintos/linhas abaixo disto -> category
+MINIMO_CATEGORIA = 50       # com poucas linhas category não compensa
+
+_UNSIGNED_FLAG = 32
+
+# Nome do FieldType -> família de conversão
+_FAMILIAS = {
+    "TINY": "inteiro", "SHORT": "inteiro", "INT24": "inteiro", "LONG": "inteiro",
+    "LONGLONG": "inteiro", "YEAR": "inteiro", "BIT": "inteiro",
+    "FLOAT": "real", "DOUBLE": "real", "DECIMAL": "real", "NEWDECIMAL": "real",
+    "DATE": "data", "NEWDATE": "data", "DATETIME": "data", "TIMESTAMP": "data",
+    "TIME": "duracao",
+    "VARCHAR": "texto", "VAR_STRING": "texto", "STRING": "texto",
+    "ENUM": "texto", "SET": "texto", "JSON": "texto",
+    "TINY_BLOB": "texto", "MEDIUM_BLOB": "texto", "LONG_BLOB": "texto", "BLOB": "texto",
+}
+
+
+# ============ CONVERSÃO DE COLUNAS ============
+def _nulo(valor):
+    return valor is None or valor is pd.NA or valor is pd.NaT or (isinstance(valor, float) and valor != valor)
+
+
+def _familia(descricao):
+    from mysql.connector import FieldType
+    try:
+        return _FAMILIAS.get(FieldType.get_info(descricao[1]), "objeto")
+    except (KeyError, TypeError):
+        return "objeto"
+
+
+def _coluna_texto(valores):
+    """string/category se todos os valores forem texto; bytes ficam como objeto"""
+    valores = [",".join(sorted(v)) if isinstance(v, set) else v for v in valores]
+    if any(v is not None and not isinstance(v, str) for v in valores):
+        return pd.array(valores, dtype=object)
+
+    distintos = len(set(valores))
+    if len(valores) >= MINIMO_CATEGORIA and distintos <= len(valores) * LIMITE_CATEGORIA:
+        return pd.Categorical(valores)
+    return pd.array(valores, dtype="string")
+
+
+def coluna_tipada(valores, familia, sem_sinal=False):
+    """Converte uma lista de valores do conector no array pandas da família"""
+    try:
+        if familia == "inteiro":
+            return pd.array(valores, dtype="UInt64" if sem_sinal else "Int64")
+        if familia == "real":
+            return pd.array([None if v is None else float(v) for v in valores], dtype="Float64")
+        if familia == "data":
+            # Datas zeradas ('0000-00-00') chegam como None ou texto: viram NaT
+            return pd.to_datetime(pd.Series(valores, dtype=object), errors="coerce").array
+        if familia == "duracao":
+            return pd.to_timedelta(pd.Series(valores, dtype=object), errors="coerce").array
+        if familia == "texto":
+            return _coluna_texto(valores)
+    except (TypeError, ValueError, OverflowError):
+        pass
+    return pd.array(valores, dtype=object)
+
+
+# ============ DATAFRAMES ============
+def dataframe_do_cursor(cursor, linhas=None):
+    """
+    DataFrame tipado para o resultado do cursor.
+    linhas: tuplas já lidas (ex: fetchmany); se omitido, faz fetchall().
+    """
+    if linhas is None:
+        linhas = cursor.fetchall()
+    descricao = cursor.description or []
+    nomes = [d[0] for d in descricao]
+    if not linhas:
+        return pd.DataFrame(columns=nomes)
+
+    colunas = list(zip(*linhas))
+    dados = {}
+    for indice, d in enumerate(descricao):
+        sem_sinal = bool(len(d) > 7 and d[7] and d[7] & _UNSIGNED_FLAG)
+        dados[indice] = coluna_tipada(list(colunas[indice]), _familia(d), sem_sinal)
+
+    df = pd.DataFrame(dados)
+    df.columns = nomes      # nomes repetidos (ex: JOIN sem alias) são mantidos
+    return df
+
+
+def consultar_dataframe(conexao, sql, params=None):
+    """Executa a consulta num cursor comum e devolve o DataFrame tipado"""
+    cursor = conexao.cursor()
+    try:
+        if params:
+            cursor.execute(sql, params)
+        else:
+            cursor.execute(sql)
+        return dataframe_do_cursor(cursor)
+    finally:
+        cursor.close()
+
+
+def tipar_dataframe(df):
+    """
+    Para DataFrames que não vieram de um cursor (ex: DESCRIBE, listas montadas):
+    bytes viram texto, tipos misturados viram string (NULL continua <NA>)
+    e o resto ganha o dtype anulável adequado.
+    """
+    df = df.copy()
+    for coluna in df.columns:
+        serie = df[coluna]
+        if serie.dtype != object:
+            continue
+        valores = [None if _nulo(v) else v.decode("utf-8", "replace")
+                   if isinstance(v, (bytes, bytearray)) else v for v in serie]
+        tipos = {type(v) for v in valores if v is not None}
+        if not tipos:
+            continue
+        if tipos <= {int, bool}:
+            df[coluna] = pd.array(valores, dtype="Int64")
+        elif tipos <= {int, float, Decimal}:
+            df[coluna] = pd.array([None if v is None else float(v) for v in valores], dtype="Float64")
+        elif tipos <= {datetime, date}:
+            df[coluna] = pd.to_datetime(pd.Series(valores, dtype=object), errors="coerce").array
+        elif tipos <= {timedelta}:
+            df[coluna] = pd.to_timedelta(pd.Series(valores, dtype=object), errors="coerce").array
+        else:
+            df[coluna] = pd.array([None if v is None else str(v) for v in valores], dtype="string")
+    return df
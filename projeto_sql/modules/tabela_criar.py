@@ -2,6 +2,7 @@
 import streamlit as st
 import pandas as pd
 from .tabela_utils import conectar_banco, listar_tabelas, converter_tipo_access_para_mysql, listar_colunas_tabela
+from .particionamento import formulario_particionamento, montar_particionamento, problemas_particionamento
 
 def pagina_criar_tabela():
     """Página para criar tabelas"""
@@ -192,6 +193,16 @@ def pagina_criar_tabela():
                         )
                         fk_info["on_update"] = str(on_update) if on_update else ""
     
+    # Particionamento (opcional): séries temporais grandes, retenção por partição
+    st.session_state.particionamento_tabela = None
+    if st.session_state.colunas_tabela:
+        with st.expander("🗂️ Particionamento (opcional)", expanded=False):
+            if st.checkbox("Particionar esta tabela", key="particionar_nova_tabela"):
+                st.session_state.particionamento_tabela = formulario_particionamento(
+                    [(c["nome"], c["tipo_mysql"]) for c in st.session_state.colunas_tabela],
+                    "particionar_nova_tabela"
+                )
+    
     # Botões de ação
     st.markdown("##### 🎯 Ações")
     col_acao1, col_acao2, col_acao3, col_acao4 = st.columns(4)
@@ -288,6 +299,8 @@ def criar_tabela_no_banco(banco, nome_tabela):
         # Construir SQL
         sql_parts = []
         fk_constraints = []
+        chaves_primarias = []
+        particionamento = st.session_state.get("particionamento_tabela")
         
         for coluna in st.session_state.colunas_tabela:
             col_def = f"`{coluna['nome']}` {coluna['tipo_mysql']}"
@@ -313,7 +326,7 @@ def criar_tabela_no_banco(banco, nome_tabela):
             sql_parts.append(col_def)
             
             if coluna['is_primary_key']:
-                sql_parts.append(f"PRIMARY KEY (`{coluna['nome']}`)")
+                chaves_primarias.append(coluna['nome'])
             
             if coluna['is_foreign_key'] and coluna['fk_info']:
                 fk = f"FOREIGN KEY (`{coluna['nome']}`) "
@@ -326,6 +339,20 @@ def criar_tabela_no_banco(banco, nome_tabela):
                 
                 fk_constraints.append(fk)
         
+        if particionamento:
+            unicas = {c['nome']: [c['nome']] for c in st.session_state.colunas_tabela if c['is_unique']}
+            problemas = problemas_particionamento(particionamento, unicas, bool(fk_constraints))
+            if problemas:
+                for problema in problemas:
+                    st.error(f"❌ Particionamento: {problema}")
+                return
+            # A PRIMARY KEY de uma tabela particionada precisa conter a coluna de particionamento
+            if chaves_primarias and particionamento["coluna"] not in chaves_primarias:
+                chaves_primarias.append(particionamento["coluna"])
+        
+        if chaves_primarias:
+            sql_parts.append("PRIMARY KEY (" + ", ".join(f"`{c}`" for c in chaves_primarias) + ")")
+        
         # Juntar tudo
         all_parts = sql_parts + fk_constraints
         sql = f"CREATE TABLE `{nome_tabela}` (\n  " + ",\n  ".join(all_parts) + "\n)"
@@ -333,6 +360,9 @@ def criar_tabela_no_banco(banco, nome_tabela):
         if innodb_available:
             sql += " ENGINE=InnoDB"
         
+        if particionamento:
+            sql += "\n" + montar_particionamento(particionamento)
+        
         # Executar
         cursor.execute(sql)
         conexao.commit()
@@ -2,6 +2,30 @@
 import streamlit as st
 import pandas as pd
 from .tabela_utils import conectar_banco, listar_tabelas, converter_tipo_access_para_mysql, listar_colunas_tabela
+from .ddl_online import (ROTULOS_ALGORITMO, enfileirar, executar_alter_interativo, garantir_innodb,
+                         modo_fila, motor_tabela, mostrar_ddl_pendente, mostrar_fila_alteracoes)
+from .conexao_resiliente import obter_conexao_sessao
+from .gestao_indices import mostrar_gestao_indices
+from .particionamento import mostrar_particionamento
+
+def executar_alter(conexao, banco, tabela, clausula, descricao):
+    """ALTER no modo menos bloqueante aceito pelo servidor (ou na fila); erro vira exceção como no cursor.execute"""
+    resultado = executar_alter_interativo(conexao, banco, tabela, [clausula], descricao)
+    if resultado.get("enfileirado"):
+        st.caption(f"📥 {resultado['mensagem']}")
+    elif resultado["sucesso"]:
+        st.caption(f"⚙️ {ROTULOS_ALGORITMO[resultado['algoritmo']]}")
+    elif not resultado["pendente"]:
+        raise RuntimeError(resultado["mensagem"])
+    return resultado
+
+def converter_para_innodb(conexao, banco, tabela):
+    """ENGINE=InnoDB antes de uma FK; no modo fila entra no mesmo ALTER das outras alterações"""
+    if modo_fila(banco, tabela):
+        if (motor_tabela(conexao, banco, tabela) or "").lower() != "innodb":
+            enfileirar(banco, tabela, "ENGINE=InnoDB", "converter para InnoDB")
+    else:
+        garantir_innodb(conexao, banco, tabela)
 
 def mostrar_fks_tabela(banco, tabela, cursor):
     """Mostra todas as FOREIGN KEYS de uma tabela"""
@@ -68,8 +92,14 @@ def pagina_editar_tabela():
     st.header(f"✏️ Editar Tabela: `{tabela}`")
     st.info(f"**Banco:** `{banco}`")
     
+    # Conexão da sessão (reaproveitada a cada rerun, não uma nova por render)
+    conexao_ddl = obter_conexao_sessao("conexao_mysql", banco=banco)
+    if conexao_ddl:
+        mostrar_ddl_pendente(conexao_ddl, banco, tabela)
+        mostrar_fila_alteracoes(conexao_ddl, banco, tabela)
+    
     st.markdown("### 🔧 Ações Disponíveis")
-    col_op1, col_op2, col_op3, col_op4 = st.columns(4)
+    col_op1, col_op2, col_op3, col_op4, col_op5, col_op6 = st.columns(6)
     
     with col_op1:
         if st.button("📝 Renomear Tabela", use_container_width=True, key=f"btn_renomear_{tabela}"):
@@ -91,6 +121,16 @@ def pagina_editar_tabela():
             st.session_state.menu_estado["acao_edicao"] = "remover_coluna"
             st.rerun()
     
+    with col_op5:
+        if st.button("🔑 Índices", use_container_width=True, key=f"btn_indices_{tabela}"):
+            st.session_state.menu_estado["acao_edicao"] = "indices"
+            st.rerun()
+    
+    with col_op6:
+        if st.button("🗂️ Partições", use_container_width=True, key=f"btn_particoes_{tabela}"):
+            st.session_state.menu_estado["acao_edicao"] = "particoes"
+            st.rerun()
+    
     st.markdown("---")
     
     acao = st.session_state.menu_estado.get("acao_edicao", "")
@@ -103,6 +143,16 @@ def pagina_editar_tabela():
         modificar_coluna_tabela(banco, tabela)
     elif acao == "remover_coluna":
         remover_coluna_tabela(banco, tabela)
+    elif acao == "indices":
+        if conexao_ddl:
+            mostrar_gestao_indices(conexao_ddl, banco, tabela)
+        else:
+            st.error("Não foi possível conectar ao banco")
+    elif acao == "particoes":
+        if conexao_ddl:
+            mostrar_particionamento(conexao_ddl, banco, tabela)
+        else:
+            st.error("Não foi possível conectar ao banco")
     else:
         mostrar_informacoes_tabela(banco, tabela)
     
@@ -274,7 +324,7 @@ def adicionar_coluna_tabela(banco, tabela):
                     return
                 
                 cursor = conexao.cursor()
-                sql = f"ALTER TABLE `{tabela}` ADD COLUMN `{nome_coluna}` {tipo_coluna}"
+                sql = f"ADD COLUMN `{nome_coluna}` {tipo_coluna}"
                 
                 if permite_null == "NOT NULL":
                     sql += " NOT NULL"
@@ -304,23 +354,26 @@ def adicionar_coluna_tabela(banco, tabela):
                 elif posicao == "APÓS..." and coluna_anterior:
                     sql += f" AFTER `{coluna_anterior}`"
                 
-                cursor.execute(sql)
-                conexao.commit()
+                descricao = f"adicionar a coluna `{nome_coluna}`"
+                if is_foreign and not modo_fila(banco, tabela):
+                    descricao += " (crie a FOREIGN KEY depois, em Modificar Coluna)"
+                if executar_alter(conexao, banco, tabela, sql, descricao)["pendente"]:
+                    st.rerun()
                 
                 if is_foreign and fk_info.get("tabela_ref") and fk_info.get("coluna_ref"):
                     if fk_info["tabela_ref"] != "-- Selecione --" and fk_info["coluna_ref"] != "-- Selecione --":
                         try:
                             try:
-                                cursor.execute(f"ALTER TABLE `{tabela}` ENGINE=InnoDB")
+                                converter_para_innodb(conexao, banco, tabela)
                             except:
                                 pass
                             
                             try:
-                                cursor.execute(f"ALTER TABLE `{fk_info['tabela_ref']}` ENGINE=InnoDB")
+                                garantir_innodb(conexao, banco, fk_info['tabela_ref'])
                             except:
                                 pass
                             
-                            fk_sql = f"ALTER TABLE `{tabela}` ADD FOREIGN KEY (`{nome_coluna}`) "
+                            fk_sql = f"ADD FOREIGN KEY (`{nome_coluna}`) "
                             fk_sql += f"REFERENCES `{fk_info['tabela_ref']}`(`{fk_info['coluna_ref']}`)"
                             
                             if fk_info.get("on_delete") and fk_info["on_delete"] not in ["", "RESTRICT"]:
@@ -329,21 +382,25 @@ def adicionar_coluna_tabela(banco, tabela):
                             if fk_info.get("on_update") and fk_info["on_update"] not in ["", "RESTRICT"]:
                                 fk_sql += f" ON UPDATE {fk_info['on_update']}"
                             
-                            cursor.execute(fk_sql)
-                            conexao.commit()
-                            st.success("✅ FOREIGN KEY criada com sucesso!")
+                            resultado_fk = executar_alter(conexao, banco, tabela, fk_sql, f"FOREIGN KEY em `{nome_coluna}`")
+                            if resultado_fk["pendente"]:
+                                st.rerun()
+                            if resultado_fk.get("enfileirado"):
+                                st.info("📥 FOREIGN KEY enfileirada: será criada ao aplicar as alterações enfileiradas")
+                            else:
+                                st.success("✅ FOREIGN KEY criada com sucesso!")
                             
-                            st.markdown("##### 🔗 Detalhes da FK Criada:")
-                            st.info(f"""
-                            **Tabela:** `{tabela}`  
-                            **Coluna FK:** `{nome_coluna}`  
-                            **Referência:** `{fk_info['tabela_ref']}`.`{fk_info['coluna_ref']}`  
-                            **ON DELETE:** {fk_info.get('on_delete', 'RESTRICT')}  
-                            **ON UPDATE:** {fk_info.get('on_update', 'RESTRICT')}
-                            """)
+                                st.markdown("##### 🔗 Detalhes da FK Criada:")
+                                st.info(f"""
+                                **Tabela:** `{tabela}`  
+                                **Coluna FK:** `{nome_coluna}`  
+                                **Referência:** `{fk_info['tabela_ref']}`.`{fk_info['coluna_ref']}`  
+                                **ON DELETE:** {fk_info.get('on_delete', 'RESTRICT')}  
+                                **ON UPDATE:** {fk_info.get('on_update', 'RESTRICT')}
+                                """)
                             
-                            st.markdown("---")
-                            mostrar_fks_tabela(banco, tabela, cursor)
+                                st.markdown("---")
+                                mostrar_fks_tabela(banco, tabela, cursor)
                             
                         except Exception as fk_error:
                             st.warning(f"⚠️ A coluna foi criada, mas a FOREIGN KEY falhou: {fk_error}")
@@ -487,7 +544,7 @@ def modificar_coluna_tabela(banco, tabela):
                         
                         if novo_nome and novo_nome != coluna_selecionada:
                             try:
-                                rename_sql = f"ALTER TABLE `{tabela}` CHANGE COLUMN `{coluna_selecionada}` `{novo_nome}` {novo_tipo}"
+                                rename_sql = f"CHANGE COLUMN `{coluna_selecionada}` `{novo_nome}` {novo_tipo}"
                                 
                                 if novo_null == "NOT NULL":
                                     rename_sql += " NOT NULL"
@@ -514,14 +571,18 @@ def modificar_coluna_tabela(banco, tabela):
                                 if novo_auto and "INT" in novo_tipo.upper():
                                     rename_sql += " AUTO_INCREMENT"
                                 
-                                cursor.execute(rename_sql)
+                                if comentario:
+                                    rename_sql += f" COMMENT '{comentario.replace(chr(39), chr(39) * 2)}'"
+                                
+                                if executar_alter(conexao, banco, tabela, rename_sql, f"renomear `{coluna_selecionada}` para `{novo_nome}`")["pendente"]:
+                                    st.rerun()
                                 st.success(f"✅ Nome alterado para: `{novo_nome}`")
                                 coluna_selecionada = novo_nome
                                 
                             except Exception as rename_err:
                                 st.error(f"❌ Erro ao renomear coluna: {rename_err}")
                         else:
-                            modify_sql = f"ALTER TABLE `{tabela}` MODIFY COLUMN `{coluna_selecionada}` {novo_tipo}"
+                            modify_sql = f"MODIFY COLUMN `{coluna_selecionada}` {novo_tipo}"
                             
                             if novo_null == "NOT NULL":
                                 modify_sql += " NOT NULL"
@@ -548,18 +609,22 @@ def modificar_coluna_tabela(banco, tabela):
                             if novo_auto and "INT" in novo_tipo.upper():
                                 modify_sql += " AUTO_INCREMENT"
                             
-                            cursor.execute(modify_sql)
+                            if comentario:
+                                modify_sql += f" COMMENT '{comentario.replace(chr(39), chr(39) * 2)}'"
+                            
+                            if executar_alter(conexao, banco, tabela, modify_sql, f"modificar a coluna `{coluna_selecionada}`")["pendente"]:
+                                st.rerun()
                             st.success("✅ Tipo e atributos modificados")
                         
                         if adicionar_fk and fk_info.get("tabela_ref") and fk_info.get("coluna_ref"):
                             if fk_info["tabela_ref"] != "-- Selecione --" and fk_info["coluna_ref"] != "-- Selecione --":
                                 try:
                                     try:
-                                        cursor.execute(f"ALTER TABLE `{tabela}` ENGINE=InnoDB")
+                                        converter_para_innodb(conexao, banco, tabela)
                                     except:
                                         pass
                                     
-                                    fk_sql = f"ALTER TABLE `{tabela}` ADD FOREIGN KEY (`{coluna_selecionada}`) "
+                                    fk_sql = f"ADD FOREIGN KEY (`{coluna_selecionada}`) "
                                     fk_sql += f"REFERENCES `{fk_info['tabela_ref']}`(`{fk_info['coluna_ref']}`)"
                                     
                                     if fk_info.get("on_delete"):
@@ -568,36 +633,36 @@ def modificar_coluna_tabela(banco, tabela):
                                     if fk_info.get("on_update"):
                                         fk_sql += f" ON UPDATE {fk_info['on_update']}"
                                     
-                                    cursor.execute(fk_sql)
-                                    st.success("✅ FOREIGN KEY adicionada")
+                                    resultado_fk = executar_alter(conexao, banco, tabela, fk_sql, f"FOREIGN KEY em `{coluna_selecionada}`")
+                                    if resultado_fk["pendente"]:
+                                        st.rerun()
+                                    if resultado_fk.get("enfileirado"):
+                                        st.info("📥 FOREIGN KEY enfileirada: será criada ao aplicar as alterações enfileiradas")
+                                    else:
+                                        st.success("✅ FOREIGN KEY adicionada")
                                     
-                                    st.markdown("##### 🔗 Detalhes da FK Adicionada:")
-                                    st.info(f"""
-                                    **Tabela:** `{tabela}`  
-                                    **Coluna FK:** `{coluna_selecionada}`  
-                                    **Referência:** `{fk_info['tabela_ref']}`.`{fk_info['coluna_ref']}`  
-                                    **ON DELETE:** {fk_info.get('on_delete', 'RESTRICT')}  
-                                    **ON UPDATE:** {fk_info.get('on_update', 'RESTRICT')}
-                                    """)
+                                        st.markdown("##### 🔗 Detalhes da FK Adicionada:")
+                                        st.info(f"""
+                                        **Tabela:** `{tabela}`  
+                                        **Coluna FK:** `{coluna_selecionada}`  
+                                        **Referência:** `{fk_info['tabela_ref']}`.`{fk_info['coluna_ref']}`  
+                                        **ON DELETE:** {fk_info.get('on_delete', 'RESTRICT')}  
+                                        **ON UPDATE:** {fk_info.get('on_update', 'RESTRICT')}
+                                        """)
                                     
-                                    st.markdown("---")
-                                    mostrar_fks_tabela(banco, tabela, cursor)
+                                        st.markdown("---")
+                                        mostrar_fks_tabela(banco, tabela, cursor)
                                     
                                 except Exception as fk_err:
                                     st.warning(f"⚠️ Coluna modificada, mas FK falhou: {fk_err}")
                         
-                        if comentario:
-                            try:
-                                comment_sql = f"ALTER TABLE `{tabela}` MODIFY COLUMN `{coluna_selecionada}` {novo_tipo} COMMENT '{comentario}'"
-                                cursor.execute(comment_sql)
-                                st.info("💬 Comentário adicionado")
-                            except Exception as comment_err:
-                                st.info(f"ℹ️ Não foi possível adicionar comentário: {comment_err}")
-                        
                         conexao.commit()
                         cursor.close()
                         
-                        st.success("✅ Todas as modificações aplicadas!")
+                        if modo_fila(banco, tabela):
+                            st.success("📥 Modificações enfileiradas: aplique-as no painel de alterações enfileiradas")
+                        else:
+                            st.success("✅ Todas as modificações aplicadas!")
                         st.markdown("---")
                         st.subheader("📊 Estrutura Atualizada da Tabela")
                         
@@ -654,9 +719,10 @@ def remover_coluna_tabela(banco, tabela):
                     try:
                         conexao = conectar_banco(banco)
                         if conexao:
-                            cursor = conexao.cursor()
-                            cursor.execute(f"ALTER TABLE `{tabela}` DROP COLUMN `{coluna_para_remover}`")
-                            conexao.commit()
+                            resultado = executar_alter(conexao, banco, tabela, f"DROP COLUMN `{coluna_para_remover}`",
+                                                       f"remover a coluna `{coluna_para_remover}`")
+                            if resultado["pendente"]:
+                                st.rerun()
                             st.success(f"✅ Coluna `{coluna_para_remover}` removida com sucesso!")
                             del st.session_state.menu_estado["acao_edicao"]
                             st.rerun()
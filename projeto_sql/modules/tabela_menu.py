@@ -1,5 +1,6 @@
 # modules/tabela_menu.py COMPLETO CORRIGIDO
 import streamlit as st
+from .conexao_resiliente import usar_banco
 from .tabela_utils import listar_bancos, listar_tabelas
 
 def criar_menu_superior():
@@ -39,10 +40,7 @@ def criar_menu_superior():
                     # Atualizar a conexão com o banco selecionado
                     if "conexao_mysql" in st.session_state and st.session_state.conexao_mysql:
                         try:
-                            cursor = st.session_state.conexao_mysql.cursor()
-                            cursor.execute(f"USE {banco_selecionado}")
-                            cursor.close()
-                            st.session_state.conexao_mysql.database = banco_selecionado
+                            usar_banco(st.session_state.conexao_mysql, banco_selecionado)
                         except:
                             pass
                 else:
@@ -62,8 +60,8 @@ def criar_menu_superior():
         if st.session_state.menu_estado.get("banco_selecionado"):
             st.markdown("### 📋 Operações com Tabelas")
             
-            # 9 botões em linha - CORRIGIDO
-            col1, col2, col3, col4, col5, col6, col7, col8, col9 = st.columns(9)
+            # 10 botões em linha
+            col1, col2, col3, col4, col5, col6, col7, col8, col9, col10 = st.columns(10)
             
             # Lista de botões: (texto, opção, tooltip, precisa_tabela_selecionada)
             botoes_info = [
@@ -75,10 +73,11 @@ def criar_menu_superior():
                 ("👁️ Visualizar", "visualizar_tabela", "Ver dados e estrutura", True),
                 ("📋 Listar", "listar_tabelas", "Listar todas as tabelas", False),
                 ("🔗 Ver Diagrama", "Visualizar_relacoes", "Visualizar relações", False),
-                ("📊 Tipos", "tipos_dados", "Ver tabela de tipos de dados", False)
+                ("📊 Tipos", "tipos_dados", "Ver tabela de tipos de dados", False),
+                ("🛠️ Manutenção", "manutencao_tabelas", "Fragmentação, estatísticas, ANALYZE/OPTIMIZE", False)
             ]
             
-            cols = [col1, col2, col3, col4, col5, col6, col7, col8, col9]
+            cols = [col1, col2, col3, col4, col5, col6, col7, col8, col9, col10]
             
             for i, (texto, opcao, tooltip, precisa_tabela) in enumerate(botoes_info):
                 with cols[i]:
@@ -1,7 +1,7 @@
 # modules/tabela_utils.py
-import mysql.connector
 from mysql.connector import Error
 import streamlit as st
+from .conexao_resiliente import conectar, obter_conexao_sessao
 
 # ============ DADOS DOS TIPOS (DA IMAGEM) ============
 TIPOS_DADOS_ACCESS = {
@@ -55,27 +55,12 @@ def converter_tipo_access_para_mysql(tipo_access):
 
 def conectar_banco(database=None):
     """Conecta ao MySQL usando a conexão existente ou cria nova"""
-    if "conexao_mysql" in st.session_state and st.session_state.conexao_mysql:
-        conexao = st.session_state.conexao_mysql
-        if database and database != conexao.database:
-            try:
-                cursor = conexao.cursor()
-                cursor.execute(f"USE {database}")
-                cursor.close()
-                conexao.database = database
-                return conexao
-            except:
-                pass
+    conexao = obter_conexao_sessao("conexao_mysql", banco=database, criar=False)
+    if conexao:
         return conexao
     
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=database
-        )
-        return conexao
+        return conectar(database)
     except Error as e:
         st.error(f"Erro: {e}")
         return None
@@ -83,11 +68,7 @@ def conectar_banco(database=None):
 def listar_bancos():
     """Lista todos os bancos disponíveis"""
     try:
-        conexao_temp = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao_temp = conectar()
         cursor = conexao_temp.cursor()
         cursor.execute("SHOW DATABASES")
         todos_bancos = [db[0] for db in cursor.fetchall()]
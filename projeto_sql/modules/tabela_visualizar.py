@@ -4,17 +4,16 @@ import pandas as pd
 import mysql.connector
 from mysql.connector import Error
 from typing import List, Dict, Optional
-from io import BytesIO
+from .contagem_registros import obter_contagem, mostrar_contagem
+from .conexao_resiliente import obter_conexao_sessao, usar_banco
+from .exportacao import mostrar_exportacao
+from .colunar import mostrar_importacao_colunar
+from .resultados import dataframe_do_cursor
+from .grade_virtual import invalidar_grade, mostrar_grade, obter_colunas
 
 def get_conexao():
-    """Obtém conexão do session_state ou cria nova"""
-    if "conexao_mysql" in st.session_state and st.session_state.conexao_mysql:
-        try:
-            if st.session_state.conexao_mysql.is_connected():
-                return st.session_state.conexao_mysql
-        except:
-            pass
-    return None
+    """Obtém a conexão viva do session_state (None se o app ainda não conectou)"""
+    return obter_conexao_sessao("conexao_mysql", criar=False)
 
 def listar_bancos() -> List[str]:
     """Lista todos os bancos de dados disponíveis"""
@@ -41,7 +40,7 @@ def listar_tabelas(banco: str) -> List[str]:
     
     try:
         cursor = conexao.cursor()
-        cursor.execute(f"USE `{banco}`")
+        usar_banco(conexao, banco)
         cursor.execute("SHOW TABLES")
         tabelas = [t[0] for t in cursor.fetchall()]
         cursor.close()
@@ -58,7 +57,7 @@ def obter_estrutura_tabela(banco: str, tabela: str) -> pd.DataFrame:
     
     try:
         cursor = conexao.cursor()
-        cursor.execute(f"USE `{banco}`")
+        usar_banco(conexao, banco)
         cursor.execute(f"DESCRIBE `{tabela}`")
         
         colunas = ["Campo", "Tipo", "Nulo", "Chave", "Default", "Extra"]
@@ -79,16 +78,11 @@ def obter_dados_tabela(banco: str, tabela: str, limite: int = 100) -> pd.DataFra
     
     try:
         cursor = conexao.cursor()
-        cursor.execute(f"USE `{banco}`")
+        usar_banco(conexao, banco)
         cursor.execute(f"SELECT * FROM `{tabela}` LIMIT {limite}")
         
-        # Obter nomes das colunas
-        colunas = [desc[0] for desc in cursor.description]
-        
-        # Obter dados
-        dados = cursor.fetchall()
-        
-        df = pd.DataFrame(dados, columns=colunas)
+        # DataFrame tipado direto do cursor
+        df = dataframe_do_cursor(cursor)
         cursor.close()
         return df
     except Exception as e:
@@ -96,18 +90,13 @@ def obter_dados_tabela(banco: str, tabela: str, limite: int = 100) -> pd.DataFra
         return pd.DataFrame()
 
 def obter_contagem_registros(banco: str, tabela: str) -> int:
-    """Obtém o total de registros em uma tabela"""
+    """Obtém o total de registros (estimativa em tabelas grandes, ver contagem_registros)"""
     conexao = get_conexao()
     if not conexao:
         return 0
     
     try:
-        cursor = conexao.cursor()
-        cursor.execute(f"USE `{banco}`")
-        cursor.execute(f"SELECT COUNT(*) FROM `{tabela}`")
-        total = cursor.fetchone()[0]
-        cursor.close()
-        return total
+        return obter_contagem(conexao, banco, tabela)["total"]
     except Exception as e:
         st.error(f"Erro ao contar registros: {e}")
         return 0
@@ -120,7 +109,7 @@ def obter_chaves_tabela(banco: str, tabela: str) -> Dict:
     
     try:
         cursor = conexao.cursor()
-        cursor.execute(f"USE `{banco}`")
+        usar_banco(conexao, banco)
         
         # Chaves primárias
         cursor.execute(f"""
@@ -165,7 +154,7 @@ def obter_indices_tabela(banco: str, tabela: str) -> pd.DataFrame:
     
     try:
         cursor = conexao.cursor()
-        cursor.execute(f"USE `{banco}`")
+        usar_banco(conexao, banco)
         cursor.execute(f"SHOW INDEX FROM `{tabela}`")
         
         # Obter descrição das colunas
@@ -227,8 +216,7 @@ def pagina_visualizar_tabela():
     if not conexao:
         st.warning("⚠️ Não há conexão com o MySQL")
         if st.button("🔄 Tentar Conectar"):
-            from app import conectar_mysql
-            st.session_state.conexao_mysql = conectar_mysql()
+            obter_conexao_sessao("conexao_mysql")
             st.rerun()
         return
     
@@ -255,6 +243,10 @@ def pagina_visualizar_tabela():
         if st.button("🔄 Atualizar Lista", use_container_width=True):
             st.rerun()
     
+    # Importação de Parquet/Arrow (também cria a tabela, se necessário)
+    with st.expander("📥 Importar Parquet / Arrow"):
+        mostrar_importacao_colunar(banco_selecionado, chave=f"importar_{banco_selecionado}")
+    
     # Seleção de tabela
     tabelas = listar_tabelas(banco_selecionado)
     
@@ -376,87 +368,66 @@ def visualizar_dados(banco: str, tabela: str):
     """Visualiza os dados da tabela"""
     st.subheader("📊 Dados da Tabela")
     
-    # Controle de limite
-    col_lim1, col_lim2 = st.columns([3, 1])
-    
-    with col_lim1:
-        limite = st.slider(
-            "Quantidade de registros:",
-            min_value=10,
-            max_value=1000,
-            value=100,
-            step=10,
-            help="Limite de registros a exibir"
+    conexao = get_conexao()
+    try:
+        colunas = [nome for nome, _ in obter_colunas(conexao, banco, tabela)]
+    except Error as e:
+        st.error(f"Erro ao obter colunas: {e}")
+        return
+    
+    # Ordenação feita no servidor: cada página é lida já na ordem escolhida
+    col_ord1, col_ord2, col_ord3 = st.columns([2, 1, 1])
+    
+    with col_ord1:
+        ordenar_por = st.selectbox(
+            "Ordenar por:",
+            ["(chave da tabela)"] + colunas,
+            key=f"visualizar_ordem_{banco}_{tabela}"
         )
     
-    with col_lim2:
+    with col_ord2:
+        descendente = st.radio(
+            "Ordem:", ["Ascendente", "Descendente"],
+            horizontal=True, key=f"visualizar_direcao_{banco}_{tabela}"
+        ) == "Descendente"
+    
+    with col_ord3:
         if st.button("🔄 Atualizar Dados", use_container_width=True):
+            invalidar_grade(banco, tabela)
             st.rerun()
     
-    # Obter dados
-    df_dados = obter_dados_tabela(banco, tabela, limite)
+    # Grade paginada: só a página visível é lida (e guardada no cache de páginas)
+    janela = mostrar_grade(
+        conexao, banco, tabela, chave=f"visualizar_{banco}_{tabela}",
+        ordenar_por=None if ordenar_por == "(chave da tabela)" else ordenar_por,
+        descendente=descendente
+    )
     
-    if df_dados.empty:
-        st.info("A tabela está vazia ou não foi possível obter os dados")
+    if janela is None:
         return
     
-    # Estatísticas rápidas
-    total_registros = obter_contagem_registros(banco, tabela)
+    df_dados = janela["dados"]
     
-    st.info(f"**Total de registros na tabela:** {total_registros:,}")
-    st.info(f"**Mostrando:** {len(df_dados):,} de {total_registros:,} registros")
-    
-    # Visualizar dados
-    st.dataframe(
-        df_dados,
-        use_container_width=True,
-        height=400
-    )
+    if df_dados.empty:
+        st.info("A tabela está vazia ou não foi possível obter os dados")
+        return
     
     # Opções de visualização
     with st.expander("⚙️ Opções de Visualização"):
-        col_opt1, col_opt2 = st.columns(2)
-        
-        with col_opt1:
-            mostrar_tipos = st.checkbox("Mostrar tipos de dados", value=False)
-            if mostrar_tipos:
-                st.write("**Tipos de dados das colunas:**")
-                for coluna in df_dados.columns:
-                    tipo = str(df_dados[coluna].dtype)
-                    st.write(f"• {coluna}: `{tipo}`")
-        
-        with col_opt2:
-            formato_download = st.radio(
-                "Formato para download:",
-                ["CSV", "Excel", "JSON"],
-                horizontal=True
-            )
-            
-            if st.button("💾 Baixar Dados"):
-                buffer = BytesIO()
-                
-                if formato_download == "CSV":
-                    df_dados.to_csv(buffer, index=False, encoding='utf-8')
-                    mime_type = "text/csv"
-                    extensao = "csv"
-                elif formato_download == "Excel":
-                    df_dados.to_excel(buffer, index=False)
-                    mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    extensao = "xlsx"
-                else:  # JSON
-                    df_dados.to_json(buffer, orient='records', indent=2)
-                    mime_type = "application/json"
-                    extensao = "json"
-                
-                buffer.seek(0)
-                
-                st.download_button(
-                    label=f"⬇️ Baixar {formato_download}",
-                    data=buffer,
-                    file_name=f"{tabela}_dados.{extensao}",
-                    mime=mime_type,
-                    use_container_width=True
-                )
+        mostrar_tipos = st.checkbox("Mostrar tipos de dados", value=False)
+        if mostrar_tipos:
+            st.write("**Tipos de dados das colunas:**")
+            for coluna in df_dados.columns:
+                tipo = str(df_dados[coluna].dtype)
+                st.write(f"• {coluna}: `{tipo}`")
+    
+    # Exportação em streaming da tabela inteira (não só das linhas exibidas)
+    with st.expander("💾 Baixar Dados"):
+        mostrar_exportacao(
+            f"SELECT * FROM `{tabela}`", banco=banco,
+            nome_base=f"{tabela}_dados", chave=f"visualizar_{banco}_{tabela}",
+            tabela=tabela
+        )
 
 def visualizar_estatisticas(banco: str, tabela: str):
     """Visualiza estatísticas da tabela"""
@@ -469,13 +440,10 @@ def visualizar_estatisticas(banco: str, tabela: str):
         st.info("Não há dados suficientes para análise estatística")
         return
     
-    # Métricas principais
-    total_registros = obter_contagem_registros(banco, tabela)
-    
     col_met1, col_met2, col_met3 = st.columns(3)
     
     with col_met1:
-        st.metric("Total de Registros", f"{total_registros:,}")
+        mostrar_contagem(get_conexao(), banco, tabela, chave="visualizar")
     
     with col_met2:
         colunas = len(df_dados.columns)
@@ -560,7 +528,7 @@ def visualizar_sql(banco: str, tabela: str):
     if conexao:
         try:
             cursor = conexao.cursor()
-            cursor.execute(f"USE `{banco}`")
+            usar_banco(conexao, banco)
             cursor.execute(f"SHOW CREATE TABLE `{tabela}`")
             
             resultado = cursor.fetchone()
@@ -1,10 +1,13 @@
 # query_editor.py - Editor SQL completo COM VISUALIZAÇÃO DE TABELAS
 import streamlit as st
 import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 import io
-from io import BytesIO
+import time
+from modules.conexao_resiliente import conectar
+from modules.exportacao import mostrar_exportacao
+from modules.gestao_indices import registrar_consulta
+from modules.resultados import dataframe_do_cursor
 
 # Verificar se há banco selecionado
 if "banco_ativo" not in st.session_state or not st.session_state.banco_ativo:
@@ -21,13 +24,7 @@ st.title("📊 Sistema de Banco de Dados")
 # ============ FUNÇÃO DE CONEXÃO ============
 def conectar_mysql(database=None):
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",  # Sua senha aqui
-            database=database
-        )
-        return conexao
+        return conectar(database)
     except Error as e:
         st.error(f"Erro: {e}")
         return None
@@ -138,14 +135,12 @@ def pagina_query_editor():
                             if conexao:
                                 cursor = conexao.cursor()
                                 cursor.execute(f"SELECT * FROM {tabela} LIMIT 5")
-                                dados = cursor.fetchall()
                                 
                                 if cursor.description:
-                                    colunas = [desc[0] for desc in cursor.description]
-                                    if dados:
-                                        df_preview = pd.DataFrame(dados, columns=colunas)
+                                    df_preview = dataframe_do_cursor(cursor)
+                                    if not df_preview.empty:
                                         st.dataframe(df_preview, use_container_width=True)
-                                        st.caption(f"Preview: {len(dados)} registros")
+                                        st.caption(f"Preview: {len(df_preview)} registros")
                                     else:
                                         st.info("Tabela vazia")
                                 else:
@@ -288,16 +283,17 @@ CALL relatorio_vendas('2024-01-01', '2024-12-31');
         
         try:
             with st.spinner("Executando query..."):
+                inicio = time.perf_counter()
                 cursor.execute(query)
                 
                 if query.strip().upper().startswith(('SELECT', 'SHOW', 'DESCRIBE', 'EXPLAIN')):
-                    resultados = cursor.fetchall()
-                    
                     if cursor.description:
-                        colunas = [desc[0] for desc in cursor.description]
+                        linhas_lidas = cursor.fetchall()
+                        df = dataframe_do_cursor(cursor, linhas_lidas)
+                        # Consultas lentas alimentam as sugestões de índice
+                        registrar_consulta(banco_selecionado, query, time.perf_counter() - inicio)
                         
-                        if resultados:
-                            df = pd.DataFrame(resultados, columns=colunas)
+                        if not df.empty:
                             st.success(f"✅ {len(df)} linha(s) retornada(s)")
                             
                             # Mostrar dataframe
@@ -311,51 +307,17 @@ CALL relatorio_vendas('2024-01-01', '2024-12-31');
                                 tipos = {col: str(dtype) for col, dtype in df.dtypes.items()}
                                 st.json(tipos)
                             
-                            # Download
-                            col_d1, col_d2, col_d3 = st.columns(3)
-                            
-                            with col_d1:
-                                # CSV
-                                csv_buffer = df.to_csv(index=False).encode('utf-8')
-                                st.download_button(
-                                    "⬇️ Baixar CSV",
-                                    csv_buffer,
-                                    f"resultados_{banco_selecionado}.csv",
-                                    "text/csv",
-                                    use_container_width=True
-                                )
-                            
-                            with col_d2:
-                                # JSON
-                                json_str = df.to_json(orient='records', indent=2)
-                                st.download_button(
-                                    "⬇️ Baixar JSON",
-                                    json_str,
-                                    f"resultados_{banco_selecionado}.json",
-                                    "application/json",
-                                    use_container_width=True
-                                )
-                            
-                            with col_d3:
-                                # EXCEL
-                                excel_buffer = BytesIO()
-                                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                                    df.to_excel(writer, index=False, sheet_name='Resultados')
-                                
-                                excel_data = excel_buffer.getvalue()
-                                st.download_button(
-                                    "⬇️ Baixar Excel",
-                                    excel_data,
-                                    f"resultados_{banco_selecionado}.xlsx",
-                                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    use_container_width=True
-                                )
+                            # Exportação das linhas já lidas (seção abaixo, sobrevive aos reruns):
+                            # a consulta não é executada de novo (CALL pode ter efeitos)
+                            st.session_state.query_exportacao = (
+                                query, banco_selecionado, (cursor.description, linhas_lidas))
                         else:
                             st.info("✅ Query executada, mas sem resultados retornados.")
                     else:
                         st.info("✅ Query executada com sucesso (sem descrição de colunas).")
                 
                 else:
+                    st.session_state.query_exportacao = None
                     linhas = cursor.rowcount
                     conexao.commit()
                     st.success(f"✅ Query executada com sucesso!")
@@ -379,6 +341,13 @@ CALL relatorio_vendas('2024-01-01', '2024-12-31');
             cursor.close()
             conexao.close()
     
+    # Exportação da última consulta, a partir das linhas já lidas
+    if st.session_state.get("query_exportacao"):
+        query_exp, banco_exp, resultado_exp = st.session_state.query_exportacao
+        st.subheader("📤 Exportar Resultados")
+        mostrar_exportacao(query_exp, banco=banco_exp, nome_base=f"resultados_{banco_exp}",
+                           chave="query_editor", resultado=resultado_exp)
+    
     # Seção 4: Histórico (simplificado)
     with st.expander("📋 Histórico de Queries (últimas 5)"):
         if "historico_queries" not in st.session_state:
@@ -1,10 +1,11 @@
 # relacoes_1.py - VERSÃO FINAL CORRIGIDA (PROBLEMA DE TABELAS COM MESMO NOME)
 import streamlit as st
 import pandas as pd
-import mysql.connector
-import networkx as nx
-import matplotlib.pyplot as plt
 import io
+from importlib.util import find_spec
+from modules.conexao_resiliente import conectar
+# networkx e matplotlib são importados dentro das funções que os usam
+# (são pesados e só fazem falta quando o diagrama é desenhado)
 
 # ============ SISTEMA DE RESET AUTOMÁTICO ============
 def reset_relacoes_state():
@@ -54,13 +55,7 @@ def get_tabelas_cache_key(banco):
 def conectar_banco(database=None):
     """Sempre cria NOVA conexão para evitar cache"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=database,
-            autocommit=True
-        )
+        conexao = conectar(database, autocommit=True)
         return conexao
     except Exception as e:
         st.error(f"Erro ao conectar a '{database}': {e}")
@@ -108,11 +103,7 @@ def buscar_relacoes_fresh(database):
     """Busca relações APENAS do banco especificado - VERSÃO ULTRA-FILTRADA"""
     try:
         # Conectar SEM banco para acessar INFORMATION_SCHEMA
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         
         cursor = conexao.cursor(dictionary=True)
         
@@ -179,7 +170,8 @@ def buscar_relacoes_via_show_create(database):
         if not conexao:
             return []
         
-        cursor = conexao.cursor(dictionary=True)
+        # Cursor de tuplas: (nome, DDL) em SHOW CREATE TABLE
+        cursor = conexao.cursor()
         
         # Primeiro, pegar todas as tabelas do banco
         cursor.execute("SHOW TABLES")
@@ -192,8 +184,9 @@ def buscar_relacoes_via_show_create(database):
             cursor.execute(f"SHOW CREATE TABLE `{tabela}`")
             create_stmt = cursor.fetchone()
             
-            if create_stmt and 'Create Table' in create_stmt:
-                create_sql = create_stmt['Create Table']
+            # Views devolvem 'Create View' na mesma posição: ignoradas
+            if create_stmt and cursor.column_names[1] == 'Create Table':
+                create_sql = create_stmt[1]
                 
                 # Analisar o SQL para encontrar FOREIGN KEY
                 lines = create_sql.split('\n')
@@ -325,11 +318,7 @@ def componente_selecao_banco_com_limpeza():
 def listar_bancos_local():
     """Lista bancos sem config_global"""
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password=""
-        )
+        conexao = conectar()
         cursor = conexao.cursor()
         cursor.execute("SHOW DATABASES")
         todos_bancos = [db[0] for db in cursor.fetchall()]
@@ -350,6 +339,7 @@ def criar_grafo_limpo(database, relacoes):
         return None, "Nenhuma relação encontrada"
     
     try:
+        import networkx as nx
         G = nx.DiGraph()
         G.name = f"Relações - {database}"
         
@@ -388,6 +378,11 @@ def criar_grafo_limpo(database, relacoes):
 def plotar_grafo_limpo(G, database):
     """Plota grafo com título específico do banco"""
     try:
+        import networkx as nx
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        
         fig, ax = plt.subplots(figsize=(12, 10))
         pos = nx.spring_layout(G, k=2, iterations=50)
         
@@ -576,6 +571,7 @@ def pagina_relacoes():
                     st.metric("Relações", len(G.edges()))
                 with col3:
                     try:
+                        import networkx as nx
                         densidade = nx.density(G)
                         st.metric("Densidade", f"{densidade:.3f}")
                     except:
@@ -676,10 +672,8 @@ if __name__ == "__main__":
         st.session_state.banco_anterior_relacoes = None
     
     # Verificar dependências
-    try:
-        import networkx
-        import matplotlib
-    except ImportError:
+    # Só confere se estão instalados: a importação (pesada) fica para quando o grafo é desenhado
+    if not (find_spec("networkx") and find_spec("matplotlib")):
         st.error("⚠️ Instale: pip install networkx matplotlib")
         st.stop()
     
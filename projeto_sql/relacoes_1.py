@@ -1,22 +1,17 @@
 # relacoes.py - Versão simplificada que funciona com seu app.py
 import streamlit as st
 import pandas as pd
-import mysql.connector
-import matplotlib.pyplot as plt
+from modules.conexao_resiliente import conectar, obter_conexao_sessao, usar_banco
+from modules.resultados import consultar_dataframe
 
 def conectar_banco(database=None):
     """Conecta ao MySQL usando sua conexão existente"""
-    if "conexao_mysql" in st.session_state and st.session_state.conexao_mysql:
-        return st.session_state.conexao_mysql
+    conexao = obter_conexao_sessao("conexao_mysql", criar=False)
+    if conexao:
+        return conexao
     
     try:
-        conexao = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database=database
-        )
-        return conexao
+        return conectar(database)
     except Exception as e:
         st.error(f"Erro: {e}")
         return None
@@ -29,7 +24,7 @@ def pagina_relacoes():
     
     # Verificar conexão
     conexao = conectar_banco()
-    if not conexao or not conexao.is_connected():
+    if not conexao:
         st.warning("⚠️ Conecte-se ao MySQL primeiro!")
         
         # Mostrar bancos disponíveis para seleção
@@ -51,9 +46,7 @@ def pagina_relacoes():
                 
                 if banco_selecionado != "Selecione um banco":
                     try:
-                        cursor = conexao.cursor()
-                        cursor.execute(f"USE {banco_selecionado}")
-                        cursor.close()
+                        usar_banco(conexao, banco_selecionado)
                         st.success(f"✅ Banco {banco_selecionado} selecionado!")
                         st.rerun()
                     except:
@@ -83,8 +76,6 @@ def pagina_relacoes():
     with tab1:
         # Obter relações do banco
         try:
-            cursor = conexao.cursor(dictionary=True)
-            
             query = """
             SELECT 
                 TABLE_NAME as tabela_origem,
@@ -100,56 +91,42 @@ def pagina_relacoes():
                 TABLE_NAME, COLUMN_NAME
             """
             
-            cursor.execute(query, (banco_atual,))
-            relacoes = cursor.fetchall()
-            cursor.close()
+            relacoes = consultar_dataframe(conexao, query, (banco_atual,))
             
-            if relacoes:
+            if not relacoes.empty:
                 st.subheader(f"📊 {len(relacoes)} Relações Encontradas")
                 
-                # Criar DataFrame
-                dados = []
-                for rel in relacoes:
-                    dados.append({
-                        "Tabela Origem": rel['tabela_origem'],
-                        "Coluna": rel['coluna_origem'],
-                        "→": "→",
-                        "Tabela Destino": rel['tabela_destino'],
-                        "Coluna Referência": rel['coluna_destino']
-                    })
-                
-                df = pd.DataFrame(dados)
+                df = relacoes.rename(columns={
+                    "tabela_origem": "Tabela Origem",
+                    "coluna_origem": "Coluna",
+                    "tabela_destino": "Tabela Destino",
+                    "coluna_destino": "Coluna Referência"
+                })
+                df.insert(2, "→", "→")
                 st.dataframe(df, use_container_width=True, hide_index=True)
                 
                 # Estatísticas
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    tabelas_unicas = set()
-                    for rel in relacoes:
-                        tabelas_unicas.add(rel['tabela_origem'])
-                        tabelas_unicas.add(rel['tabela_destino'])
+                    tabelas_unicas = set(relacoes['tabela_origem']) | set(relacoes['tabela_destino'])
                     st.metric("Tabelas Relacionadas", len(tabelas_unicas))
                 
                 with col2:
                     # Contar tabelas que são apenas origem
-                    tabelas_origem = set(rel['tabela_origem'] for rel in relacoes)
-                    st.metric("Tabelas com FK", len(tabelas_origem))
+                    st.metric("Tabelas com FK", relacoes['tabela_origem'].nunique())
                 
                 with col3:
                     # Contar tabelas que são apenas destino
-                    tabelas_destino = set(rel['tabela_destino'] for rel in relacoes)
-                    st.metric("Tabelas Referenciadas", len(tabelas_destino))
+                    st.metric("Tabelas Referenciadas", relacoes['tabela_destino'].nunique())
                 
                 # Gráfico simples
                 st.subheader("📈 Distribuição de Relações")
                 
                 # Contar relações por tabela origem
-                contagem = {}
-                for rel in relacoes:
-                    tabela = rel['tabela_origem']
-                    contagem[tabela] = contagem.get(tabela, 0) + 1
+                contagem = relacoes['tabela_origem'].value_counts(sort=False).to_dict()
                 
                 if contagem:
+                    import matplotlib.pyplot as plt  # import preguiçoso (pesado)
                     fig, ax = plt.subplots(figsize=(10, 6))
                     tabelas = list(contagem.keys())
                     valores = list(contagem.values())
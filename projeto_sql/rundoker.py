@@ -1,8 +1,14 @@
 # verificar_docker.py - Execute ANTES do app.py
 import streamlit as st
-import subprocess
-import time
 import os
+from modules.mysql_prontidao import (
+    diagnostico_docker, iniciar_container_async, parar_container,
+    mostrar_indicador_status, obter_status
+)
+
+CONTAINER_TESTE = "test_mysql"
+PORTA_TESTE = 3307
+SENHA_TESTE = "test123"
 
 st.set_page_config(page_title="Verificador Docker", layout="wide")
 st.title("🔍 Verificação do Sistema")
@@ -10,51 +16,41 @@ st.title("🔍 Verificação do Sistema")
 # ============ VERIFICAÇÕES ============
 st.header("1. 🐳 Status do Docker")
 
-try:
-    # Verificar se Docker está instalado
-    result = subprocess.run(["docker", "--version"], 
-                          capture_output=True, text=True)
+# Diagnóstico em cache (60s): não repete os subprocess a cada rerun
+if st.button("🔄 Verificar novamente"):
+    diagnostico = diagnostico_docker(forcar=True)
+else:
+    diagnostico = diagnostico_docker()
+
+if diagnostico["instalado"]:
+    st.success(f"✅ Docker instalado: {diagnostico['versao']}")
     
-    if result.returncode == 0:
-        st.success(f"✅ Docker instalado: {result.stdout.strip()}")
+    if diagnostico["engine"]:
+        st.success("✅ Docker Engine está rodando")
         
-        # Verificar se Docker está rodando
-        result = subprocess.run(["docker", "info"], 
-                              capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            st.success("✅ Docker Engine está rodando")
-            
-            # Verificar imagens MySQL disponíveis
-            result = subprocess.run(["docker", "images", "mysql"], 
-                                  capture_output=True, text=True)
-            
-            if "mysql" in result.stdout:
-                st.success("✅ Imagem MySQL disponível")
-            else:
-                st.warning("⚠️ Imagem MySQL não encontrada")
-                st.info("Baixando automaticamente quando iniciar...")
-                
+        if diagnostico["imagem_mysql"]:
+            st.success("✅ Imagem MySQL disponível")
         else:
-            st.error("❌ Docker Engine não está rodando")
-            st.info("""
-            **Soluções:**
-            1. **Windows/Mac:** Abra o Docker Desktop
-            2. **Linux:** `sudo systemctl start docker`
-            3. Aguarde o ícone do Docker ficar verde
-            """)
+            st.warning("⚠️ Imagem MySQL não encontrada")
+            st.info("Baixando automaticamente quando iniciar...")
             
     else:
-        st.error("❌ Docker não está instalado")
-        st.markdown("""
-        **Baixe e instale:**
-        - **Windows:** https://desktop.docker.com/win/main/amd64/Docker%20Desktop%20Installer.exe
-        - **Mac:** https://desktop.docker.com/mac/main/amd64/Docker.dmg
-        - **Linux:** `sudo apt-get install docker.io`
+        st.error("❌ Docker Engine não está rodando")
+        st.info("""
+        **Soluções:**
+        1. **Windows/Mac:** Abra o Docker Desktop
+        2. **Linux:** `sudo systemctl start docker`
+        3. Aguarde o ícone do Docker ficar verde
         """)
         
-except Exception as e:
-    st.error(f"❌ Erro ao verificar Docker: {e}")
+else:
+    st.error("❌ Docker não está instalado")
+    st.markdown("""
+    **Baixe e instale:**
+    - **Windows:** https://desktop.docker.com/win/main/amd64/Docker%20Desktop%20Installer.exe
+    - **Mac:** https://desktop.docker.com/mac/main/amd64/Docker.dmg
+    - **Linux:** `sudo apt-get install docker.io`
+    """)
 
 st.markdown("---")
 
@@ -65,64 +61,37 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("🚀 Testar Inicialização MySQL Docker", type="primary"):
-        with st.spinner("Iniciando MySQL Docker..."):
-            try:
-                # Parar container existente
-                subprocess.run(["docker", "stop", "test_mysql"], 
-                             capture_output=True)
-                subprocess.run(["docker", "rm", "test_mysql"], 
-                             capture_output=True)
-                
-                # Iniciar novo container
-                cmd = [
-                    "docker", "run", "-d",
-                    "--name", "test_mysql",
-                    "-p", "3307:3306",  # Porta diferente para teste
-                    "-e", "MYSQL_ROOT_PASSWORD=test123",
-                    "mysql:8.0"
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    st.success("✅ Container MySQL criado!")
-                    
-                    # Aguardar inicialização
-                    time.sleep(10)
-                    
-                    # Verificar se está rodando
-                    result = subprocess.run(
-                        ["docker", "ps", "--filter", "name=test_mysql"],
-                        capture_output=True, text=True
-                    )
-                    
-                    if "Up" in result.stdout:
-                        st.success("✅ MySQL Docker está rodando!")
-                        st.code("""
-                        Conexão de teste:
-                        Host: localhost
-                        Porta: 3307
-                        Usuário: root
-                        Senha: test123
-                        """)
-                    else:
-                        st.error("❌ Container não iniciou")
-                        
-                else:
-                    st.error(f"❌ Erro: {result.stderr}")
-                    
-            except Exception as e:
-                st.error(f"❌ Exception: {e}")
+        # Arranque em segundo plano; o progresso aparece abaixo
+        if iniciar_container_async(
+            CONTAINER_TESTE, PORTA_TESTE, SENHA_TESTE,
+            argumentos_run=[
+                "-p", f"{PORTA_TESTE}:3306",  # Porta diferente para teste
+                "-e", f"MYSQL_ROOT_PASSWORD={SENHA_TESTE}",
+                "mysql:8.0"
+            ]
+        ):
+            st.success("✅ Arranque do container de teste iniciado!")
+        else:
+            st.info("⏳ O container de teste já está iniciando...")
 
 with col2:
     if st.button("🛑 Parar Teste MySQL"):
-        result = subprocess.run(["docker", "stop", "test_mysql"], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
+        if parar_container(CONTAINER_TESTE):
             st.success("✅ Container parado")
         else:
             st.info("Container já estava parado")
 
+mostrar_indicador_status(CONTAINER_TESTE, PORTA_TESTE, SENHA_TESTE)
+
+if obter_status(porta=PORTA_TESTE, senha=SENHA_TESTE)["mysql_pronto"]:
+    st.code(f"""
+    Conexão de teste:
+    Host: localhost
+    Porta: {PORTA_TESTE}
+    Usuário: root
+    Senha: {SENHA_TESTE}
+    """)
+
 st.markdown("---")
 
 # ============ VERIFICAÇÃO DE MÓDULOS ============